@@ -13,6 +13,11 @@ from app.routes.apiInserirLog import api_inserir_log_bp
 from app.routes.apiListaProdutos import api_lista_produtos_bp
 from app.routes.apiNotificacoes import api_notificacoes_bp
 from app.routes.apiNotificacoesMarcarLida import api_notificacoes_marcar_lida_bp
+from app.routes.apiNotificacoesStream import api_notificacoes_stream_bp
+from app.routes.apiRelatoriosPdf import api_relatorios_pdf_bp
+from app.routes.apiVendas import api_vendas_bp
+from app.routes.apiGraficoFigura import api_grafico_figura_bp
+from app.routes.apiMongoPool import api_mongo_pool_bp
 from app.routes.apiProdutoDetalhe import api_produto_detalhe_bp
 from app.routes.apiProdutoUpdate import api_produto_update_bp
 from app.routes.apiTestarEmail import api_testar_email_bp
@@ -38,6 +43,37 @@ from app.routes.usuarios import usuarios_bp
 from app.routes.vendas import vendas_bp
 from app.routes.erro500 import erro_500
 from app.routes.apiConfigsValorAcesso import api_configs_valor_acesso_bp
+from app.indices import garantir_indices, mensagem_duplicados
+from app.conexao_mongo import iniciar_mongo_app
+from app.email_fila import iniciar_worker_email
+from app.relatorios_pdf import iniciar_worker_relatorios
+from app.agendador import iniciar_agendador
+from app.sessao import criar_interface_sessao
+from app.rasterizacao import processos_padrao
+from app.utils import formatar_moeda, formatar_data_iso
+from app.registro_graficos import url_plotly_js
+from app.graficos_lote import THREADS_PADRAO
+
+def iniciar_tarefas_segundo_plano(app):
+    """
+    Inicia as threads em segundo plano do processo atual (uma vez por processo/worker).
+
+    Parâmetros:
+        app (Flask): Aplicação (o worker de relatórios usa o contexto dela).
+    """
+    # Worker que envia os e-mails enfileirados pelas rotas; desative com EMAIL_WORKER=False
+    if os.environ.get("EMAIL_WORKER", "True") == "True":
+        iniciar_worker_email(intervalo=int(os.environ.get("EMAIL_WORKER_INTERVALO", "5")))
+
+    # Worker que gera os relatórios PDF pedidos em /api/relatorios-pdf; desative com RELATORIOS_WORKER=False
+    if os.environ.get("RELATORIOS_WORKER", "True") == "True":
+        iniciar_worker_relatorios(app, intervalo=int(os.environ.get("RELATORIOS_WORKER_INTERVALO", "5")))
+
+    # Tarefas periódicas (desligamento dos acessos, cache dos gráficos, vendas_diarias, limpeza),
+    # com lease no MongoDB para rodar uma vez entre workers/nós; desative com AGENDADOR=False
+    if os.environ.get("AGENDADOR", "True") == "True":
+        iniciar_agendador(app)
+
 
 def create_app(testing=False):
     # Carrega as variáveis de ambiente do arquivo .env
@@ -57,6 +93,56 @@ def create_app(testing=False):
     if testing:
         app.config["TESTING"] = True
 
+    # Cache do HTML dos gráficos (app/cache_graficos.py); desative com CACHE_GRAFICOS=False
+    app.config['CACHE_GRAFICOS'] = not testing and os.environ.get("CACHE_GRAFICOS", "True") == "True"
+
+    # Catálogo de produtos em memória (app/catalogo_produtos.py); desative com CACHE_PRODUTOS=False
+    app.config['CACHE_PRODUTOS'] = not testing and os.environ.get("CACHE_PRODUTOS", "True") == "True"
+
+    # Configurações tipadas em memória (app/configuracoes.py); desative com CACHE_CONFIGS=False
+    app.config['CACHE_CONFIGS'] = not testing and os.environ.get("CACHE_CONFIGS", "True") == "True"
+
+    # Processos que convertem os gráficos do PDF em PNG (app/rasterizacao.py); 1 = sem paralelismo
+    app.config['PDF_PROCESSOS'] = 1 if testing else int(os.environ.get("PDF_PROCESSOS", processos_padrao()))
+
+    # Conexões simultâneas de /api/notificacoes/stream por processo (app/notificacoes_stream.py); 0 = sem limite
+    app.config['STREAM_CONEXOES'] = int(os.environ.get("STREAM_CONEXOES", 0))
+
+    # Threads que geram os gráficos pedidos em lote no dashboard (app/graficos_lote.py)
+    app.config['GRAFICOS_THREADS'] = int(os.environ.get("GRAFICOS_THREADS", THREADS_PADRAO))
+
+    # Valores monetários (gravados como número) exibidos no padrão brasileiro: {{ valor|moeda }}
+    app.jinja_env.filters['moeda'] = formatar_moeda
+    # Datas gravadas como datetime nos campos <input type="date">: {{ data|data_iso }}
+    app.jinja_env.filters['data_iso'] = formatar_data_iso
+    # plotly.js servido localmente com a versão na URL: <script src="{{ url_plotly_js() }}">
+    app.jinja_env.globals['url_plotly_js'] = url_plotly_js
+
+    # Cliente MongoDB criado aqui, e não ao importar app.models (nos testes é criado no primeiro uso).
+    # Pool configurado por MONGO_MAX_POOL_SIZE, MONGO_WAIT_QUEUE_TIMEOUT_MS etc. (app/conexao_mongo.py);
+    # cada worker (após o fork) recria o próprio cliente com as mesmas opções
+    if not testing:
+        iniciar_mongo_app(app)
+
+    # Sessão guardada no servidor (o cookie leva só o ID); SESSAO_BACKEND=memoria|mongo
+    app.session_interface = criar_interface_sessao(testing=testing, backend=os.environ.get("SESSAO_BACKEND"))
+
+    # Cria os índices do banco na inicialização (idempotente); desative com CRIAR_INDICES=False
+    if not testing and os.environ.get("CRIAR_INDICES", "True") == "True":
+        from app.models import db
+        resultado = garantir_indices(db)
+        for colecao, nome, erro in resultado['erros']:
+            app.logger.error("Falha ao criar índice %s.%s: %s", colecao, nome, erro)
+        if resultado['duplicados']:
+            # Sem o índice único a numeração fica sem proteção no banco: avisa com o comando de correção
+            app.logger.error(mensagem_duplicados(resultado['duplicados']))
+
+    # Tarefas em segundo plano (e-mails, relatórios PDF, agendador). Threads não sobrevivem ao fork:
+    # no gunicorn com preload_app o mestre usa TAREFAS_SEGUNDO_PLANO=False e cada worker inicia as
+    # suas depois do fork (gunicorn.conf.py)
+    if not testing and os.environ.get("TAREFAS_SEGUNDO_PLANO", "True") == "True":
+        iniciar_tarefas_segundo_plano(app)
+
     # Middleware para bloquear IPs externos
     @app.before_request
     def bloquear_ips_externos():
@@ -77,6 +163,11 @@ def create_app(testing=False):
     app.register_blueprint(api_lista_produtos_bp)
     app.register_blueprint(api_notificacoes_bp)
     app.register_blueprint(api_notificacoes_marcar_lida_bp)
+    app.register_blueprint(api_notificacoes_stream_bp)
+    app.register_blueprint(api_relatorios_pdf_bp)
+    app.register_blueprint(api_vendas_bp)
+    app.register_blueprint(api_grafico_figura_bp)
+    app.register_blueprint(api_mongo_pool_bp)
     app.register_blueprint(api_produto_detalhe_bp)
     app.register_blueprint(api_produto_update_bp)
     app.register_blueprint(api_testar_email_bp)
@@ -0,0 +1,419 @@
+"""
+Módulo do agendador de tarefas periódicas de manutenção (desligamento dos acessos, reconstrução
+de 'vendas_diarias' e limpeza de notificações e logs).
+
+Cada tarefa tem uma agenda no formato cron, com campo opcional de segundos:
+    'minuto hora dia mês dia_semana'            ex: '30 3 * * *'   (todo dia às 03:30)
+    'segundo minuto hora dia mês dia_semana'    ex: '5 30 19 * * *' (todo dia às 19:30:05)
+Campos aceitam *, listas (1,2), faixas (1-5) e passos (*/5); dia da semana 0 (ou 7) = domingo.
+
+Todos os workers (e nós) rodam o agendador, e a coleção 'agendamentos' garante que cada
+horário seja executado uma única vez: o documento da tarefa guarda a próxima execução e um
+lease (dono + validade). Quem reserva o horário com find_one_and_update (atômico) já grava a
+próxima execução e o lease; os demais encontram o horário adiantado e não executam. O lease é
+renovado enquanto a tarefa roda e evita execuções sobrepostas quando ela demora mais que o
+intervalo.
+
+Um horário perdido (todos os processos parados) é executado uma vez quando o agendador volta,
+a menos que o atraso passe da tolerância da tarefa (ex: não desligar acessos às 10h da manhã
+porque o servidor estava fora às 19:30).
+"""
+
+import os
+import secrets
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from app.models import agendamentos_collection, limpar_logs_antigos
+from app.services import HORARIOS_DESLIGAMENTO, desligar_acessos_usuarios, limpar_notificacoes_antigas
+from app.vendas_diarias import reconstruir_vendas_diarias
+from app.cache_graficos import invalidar_cache_graficos
+
+# (mínimo, máximo) de cada campo: segundo, minuto, hora, dia do mês, mês, dia da semana
+LIMITES_CRON = [(0, 59), (0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+# Espera máxima (s) entre duas verificações do agendador
+ESPERA_MAXIMA = 30
+
+# Espera (s) antes de tentar de novo uma tarefa vencida que está com outro processo (ou sem banco)
+ESPERA_RETENTATIVA = 5
+
+
+def ler_campo_cron(campo, minimo, maximo):
+    """
+    Valores de um campo cron (ex: '*/15', '1-5', '0,30').
+
+    Lança:
+        ValueError: Se o campo for inválido ou sair dos limites.
+    """
+    valores = set()
+    for parte in campo.split(','):
+        faixa, barra, passo = parte.partition('/')
+        try:
+            passo = int(passo) if barra else 1
+            if faixa == '*':
+                inicio, fim = minimo, maximo
+            elif '-' in faixa:
+                inicio, fim = (int(valor) for valor in faixa.split('-', 1))
+            else:
+                inicio = int(faixa)
+                fim = maximo if barra else inicio
+        except ValueError:
+            raise ValueError(f"Campo inválido na agenda: {campo}")
+        if passo < 1 or inicio < minimo or fim > maximo or inicio > fim:
+            raise ValueError(f"Campo inválido na agenda: {campo}")
+        valores.update(range(inicio, fim + 1, passo))
+    return valores
+
+
+class AgendaCron:
+    """
+    Expressão cron com 5 campos (minuto hora dia mês dia_semana) ou 6 (com segundos no início).
+    """
+
+    def __init__(self, expressao):
+        campos = expressao.split()
+        if len(campos) == 5:
+            campos = ['0'] + campos
+        if len(campos) != 6:
+            raise ValueError(f"Agenda inválida: {expressao}")
+        self.expressao = expressao
+        (self.segundos, self.minutos, self.horas, self.dias, self.meses, dias_semana) = [
+            ler_campo_cron(campo, minimo, maximo) for campo, (minimo, maximo) in zip(campos, LIMITES_CRON)
+        ]
+        self.dias_semana = {dia % 7 for dia in dias_semana}  # 7 também é domingo
+        # Como no cron: com dia do mês e dia da semana restritos, basta um dos dois coincidir
+        self.dia_e_semana = campos[3] != '*' and campos[5] != '*'
+
+    def dia_valido(self, momento):
+        dia = momento.day in self.dias
+        semana = (momento.weekday() + 1) % 7 in self.dias_semana
+        return (dia or semana) if self.dia_e_semana else (dia and semana)
+
+    def proxima(self, depois):
+        """
+        Primeiro horário da agenda estritamente depois de `depois` (precisão de segundos).
+
+        Lança:
+            ValueError: Se não houver horário nos próximos 5 anos (ex: 31 de fevereiro).
+        """
+        momento = depois.replace(microsecond=0) + timedelta(seconds=1)
+        limite = momento + timedelta(days=5 * 366)
+        while momento <= limite:
+            if momento.month not in self.meses:
+                ano, mes = (momento.year + 1, 1) if momento.month == 12 else (momento.year, momento.month + 1)
+                momento = datetime(ano, mes, 1)
+            elif not self.dia_valido(momento):
+                momento = datetime(momento.year, momento.month, momento.day) + timedelta(days=1)
+            elif momento.hour not in self.horas:
+                momento = momento.replace(minute=0, second=0) + timedelta(hours=1)
+            elif momento.minute not in self.minutos:
+                momento = momento.replace(second=0) + timedelta(minutes=1)
+            elif momento.second not in self.segundos:
+                momento += timedelta(seconds=1)
+            else:
+                return momento
+        raise ValueError(f"Agenda sem próxima execução: {self.expressao}")
+
+
+def cron_horarios(horarios):
+    """
+    Agenda cron (com segundos) diária para uma lista de horários (datetime.time).
+
+    Lança:
+        ValueError: Se os horários não formarem uma única agenda (todas as combinações de
+            segundos x minutos x horas precisam estar na lista).
+    """
+    horarios = set(horarios)
+    segundos = sorted({horario.second for horario in horarios})
+    minutos = sorted({horario.minute for horario in horarios})
+    horas = sorted({horario.hour for horario in horarios})
+    if len(segundos) * len(minutos) * len(horas) != len(horarios):
+        raise ValueError("Horários não representáveis em uma única agenda cron")
+    return ' '.join(','.join(map(str, valores)) for valores in (segundos, minutos, horas)) + ' * * *'
+
+
+class Tarefa:
+    """
+    Tarefa periódica.
+
+    Parâmetros:
+        nome (str): Identificador (é o _id do documento em 'agendamentos').
+        funcao (callable): Executada sem argumentos (dentro do contexto da aplicação, se houver).
+        agenda (str): Expressão cron.
+        lease (int): Segundos de validade do lease (renovado enquanto a tarefa roda).
+        tolerancia (int, opcional): Atraso máximo (s) para executar um horário perdido; None = sempre.
+    """
+
+    def __init__(self, nome, funcao, agenda, lease=300, tolerancia=None):
+        self.nome = nome
+        self.funcao = funcao
+        self.agenda = agenda
+        self.cron = AgendaCron(agenda)
+        self.lease = lease
+        self.tolerancia = tolerancia
+
+
+class Agendador:
+    """
+    Executa as tarefas nos horários da agenda, cada horário uma única vez entre todos os
+    processos (ver docstring do módulo).
+    """
+
+    def __init__(self, tarefas, app=None, colecao=None, dono=None):
+        self.tarefas = {tarefa.nome: tarefa for tarefa in tarefas}
+        self.app = app
+        self.colecao = agendamentos_collection if colecao is None else colecao
+        # Identifica este processo no lease (PID se repete entre máquinas e reinícios)
+        self.dono = dono or f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(3)}"
+        self.proximas = {}      # nome -> próxima verificação neste processo
+        self.em_execucao = {}   # nome -> instante (monotonic) da última renovação do lease
+        self.preparadas = set()
+        self._trava = threading.Lock()
+
+    def _preparar(self, tarefa, agora):
+        """
+        Cria o documento da tarefa (ou reagenda, se a agenda mudou) e lê a próxima execução.
+        """
+        try:
+            self.colecao.update_one(
+                {'_id': tarefa.nome, 'agenda': {'$ne': tarefa.agenda}},
+                {'$set': {'agenda': tarefa.agenda, 'proxima_execucao': tarefa.cron.proxima(agora)}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            pass  # Documento já existe com a mesma agenda
+        self.proximas[tarefa.nome] = self._ler_proxima(tarefa, agora)
+        self.preparadas.add(tarefa.nome)
+
+    def _ler_proxima(self, tarefa, agora):
+        """
+        Lê do banco a próxima execução da tarefa (agora, se o documento não existir).
+        """
+        documento = self.colecao.find_one({'_id': tarefa.nome}, {'proxima_execucao': 1})
+        return documento['proxima_execucao'] if documento else agora
+
+    def _reservar(self, tarefa, agora):
+        """
+        Reserva o horário vencido da tarefa (sem lease ativo de outro processo) e já grava a
+        próxima execução e o lease deste processo.
+
+        Retorna:
+            dict | None: Documento antes da reserva (com o horário reservado) ou None.
+        """
+        return self.colecao.find_one_and_update(
+            {
+                '_id': tarefa.nome,
+                'proxima_execucao': {'$lte': agora},
+                '$or': [{'lease_ate': None}, {'lease_ate': {'$lte': agora}}],
+            },
+            {'$set': {
+                'proxima_execucao': tarefa.cron.proxima(agora),
+                'dono': self.dono,
+                'lease_ate': agora + timedelta(seconds=tarefa.lease),
+            }},
+            return_document=ReturnDocument.BEFORE
+        )
+
+    def executar_pendentes(self, agora=None, aguardar=False):
+        """
+        Inicia (cada uma em sua thread) as tarefas vencidas que este processo conseguir reservar.
+
+        Parâmetros:
+            agora (datetime, opcional): Momento atual (padrão: datetime.now()).
+            aguardar (bool): Espera as tarefas iniciadas terminarem.
+
+        Retorna:
+            list: Nomes das tarefas iniciadas.
+        """
+        agora = agora or datetime.now()
+        threads = []
+        for tarefa in self.tarefas.values():
+            with self._trava:
+                if tarefa.nome in self.em_execucao:
+                    continue
+            try:
+                if tarefa.nome not in self.preparadas:
+                    self._preparar(tarefa, agora)
+                if self.proximas[tarefa.nome] > agora:
+                    continue
+
+                documento = self._reservar(tarefa, agora)
+                if documento is None:
+                    # Outro processo reservou este horário (ou ainda executa o anterior, com
+                    # lease ativo: nesse caso tenta de novo em ESPERA_RETENTATIVA segundos)
+                    proxima = self._ler_proxima(tarefa, agora)
+                    if proxima <= agora:
+                        proxima = agora + timedelta(seconds=ESPERA_RETENTATIVA)
+                    self.proximas[tarefa.nome] = proxima
+                    continue
+                horario = documento['proxima_execucao']
+                self.proximas[tarefa.nome] = tarefa.cron.proxima(agora)
+            except PyMongoError as e:
+                print(f"Erro no agendador ({tarefa.nome}): {e}")
+                self.proximas[tarefa.nome] = agora + timedelta(seconds=ESPERA_RETENTATIVA)
+                continue
+
+            if tarefa.tolerancia is not None and (agora - horario).total_seconds() > tarefa.tolerancia:
+                print(f"Tarefa {tarefa.nome} não executada: horário {horario:%d/%m/%Y %H:%M:%S} perdido")
+                self._liberar(tarefa)
+                continue
+
+            with self._trava:
+                self.em_execucao[tarefa.nome] = time.monotonic()
+            thread = threading.Thread(target=self._executar, args=(tarefa,), name=f"tarefa-{tarefa.nome}", daemon=True)
+            thread.start()
+            threads.append(thread)
+
+        if aguardar:
+            for thread in threads:
+                thread.join()
+        return [thread.name[len('tarefa-'):] for thread in threads]
+
+    def _liberar(self, tarefa, **campos):
+        """
+        Solta o lease da tarefa (se ainda for deste processo) e grava os campos informados.
+        """
+        atualizacao = {'$set': dict(campos, lease_ate=None)}
+        if 'ultima_execucao' in campos:
+            atualizacao['$inc'] = {'execucoes': 1}
+        try:
+            self.colecao.update_one({'_id': tarefa.nome, 'dono': self.dono}, atualizacao)
+        except PyMongoError as e:
+            print(f"Erro no agendador ({tarefa.nome}): {e}")
+
+    def _executar(self, tarefa):
+        """
+        Executa a tarefa e registra o resultado no documento dela.
+        """
+        inicio = datetime.now()
+        resultado = erro = None
+        try:
+            if self.app is not None:
+                with self.app.app_context():
+                    resultado = tarefa.funcao()
+            else:
+                resultado = tarefa.funcao()
+        except Exception as e:
+            erro = str(e)
+            print(f"Erro na tarefa {tarefa.nome}: {e}")
+        finally:
+            self._liberar(
+                tarefa,
+                ultima_execucao=inicio,
+                ultima_duracao_s=round((datetime.now() - inicio).total_seconds(), 3),
+                ultimo_resultado=resultado if isinstance(resultado, (int, float, str)) else None,
+                ultimo_erro=erro,
+            )
+            with self._trava:
+                self.em_execucao.pop(tarefa.nome, None)
+
+    def renovar_leases(self):
+        """
+        Renova (a cada 1/3 do lease) o lease das tarefas em execução neste processo.
+        """
+        agora = time.monotonic()
+        with self._trava:
+            vencendo = [
+                nome for nome, renovado in self.em_execucao.items()
+                if agora - renovado >= self.tarefas[nome].lease / 3
+            ]
+        for nome in vencendo:
+            try:
+                self.colecao.update_one(
+                    {'_id': nome, 'dono': self.dono},
+                    {'$set': {'lease_ate': datetime.now() + timedelta(seconds=self.tarefas[nome].lease)}}
+                )
+            except PyMongoError as e:
+                print(f"Erro no agendador ({nome}): {e}")
+                continue
+            with self._trava:
+                if nome in self.em_execucao:
+                    self.em_execucao[nome] = agora
+
+    def espera(self):
+        """
+        Segundos até a próxima verificação (próximo horário, renovação de lease ou ESPERA_MAXIMA).
+        """
+        agora = datetime.now()
+        espera = ESPERA_MAXIMA
+        if self.proximas:
+            espera = min(espera, (min(self.proximas.values()) - agora).total_seconds())
+        with self._trava:
+            for nome in self.em_execucao:
+                espera = min(espera, self.tarefas[nome].lease / 3)
+        return max(espera, 0.05)
+
+    def iniciar(self):
+        """
+        Inicia o agendador em uma thread daemon.
+
+        Retorna:
+            threading.Event: Evento que, ao ser sinalizado (set), encerra o agendador.
+        """
+        parar = threading.Event()
+
+        def executar():
+            while not parar.is_set():
+                try:
+                    self.renovar_leases()
+                    self.executar_pendentes()
+                except Exception as e:
+                    print(f"Erro no agendador: {e}")
+                parar.wait(self.espera())
+
+        threading.Thread(target=executar, name="agendador", daemon=True).start()
+        return parar
+
+
+def reconstruir_rollups(hoje=None):
+    """
+    Reconstrói 'vendas_diarias' do mês atual e do anterior (corrige divergências dos totais
+    mantidos a cada gravação) e invalida o cache dos gráficos desses meses.
+    """
+    hoje = hoje or datetime.today()
+    mes_anterior = hoje.replace(day=1) - timedelta(days=1)
+    total = 0
+    for dia in (mes_anterior, hoje):
+        total += reconstruir_vendas_diarias(dia.year, dia.month)
+        invalidar_cache_graficos(datetime(dia.year, dia.month, 1))
+    return total
+
+
+def limpar_notificacoes_logs():
+    """
+    Remove notificações e logs mais antigos que a retenção configurada
+    (NOTIFICACOES_RETENCAO_DIAS, padrão 90; LOGS_RETENCAO_DIAS, padrão 365).
+    """
+    return (
+        limpar_notificacoes_antigas(int(os.environ.get("NOTIFICACOES_RETENCAO_DIAS", "90")))
+        + limpar_logs_antigos(int(os.environ.get("LOGS_RETENCAO_DIAS", "365")))
+    )
+
+
+def tarefas_padrao():
+    """
+    Tarefas de manutenção do sistema.
+    """
+    return [
+        # Horários de HORARIOS_DESLIGAMENTO; se o servidor estava fora, executa com até 10 min de atraso
+        Tarefa('desligar_acessos', desligar_acessos_usuarios, cron_horarios(HORARIOS_DESLIGAMENTO),
+               lease=60, tolerancia=600),
+        Tarefa('reconstruir_vendas_diarias', reconstruir_rollups, '0 3 * * *', lease=1800),
+        Tarefa('limpar_notificacoes_logs', limpar_notificacoes_logs, '30 3 * * *', lease=600),
+    ]
+
+
+def iniciar_agendador(app, tarefas=None):
+    """
+    Inicia o agendador deste processo com as tarefas padrão (ou as informadas).
+
+    Retorna:
+        threading.Event: Evento que, ao ser sinalizado (set), encerra o agendador.
+    """
+    return Agendador(tarefas_padrao() if tarefas is None else tarefas, app=app).iniciar()
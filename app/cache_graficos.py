@@ -0,0 +1,168 @@
+"""
+Módulo de cache dos gráficos do dashboard.
+Guarda os dados calculados dos gráficos do registro (app/registro_graficos.py), que o
+dashboard e o PDF do mesmo mês reaproveitam, e o HTML (ou o JSON da figura) das funções de
+gráfico que ainda não estão no registro (app/graficos.py), por (gráfico, ano, mes,
+data_escolhida, username, formato), marcados com a versão dos dados de vendas.
+Cada gráfico passa por uma só camada de cache.
+
+A versão fica no MongoDB (coleção 'contadores', documento 'versao_graficos'), então é
+compartilhada por todos os workers:
+    geral         -> muda a cada escrita (venda cadastrada/editada, metas, limites, meta da empresa)
+    meses.AAAAMM  -> muda só quando uma venda daquele mês é cadastrada/editada
+    configs       -> muda a cada escrita em 'configs' (metas, limites e meta da empresa valem
+                     para todos os meses)
+
+O mês atual usa a versão geral mais o dia de hoje (vale até a próxima escrita ou a virada do
+dia, já que metas diárias/semanais dependem da data atual); meses anteriores usam a versão
+do próprio mês e de configs. As escritas em vendas passam por models.atualizar_venda/excluir_venda
+(também as das rotas que usam vendas_collection.update_one), que invalidam os meses afetados, e
+as escritas em configs passam por models.configs_collection, que invalida todos os meses. Como
+garantia para escritas feitas fora da aplicação (ex: direto no banco), nenhum gráfico fica
+guardado mais que IDADE_MAXIMA segundos.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import wraps
+from inspect import signature
+
+from flask import current_app, has_app_context
+from pymongo.errors import PyMongoError
+
+from app.models import contadores_collection
+
+# Documento da coleção 'contadores' que guarda as versões dos dados
+ID_VERSAO = 'versao_graficos'
+
+# Quantidade máxima de gráficos guardados por processo (os menos usados saem primeiro)
+TAMANHO_MAXIMO = 256
+
+# Tempo máximo (segundos) que um gráfico fica guardado, mesmo sem mudança de versão
+IDADE_MAXIMA = 3600
+
+_cache = OrderedDict()   # chave -> (versão, html, instante em que foi guardado)
+_trava = threading.Lock()
+
+
+def invalidar_cache_graficos(data=None, configuracoes=False):
+    """
+    Incrementa a versão dos dados dos gráficos. Deve ser chamada após cada escrita que
+    altera os gráficos (cadastro/edição de venda e escritas em configs).
+
+    Parâmetros:
+        data (datetime, opcional): Data (data_criacao) da venda alterada; invalida também
+            o cache do mês dela (necessário quando a venda é de um mês anterior).
+        configuracoes (bool): Escrita em configs (metas, limites, meta da empresa);
+            invalida os gráficos de todos os meses.
+    """
+    incrementos = {'geral': 1}
+    if isinstance(data, datetime):
+        incrementos[f"meses.{data:%Y%m}"] = 1
+    if configuracoes:
+        incrementos['configs'] = 1
+    contadores_collection.update_one({'_id': ID_VERSAO}, {'$inc': incrementos}, upsert=True)
+
+
+def versao_dados(ano, mes, hoje=None):
+    """
+    Retorna a versão dos dados usada para o cache de um mês.
+
+    Parâmetros:
+        ano (int): Ano consultado.
+        mes (int): Mês consultado.
+        hoje (datetime, opcional): Data de referência (padrão: agora).
+
+    Retorna:
+        tuple: ('geral', n, dia) para o mês atual ou futuro, ('mes', n, configs) para meses anteriores.
+    """
+    hoje = hoje or datetime.today()
+    documento = contadores_collection.find_one({'_id': ID_VERSAO}) or {}
+    if (ano, mes) >= (hoje.year, hoje.month):
+        return ('geral', documento.get('geral', 0), hoje.date())
+    return ('mes', documento.get('meses', {}).get(f"{ano}{mes:02d}", 0), documento.get('configs', 0))
+
+
+def periodo_grafico(argumentos, hoje=None):
+    """
+    Resolve o (ano, mes) consultado por um gráfico a partir dos argumentos da chamada.
+    data_escolhida ('YYYY-MM-DD') tem prioridade; ano/mes ausentes usam o mês atual.
+    """
+    hoje = hoje or datetime.today()
+    data_escolhida = argumentos.get('data_escolhida')
+    if data_escolhida:
+        try:
+            dia = datetime.strptime(data_escolhida, "%Y-%m-%d")
+            return dia.year, dia.month
+        except ValueError:
+            pass
+    return argumentos.get('ano') or hoje.year, argumentos.get('mes') or hoje.month
+
+
+def cache_ativo():
+    """
+    O cache só é usado dentro de uma aplicação Flask com CACHE_GRAFICOS ligado
+    (chamadas diretas, como nos testes e scripts, sempre geram o gráfico).
+    """
+    return has_app_context() and current_app.config.get('CACHE_GRAFICOS', False)
+
+
+def limpar_cache_graficos():
+    """
+    Remove todos os gráficos guardados neste processo.
+    """
+    with _trava:
+        _cache.clear()
+
+
+def cache_grafico(funcao=None, ignorar=()):
+    """
+    Decorador para as funções gerar_grafico_*: devolve o HTML guardado quando a versão
+    dos dados do mês consultado não mudou; caso contrário gera e guarda o gráfico.
+
+    A chave é o nome da função, o mês consultado e os demais argumentos da chamada.
+    Use @cache_grafico(ignorar=(...)) para deixar de fora da chave argumentos que não
+    identificam o resultado (ex: as coleções usadas na consulta).
+    """
+    if funcao is None:
+        return lambda funcao: cache_grafico(funcao, ignorar=ignorar)
+
+    assinatura = signature(funcao)
+
+    @wraps(funcao)
+    def envolvida(*args, **kwargs):
+        if not cache_ativo():
+            return funcao(*args, **kwargs)
+
+        argumentos = assinatura.bind(*args, **kwargs)
+        argumentos.apply_defaults()
+        argumentos = argumentos.arguments
+        ano, mes = periodo_grafico(argumentos)
+        chave = (funcao.__name__, ano, mes) + tuple(
+            (nome, valor) for nome, valor in argumentos.items() if nome not in ('ano', 'mes') and nome not in ignorar
+        )
+
+        try:
+            versao = versao_dados(ano, mes)
+        except PyMongoError:
+            # Sem acesso à versão não dá para saber se o cache vale: gera direto
+            return funcao(*args, **kwargs)
+
+        agora = time.monotonic()
+        with _trava:
+            guardado = _cache.get(chave)
+            if guardado and guardado[0] == versao and agora - guardado[2] < IDADE_MAXIMA:
+                _cache.move_to_end(chave)
+                return guardado[1]
+
+        html = funcao(*args, **kwargs)
+        with _trava:
+            _cache[chave] = (versao, html, agora)
+            _cache.move_to_end(chave)
+            while len(_cache) > TAMANHO_MAXIMO:
+                _cache.popitem(last=False)
+        return html
+
+    return envolvida
@@ -0,0 +1,96 @@
+"""
+Módulo de importação tardia das bibliotecas pesadas (pandas, Plotly, ReportLab).
+Essas bibliotecas só são usadas pelos gráficos e pelo PDF, mas eram importadas por todas as
+rotas (inclusive /login e /api/notificacoes) ao iniciar cada worker. Com importar_tardio o
+módulo é registrado já na importação, mas só é carregado de fato no primeiro acesso a um
+atributo (ex: pd.DataFrame), usando o importlib.util.LazyLoader da biblioteca padrão.
+
+Uso (no lugar de `import pandas as pd`):
+    pd = importar_tardio('pandas')
+
+Antes do Python 3.12.3 o LazyLoader não era seguro entre threads: a primeira thread trocava a
+classe do módulo antes de executá-lo e as outras, acessando ao mesmo tempo (threads do gthread
+ou do ThreadPoolExecutor de app/graficos_lote.py em um worker recém-criado), recebiam
+AttributeError do módulo ainda vazio. Nessas versões o primeiro acesso é serializado por
+_ModuloTardioSeguro.
+"""
+
+import importlib.util
+import sys
+import threading
+import types
+
+_trava = threading.Lock()
+
+# Carga dos módulos tardios (reentrante: carregar um módulo pode acessar outro módulo tardio)
+_trava_carga = threading.RLock()
+
+# A partir desta versão o próprio LazyLoader protege a carga com uma trava
+LAZYLOADER_SEGURO = (3, 12, 3)
+
+
+class _ModuloTardioSeguro(types.ModuleType):
+    """
+    Módulo tardio para Python < 3.12.3 (mesma lógica do LazyLoader das versões novas): o
+    primeiro acesso carrega o módulo com _trava_carga adquirida e só troca a classe para
+    ModuleType depois de executá-lo, então as outras threads esperam a carga terminar.
+    """
+
+    def __getattribute__(self, atributo):
+        spec = object.__getattribute__(self, '__spec__')
+        estado = spec.loader_state
+        with _trava_carga:
+            if object.__getattribute__(self, '__class__') is _ModuloTardioSeguro:
+                dicionario = types.ModuleType.__getattribute__(self, '__dict__')
+                # Acesso da própria thread durante a execução do módulo (exec_module)
+                if estado.get('carregando'):
+                    return types.ModuleType.__getattribute__(self, atributo)
+                estado['carregando'] = True
+
+                # Atributos definidos no módulo antes da carga continuam valendo depois dela
+                antes = estado['__dict__']
+                alterados = {
+                    chave: valor for chave, valor in dicionario.items()
+                    if chave not in antes or antes[chave] is not valor
+                }
+                spec.loader.exec_module(self)
+                dicionario.update(alterados)
+                self.__class__ = types.ModuleType
+        return getattr(self, atributo)
+
+
+def importar_tardio(nome):
+    """
+    Retorna o módulo `nome`, que só será carregado no primeiro acesso a um atributo.
+    Se o módulo já foi importado, retorna o próprio módulo.
+
+    Parâmetros:
+        nome (str): Nome completo do módulo (ex: 'plotly.io').
+
+    Retorna:
+        module: Módulo (carregado ou tardio).
+
+    Lança:
+        ModuleNotFoundError: Se o módulo não estiver instalado.
+    """
+    with _trava:
+        if nome in sys.modules:
+            return sys.modules[nome]
+
+        # find_spec de um submódulo importa o pacote pai (ex: 'plotly' para 'plotly.io')
+        spec = importlib.util.find_spec(nome)
+        if spec is None:
+            raise ModuleNotFoundError(f"Módulo não encontrado: {nome}", name=nome)
+        carregador = importlib.util.LazyLoader(spec.loader)
+        spec.loader = carregador
+        modulo = importlib.util.module_from_spec(spec)
+        sys.modules[nome] = modulo
+        carregador.exec_module(modulo)
+        if sys.version_info < LAZYLOADER_SEGURO:
+            modulo.__class__ = _ModuloTardioSeguro
+
+        # Como no import normal, o submódulo fica acessível pelo pacote pai (plotly.io)
+        pai, _, filho = nome.rpartition('.')
+        if pai:
+            setattr(sys.modules[pai], filho, modulo)
+        return modulo
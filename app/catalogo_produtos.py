@@ -0,0 +1,126 @@
+"""
+Módulo do catálogo de produtos em memória.
+O cadastro e a edição de vendas validam o produto e a condição de pagamento e montam a
+tabela de valores a partir da coleção 'produtos'; antes, cada uma dessas funções lia a
+coleção inteira a cada envio. O catálogo carrega os produtos uma vez por processo e guarda
+os nomes e as condições ('TIPO | PARCELAS') em conjuntos, para validação sem percorrer listas.
+
+A versão do catálogo fica no MongoDB (coleção 'contadores', documento 'versao_produtos') e é
+incrementada a cada escrita em produtos (models.produtos_collection chama
+invalidar_catalogo_produtos), então todos os workers recarregam o catálogo na próxima consulta
+após a verificação da versão. Como garantia para escritas feitas fora da aplicação (shell,
+scripts), o catálogo também é relido quando passa de IDADE_MAXIMA.
+"""
+
+import threading
+import time
+
+from flask import current_app, has_app_context
+
+from app.models import contadores_collection
+
+# Documento da coleção 'contadores' que guarda a versão do catálogo
+ID_VERSAO = 'versao_produtos'
+
+# Intervalo mínimo (segundos) entre consultas da versão no MongoDB; escritas feitas neste
+# processo valem na hora, as de outros workers em até esse tempo
+INTERVALO_VERIFICACAO = 5
+
+# Idade máxima (segundos) do catálogo em memória, mesmo sem mudança de versão
+IDADE_MAXIMA = 600
+
+_catalogo = None
+_versao = None
+_verificado_em = 0.0
+_carregado_em = 0.0
+_trava = threading.Lock()
+
+
+class CatalogoProdutos:
+    """
+    Produtos cadastrados e os conjuntos usados nas validações da venda.
+
+    Atributos:
+        produtos (list): Produtos sem o campo '_id'.
+        nomes (frozenset): Nomes dos produtos.
+        condicoes (frozenset): Condições no formato 'TIPO | PARCELAS'.
+        valores_venda (dict): {nome: [{'condicao': 'TIPO | PARCELAS', 'valor': valor_total}, ...]}
+    """
+
+    def __init__(self, produtos):
+        self.produtos = produtos
+        self.nomes = frozenset(p.get('nome') for p in produtos)
+
+        condicoes = set()
+        self.valores_venda = {}
+        for produto in produtos:
+            lista_condicoes = []
+            for forma in produto.get('formas_pagamento', []):
+                condicoes.add(f"{str(forma.get('tipo', '')).strip()} | {str(forma.get('parcelas', '')).strip()}")
+                lista_condicoes.append({
+                    'condicao': f"{forma.get('tipo')} | {forma.get('parcelas')}",
+                    'valor': forma.get('valor_total')
+                })
+            self.valores_venda[produto.get('nome')] = lista_condicoes
+        self.condicoes = frozenset(condicoes)
+
+
+def cache_ativo():
+    """
+    O catálogo só fica em memória dentro de uma aplicação Flask com CACHE_PRODUTOS ligado
+    (chamadas diretas, como nos testes e scripts, sempre leem a coleção).
+    """
+    return has_app_context() and current_app.config.get('CACHE_PRODUTOS', False)
+
+
+def versao_catalogo():
+    """
+    Retorna a versão atual do catálogo gravada no MongoDB.
+    """
+    documento = contadores_collection.find_one({'_id': ID_VERSAO}) or {}
+    return documento.get('versao', 0)
+
+
+def invalidar_catalogo_produtos():
+    """
+    Incrementa a versão do catálogo e descarta o catálogo deste processo. Chamada por
+    models.produtos_collection após cada escrita em produtos.
+    """
+    global _catalogo
+    contadores_collection.update_one({'_id': ID_VERSAO}, {'$inc': {'versao': 1}}, upsert=True)
+    with _trava:
+        _catalogo = None
+
+
+def obter_catalogo_produtos(produtos_collection):
+    """
+    Retorna o catálogo de produtos, recarregando-o quando a versão mudou ou o catálogo passou
+    de IDADE_MAXIMA.
+
+    Parâmetros:
+        produtos_collection: Coleção de produtos do chamador.
+
+    Retorna:
+        CatalogoProdutos: Catálogo compartilhado (não deve ser alterado pelo chamador).
+    """
+    global _catalogo, _versao, _verificado_em, _carregado_em
+    if not cache_ativo():
+        return CatalogoProdutos(list(produtos_collection.find({}, {'_id': 0})))
+
+    agora = time.monotonic()
+    with _trava:
+        catalogo, versao, verificado_em, carregado_em = _catalogo, _versao, _verificado_em, _carregado_em
+    if catalogo is not None and agora - carregado_em >= IDADE_MAXIMA:
+        catalogo = None
+    if catalogo is not None and agora - verificado_em < INTERVALO_VERIFICACAO:
+        return catalogo
+
+    # A versão é lida antes dos produtos: uma escrita durante a carga gera uma versão nova
+    # e o catálogo é recarregado na próxima verificação
+    versao_atual = versao_catalogo()
+    if catalogo is None or versao_atual != versao:
+        catalogo = CatalogoProdutos(list(produtos_collection.find({}, {'_id': 0})))
+        carregado_em = agora
+    with _trava:
+        _catalogo, _versao, _verificado_em, _carregado_em = catalogo, versao_atual, agora, carregado_em
+    return catalogo
@@ -0,0 +1,291 @@
+"""
+Módulo do cliente MongoDB do processo: criação, configuração do pool de conexões e estatísticas.
+
+O cliente é criado por processo. Em servidores pre-fork (gunicorn com vários workers) o
+processo mestre pode ter criado o cliente (ex: create_app criando os índices); o filho herda
+esse objeto, mas sockets e threads de monitoramento do pymongo não sobrevivem ao fork. Por
+isso o cliente é descartado no filho (os.register_at_fork) e recriado no primeiro uso, com as
+mesmas opções. Como garantia extra, obter_cliente também compara o PID de quem criou o cliente.
+
+O pool é configurado por variáveis de ambiente (ver OPCOES_AMBIENTE). Com N workers por nó, o
+limite de conexões do nó é N x MONGO_MAX_POOL_SIZE; o padrão de 20 por worker mantém 8 workers
+em 160 conexões, bem abaixo do padrão do pymongo (100 por processo).
+
+Uso:
+    iniciar_mongo_app(app)      # em create_app: lê MONGO_URI/MONGO_OPCOES do app.config
+    obter_cliente()             # cliente do processo atual (cria se preciso)
+    estatisticas_pool()         # conexões abertas, em uso, esperas e falhas de checkout
+"""
+
+import os
+import threading
+import time
+
+from pymongo import MongoClient
+from pymongo import monitoring
+
+# Variável de ambiente -> (opção do MongoClient, conversão)
+OPCOES_AMBIENTE = {
+    'MONGO_MAX_POOL_SIZE': ('maxPoolSize', int),
+    'MONGO_MIN_POOL_SIZE': ('minPoolSize', int),
+    'MONGO_MAX_CONNECTING': ('maxConnecting', int),
+    'MONGO_MAX_IDLE_MS': ('maxIdleTimeMS', int),
+    'MONGO_WAIT_QUEUE_TIMEOUT_MS': ('waitQueueTimeoutMS', int),
+    'MONGO_CONNECT_TIMEOUT_MS': ('connectTimeoutMS', int),
+    'MONGO_SERVER_SELECTION_TIMEOUT_MS': ('serverSelectionTimeoutMS', int),
+    'MONGO_SOCKET_TIMEOUT_MS': ('socketTimeoutMS', int),
+    'MONGO_COMPRESSORS': ('compressors', str),        # ex: "zstd,snappy,zlib"
+    'MONGO_READ_PREFERENCE': ('readPreference', str),  # ex: "secondaryPreferred"
+    'MONGO_APPNAME': ('appname', str),
+}
+
+# Padrões do pool por worker (as variáveis de ambiente sobrescrevem)
+OPCOES_PADRAO = {
+    'maxPoolSize': 20,                # conexões por processo
+    'minPoolSize': 0,
+    'waitQueueTimeoutMS': 5000,       # espera máxima por uma conexão livre antes de erro
+    'serverSelectionTimeoutMS': 5000,
+    'connectTimeoutMS': 5000,
+    'appname': 'sysvendas',
+}
+
+
+def opcoes_mongo(ambiente=None):
+    """
+    Monta as opções do MongoClient a partir das variáveis de ambiente.
+
+    Args:
+        ambiente (dict, opcional): Variáveis a ler (padrão: os.environ).
+
+    Returns:
+        dict: Opções do MongoClient (OPCOES_PADRAO + as variáveis definidas).
+    """
+    ambiente = os.environ if ambiente is None else ambiente
+    opcoes = dict(OPCOES_PADRAO)
+    for variavel, (opcao, converter) in OPCOES_AMBIENTE.items():
+        valor = ambiente.get(variavel)
+        if valor not in (None, ''):
+            opcoes[opcao] = converter(valor)
+    return opcoes
+
+
+class EstatisticasPool(monitoring.ConnectionPoolListener):
+    """
+    Contadores do pool de conexões do processo, alimentados pelos eventos do pymongo
+    (chamados pelas threads do driver; por isso a trava).
+    """
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.zerar()
+
+    def zerar(self):
+        with self._trava:
+            self.conexoes_abertas = 0
+            self.em_uso = 0
+            self.aguardando = 0
+            self.max_aguardando = 0
+            self.checkouts = 0
+            self.falhas_checkout = {}
+            self.espera_total_ms = 0.0
+            self.espera_max_ms = 0.0
+            self.pools_limpos = 0
+
+    def _espera(self, evento):
+        # duration (segundos) existe nos eventos de checkout do pymongo 4.9+
+        ms = (getattr(evento, 'duration', None) or 0) * 1000
+        self.espera_total_ms += ms
+        self.espera_max_ms = max(self.espera_max_ms, ms)
+
+    def pool_created(self, evento):
+        pass
+
+    def pool_ready(self, evento):
+        pass
+
+    def pool_cleared(self, evento):
+        with self._trava:
+            self.pools_limpos += 1
+
+    def pool_closed(self, evento):
+        pass
+
+    def connection_created(self, evento):
+        with self._trava:
+            self.conexoes_abertas += 1
+
+    def connection_ready(self, evento):
+        pass
+
+    def connection_closed(self, evento):
+        with self._trava:
+            self.conexoes_abertas -= 1
+
+    def connection_check_out_started(self, evento):
+        with self._trava:
+            self.aguardando += 1
+            self.max_aguardando = max(self.max_aguardando, self.aguardando)
+
+    def connection_check_out_failed(self, evento):
+        with self._trava:
+            self.aguardando -= 1
+            self.falhas_checkout[evento.reason] = self.falhas_checkout.get(evento.reason, 0) + 1
+            self._espera(evento)
+
+    def connection_checked_out(self, evento):
+        with self._trava:
+            self.aguardando -= 1
+            self.em_uso += 1
+            self.checkouts += 1
+            self._espera(evento)
+
+    def connection_checked_in(self, evento):
+        with self._trava:
+            self.em_uso -= 1
+
+    def resumo(self):
+        """
+        Retorna os contadores atuais.
+        """
+        with self._trava:
+            return {
+                'conexoes_abertas': self.conexoes_abertas,
+                'em_uso': self.em_uso,
+                'aguardando': self.aguardando,
+                'max_aguardando': self.max_aguardando,
+                'checkouts': self.checkouts,
+                'falhas_checkout': dict(self.falhas_checkout),
+                'espera_media_ms': round(self.espera_total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                'espera_max_ms': round(self.espera_max_ms, 3),
+                'pools_limpos': self.pools_limpos,
+            }
+
+
+# Estado do cliente do processo
+_cliente = None
+_pid_cliente = None
+_uri = None
+_opcoes = None
+_criado_em = None
+_trava = threading.Lock()
+estatisticas = EstatisticasPool()
+
+
+def _criar_cliente():
+    """
+    Cria o cliente com a URI/opções atuais (chamada com _trava adquirida).
+    connect=False: nenhuma conexão ou thread do driver é aberta antes da primeira operação.
+    """
+    global _cliente, _pid_cliente, _criado_em
+    if _opcoes is None:
+        globals()['_opcoes'] = opcoes_mongo()
+    _cliente = MongoClient(_uri or os.getenv("MONGO_URI"), connect=False,
+                           event_listeners=[estatisticas], **_opcoes)
+    _pid_cliente = os.getpid()
+    _criado_em = time.time()
+    return _cliente
+
+
+def iniciar_mongo(uri=None, opcoes=None):
+    """
+    Cria (ou recria) o cliente MongoDB do processo.
+
+    Args:
+        uri (str, opcional): URI de conexão (padrão: MONGO_URI do ambiente).
+        opcoes (dict, opcional): Opções do MongoClient (padrão: opcoes_mongo()).
+
+    Returns:
+        MongoClient: Cliente criado.
+    """
+    global _uri, _opcoes
+    with _trava:
+        if _cliente is not None and _pid_cliente == os.getpid():
+            _cliente.close()
+        _uri = uri
+        _opcoes = opcoes_mongo() if opcoes is None else dict(opcoes)
+        estatisticas.zerar()
+        return _criar_cliente()
+
+
+def iniciar_mongo_app(app):
+    """
+    Liga o cliente MongoDB à aplicação: usa app.config['MONGO_URI'] e app.config['MONGO_OPCOES']
+    (preenchidos a partir do ambiente se ausentes) e registra obter_cliente em app.extensions.
+
+    Args:
+        app (Flask): Aplicação.
+
+    Returns:
+        MongoClient: Cliente criado.
+    """
+    app.config.setdefault('MONGO_URI', os.environ.get("MONGO_URI"))
+    app.config.setdefault('MONGO_OPCOES', opcoes_mongo())
+    app.extensions['mongo'] = obter_cliente
+    return iniciar_mongo(app.config['MONGO_URI'], app.config['MONGO_OPCOES'])
+
+
+def obter_cliente():
+    """
+    Retorna o cliente MongoDB do processo atual, criando-o no primeiro uso
+    (também depois de um fork: o cliente herdado do processo pai não é reutilizado).
+    """
+    cliente = _cliente
+    if cliente is None or _pid_cliente != os.getpid():
+        with _trava:
+            if _cliente is None or _pid_cliente != os.getpid():
+                estatisticas.zerar()
+                return _criar_cliente()
+            return _cliente
+    return cliente
+
+
+def fechar_mongo():
+    """
+    Fecha o cliente do processo atual (ex: no mestre do gunicorn, depois de criar os índices
+    e antes de criar os workers). Um novo cliente é criado no próximo obter_cliente().
+    """
+    global _cliente, _pid_cliente
+    with _trava:
+        if _cliente is not None and _pid_cliente == os.getpid():
+            _cliente.close()
+        _cliente = None
+        _pid_cliente = None
+
+
+def _descartar_cliente_apos_fork():
+    """
+    No processo filho: esquece o cliente herdado (sem fechá-lo, para não mexer nos sockets do pai)
+    e recria a trava, que pode ter sido copiada adquirida.
+    """
+    global _cliente, _pid_cliente, _trava
+    _cliente = None
+    _pid_cliente = None
+    _trava = threading.Lock()
+    estatisticas._trava = threading.Lock()
+    estatisticas.zerar()
+
+
+os.register_at_fork(after_in_child=_descartar_cliente_apos_fork)
+
+
+def estatisticas_pool():
+    """
+    Estatísticas do pool de conexões do processo atual.
+
+    Returns:
+        dict: pid, se o cliente existe, opções do pool (maxPoolSize, minPoolSize, waitQueueTimeoutMS...)
+              e os contadores de EstatisticasPool.resumo().
+    """
+    opcoes = _opcoes if _opcoes is not None else opcoes_mongo()
+    dados = {
+        'pid': os.getpid(),
+        'cliente_criado': _cliente is not None and _pid_cliente == os.getpid(),
+        'criado_em': _criado_em if _pid_cliente == os.getpid() else None,
+        'max_pool_size': opcoes.get('maxPoolSize'),
+        'min_pool_size': opcoes.get('minPoolSize'),
+        'wait_queue_timeout_ms': opcoes.get('waitQueueTimeoutMS'),
+        'compressores': opcoes.get('compressors'),
+        'read_preference': opcoes.get('readPreference'),
+    }
+    dados.update(estatisticas.resumo())
+    return dados
@@ -0,0 +1,278 @@
+"""
+Módulo das configurações do sistema (coleção 'configs') carregadas em objetos tipados.
+Cada envio de e-mail lia o documento 'geral' e cada gráfico lia metas e limites dos vendedores,
+convertendo de novo valores gravados como texto ("0", "21000"). Aqui cada seção é lida uma vez,
+convertida para número e guardada em memória até a próxima escrita nas configurações.
+
+Seções (tipo do documento em 'configs'):
+    geral           -> ConfigGeral (SMTP, cópias, meta da empresa)
+    valor_acesso    -> ValorAcesso
+    fim_expediente  -> FimExpediente
+    meta_vendedor   -> {vendedor_nome: MetaVendedor}
+    limite_vendedor -> {vendedor_nome: float}
+
+A versão fica no mesmo banco (coleção 'contadores', documento 'versao_configs') e é incrementada
+por invalidar_configuracoes, chamada após cada escrita (automaticamente por models.configs_collection,
+inclusive nas rotas /api/configs/*); os outros workers recarregam as seções após a próxima
+verificação da versão.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app, has_app_context
+
+from app.utils import converter_valor_monetario
+
+# Documento da coleção 'contadores' que guarda a versão das configurações
+ID_VERSAO = 'versao_configs'
+
+# Intervalo mínimo (segundos) entre consultas da versão no MongoDB
+INTERVALO_VERIFICACAO = 5
+
+_configuracoes = None
+_versao = None
+_verificado_em = 0.0
+_trava = threading.Lock()
+
+
+def _numero(valor):
+    """
+    Converte um valor de configuração ("21000", "1.500,00", 0) para float (None se vazio/inválido).
+    """
+    return converter_valor_monetario(valor)
+
+
+def _inteiro(valor):
+    """
+    Converte um valor de configuração para int (None se vazio/inválido).
+    """
+    numero = converter_valor_monetario(valor)
+    return None if numero is None else int(numero)
+
+
+def _sem_id(documento):
+    """
+    Cópia do documento sem o campo '_id'.
+    """
+    return {chave: valor for chave, valor in (documento or {}).items() if chave != '_id'}
+
+
+class ConfigGeral:
+    """
+    Configuração 'geral': envio de e-mails e meta mensal da empresa.
+
+    Atributos:
+        smtp (str), porta (int), email_copia (str), senha_email_smtp (str)
+        remetente_principal / remetente_secundario (str): E-mails de envio.
+        principal_ativo / secundario_ativo (bool): Qual remetente está ligado.
+        meta_empresa (float | None): Meta mensal da empresa.
+        documento (dict): Documento original (sem '_id').
+    """
+
+    def __init__(self, documento):
+        self.documento = _sem_id(documento)
+        self.smtp = self.documento.get('smtp')
+        self.porta = _inteiro(self.documento.get('porta'))
+        self.email_copia = self.documento.get('email_copia')
+        self.senha_email_smtp = self.documento.get('senha_email_smtp')
+        # Remetentes gravados como 'email:true' / 'email:false'
+        self.remetente_principal, self.principal_ativo = self._remetente('email_smtp_principal')
+        self.remetente_secundario, self.secundario_ativo = self._remetente('email_smtp_secundario')
+        self.meta_empresa = _numero(self.documento.get('meta_empresa'))
+
+    def _remetente(self, campo):
+        partes = (self.documento.get(campo) or '').split(':')
+        return partes[0], len(partes) > 1 and partes[1] == 'true'
+
+    @property
+    def email_remetente(self):
+        """
+        E-mail usado no envio: o principal se estiver ligado, senão o secundário (ou None).
+        """
+        if self.principal_ativo:
+            return self.remetente_principal
+        if self.secundario_ativo:
+            return self.remetente_secundario
+        return None
+
+
+class ValorAcesso:
+    """
+    Configuração 'valor_acesso': valor cobrado por acesso na venda nova e na atualização.
+    """
+
+    def __init__(self, documento):
+        self.documento = _sem_id(documento)
+        self.nova_venda = _numero(self.documento.get('valor_acesso_nova_venda'))
+        self.atualizacao = _numero(self.documento.get('valor_acesso_atualizacao'))
+
+
+class FimExpediente:
+    """
+    Configuração 'fim_expediente': último clique no botão Fim do expediente.
+    """
+
+    def __init__(self, documento):
+        self.documento = _sem_id(documento)
+        try:
+            self.momento = datetime.strptime(
+                f"{self.documento.get('data')} {self.documento.get('hora')}", '%d/%m/%Y %H:%M:%S'
+            )
+        except ValueError:
+            self.momento = None
+
+
+class MetaVendedor:
+    """
+    Metas de um vendedor; campos não cadastrados ficam None (cada gráfico aplica o seu padrão).
+    """
+
+    def __init__(self, documento):
+        self.documento = _sem_id(documento)
+        self.vendedor_id = self.documento.get('vendedor_id')
+        self.vendedor_nome = self.documento.get('vendedor_nome')
+        self.meta_dia_quantidade = _inteiro(self.documento.get('meta_dia_quantidade'))
+        self.meta_dia_valor = _numero(self.documento.get('meta_dia_valor'))
+        self.meta_semana = _numero(self.documento.get('meta_semana'))
+
+
+class ConfiguracoesSistema:
+    """
+    Seções da coleção 'configs', cada uma lida na primeira vez em que é usada.
+    """
+
+    def __init__(self, configs_collection):
+        self._colecao = configs_collection
+        self._secoes = {}
+
+    def _secao(self, nome, carregar):
+        if nome not in self._secoes:
+            self._secoes[nome] = carregar()
+        return self._secoes[nome]
+
+    @property
+    def geral(self):
+        """ConfigGeral ou None se não houver documento 'geral'."""
+        def carregar():
+            documento = self._colecao.find_one({'tipo': 'geral'})
+            return ConfigGeral(documento) if documento else None
+        return self._secao('geral', carregar)
+
+    @property
+    def valor_acesso(self):
+        """ValorAcesso ou None."""
+        def carregar():
+            documento = self._colecao.find_one({'tipo': 'valor_acesso'})
+            return ValorAcesso(documento) if documento else None
+        return self._secao('valor_acesso', carregar)
+
+    @property
+    def fim_expediente(self):
+        """FimExpediente ou None."""
+        def carregar():
+            documento = self._colecao.find_one({'tipo': 'fim_expediente'})
+            return FimExpediente(documento) if documento else None
+        return self._secao('fim_expediente', carregar)
+
+    @property
+    def documentos_metas(self):
+        """Documentos 'meta_vendedor' originais (sem '_id'), para as telas de configuração."""
+        def carregar():
+            return [_sem_id(d) for d in self._colecao.find({'tipo': 'meta_vendedor'}, {'_id': 0})]
+        return self._secao('documentos_metas', carregar)
+
+    @property
+    def metas(self):
+        """{vendedor_nome: MetaVendedor}"""
+        def carregar():
+            return {d.get('vendedor_nome'): MetaVendedor(d) for d in self.documentos_metas}
+        return self._secao('metas', carregar)
+
+    @property
+    def documentos_limites(self):
+        """Documentos 'limite_vendedor' originais (sem '_id'), para as telas de configuração."""
+        def carregar():
+            return [_sem_id(d) for d in self._colecao.find({'tipo': 'limite_vendedor'}, {'_id': 0})]
+        return self._secao('documentos_limites', carregar)
+
+    @property
+    def limites(self):
+        """{vendedor_nome: limite (float)}"""
+        def carregar():
+            return {d.get('vendedor_nome'): _numero(d.get('limite')) or 0.0 for d in self.documentos_limites}
+        return self._secao('limites', carregar)
+
+    def meta_vendedor(self, vendedor_nome):
+        """
+        Metas de um vendedor (MetaVendedor ou None). Sem as metas já carregadas, lê só o
+        documento do vendedor.
+        """
+        if 'metas' in self._secoes or cache_ativo():
+            return self.metas.get(vendedor_nome)
+        documento = self._colecao.find_one({'tipo': 'meta_vendedor', 'vendedor_nome': vendedor_nome})
+        return MetaVendedor(documento) if documento else None
+
+
+def cache_ativo():
+    """
+    As configurações só ficam em memória dentro de uma aplicação Flask com CACHE_CONFIGS ligado
+    (chamadas diretas, como nos testes e scripts, sempre leem a coleção).
+    """
+    return has_app_context() and current_app.config.get('CACHE_CONFIGS', False)
+
+
+def _contadores(configs_collection):
+    # A versão fica no mesmo banco da coleção de configurações
+    return configs_collection.database['contadores']
+
+
+def versao_configuracoes(configs_collection):
+    """
+    Retorna a versão atual das configurações gravada no MongoDB.
+    """
+    documento = _contadores(configs_collection).find_one({'_id': ID_VERSAO}) or {}
+    return documento.get('versao', 0)
+
+
+def invalidar_configuracoes(configs_collection):
+    """
+    Incrementa a versão das configurações e descarta as deste processo. Chamada após cada
+    escrita feita por models.configs_collection (APIs /api/configs/*, metas, limites, fim do expediente).
+
+    Parâmetros:
+        configs_collection: Coleção de configurações onde foi feita a escrita.
+    """
+    global _configuracoes
+    _contadores(configs_collection).update_one({'_id': ID_VERSAO}, {'$inc': {'versao': 1}}, upsert=True)
+    with _trava:
+        _configuracoes = None
+
+
+def obter_configuracoes(configs_collection):
+    """
+    Retorna as configurações do sistema, recarregando-as só quando a versão mudou.
+
+    Parâmetros:
+        configs_collection: Coleção de configurações do chamador.
+
+    Retorna:
+        ConfiguracoesSistema: Configurações compartilhadas (não devem ser alteradas pelo chamador).
+    """
+    global _configuracoes, _versao, _verificado_em
+    if not cache_ativo():
+        return ConfiguracoesSistema(configs_collection)
+
+    agora = time.monotonic()
+    with _trava:
+        configuracoes, versao, verificado_em = _configuracoes, _versao, _verificado_em
+    if configuracoes is not None and agora - verificado_em < INTERVALO_VERIFICACAO:
+        return configuracoes
+
+    versao_atual = versao_configuracoes(configs_collection)
+    if configuracoes is None or versao_atual != versao:
+        configuracoes = ConfiguracoesSistema(configs_collection)
+    with _trava:
+        _configuracoes, _versao, _verificado_em = configuracoes, versao_atual, agora
+    return configuracoes
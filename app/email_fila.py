@@ -0,0 +1,294 @@
+"""
+Módulo da fila de envio de e-mails (outbox).
+As rotas apenas gravam o e-mail na coleção 'email_fila'; um worker em segundo plano envia
+as mensagens pendentes em lotes, reaproveitando uma conexão SMTP autenticada por remetente,
+com novas tentativas (backoff exponencial) e registro do status de entrega. A senha SMTP não
+é gravada na fila: o worker a lê das configurações ('geral') ao autenticar.
+
+Status possíveis de uma mensagem:
+    pendente  -> aguardando envio (ou nova tentativa)
+    enviando  -> reservada por um worker
+    enviado   -> entregue ao servidor SMTP
+    falhou    -> esgotou as tentativas (campo 'erro' guarda o último erro)
+"""
+
+import smtplib  # Envio de e-mails via SMTP
+import threading  # Worker de envio em segundo plano
+import time  # Controle de conexões ociosas
+from datetime import datetime, timedelta
+from email.message import EmailMessage  # Criação de mensagens de e-mail
+
+from pymongo import ASCENDING, ReturnDocument
+
+from app.models import email_fila_collection, configs_collection
+from app.configuracoes import obter_configuracoes
+
+# Número máximo de tentativas antes de marcar a mensagem como 'falhou'
+MAX_TENTATIVAS = 5
+
+# Espera base entre tentativas (dobra a cada falha) e espera máxima
+ESPERA_BASE_SEGUNDOS = 30
+ESPERA_MAXIMA_SEGUNDOS = 3600
+
+# Mensagens 'enviando' há mais tempo que isso voltam para a fila (worker interrompido)
+RESERVA_EXPIRA_MINUTOS = 10
+
+# Quantidade máxima de mensagens enviadas por ciclo do worker
+TAMANHO_LOTE = 50
+
+# Tempo (s) que uma conexão SMTP ociosa é mantida aberta entre ciclos
+CONEXAO_OCIOSA_SEGUNDOS = 60
+
+
+def montar_mensagem_email(assunto, email_remetente, corpo, copias, email_destinatario):
+    """
+    Monta a mensagem de e-mail (HTML com texto alternativo) e a lista de destinatários.
+
+    Parâmetros:
+        assunto (str): Assunto do e-mail.
+        email_remetente (str): E-mail do remetente.
+        corpo (str): Conteúdo HTML do e-mail.
+        copias (str): E-mails de cópia separados por vírgula. Opcional.
+        email_destinatario (str): Destinatário principal.
+
+    Retorna:
+        tuple: (EmailMessage, lista com todos os destinatários)
+    """
+    msg = EmailMessage()
+    msg['Subject'] = assunto
+    msg['From'] = email_remetente
+    msg['To'] = email_destinatario
+
+    # Adiciona destinatários em cópia, se houver
+    todos_destinatarios = [email_destinatario]
+    if copias:
+        copias_limpa = [c.strip() for c in copias.split(',') if c.strip()]
+        msg['Cc'] = ', '.join(copias_limpa)
+        todos_destinatarios += copias_limpa
+
+    # Corpo alternativo em HTML
+    msg.set_content("Este e-mail contém uma versão em HTML. Por favor, habilite a visualização de conteúdo.")
+    msg.add_alternative(corpo, subtype='html')
+    return msg, todos_destinatarios
+
+
+def enfileirar_email(assunto, email_remetente, corpo, servidor, porta, copias, email_destinatario):
+    """
+    Grava um e-mail na fila para envio em segundo plano (mesmos parâmetros de enviar_email,
+    exceto a senha, lida das configurações no envio).
+
+    Retorna:
+        ObjectId: ID da mensagem na fila (permite consultar o status depois).
+    """
+    agora = datetime.now()
+    mensagem = {
+        "assunto": assunto,
+        "email_remetente": email_remetente,
+        "corpo": corpo,
+        "copias": copias or "",
+        "email_destinatario": email_destinatario,
+        "servidor": servidor,
+        "porta": porta,
+        "status": "pendente",
+        "tentativas": 0,
+        "proxima_tentativa": agora,
+        "criado_em": agora,
+        "enviado_em": None,
+        "erro": None
+    }
+    return email_fila_collection.insert_one(mensagem).inserted_id
+
+
+def status_email(id_mensagem):
+    """
+    Consulta o status de entrega de uma mensagem da fila.
+
+    Retorna:
+        dict | None: {'status', 'tentativas', 'erro', 'enviado_em'} ou None se não existir.
+    """
+    return email_fila_collection.find_one(
+        {"_id": id_mensagem},
+        {"_id": 0, "status": 1, "tentativas": 1, "erro": 1, "enviado_em": 1}
+    )
+
+
+def reservar_mensagens(limite=TAMANHO_LOTE, agora=None):
+    """
+    Reserva (status 'enviando') até `limite` mensagens prontas para envio.
+    Cada reserva é um find_one_and_update atômico, então vários workers podem
+    processar a fila ao mesmo tempo sem enviar a mesma mensagem duas vezes.
+
+    Retorna:
+        list: Mensagens reservadas.
+    """
+    agora = agora or datetime.now()
+    filtro = {"$or": [
+        {"status": "pendente", "proxima_tentativa": {"$lte": agora}},
+        {"status": "enviando", "reservado_em": {"$lt": agora - timedelta(minutes=RESERVA_EXPIRA_MINUTOS)}}
+    ]}
+    reservadas = []
+    for _ in range(limite):
+        mensagem = email_fila_collection.find_one_and_update(
+            filtro,
+            {"$set": {"status": "enviando", "reservado_em": agora}},
+            sort=[("proxima_tentativa", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+        if mensagem is None:
+            break
+        reservadas.append(mensagem)
+    return reservadas
+
+
+def senha_smtp():
+    """
+    Lê a senha SMTP das configurações no momento do envio.
+
+    Retorna:
+        str: Senha do remetente (configuração 'geral').
+
+    Raises:
+        ValueError: Se a senha não estiver configurada (o envio é registrado como falha).
+    """
+    geral = obter_configuracoes(configs_collection).geral
+    senha = geral.senha_email_smtp if geral else None
+    if not senha:
+        raise ValueError("Senha SMTP não configurada")
+    return senha
+
+
+def registrar_envio(mensagem):
+    """
+    Marca a mensagem como enviada (e descarta a senha SMTP de mensagens antigas, que a gravavam).
+    """
+    email_fila_collection.update_one(
+        {"_id": mensagem["_id"]},
+        {"$set": {"status": "enviado", "enviado_em": datetime.now(), "erro": None},
+         "$inc": {"tentativas": 1},
+         "$unset": {"senha_email": "", "reservado_em": ""}}
+    )
+
+
+def registrar_falha(mensagem, erro, agora=None):
+    """
+    Registra uma falha de envio: agenda nova tentativa com backoff exponencial
+    ou marca como 'falhou' ao atingir MAX_TENTATIVAS.
+    """
+    agora = agora or datetime.now()
+    tentativas = mensagem.get("tentativas", 0) + 1
+    if tentativas >= MAX_TENTATIVAS:
+        atualizacao = {
+            "$set": {"status": "falhou", "tentativas": tentativas, "erro": str(erro)},
+            "$unset": {"senha_email": "", "reservado_em": ""}
+        }
+    else:
+        espera = min(ESPERA_BASE_SEGUNDOS * 2 ** (tentativas - 1), ESPERA_MAXIMA_SEGUNDOS)
+        atualizacao = {
+            "$set": {"status": "pendente", "tentativas": tentativas, "erro": str(erro),
+                     "proxima_tentativa": agora + timedelta(seconds=espera)},
+            "$unset": {"reservado_em": ""}
+        }
+    email_fila_collection.update_one({"_id": mensagem["_id"]}, atualizacao)
+
+
+class EnviadorEmail:
+    """
+    Envia as mensagens da fila mantendo uma conexão SMTP autenticada por
+    (servidor, porta, remetente), reaproveitada entre lotes enquanto estiver ativa.
+    """
+
+    def __init__(self):
+        self._conexoes = {}   # chave -> (smtp, instante do último uso)
+
+    def _conexao(self, mensagem):
+        chave = (mensagem["servidor"], mensagem["porta"], mensagem["email_remetente"])
+        if chave in self._conexoes:
+            smtp, _ = self._conexoes[chave]
+            try:
+                smtp.noop()  # Confere se o servidor ainda aceita a conexão
+                return chave, smtp
+            except (smtplib.SMTPException, OSError):
+                self._fechar(chave)
+        senha = senha_smtp()
+        smtp = smtplib.SMTP_SSL(mensagem["servidor"], mensagem["porta"])
+        try:
+            smtp.login(mensagem["email_remetente"], senha)
+        except Exception:
+            smtp.close()
+            raise
+        self._conexoes[chave] = (smtp, time.monotonic())
+        return chave, smtp
+
+    def _fechar(self, chave):
+        smtp, _ = self._conexoes.pop(chave)
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+
+    def fechar_ociosas(self, limite_segundos=CONEXAO_OCIOSA_SEGUNDOS):
+        """
+        Fecha conexões sem uso há mais de `limite_segundos` (0 fecha todas).
+        """
+        agora = time.monotonic()
+        for chave, (_, ultimo_uso) in list(self._conexoes.items()):
+            if agora - ultimo_uso >= limite_segundos:
+                self._fechar(chave)
+
+    def processar_fila(self, limite=TAMANHO_LOTE):
+        """
+        Reserva um lote de mensagens e envia cada uma, registrando sucesso ou falha. Qualquer
+        erro de uma mensagem (SMTP, rede, dados inválidos) vira falha dela, sem deixá-la presa
+        em 'enviando' nem interromper o restante do lote.
+
+        Retorna:
+            dict: {'enviados': int, 'falhas': int}
+        """
+        resultado = {"enviados": 0, "falhas": 0}
+        for mensagem in reservar_mensagens(limite):
+            chave = None
+            try:
+                chave, smtp = self._conexao(mensagem)
+                msg, destinatarios = montar_mensagem_email(
+                    mensagem["assunto"], mensagem["email_remetente"], mensagem["corpo"],
+                    mensagem.get("copias"), mensagem["email_destinatario"]
+                )
+                smtp.send_message(msg, to_addrs=destinatarios)
+                self._conexoes[chave] = (smtp, time.monotonic())
+                registrar_envio(mensagem)
+                resultado["enviados"] += 1
+            except Exception as e:
+                # Descarta a conexão com problema; a próxima mensagem abre outra
+                if chave in self._conexoes and not isinstance(e, smtplib.SMTPRecipientsRefused):
+                    self._fechar(chave)
+                registrar_falha(mensagem, e)
+                resultado["falhas"] += 1
+        return resultado
+
+
+def iniciar_worker_email(intervalo=5):
+    """
+    Inicia o worker de envio em uma thread daemon.
+
+    Parâmetros:
+        intervalo (int): Segundos entre verificações da fila.
+
+    Retorna:
+        threading.Event: Evento que, ao ser sinalizado (set), encerra o worker.
+    """
+    parar = threading.Event()
+
+    def executar():
+        enviador = EnviadorEmail()
+        while not parar.is_set():
+            try:
+                enviador.processar_fila()
+                enviador.fechar_ociosas()
+            except Exception as e:
+                # Banco indisponível ou erro inesperado: tenta de novo no próximo ciclo
+                print(f"Erro no worker de e-mails: {e}")
+            parar.wait(intervalo)
+        enviador.fechar_ociosas(0)
+
+    threading.Thread(target=executar, name="worker-email", daemon=True).start()
+    return parar
@@ -0,0 +1,307 @@
+"""
+Módulo do GeoJSON dos estados brasileiros usado nos mapas de vendas por estado.
+O arquivo original (static/data/brazil-states.geojson, ~3,3 MB) tem muito mais detalhe do que
+um mapa do país inteiro precisa e era lido do disco (e embutido inteiro no gráfico) a cada mapa.
+Aqui ele é pré-processado uma vez em uma versão simplificada:
+    - coordenadas quantizadas (arredondadas para CASAS_DECIMAIS, ~100 m);
+    - linhas simplificadas por Douglas-Peucker preservando a topologia: as fronteiras são
+      divididas nos pontos de junção entre estados e cada trecho compartilhado é simplificado
+      do mesmo jeito nos dois estados (sem buracos nem sobreposições entre vizinhos);
+    - propriedades reduzidas às usadas no mapa (sigla e nome).
+
+O arquivo simplificado (static/data/brazil-states.simplificado.geojson) é gerado por este módulo
+e guarda o hash do original (campo 'origem'); ao carregar, ele é recriado automaticamente se
+estiver ausente ou tiver sido gerado de outro original. Cada processo o lê uma vez; o navegador o baixa por uma URL versionada com cache longo
+(app/routes/apiGraficoFigura.py), em vez de receber a geometria dentro de cada gráfico.
+
+Uso pela linha de comando (etapa de build):
+    python -m app.geojson_brasil
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from flask import url_for
+
+PASTA_DADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'data')
+ARQUIVO_ORIGINAL = os.path.join(PASTA_DADOS, 'brazil-states.geojson')
+ARQUIVO_SIMPLIFICADO = os.path.join(PASTA_DADOS, 'brazil-states.simplificado.geojson')
+
+# Casas decimais das coordenadas (3 casas ~ 110 m no equador)
+CASAS_DECIMAIS = 3
+
+# Distância máxima (em graus) entre a linha original e a simplificada (~1 km)
+TOLERANCIA = 0.01
+
+# Propriedades mantidas em cada estado (o mapa usa 'properties.sigla')
+PROPRIEDADES = ('sigla', 'name')
+
+_geojson = None
+_versao = None
+_trava = threading.Lock()
+
+
+def _distancia_segmento(ponto, inicio, fim):
+    """
+    Distância do ponto ao segmento inicio-fim (coordenadas planas).
+    """
+    (x, y), (x1, y1), (x2, y2) = ponto, inicio, fim
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 0 and dy == 0:
+        return ((x - x1) ** 2 + (y - y1) ** 2) ** 0.5
+    t = max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)))
+    px, py = x1 + t * dx, y1 + t * dy
+    return ((x - px) ** 2 + (y - py) ** 2) ** 0.5
+
+
+def _douglas_peucker(linha, tolerancia):
+    """
+    Simplifica uma linha mantendo o primeiro e o último ponto (versão iterativa).
+    """
+    if len(linha) < 3:
+        return list(linha)
+    manter = [False] * len(linha)
+    manter[0] = manter[-1] = True
+    pilha = [(0, len(linha) - 1)]
+    while pilha:
+        inicio, fim = pilha.pop()
+        maior, indice = 0.0, None
+        for i in range(inicio + 1, fim):
+            distancia = _distancia_segmento(linha[i], linha[inicio], linha[fim])
+            if distancia > maior:
+                maior, indice = distancia, i
+        if indice is not None and maior > tolerancia:
+            manter[indice] = True
+            pilha.append((inicio, indice))
+            pilha.append((indice, fim))
+    return [ponto for ponto, fica in zip(linha, manter) if fica]
+
+
+def _simplificar_trecho(trecho, tolerancia):
+    """
+    Simplifica um trecho sempre no mesmo sentido (o do menor ponto inicial), para que um trecho
+    compartilhado por dois estados (percorrido em sentidos opostos) dê o mesmo resultado.
+    Trechos fechados (que voltam ao ponto inicial) são divididos no ponto mais distante dele.
+    """
+    if trecho[0] == trecho[-1] and len(trecho) > 3:
+        meio = max(range(1, len(trecho) - 1),
+                   key=lambda i: (_distancia_segmento(trecho[i], trecho[0], trecho[0]), trecho[i]))
+        return (_simplificar_trecho(trecho[:meio + 1], tolerancia)[:-1]
+                + _simplificar_trecho(trecho[meio:], tolerancia))
+    if trecho[0] > trecho[-1]:
+        return _douglas_peucker(trecho[::-1], tolerancia)[::-1]
+    return _douglas_peucker(trecho, tolerancia)
+
+
+def _aneis(geometria):
+    """
+    Lista os anéis (listas de pontos) de um Polygon/MultiPolygon.
+    """
+    if not geometria:
+        return []
+    if geometria.get('type') == 'Polygon':
+        return list(geometria['coordinates'])
+    if geometria.get('type') == 'MultiPolygon':
+        return [anel for poligono in geometria['coordinates'] for anel in poligono]
+    return []
+
+
+def _quantizar(geometria, casas):
+    """
+    Arredonda as coordenadas e remove pontos repetidos em sequência.
+    """
+    def anel(pontos):
+        resultado = []
+        for x, y, *_ in pontos:
+            ponto = (round(x, casas), round(y, casas))
+            if not resultado or resultado[-1] != ponto:
+                resultado.append(ponto)
+        return resultado
+
+    if geometria.get('type') == 'Polygon':
+        return {'type': 'Polygon', 'coordinates': [anel(a) for a in geometria['coordinates']]}
+    return {'type': 'MultiPolygon', 'coordinates': [[anel(a) for a in p] for p in geometria['coordinates']]}
+
+
+def _juncoes(geometrias):
+    """
+    Pontos de junção: pontos que têm vizinhos diferentes em anéis diferentes (onde uma
+    fronteira compartilhada começa ou termina).
+    """
+    vizinhos = {}
+    juncoes = set()
+    for geometria in geometrias:
+        for anel in _aneis(geometria):
+            pontos = anel[:-1] if len(anel) > 1 and anel[0] == anel[-1] else anel
+            n = len(pontos)
+            if n < 4:
+                # Anéis pequenos não são simplificados: os vizinhos também mantêm esses pontos
+                juncoes.update(pontos)
+                continue
+            for i, ponto in enumerate(pontos):
+                par = frozenset((pontos[i - 1], pontos[(i + 1) % n]))
+                anterior = vizinhos.setdefault(ponto, par)
+                if anterior != par:
+                    juncoes.add(ponto)
+    return juncoes
+
+
+def _simplificar_anel(anel, juncoes, tolerancia):
+    """
+    Simplifica um anel fechado dividindo-o nos pontos de junção.
+
+    Retorna:
+        list | None: Pontos do anel simplificado, ou None se ele se reduziria a menos de um triângulo.
+    """
+    pontos = anel[:-1] if len(anel) > 1 and anel[0] == anel[-1] else list(anel)
+    if len(pontos) < 4:
+        return [list(p) for p in anel]
+
+    # Começa o anel em uma junção (ou no menor ponto, se o anel não é compartilhado)
+    indices = [i for i, ponto in enumerate(pontos) if ponto in juncoes]
+    inicio = indices[0] if indices else pontos.index(min(pontos))
+    pontos = pontos[inicio:] + pontos[:inicio]
+    cortes = [i for i, ponto in enumerate(pontos) if ponto in juncoes] or [0]
+    cortes.append(len(pontos))
+    pontos.append(pontos[0])
+
+    resultado = []
+    for a, b in zip(cortes, cortes[1:]):
+        trecho = _simplificar_trecho(pontos[a:b + 1], tolerancia)
+        resultado.extend(trecho[:-1])
+    resultado.append(resultado[0])
+    if len(resultado) < 4:
+        return None
+    return [list(p) for p in resultado]
+
+
+def _simplificar_geometria(geometria, juncoes, tolerancia, colapsados):
+    """
+    Simplifica os anéis de um Polygon/MultiPolygon. Anéis que se reduziriam a menos de um
+    triângulo ficam com os pontos quantizados, que são acrescentados a 'colapsados'.
+    """
+    def anel(pontos):
+        simplificado = _simplificar_anel(pontos, juncoes, tolerancia)
+        if simplificado is None:
+            colapsados.update(pontos)
+            return [list(p) for p in pontos]
+        return simplificado
+
+    if geometria['type'] == 'Polygon':
+        return [anel(a) for a in geometria['coordinates']]
+    return [[anel(a) for a in p] for p in geometria['coordinates']]
+
+
+def simplificar_geojson(geojson, tolerancia=TOLERANCIA, casas=CASAS_DECIMAIS):
+    """
+    Gera a versão simplificada de um GeoJSON de polígonos.
+
+    Parâmetros:
+        geojson (dict): FeatureCollection original.
+        tolerancia (float): Desvio máximo em graus aceito na simplificação.
+        casas (int): Casas decimais das coordenadas.
+
+    Retorna:
+        dict: FeatureCollection simplificada.
+    """
+    features = [f for f in geojson.get('features', []) if f.get('geometry')]
+    geometrias = [_quantizar(f['geometry'], casas) for f in features]
+    juncoes = _juncoes(geometrias)
+
+    # Anéis que colapsariam ficam inteiros; os pontos deles viram junções e a simplificação é
+    # refeita, para que os estados vizinhos também os mantenham
+    while True:
+        colapsados = set()
+        todas_coordenadas = [_simplificar_geometria(g, juncoes, tolerancia, colapsados) for g in geometrias]
+        if colapsados <= juncoes:
+            break
+        juncoes |= colapsados
+
+    simplificadas = []
+    for feature, geometria, coordenadas in zip(features, geometrias, todas_coordenadas):
+        propriedades = feature.get('properties') or {}
+        simplificadas.append({
+            'type': 'Feature',
+            'properties': {campo: propriedades.get(campo) for campo in PROPRIEDADES},
+            'geometry': {'type': geometria['type'], 'coordinates': coordenadas}
+        })
+    return {'type': 'FeatureCollection', 'features': simplificadas}
+
+
+def _hash_arquivo(caminho):
+    with open(caminho, 'rb') as arquivo:
+        return hashlib.sha1(arquivo.read()).hexdigest()
+
+
+def gerar_geojson_simplificado(origem=ARQUIVO_ORIGINAL, destino=ARQUIVO_SIMPLIFICADO):
+    """
+    Lê o GeoJSON original, simplifica e grava o resultado (JSON compacto).
+
+    Retorna:
+        dict: GeoJSON simplificado.
+    """
+    with open(origem, encoding='utf-8') as arquivo:
+        geojson = simplificar_geojson(json.load(arquivo))
+    geojson['origem'] = _hash_arquivo(origem)
+    with open(destino + '.tmp', 'w', encoding='utf-8') as arquivo:
+        json.dump(geojson, arquivo, ensure_ascii=False, separators=(',', ':'))
+    os.replace(destino + '.tmp', destino)
+    return geojson
+
+
+
+
+def carregar_geojson_brasil():
+    """
+    Retorna o GeoJSON simplificado dos estados, lido uma vez por processo (gerado se estiver
+    ausente ou desatualizado). Em caso de erro devolve uma FeatureCollection vazia.
+
+    Retorna:
+        dict: GeoJSON (compartilhado; não deve ser alterado pelo chamador).
+    """
+    global _geojson, _versao
+    with _trava:
+        if _geojson is None:
+            try:
+                geojson = None
+                if os.path.exists(ARQUIVO_SIMPLIFICADO):
+                    with open(ARQUIVO_SIMPLIFICADO, 'rb') as arquivo:
+                        conteudo = arquivo.read()
+                    geojson = json.loads(conteudo)
+                if os.path.exists(ARQUIVO_ORIGINAL) and (
+                        geojson is None or geojson.get('origem') != _hash_arquivo(ARQUIVO_ORIGINAL)):
+                    gerar_geojson_simplificado()
+                    with open(ARQUIVO_SIMPLIFICADO, 'rb') as arquivo:
+                        conteudo = arquivo.read()
+                    geojson = json.loads(conteudo)
+                if geojson is None:
+                    raise FileNotFoundError(ARQUIVO_SIMPLIFICADO)
+                _geojson = geojson
+                _versao = hashlib.sha1(conteudo).hexdigest()[:12]
+            except Exception as e:
+                print(f'Erro ao carregar o GeoJSON dos estados: {e}')
+                return {"type": "FeatureCollection", "features": []}
+        return _geojson
+
+
+def versao_geojson_brasil():
+    """
+    Versão (hash do conteúdo) do GeoJSON simplificado, usada na URL com cache longo.
+    """
+    carregar_geojson_brasil()
+    return _versao
+
+
+def url_geojson_brasil():
+    """
+    URL do GeoJSON simplificado (app/routes/apiGraficoFigura.py), para o mapa no navegador.
+    """
+    return url_for('api_grafico_figura.geojson_brasil', versao=versao_geojson_brasil())
+
+
+if __name__ == '__main__':
+    geojson = gerar_geojson_simplificado()
+    print(f"GeoJSON simplificado gravado em {ARQUIVO_SIMPLIFICADO} "
+          f"({os.path.getsize(ARQUIVO_SIMPLIFICADO) / 1024:.0f} KB, {len(geojson['features'])} estados)")
@@ -0,0 +1,94 @@
+"""
+Módulo do carregamento em lote dos gráficos do dashboard (/api/graficos/lote).
+Em vez de uma requisição por aba, o navegador pede vários gráficos de uma vez; eles são
+gerados em paralelo num pool de threads limitado e cada um é enviado (uma linha NDJSON)
+assim que fica pronto. O tempo total fica próximo ao do gráfico mais lento.
+
+Threads bastam aqui: quase todo o tempo de um gráfico é espera pelo MongoDB (pymongo libera
+o GIL durante a consulta). As threads de um mesmo lote compartilham o snapshot mensal da
+requisição (app/snapshot.py), então as agregações comuns são feitas uma única vez.
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from flask import copy_current_request_context, g
+
+from app.graficos import GRAFICOS_PAINEL, gerar_grafico_painel
+
+# Threads padrão do pool compartilhado por todas as requisições do processo
+THREADS_PADRAO = 4
+
+_executor = None
+_threads_executor = 0
+_trava = threading.Lock()
+
+
+def obter_executor(threads):
+    """
+    Retorna o pool de threads compartilhado, recriando-o se a quantidade mudou.
+    """
+    global _executor, _threads_executor
+    with _trava:
+        if _executor is None or _threads_executor != threads:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='graficos')
+            _threads_executor = threads
+        return _executor
+
+
+def linha_erro(nome, erro):
+    """
+    Linha NDJSON de um gráfico que não pôde ser gerado.
+    """
+    return json.dumps({"nome": nome, "erro": erro}, ensure_ascii=False) + "\n"
+
+
+def gerar_graficos_lote(nomes, ano=None, mes=None, data_escolhida=None, threads=THREADS_PADRAO):
+    """
+    Agenda a geração dos gráficos (formato figura) e retorna as linhas NDJSON na ordem em que ficam prontos.
+    Deve ser chamada dentro da requisição: os gráficos começam a ser gerados antes de a
+    resposta ser enviada.
+
+    Parâmetros:
+        nomes (list): Nomes dos gráficos (chaves de GRAFICOS_PAINEL); repetidos são ignorados.
+        ano (int, opcional), mes (int, opcional): Período (padrão: mês atual).
+        data_escolhida (str, opcional): Dia do gráfico vendas_diarias ('YYYY-MM-DD').
+        threads (int): Tamanho do pool de threads.
+
+    Retorna:
+        generator: Linhas {"nome": ..., "figura": {...}} ou {"nome": ..., "erro": "..."}.
+    """
+    nomes = list(dict.fromkeys(nomes))
+    desconhecidos = [nome for nome in nomes if nome not in GRAFICOS_PAINEL]
+
+    # Snapshots mensais desta requisição, compartilhados com as threads do lote
+    snapshots = g.setdefault('snapshots_mensais', {})
+
+    def gerar(nome):
+        g.snapshots_mensais = snapshots
+        return gerar_grafico_painel(nome, ano, mes, data_escolhida=data_escolhida, formato='figura')
+
+    executor = obter_executor(threads)
+    # Cada thread roda numa cópia do contexto da requisição (sessão, url_for, configurações)
+    futuros = {
+        executor.submit(copy_current_request_context(gerar), nome): nome
+        for nome in nomes if nome in GRAFICOS_PAINEL
+    }
+
+    def linhas():
+        for nome in desconhecidos:
+            yield linha_erro(nome, "Gráfico não encontrado")
+        for futuro in as_completed(futuros):
+            nome = futuros[futuro]
+            try:
+                figura = futuro.result()
+            except Exception as e:
+                yield linha_erro(nome, f"Erro ao gerar gráfico: {str(e)}")
+                continue
+            # A figura já é JSON: monta a linha sem decodificar/recodificar
+            yield '{"nome":' + json.dumps(nome) + ',"figura":' + figura + '}\n'
+
+    return linhas()
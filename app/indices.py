@@ -0,0 +1,332 @@
+"""
+Módulo de gerenciamento de índices do banco sistemaVendas.
+Declara os índices necessários para as consultas do sistema (gráficos, login, numeração de
+vendas e notificações), cria esses índices de forma idempotente e gera um relatório, via
+`explain`, das consultas que ainda fazem varredura completa da coleção (COLLSCAN).
+
+O índice único de 'numero_da_venda' não é criado enquanto houver números repetidos (gravados
+antes do contador atômico); numeros_venda_duplicados lista esses números e
+corrigir_numeros_duplicados renumera as vendas repetidas, mantendo o número na mais antiga.
+
+Uso pela linha de comando:
+    python -m app.indices                        # cria/atualiza os índices
+    python -m app.indices --relatorio            # cria os índices e mostra o relatório de COLLSCAN
+    python -m app.indices --corrigir-duplicados  # renumera vendas repetidas e cria os índices
+"""
+
+import sys
+from datetime import datetime
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import ConnectionFailure, PyMongoError
+
+from app.utils import NOMES_FAIXAS_PRAZO
+
+# Índices declarados por coleção.
+# Nas chaves compostas, os campos de igualdade vêm antes do campo de intervalo (data).
+INDICES = {
+    'vendas': [
+        # Gráficos gerais: status + vendedores ativos + intervalo de datas
+        IndexModel([('status', ASCENDING), ('vendedor', ASCENDING), ('data_criacao', ASCENDING)],
+                   name='status_vendedor_data_criacao'),
+        # Gráficos individuais: vendedor + intervalo de datas
+        IndexModel([('vendedor', ASCENDING), ('data_criacao', ASCENDING)],
+                   name='vendedor_data_criacao'),
+        # Listagem de vendas (/api/vendas): período + paginação por cursor em (data_criacao, _id)
+        IndexModel([('data_criacao', DESCENDING), ('_id', DESCENDING)], name='data_criacao_id'),
+        # Listagem de vendas do vendedor logado
+        IndexModel([('usuario_id', ASCENDING), ('data_criacao', DESCENDING), ('_id', DESCENDING)],
+                   name='usuario_id_data_criacao_id'),
+        # Pesquisa da tela de vendas por prefixo nos campos normalizados (app/utils.py: campos_busca_venda)
+        IndexModel([('busca_documento', ASCENDING)], name='busca_documento'),
+        IndexModel([('busca_nome', ASCENDING)], name='busca_nome'),
+        IndexModel([('busca_vendedor', ASCENDING)], name='busca_vendedor'),
+        # Numeração sequencial das vendas: único para impedir números repetidos
+        # (o filtro parcial ignora vendas antigas sem número preenchido)
+        IndexModel([('numero_da_venda', ASCENDING)], name='numero_da_venda', unique=True,
+                   partialFilterExpression={'numero_da_venda': {'$gt': ''}}),
+    ],
+    'vendas_diarias': [
+        # Um documento por (dia, vendedor, status); único para o upsert incremental
+        IndexModel([('dia', ASCENDING), ('vendedor', ASCENDING), ('status', ASCENDING)],
+                   name='dia_vendedor_status', unique=True),
+    ],
+    'usuarios': [
+        # Login e buscas por username
+        IndexModel([('username', ASCENDING)], name='username', unique=True),
+        # Listagem de vendedores ativos/bloqueados e de admins
+        IndexModel([('status', ASCENDING)], name='status'),
+        IndexModel([('tipo', ASCENDING)], name='tipo'),
+        IndexModel([('nome_completo', ASCENDING)], name='nome_completo'),
+    ],
+    'notificacoes': [
+        # /api/notificacoes: notificações do usuário, mais recentes primeiro
+        IndexModel([('envolvidos', ASCENDING), ('data_hora', DESCENDING)],
+                   name='envolvidos_data_hora'),
+    ],
+    'configs': [
+        # Configurações por tipo (geral, metas, limites) e por vendedor
+        IndexModel([('tipo', ASCENDING), ('vendedor', ASCENDING)], name='tipo_vendedor'),
+    ],
+    'email_fila': [
+        # Worker de e-mails: próximas mensagens pendentes
+        IndexModel([('status', ASCENDING), ('proxima_tentativa', ASCENDING)],
+                   name='status_proxima_tentativa'),
+    ],
+    'relatorios_pdf': [
+        # Um único pedido ativo (na fila ou sendo gerado) por conjunto de parâmetros
+        IndexModel([('chave_ativa', ASCENDING)], name='chave_ativa', unique=True,
+                   partialFilterExpression={'chave_ativa': {'$exists': True}}),
+        # Worker: próximo pedido da fila e limpeza dos expirados
+        IndexModel([('status', ASCENDING), ('criado_em', ASCENDING)], name='status_criado_em'),
+    ],
+    'sessoes': [
+        # Sessões no servidor: o MongoDB remove as expiradas (TTL)
+        IndexModel([('expira_em', ASCENDING)], name='expira_em_ttl', expireAfterSeconds=0),
+    ],
+    'logs': [
+        # Listagem de logs por data/hora (mais recentes primeiro)
+        IndexModel([('data', DESCENDING), ('hora', DESCENDING)], name='data_hora'),
+    ],
+}
+
+
+def garantir_indices(db):
+    """
+    Cria os índices declarados em INDICES (operação idempotente).
+
+    Índices já existentes com a mesma definição são mantidos. Se a criação de um índice
+    falhar (ex: documentos duplicados impedindo um índice único), o erro é registrado
+    e os demais índices continuam sendo criados. Se o banco estiver inacessível,
+    a operação é interrompida no primeiro erro de conexão.
+
+    Se o índice único de 'numero_da_venda' falhar, os números repetidos que o impedem são
+    listados em 'duplicados' (ver numeros_venda_duplicados).
+
+    Parâmetros:
+        db: Banco de dados MongoDB (ex: models.db).
+
+    Retorna:
+        dict: {'criados': [(colecao, nome)], 'erros': [(colecao, nome, mensagem)], 'duplicados': list}
+    """
+    resultado = {'criados': [], 'erros': [], 'duplicados': []}
+    for nome_colecao, indices in INDICES.items():
+        colecao = db[nome_colecao]
+        for indice in indices:
+            nome = indice.document['name']
+            try:
+                colecao.create_indexes([indice])
+                resultado['criados'].append((nome_colecao, nome))
+            except ConnectionFailure as e:
+                # Banco indisponível: não adianta tentar os demais índices
+                resultado['erros'].append((nome_colecao, nome, str(e)))
+                return resultado
+            except PyMongoError as e:
+                resultado['erros'].append((nome_colecao, nome, str(e)))
+                if (nome_colecao, nome) == ('vendas', 'numero_da_venda'):
+                    resultado['duplicados'] = numeros_venda_duplicados(db)
+    return resultado
+
+
+def numeros_venda_duplicados(db):
+    """
+    Lista os números de venda usados por mais de uma venda.
+
+    Parâmetros:
+        db: Banco de dados MongoDB.
+
+    Retorna:
+        list: [{'numero_da_venda': str, 'ids': [ObjectId, ...]}], com os IDs da venda mais
+              antiga para a mais nova.
+    """
+    pipeline = [
+        {'$match': {'numero_da_venda': {'$gt': ''}}},
+        {'$sort': {'_id': ASCENDING}},
+        {'$group': {'_id': '$numero_da_venda', 'ids': {'$push': '$_id'}, 'quantidade': {'$sum': 1}}},
+        {'$match': {'quantidade': {'$gt': 1}}},
+        {'$sort': {'_id': ASCENDING}},
+    ]
+    return [{'numero_da_venda': item['_id'], 'ids': item['ids']}
+            for item in db['vendas'].aggregate(pipeline, allowDiskUse=True)]
+
+
+def corrigir_numeros_duplicados(db, gerar_numero):
+    """
+    Renumera as vendas com número repetido: a mais antiga mantém o número e as demais recebem
+    um número novo do mesmo mês.
+
+    Parâmetros:
+        db: Banco de dados MongoDB.
+        gerar_numero (callable): Recebe o prefixo 'yyyymm' e devolve um número livre
+            (ex: services.gerar_numero_venda).
+
+    Retorna:
+        list: [(id da venda, número antigo, número novo)]
+    """
+    alteracoes = []
+    for duplicado in numeros_venda_duplicados(db):
+        numero = duplicado['numero_da_venda']
+        for id_venda in duplicado['ids'][1:]:
+            novo = gerar_numero(numero[:6])
+            db['vendas'].update_one({'_id': id_venda}, {'$set': {'numero_da_venda': novo}})
+            alteracoes.append((id_venda, numero, novo))
+    return alteracoes
+
+
+def mensagem_duplicados(duplicados, limite=10):
+    """
+    Texto que explica por que o índice único de 'numero_da_venda' não foi criado e como corrigir.
+    """
+    exemplos = ', '.join(d['numero_da_venda'] for d in duplicados[:limite])
+    if len(duplicados) > limite:
+        exemplos += ', ...'
+    return (f"{len(duplicados)} número(s) de venda repetido(s) impedem o índice único de numero_da_venda "
+            f"({exemplos}). Corrija com: python -m app.indices --corrigir-duplicados")
+
+
+def consultas_monitoradas():
+    """
+    Consultas e pipelines representativos dos caminhos de acesso do sistema.
+
+    Os valores (mês atual, nomes de exemplo) só servem para o `explain` escolher um plano;
+    o que importa é o formato do filtro.
+
+    Retorna:
+        list: Lista de dicts com 'nome', 'colecao' e 'filtro' (+ 'sort') ou 'pipeline'.
+    """
+    hoje = datetime.today()
+    primeiro_dia = datetime(hoje.year, hoje.month, 1)
+    proximo_mes = datetime(hoje.year + 1, 1, 1) if hoje.month == 12 else datetime(hoje.year, hoje.month + 1, 1)
+    periodo = {'$gte': primeiro_dia, '$lt': proximo_mes}
+    status_faturados = {'$in': ['Aprovada', 'Faturado']}
+    vendedores = {'$in': ['vendedor']}
+
+    return [
+        {'nome': 'vendas do mês (vendedores ativos)', 'colecao': 'vendas',
+         'filtro': {'data_criacao': periodo, 'status': status_faturados, 'vendedor': vendedores}},
+        {'nome': 'vendas do mês (todos)', 'colecao': 'vendas',
+         'filtro': {'data_criacao': periodo, 'status': status_faturados}},
+        {'nome': 'vendas do vendedor no mês', 'colecao': 'vendas',
+         'filtro': {'data_criacao': periodo, 'vendedor': 'vendedor'}},
+        {'nome': 'listagem de vendas (página por cursor)', 'colecao': 'vendas',
+         'filtro': {'data_criacao': periodo}, 'sort': [('data_criacao', -1), ('_id', -1)]},
+        {'nome': 'gráficos de prazo (faixa_prazo gravada)', 'colecao': 'vendas',
+         'pipeline': [{'$match': {'data_criacao': periodo, 'status': status_faturados, 'vendedor': vendedores,
+                                  'faixa_prazo': {'$in': NOMES_FAIXAS_PRAZO}}},
+                      {'$group': {'_id': {'vendedor': '$vendedor', 'faixa_prazo': '$faixa_prazo'}, 'quantidade': {'$sum': 1}}}]},
+        {'nome': 'pesquisa de vendas por cliente/CNPJ', 'colecao': 'vendas',
+         'filtro': {'$or': [{'busca_nome': {'$regex': '^cliente'}}, {'busca_documento': {'$regex': '^123'}}]}},
+        {'nome': 'última venda do mês (gerar_numero_venda)', 'colecao': 'vendas',
+         'filtro': {'numero_da_venda': {'$regex': f"^{hoje.strftime('%Y%m')}"}},
+         'sort': [('numero_da_venda', -1)]},
+        {'nome': 'vendas por status (pipeline)', 'colecao': 'vendas',
+         'pipeline': [
+             {'$match': {'data_criacao': periodo, 'vendedor': vendedores}},
+             {'$group': {'_id': '$status', 'quantidade': {'$sum': 1}}}
+         ]},
+        {'nome': 'usuário por username (login)', 'colecao': 'usuarios',
+         'filtro': {'username': 'usuario'}},
+        {'nome': 'vendedores ativos', 'colecao': 'usuarios',
+         'filtro': {'status': {'$in': ['ativo', 'bloqueado']}}},
+        {'nome': 'admins', 'colecao': 'usuarios',
+         'filtro': {'tipo': 'admin'}},
+        {'nome': 'notificações do usuário', 'colecao': 'notificacoes',
+         'filtro': {'envolvidos': 'usuario'}, 'sort': [('data_hora', -1)]},
+        {'nome': 'configuração geral', 'colecao': 'configs',
+         'filtro': {'tipo': 'geral'}},
+    ]
+
+
+def possui_collscan(plano):
+    """
+    Verifica recursivamente se um resultado de `explain` contém algum estágio COLLSCAN.
+
+    Parâmetros:
+        plano: Documento (dict/list) retornado pelo explain.
+
+    Retorna:
+        bool: True se houver COLLSCAN no plano.
+    """
+    if isinstance(plano, dict):
+        if plano.get('stage') == 'COLLSCAN':
+            return True
+        return any(possui_collscan(valor) for valor in plano.values())
+    if isinstance(plano, list):
+        return any(possui_collscan(item) for item in plano)
+    return False
+
+
+def explicar_consulta(db, consulta):
+    """
+    Executa o `explain` de uma consulta (find) ou pipeline (aggregate).
+
+    Parâmetros:
+        db: Banco de dados MongoDB.
+        consulta (dict): Item no formato de consultas_monitoradas().
+
+    Retorna:
+        dict: Documento retornado pelo explain.
+    """
+    if 'pipeline' in consulta:
+        return db.command('aggregate', consulta['colecao'], pipeline=consulta['pipeline'], explain=True)
+    cursor = db[consulta['colecao']].find(consulta['filtro'])
+    if consulta.get('sort'):
+        cursor = cursor.sort(consulta['sort'])
+    return cursor.explain()
+
+
+def relatorio_collscan(db, consultas=None):
+    """
+    Gera o relatório de consultas que ainda fazem COLLSCAN.
+
+    Parâmetros:
+        db: Banco de dados MongoDB.
+        consultas (list, opcional): Consultas a analisar (padrão: consultas_monitoradas()).
+
+    Retorna:
+        list: Lista de dicts {'nome', 'colecao', 'collscan' (bool ou None), 'erro'}.
+    """
+    consultas = consultas if consultas is not None else consultas_monitoradas()
+    relatorio = []
+    for consulta in consultas:
+        item = {'nome': consulta['nome'], 'colecao': consulta['colecao'], 'collscan': None, 'erro': None}
+        try:
+            item['collscan'] = possui_collscan(explicar_consulta(db, consulta))
+        except (PyMongoError, NotImplementedError) as e:
+            item['erro'] = str(e)
+        relatorio.append(item)
+    return relatorio
+
+
+def imprimir_relatorio(relatorio):
+    """
+    Mostra o relatório de COLLSCAN no terminal.
+    """
+    for item in relatorio:
+        if item['erro']:
+            situacao = f"ERRO ({item['erro']})"
+        elif item['collscan']:
+            situacao = 'COLLSCAN'
+        else:
+            situacao = 'ok (usa índice)'
+        print(f"[{item['colecao']}] {item['nome']}: {situacao}")
+
+
+if __name__ == '__main__':
+    from app.models import db
+
+    if '--corrigir-duplicados' in sys.argv:
+        # Importado aqui: services carrega gráficos e PDF, desnecessários nos demais usos
+        from app.services import gerar_numero_venda
+        for id_venda, antigo, novo in corrigir_numeros_duplicados(db, gerar_numero_venda):
+            print(f"Venda {id_venda}: número {antigo} -> {novo}")
+
+    resultado = garantir_indices(db)
+    print(f"Índices verificados: {len(resultado['criados'])}")
+    for colecao, nome, erro in resultado['erros']:
+        print(f"Falha ao criar índice {colecao}.{nome}: {erro}")
+    if resultado['duplicados']:
+        print(mensagem_duplicados(resultado['duplicados']))
+
+    if '--relatorio' in sys.argv:
+        imprimir_relatorio(relatorio_collscan(db))
@@ -0,0 +1,90 @@
+"""
+Medição da inicialização de um worker: importação da aplicação + create_app, memória (RSS)
+e o relatório do `python -X importtime`.
+Executa tudo num processo novo (como um worker recém-iniciado) e resume o resultado: tempo
+total, RSS máxima, os módulos mais lentos e quais bibliotecas pesadas de gráficos/PDF foram
+carregadas já na inicialização (o esperado é nenhuma: elas são carregadas no primeiro uso,
+ver app/carga_tardia.py).
+
+Uso pela linha de comando:
+    python -m app.medir_inicializacao             # resumo com os 15 módulos mais lentos
+    python -m app.medir_inicializacao --todos     # inclui o relatório completo do -X importtime
+"""
+
+import json
+import subprocess
+import sys
+
+# Bibliotecas dos gráficos e do PDF que não deveriam ser carregadas na inicialização
+# (os pacotes pais, como plotly e reportlab.pdfgen, são pequenos e são importados pelo find_spec)
+MODULOS_PESADOS = ['pandas', 'plotly.express', 'plotly.graph_objs', 'plotly.io', 'reportlab.pdfgen.canvas', 'kaleido']
+
+# Código executado no processo medido (create_app em modo de teste: sem workers nem índices)
+CODIGO_MEDIDO = """
+import json, resource, time
+inicio = time.perf_counter()
+from app import create_app
+create_app(testing=True)
+segundos = time.perf_counter() - inicio
+print(json.dumps({'segundos': segundos, 'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def ler_importtime(relatorio):
+    """
+    Lê as linhas do -X importtime.
+
+    Retorna:
+        list: (modulo, proprio_us, acumulado_us, nivel) na ordem do relatório.
+    """
+    linhas = []
+    for linha in relatorio.splitlines():
+        if not linha.startswith('import time:') or linha.count('|') < 2:
+            continue
+        proprio, acumulado, nome = linha[len('import time:'):].split('|', 2)
+        if not proprio.strip().isdigit():
+            continue  # cabeçalho
+        nivel = (len(nome) - len(nome.lstrip(' ')) - 1) // 2
+        linhas.append((nome.strip(), int(proprio), int(acumulado), nivel))
+    return linhas
+
+
+def medir_inicializacao(python=sys.executable):
+    """
+    Mede a inicialização num processo novo.
+
+    Retorna:
+        dict: {'segundos', 'rss_mb', 'importtime_ms', 'mais_lentos': [(modulo, ms)],
+               'pesados_carregados': [...], 'relatorio': texto do -X importtime}
+    """
+    processo = subprocess.run(
+        [python, '-X', 'importtime', '-c', CODIGO_MEDIDO], capture_output=True, text=True, check=True
+    )
+    resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+    linhas = ler_importtime(processo.stderr)
+    nomes = [modulo for modulo, _, _, _ in linhas]
+
+    resultado['importtime_ms'] = sum(acumulado for _, _, acumulado, nivel in linhas if nivel == 0) / 1000
+    resultado['mais_lentos'] = [
+        (modulo, acumulado / 1000)
+        for modulo, _, acumulado, _ in sorted(linhas, key=lambda linha: linha[2], reverse=True)
+    ]
+    resultado['pesados_carregados'] = [
+        pesado for pesado in MODULOS_PESADOS
+        if any(nome == pesado or nome.startswith(pesado + '.') for nome in nomes)
+    ]
+    resultado['relatorio'] = processo.stderr
+    return resultado
+
+
+if __name__ == '__main__':
+    medida = medir_inicializacao()
+    print(f"Inicialização (import + create_app): {medida['segundos']:.2f} s")
+    print(f"Soma do -X importtime: {medida['importtime_ms']:.0f} ms")
+    print(f"RSS máxima: {medida['rss_mb']:.0f} MB")
+    print(f"Bibliotecas pesadas carregadas: {', '.join(medida['pesados_carregados']) or 'nenhuma'}")
+    print("Módulos mais lentos (acumulado):")
+    for modulo, ms in medida['mais_lentos'][:15]:
+        print(f"    {ms:8.1f} ms  {modulo}")
+    if '--todos' in sys.argv[1:]:
+        print(medida['relatorio'])
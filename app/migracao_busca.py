@@ -0,0 +1,45 @@
+"""
+Migração dos campos normalizados de busca das vendas ('busca_documento', 'busca_nome',
+'busca_vendedor'; ver app/utils.py: campos_busca_venda).
+Vendas novas já são gravadas com esses campos (app/models.py: nova_venda); esta migração
+preenche as vendas antigas para que a pesquisa da tela de vendas as encontre.
+Pode ser executada de novo a qualquer momento: só grava as vendas cujos campos mudaram.
+
+Uso pela linha de comando:
+    python -m app.migracao_busca            # preenche todas as vendas
+    python -m app.migracao_busca --faltando # apenas vendas ainda sem os campos
+"""
+
+import sys
+
+from app.models import vendas_collection
+from app.utils import campos_busca_venda
+
+# Campos lidos de cada venda: os de origem e os de busca já gravados
+CAMPOS_VENDA = {'cnpj_cpf': 1, 'nome': 1, 'vendedor': 1, 'busca_documento': 1, 'busca_nome': 1, 'busca_vendedor': 1}
+
+
+def preencher_campos_busca(somente_faltando=False):
+    """
+    Grava os campos normalizados de busca nas vendas.
+
+    Parâmetros:
+        somente_faltando (bool): Atualiza apenas vendas sem 'busca_documento'.
+
+    Retorna:
+        int: Quantidade de vendas atualizadas.
+    """
+    filtro = {'busca_documento': {'$exists': False}} if somente_faltando else {}
+    total = 0
+    for venda in vendas_collection.find(filtro, CAMPOS_VENDA):
+        campos = campos_busca_venda(venda)
+        if all(venda.get(campo) == valor for campo, valor in campos.items()):
+            continue
+        vendas_collection.update_one({'_id': venda['_id']}, {'$set': campos})
+        total += 1
+    return total
+
+
+if __name__ == '__main__':
+    total = preencher_campos_busca(somente_faltando='--faltando' in sys.argv[1:])
+    print(f"Campos de busca preenchidos em {total} vendas")
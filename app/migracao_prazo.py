@@ -0,0 +1,40 @@
+"""
+Migração dos campos de prazo das vendas.
+Vendas antigas guardam 'data_prestacao_inicial' como texto 'YYYY-MM-DD' e não têm
+'prazo_dias' nem 'faixa_prazo', que os gráficos de prazo passaram a usar direto no $match
+(antes cada gráfico convertia as datas de todas as vendas já registradas).
+Esta migração grava esses campos com o mesmo cálculo do cadastro (app/utils.py: campos_prazo_venda).
+
+Pode ser executada de novo a qualquer momento: só grava as vendas cujos campos mudaram.
+
+Uso pela linha de comando:
+    python -m app.migracao_prazo
+"""
+
+from app.models import vendas_collection
+from app.utils import campos_prazo_venda
+
+# Campos lidos de cada venda: as datas e os campos de prazo já gravados
+CAMPOS_VENDA = {'data_criacao': 1, 'data_prestacao_inicial': 1, 'prazo_dias': 1, 'faixa_prazo': 1}
+
+
+def preencher_campos_prazo():
+    """
+    Grava 'data_prestacao_inicial' como data, 'prazo_dias' e 'faixa_prazo' nas vendas.
+
+    Retorna:
+        int: Quantidade de vendas atualizadas.
+    """
+    total = 0
+    for venda in vendas_collection.find({}, CAMPOS_VENDA):
+        campos = campos_prazo_venda(venda)
+        if all(campo in venda and venda[campo] == valor for campo, valor in campos.items()):
+            continue
+        vendas_collection.update_one({'_id': venda['_id']}, {'$set': campos})
+        total += 1
+    return total
+
+
+if __name__ == '__main__':
+    total = preencher_campos_prazo()
+    print(f"Campos de prazo preenchidos em {total} vendas")
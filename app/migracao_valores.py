@@ -0,0 +1,49 @@
+"""
+Migração dos campos monetários das vendas para número.
+Vendas antigas guardam 'valor_real', 'valor_tabela', 'valor_parcelas', 'valor_entrada' e
+'valor_venda_avista' ora como número, ora como texto ("1.234,56", "1500.50"), o que obriga os
+gráficos a converter texto em número a cada consulta. Esta migração regrava esses campos como
+float com 2 casas (mesma conversão da gravação: app/utils.py: normalizar_valores_monetarios),
+permitindo que as agregações somem 'valor_real' direto com $sum.
+
+Float (e não Decimal128 ou centavos) porque é o tipo que o restante do sistema já usa nas
+somas (soma_vendas, vendas_diarias) e nos formulários.
+
+Pode ser executada de novo a qualquer momento: só grava as vendas que ainda têm texto.
+Textos que não são número são mantidos e contados em 'nao_convertidos' para revisão manual.
+
+Uso pela linha de comando:
+    python -m app.migracao_valores
+"""
+
+from app.models import vendas_collection
+from app.utils import CAMPOS_MONETARIOS, normalizar_valores_monetarios
+
+
+def migrar_valores_monetarios():
+    """
+    Converte para número os campos monetários em texto das vendas.
+
+    Retorna:
+        dict: {'atualizadas': vendas regravadas, 'nao_convertidos': campos com texto inválido}
+    """
+    # Só as vendas com algum campo monetário em texto
+    filtro = {'$or': [{campo: {'$type': 'string'}} for campo in CAMPOS_MONETARIOS]}
+    projecao = {campo: 1 for campo in CAMPOS_MONETARIOS}
+
+    atualizadas = 0
+    nao_convertidos = 0
+    for venda in vendas_collection.find(filtro, projecao):
+        valores = normalizar_valores_monetarios(venda)
+        alterados = {campo: valor for campo, valor in valores.items() if valor != venda[campo]}
+        nao_convertidos += sum(1 for valor in valores.values() if isinstance(valor, str))
+        if alterados:
+            vendas_collection.update_one({'_id': venda['_id']}, {'$set': alterados})
+            atualizadas += 1
+    return {'atualizadas': atualizadas, 'nao_convertidos': nao_convertidos}
+
+
+if __name__ == '__main__':
+    resultado = migrar_valores_monetarios()
+    print(f"Valores convertidos em {resultado['atualizadas']} vendas "
+          f"({resultado['nao_convertidos']} campos com texto inválido mantidos)")
@@ -4,10 +4,17 @@ Gerencia conexão MongoDB, hash de senhas e collections do sistema.
 """
 
 import os                  # Módulo padrão para manipulação de variáveis de ambiente e arquivos
+import copy                # Cópias dos dados do catálogo de produtos
 from dotenv import load_dotenv  # Carrega variáveis do arquivo .env, mantendo credenciais fora do código
-from pymongo import MongoClient # Cliente para conectar e interagir com o MongoDB
 import bcrypt             # Biblioteca para hash e verificação segura de senhas
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId  # Data de criação dos logs (o campo 'data' é texto livre)
+from pymongo import ReturnDocument
+from pymongo.results import UpdateResult, DeleteResult
+from app.utils import campos_busca_venda  # Campos normalizados para a busca de vendas
+from app.utils import converter_valor_monetario, normalizar_valores_monetarios  # Valores monetários numéricos
+from app.utils import campos_prazo_venda  # Prestação inicial como data e faixa de prazo
+from app.configuracoes import obter_configuracoes, invalidar_configuracoes  # Configurações tipadas em cache
 
 # Carrega as variáveis de ambiente definidas no arquivo .env
 load_dotenv()
@@ -15,23 +22,134 @@ load_dotenv()
 # Recupera a URI de conexão do MongoDB a partir das variáveis de ambiente
 MONGO_URI = os.getenv("MONGO_URI")
 
-# Cria o cliente MongoDB usando a URI configurada
-client = MongoClient(MONGO_URI)
+# Nome do banco de dados principal do sistema
+NOME_BANCO = 'sistemaVendas'
 
-# Seleciona o banco de dados principal do sistema
-db = client['sistemaVendas']
+# Cliente MongoDB do processo (um por processo, recriado após fork): app/conexao_mongo.py
+from app.conexao_mongo import obter_cliente
+
+
+class ColecaoMongo:
+    """
+    Coleção do banco principal resolvida só no primeiro uso (find, insert_one etc.),
+    para que importar os módulos não crie o cliente MongoDB.
+    """
+
+    def __init__(self, nome):
+        self.nome_colecao = nome
+        self._cliente = None
+        self._colecao = None
+
+    def _alvo(self):
+        cliente = obter_cliente()
+        # Recria a coleção se o cliente do processo mudou (iniciar_mongo chamado de novo)
+        if self._cliente is not cliente:
+            self._colecao = cliente[NOME_BANCO][self.nome_colecao]
+            self._cliente = cliente
+        return self._colecao
+
+    def __getattr__(self, atributo):
+        return getattr(self._alvo(), atributo)
+
+    def __getitem__(self, nome):
+        return self._alvo()[nome]
+
+    def __repr__(self):
+        return f"ColecaoMongo({self.nome_colecao!r})"
+
+
+class ColecaoVendas(ColecaoMongo):
+    """
+    Coleção de vendas: update_one e delete_one passam por atualizar_venda e excluir_venda,
+    que mantêm o que é calculado a partir das vendas. Assim as rotas que gravam direto em
+    vendas_collection (ex: salvar a edição da venda, aprovação de status) também o mantêm.
+    As demais opções do pymongo (upsert, array_filters, session, hint...) são repassadas.
+    """
+
+    def update_one(self, filtro, atualizacao, **opcoes):
+        return atualizar_venda(filtro, atualizacao, **opcoes)
+
+    def delete_one(self, filtro, **opcoes):
+        return excluir_venda(filtro, **opcoes)
+
+
+class ColecaoComCache(ColecaoMongo):
+    """
+    Coleção cujo conteúdo fica em cache nos processos (configurações, catálogo de produtos):
+    toda escrita feita por ela chama `invalidar(colecao)` em seguida, inclusive nas rotas que
+    gravam direto na coleção (ex: /api/configs/geral, /api/produto_update).
+    """
+
+    METODOS_ESCRITA = frozenset({
+        'insert_one', 'insert_many', 'update_one', 'update_many', 'replace_one', 'delete_one',
+        'delete_many', 'find_one_and_update', 'find_one_and_replace', 'find_one_and_delete', 'bulk_write'
+    })
+
+    def __init__(self, nome, invalidar):
+        super().__init__(nome)
+        self._invalidar = invalidar
+
+    def __getattr__(self, atributo):
+        valor = super().__getattr__(atributo)
+        if atributo not in self.METODOS_ESCRITA:
+            return valor
+
+        def escrever(*args, **kwargs):
+            resultado = valor(*args, **kwargs)
+            self._invalidar(self)
+            return resultado
+        return escrever
+
+
+class BancoMongo:
+    """
+    Banco principal resolvido só no primeiro uso; db['nome'] devolve uma ColecaoMongo.
+    """
+
+    def __getattr__(self, atributo):
+        return getattr(obter_cliente()[NOME_BANCO], atributo)
+
+    def __getitem__(self, nome):
+        return ColecaoMongo(nome)
+
+    def __repr__(self):
+        return f"BancoMongo({NOME_BANCO!r})"
+
+
+# Banco de dados principal do sistema
+db = BancoMongo()
 
 # Coleção de usuários do sistema
 usuarios_collection = db['usuarios']
 
 # Coleção de vendas realizadas (nova coleção dedicada para vendas)
-vendas_collection = db['vendas']
+vendas_collection = ColecaoVendas('vendas')
+
+def _invalidar_catalogo(colecao):
+    """
+    Invalida o catálogo de produtos em memória após uma escrita em produtos.
+    """
+    # Importado aqui: app.catalogo_produtos importa este módulo
+    from app.catalogo_produtos import invalidar_catalogo_produtos
+    invalidar_catalogo_produtos()
 
-# Coleção de produtos cadastrados
-produtos_collection = db['produtos']
 
-# Coleção para configurações do sistema (metas, limites, SMTP, etc)
-configs_collection = db['configs']
+# Coleção de produtos cadastrados; cada escrita (cadastro, /api/produto_update, exclusão) invalida o catálogo
+produtos_collection = ColecaoComCache('produtos', _invalidar_catalogo)
+
+def _invalidar_configs(colecao):
+    """
+    Invalida as configurações em cache e os gráficos (metas, limites e meta da empresa
+    entram neles) após uma escrita em configs.
+    """
+    invalidar_configuracoes(colecao)
+    # Importado aqui: app.cache_graficos importa este módulo
+    from app.cache_graficos import invalidar_cache_graficos
+    invalidar_cache_graficos(configuracoes=True)
+
+
+# Coleção para configurações do sistema (metas, limites, SMTP, etc); cada escrita invalida as configurações e os gráficos em cache
+configs_collection = ColecaoComCache('configs', _invalidar_configs)
 
 # Coleção de logs de modificações e auditoria (nova coleção)
 logs_collection = db['logs']
@@ -39,6 +157,21 @@ logs_collection = db['logs']
 # Coleção de notificações para o sistema (nova coleção)
 notificacoes_collection = db['notificacoes']
 
+# Coleção de contadores sequenciais (ex: numeração das vendas por mês)
+contadores_collection = db['contadores']
+
+# Fila de e-mails a enviar em segundo plano (outbox)
+email_fila_collection = db['email_fila']
+
+# Totais diários de vendas por (dia, vendedor, status), mantidos a cada gravação de venda
+vendas_diarias_collection = db['vendas_diarias']
+
+# Pedidos de relatórios em PDF gerados em segundo plano
+relatorios_pdf_collection = db['relatorios_pdf']
+
+# Próxima execução e lease de cada tarefa periódica (app/agendador.py)
+agendamentos_collection = db['agendamentos']
+
 
 def criar_usuario(
     nome_completo,
@@ -153,7 +286,7 @@ def nova_venda(
         valor_tabela (float): Valor de tabela do produto.
         condicoes (str): Condições de pagamento.
         valor_parcelas (str): Valor das parcelas.
-        data_prestacao_inicial (str/data): Data da prestação inicial.
+        data_prestacao_inicial (str/data): Data da prestação inicial ('YYYY-MM-DD'; gravada como data).
         tipo_envio_boleto (str): Tipo de envio do boleto.
         tipo_remessa (str): Tipo de remessa.
         email (str): Endereço de e-mail do cliente.
@@ -232,8 +365,194 @@ def nova_venda(
         "percentual_desconto_live": percentual_desconto_live,  # NOVO
         "quantidade_acessos": quantidade_acessos          # NOVO
     }
-    # Insere a venda no banco de dados e retorna o resultado
-    return vendas_collection.insert_one(venda)
+    # Valores sempre gravados como número (o formulário envia textos como "1.234,56")
+    venda.update(normalizar_valores_monetarios(venda))
+    # Prestação inicial como data + prazo em dias e faixa (usados nos gráficos de prazo)
+    venda.update(campos_prazo_venda(venda))
+    # Campos normalizados da busca (CNPJ/CPF só com dígitos, nomes sem acento) para a busca por prefixo
+    venda.update(campos_busca_venda(venda))
+
+    # Insere a venda no banco de dados e atualiza os totais diários (vendas_diarias)
+    resultado = vendas_collection.insert_one(venda)
+    atualizar_vendas_diarias(venda)
+    return resultado
+
+def valor_numerico(valor):
+    """
+    Converte valor_real para float (ver app/utils.py: converter_valor_monetario);
+    valores inválidos ou vazios contam como 0.
+    """
+    valor = converter_valor_monetario(valor)
+    return 0.0 if valor is None else valor
+
+def contribuicao_venda(venda):
+    """
+    Calcula a chave e os totais com que uma venda contribui para a coleção 'vendas_diarias'.
+
+    Parâmetros:
+        venda (dict): Documento da venda (precisa de data_criacao, vendedor e status).
+
+    Retorna:
+        tuple | None: (chave, totais) ou None se a venda não tiver data/vendedor.
+            chave: {'dia', 'vendedor', 'status'}
+            totais: {'quantidade', 'valor_real', 'novas', 'atualizacoes', 'verdes', 'vermelhos'}
+    """
+    data = venda.get('data_criacao')
+    if isinstance(data, str):
+        try:
+            data = datetime.fromisoformat(data)
+        except ValueError:
+            return None
+    if not isinstance(data, datetime) or not venda.get('vendedor'):
+        return None
+
+    produto = (venda.get('produto') or '').strip().lower()
+    atualizacao = produto in ('atualização', 'atualizacao')
+    tipo_cliente = (venda.get('tipo_cliente') or '').strip().capitalize()
+    chave = {
+        'dia': datetime(data.year, data.month, data.day),
+        'vendedor': venda.get('vendedor'),
+        'status': venda.get('status')
+    }
+    totais = {
+        'quantidade': 1,
+        'valor_real': valor_numerico(venda.get('valor_real')),
+        'novas': 0 if atualizacao else 1,
+        'atualizacoes': 1 if atualizacao else 0,
+        'verdes': 1 if tipo_cliente == 'Verde' else 0,
+        'vermelhos': 1 if tipo_cliente == 'Vermelho' else 0
+    }
+    return chave, totais
+
+def atualizar_vendas_diarias(venda, sinal=1):
+    """
+    Soma (sinal=1) ou subtrai (sinal=-1) a contribuição de uma venda em 'vendas_diarias'.
+
+    Parâmetros:
+        venda (dict): Documento da venda.
+        sinal (int): 1 para venda nova, -1 para remover a versão antiga de uma venda editada.
+    """
+    contribuicao = contribuicao_venda(venda)
+    if contribuicao is None:
+        return
+    chave, totais = contribuicao
+    vendas_diarias_collection.update_one(
+        chave,
+        {'$inc': {campo: valor * sinal for campo, valor in totais.items()}},
+        upsert=True
+    )
+
+def atualizar_vendas_diarias_edicao(venda_antes, venda_depois):
+    """
+    Ajusta 'vendas_diarias' após a edição de uma venda (status, valor, vendedor, produto etc.).
+    Chamada por atualizar_venda com o documento antes e depois do update.
+
+    Parâmetros:
+        venda_antes (dict): Venda como estava no banco antes da edição.
+        venda_depois (dict): Venda com as alterações aplicadas.
+    """
+    if contribuicao_venda(venda_antes) == contribuicao_venda(venda_depois):
+        return
+    atualizar_vendas_diarias(venda_antes, sinal=-1)
+    atualizar_vendas_diarias(venda_depois, sinal=1)
+
+def _aplicar_set(documento, campos):
+    """
+    Cópia do documento com os campos de um $set aplicados (campos com '.' entram em subdocumentos).
+    """
+    documento = copy.deepcopy(documento)
+    for campo, valor in campos.items():
+        alvo = documento
+        *caminho, ultimo = campo.split('.')
+        for parte in caminho:
+            alvo = alvo.setdefault(parte, {})
+        alvo[ultimo] = valor
+    return documento
+
+def invalidar_graficos_venda(*vendas):
+    """
+    Invalida o cache dos gráficos dos meses das vendas informadas (data_criacao).
+    """
+    # Importado aqui: app.cache_graficos importa este módulo
+    from app.cache_graficos import invalidar_cache_graficos
+    meses = {}
+    for venda in vendas:
+        data = venda.get('data_criacao')
+        meses[f"{data:%Y%m}" if isinstance(data, datetime) else None] = data
+    for data in meses.values():
+        invalidar_cache_graficos(data)
+
+def atualizar_venda(filtro, atualizacao, **opcoes):
+    """
+    Atualiza uma venda (como update_one), ajusta 'vendas_diarias' e invalida o cache dos
+    gráficos dos meses da venda antes e depois da alteração (edição, mudança de status, troca de data).
+
+    Parâmetros:
+        filtro (dict): Filtro da venda (ex: {'numero_da_venda': ...}).
+        atualizacao (dict): Operadores de atualização (ex: {'$set': {...}}).
+        **opcoes: Opções de update_one (upsert, array_filters, session, hint, collation...),
+            repassadas a find_one_and_update. Com upsert=True a venda inserida conta como venda nova.
+
+    Retorno:
+        pymongo.results.UpdateResult: Mesmo resultado de update_one.
+    """
+    session = opcoes.get('session')
+    id_inserido = None
+    if opcoes.get('upsert') and isinstance(atualizacao, dict):
+        # _id conhecido de antemão para reler a venda caso o upsert a insira
+        na_insercao = atualizacao.get('$setOnInsert', {})
+        if '_id' in filtro and not isinstance(filtro['_id'], dict):
+            id_inserido = filtro['_id']
+        elif '_id' in na_insercao:
+            id_inserido = na_insercao['_id']
+        else:
+            id_inserido = ObjectId()
+            atualizacao = {**atualizacao, '$setOnInsert': {**na_insercao, '_id': id_inserido}}
+
+    # O documento anterior vem na mesma operação da escrita
+    venda_antes = vendas_collection.find_one_and_update(
+        filtro, atualizacao, return_document=ReturnDocument.BEFORE, **opcoes
+    )
+    if venda_antes is None:
+        venda = vendas_collection.find_one({'_id': id_inserido}, session=session) if id_inserido else None
+        if venda is None:
+            return UpdateResult({'n': 0, 'nModified': 0, 'ok': 1.0}, True)
+        atualizar_vendas_diarias(venda)
+        invalidar_graficos_venda(venda)
+        return UpdateResult({'n': 1, 'nModified': 0, 'upserted': venda['_id'], 'ok': 1.0}, True)
+
+    # Só com $set simples o documento novo é calculado aqui; com outros operadores,
+    # pipeline ou caminhos posicionais ('$', '$[]', array_filters) é relido
+    if (isinstance(atualizacao, dict) and set(atualizacao) - {'$setOnInsert'} == {'$set'}
+            and not any('$' in campo for campo in atualizacao['$set'])):
+        venda_depois = _aplicar_set(venda_antes, atualizacao['$set'])
+    else:
+        venda_depois = vendas_collection.find_one({'_id': venda_antes['_id']}, session=session) or venda_antes
+
+    alterada = venda_depois != venda_antes
+    if alterada:
+        atualizar_vendas_diarias_edicao(venda_antes, venda_depois)
+        invalidar_graficos_venda(venda_antes, venda_depois)
+    return UpdateResult({'n': 1, 'nModified': int(alterada), 'ok': 1.0}, True)
+
+def excluir_venda(filtro, **opcoes):
+    """
+    Exclui uma venda (como delete_one), retira a contribuição dela de 'vendas_diarias' e
+    invalida o cache dos gráficos do mês dela.
+
+    Parâmetros:
+        filtro (dict): Filtro da venda.
+        **opcoes: Opções de delete_one (session, hint, collation...), repassadas a find_one_and_delete.
+
+    Retorno:
+        pymongo.results.DeleteResult: Mesmo resultado de delete_one.
+    """
+    venda = vendas_collection.find_one_and_delete(filtro, **opcoes)
+    if venda is None:
+        return DeleteResult({'n': 0, 'ok': 1.0}, True)
+    atualizar_vendas_diarias(venda, sinal=-1)
+    invalidar_graficos_venda(venda)
+    return DeleteResult({'n': 1, 'ok': 1.0}, True)
 
 def cadastrar_produto(codigo, nome, formas_pagamento):
     """
@@ -262,14 +581,17 @@ def listar_produtos():
     Retorno:
         list: Lista de dicionários contendo os dados dos produtos, sem o campo '_id'.
     """
-    # Busca todos os produtos e remove o campo '_id' de cada documento retornado
-    return list(produtos_collection.find({}, {"_id": 0}))
+    # Catálogo de produtos em memória (importado aqui: app.catalogo_produtos importa este módulo);
+    # a cópia protege o catálogo de alterações do chamador
+    from app.catalogo_produtos import obter_catalogo_produtos
+    return copy.deepcopy(obter_catalogo_produtos(produtos_collection).produtos)
 
 def consultar_config_geral():
     """
     Consulta as configurações gerais do sistema.
     """
-    return configs_collection.find_one({"tipo": "geral"}, {"_id": 0})
+    geral = obter_configuracoes(configs_collection).geral
+    return dict(geral.documento) if geral else None
 
 def salvar_limite_vendedor(vendedor_id, vendedor_nome, limite):
     """
@@ -303,7 +625,7 @@ def consultar_limites_vendedores():
         list: Uma lista de dicionários, cada um contendo informações de limite de um vendedor.
               O campo '_id' do MongoDB é omitido no retorno.
     """
-    return list(configs_collection.find({"tipo": "limite_vendedor"}, {"_id": 0}))
+    return [dict(d) for d in obter_configuracoes(configs_collection).documentos_limites]
 
 def salvar_meta_vendedor(vendedor_id, vendedor_nome, meta_dia_quantidade, meta_dia_valor, meta_semana):
     """
@@ -343,7 +665,7 @@ def consultar_metas_vendedores():
     Side Effects:
         Nenhum.
     """
-    return list(configs_collection.find({"tipo": "meta_vendedor"}, {"_id": 0}))
+    return [dict(d) for d in obter_configuracoes(configs_collection).documentos_metas]
 
 def inserir_log(data, hora, modificacao, usuario):
     """
@@ -369,6 +691,20 @@ def inserir_log(data, hora, modificacao, usuario):
     }
     return logs_collection.insert_one(log)
 
+def limpar_logs_antigos(dias):
+    """
+    Remove os logs gravados há mais de `dias` dias. Como o campo 'data' é texto livre,
+    a data de gravação vem do _id (ObjectId).
+
+    Parâmetros:
+        dias (int): Dias de retenção.
+
+    Retorna:
+        int: Quantidade de logs removidos.
+    """
+    limite = ObjectId.from_datetime(datetime.now(timezone.utc) - timedelta(days=dias))
+    return logs_collection.delete_many({"_id": {"$lt": limite}}).deleted_count
+
 def registrar_fim_expediente():
     """
     Atualiza (ou cria) um documento na coleção configs do tipo 'fim_expediente',
@@ -446,7 +782,7 @@ def criar_venda_dict(
     percentual_desconto_live=None,  # NOVO
     quantidade_acessos=None        # NOVO
 ):
-    return {
+    venda = {
         "usuario_id": usuario_id,
         "numero_da_venda": numero_da_venda,
         "nome": nome,
@@ -486,3 +822,7 @@ def criar_venda_dict(
         "percentual_desconto_live": percentual_desconto_live,  # NOVO
         "quantidade_acessos": quantidade_acessos          # NOVO
     }
+    # Valores monetários sempre como número; prestação inicial como data
+    venda.update(normalizar_valores_monetarios(venda))
+    venda.update(campos_prazo_venda(venda))
+    return venda
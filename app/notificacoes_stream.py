@@ -0,0 +1,212 @@
+"""
+Módulo de envio de notificações em tempo real (Server-Sent Events).
+Substitui a consulta a cada 1 segundo de /api/notificacoes: cada aba aberta mantém uma conexão
+em /api/notificacoes/stream e só recebe dados quando a lista de notificações não lidas do
+usuário muda.
+
+O aviso de nova notificação é feito em memória por registrar_notificacao (publicar_notificacao).
+Para cobrir notificações gravadas por outro processo/worker e notificações marcadas como lidas,
+cada conexão também confere o banco a cada INTERVALO_VERIFICACAO segundos.
+
+O acesso é verificado como nas demais rotas (acesso_liberado) ao abrir a conexão e a cada
+conferência: se a permissão do usuário for desligada, o fluxo é encerrado e a reconexão
+do navegador recebe 204.
+
+Cada conexão ocupa uma thread do servidor enquanto estiver aberta. O número de conexões por
+processo é limitado (STREAM_CONEXOES, reservar_conexao); acima do limite a rota responde 204 e
+a página passa a consultar /api/notificacoes a cada 30 s, sem tomar as threads das demais rotas.
+"""
+
+import json
+import threading
+import time
+
+from pymongo import DESCENDING
+
+from app.models import notificacoes_collection
+
+# Segundos entre conferências no banco enquanto nenhuma notificação é publicada neste processo
+INTERVALO_VERIFICACAO = 15
+
+# Tempo máximo (s) de uma conexão; o navegador reconecta sozinho em seguida
+DURACAO_MAXIMA_CONEXAO = 300
+
+# Intervalo (ms) que o navegador espera antes de reconectar
+RETRY_NAVEGADOR_MS = 5000
+
+# Quantidade de notificações consideradas (mesmo limite de /api/notificacoes)
+LIMITE_NOTIFICACOES = 20
+
+# Versão das notificações deste processo: muda a cada publicar_notificacao()
+_condicao = threading.Condition()
+_versao = 0
+
+# Conexões abertas neste processo (reservar_conexao / liberar_conexao)
+_trava_conexoes = threading.Lock()
+_conexoes_abertas = 0
+
+
+def reservar_conexao(limite):
+    """
+    Reserva uma vaga para uma nova conexão do fluxo neste processo.
+
+    Parâmetros:
+        limite (int): Máximo de conexões abertas ao mesmo tempo (0 = sem limite).
+
+    Retorna:
+        bool: True se a vaga foi reservada (liberar com liberar_conexao), False se está cheio.
+    """
+    global _conexoes_abertas
+    with _trava_conexoes:
+        if limite and _conexoes_abertas >= limite:
+            return False
+        _conexoes_abertas += 1
+        return True
+
+
+def liberar_conexao():
+    """
+    Libera a vaga de uma conexão encerrada.
+    """
+    global _conexoes_abertas
+    with _trava_conexoes:
+        _conexoes_abertas = max(_conexoes_abertas - 1, 0)
+
+
+def conexoes_abertas():
+    """
+    Retorna quantas conexões do fluxo estão abertas neste processo.
+    """
+    with _trava_conexoes:
+        return _conexoes_abertas
+
+
+def publicar_notificacao():
+    """
+    Avisa as conexões abertas neste processo que há uma nova notificação.
+    """
+    global _versao
+    with _condicao:
+        _versao += 1
+        _condicao.notify_all()
+
+
+def versao_atual():
+    """
+    Retorna a versão atual das notificações deste processo.
+    """
+    with _condicao:
+        return _versao
+
+
+def aguardar_notificacao(versao, timeout):
+    """
+    Bloqueia até uma nova notificação ser publicada ou o tempo acabar.
+
+    Parâmetros:
+        versao (int): Última versão conhecida pela conexão.
+        timeout (float): Tempo máximo de espera em segundos.
+
+    Retorna:
+        int: Versão atual (igual a `versao` se o tempo acabou sem novidades).
+    """
+    with _condicao:
+        _condicao.wait_for(lambda: _versao != versao, timeout=timeout)
+        return _versao
+
+
+def filtro_notificacoes(usuario):
+    """
+    Monta o filtro das notificações visíveis para o usuário (admin vê todas).
+
+    Parâmetros:
+        usuario (dict): Usuário da sessão (com 'username' e 'tipo').
+
+    Retorna:
+        dict: Filtro para notificacoes_collection.
+    """
+    if usuario.get('tipo') == 'admin':
+        return {}
+    return {'envolvidos': usuario.get('username')}
+
+
+def listar_notificacoes_nao_lidas(usuario):
+    """
+    Lista as notificações ainda não lidas pelo usuário, no mesmo formato de /api/notificacoes.
+
+    Parâmetros:
+        usuario (dict): Usuário da sessão.
+
+    Retorna:
+        list: Notificações com '_id' em texto e 'data_hora' formatada (dd/mm/aaaa hh:mm).
+    """
+    username = usuario.get('username')
+    notificacoes = list(
+        notificacoes_collection.find(filtro_notificacoes(usuario))
+        .sort('data_hora', DESCENDING)
+        .limit(LIMITE_NOTIFICACOES)
+    )
+    # Remove as que o usuário já leu
+    notificacoes = [n for n in notificacoes if username not in n.get('lida_por', [])]
+    for n in notificacoes:
+        n['_id'] = str(n['_id'])
+        n['data_hora'] = n['data_hora'].strftime('%d/%m/%Y %H:%M')
+    return notificacoes
+
+
+def acesso_liberado(usuario):
+    """
+    Verificação de acesso do fluxo, igual à das rotas: confere a permissão de acesso do usuário
+    (o desligamento por horário é feito pelo agendador, tarefa 'desligar_acessos').
+
+    Parâmetros:
+        usuario (dict): Usuário da sessão.
+
+    Retorna:
+        bool: True se o usuário ainda tem acesso.
+    """
+    # Importado aqui: app.services importa este módulo (publicar_notificacao)
+    from app.services import verificar_permissao_acesso
+    return verificar_permissao_acesso(username=usuario.get('username'))
+
+
+def formatar_evento(dados):
+    """
+    Formata um evento SSE com os dados em JSON.
+    """
+    return f"data: {json.dumps(dados, default=str)}\n\n"
+
+
+def gerar_eventos(usuario, intervalo=INTERVALO_VERIFICACAO, duracao_maxima=DURACAO_MAXIMA_CONEXAO):
+    """
+    Gera o fluxo SSE de um usuário: envia a lista de notificações não lidas ao conectar
+    e depois somente quando ela muda. Nos intervalos sem mudança envia um comentário
+    (keep-alive) para manter a conexão aberta em proxies. Encerra se o acesso do usuário
+    for desligado (acesso_liberado, conferido a cada intervalo).
+
+    Parâmetros:
+        usuario (dict): Usuário da sessão.
+        intervalo (float): Segundos entre conferências no banco.
+        duracao_maxima (float): Tempo máximo da conexão em segundos.
+
+    Retorna:
+        generator: Strings no formato text/event-stream.
+    """
+    yield f"retry: {RETRY_NAVEGADOR_MS}\n\n"
+    versao = versao_atual()
+    notificacoes = listar_notificacoes_nao_lidas(usuario)
+    assinatura = [n['_id'] for n in notificacoes]
+    yield formatar_evento(notificacoes)
+
+    fim = time.monotonic() + duracao_maxima
+    while time.monotonic() < fim:
+        versao = aguardar_notificacao(versao, timeout=min(intervalo, max(fim - time.monotonic(), 0)))
+        if not acesso_liberado(usuario):
+            return
+        notificacoes = listar_notificacoes_nao_lidas(usuario)
+        nova_assinatura = [n['_id'] for n in notificacoes]
+        if nova_assinatura != assinatura:
+            assinatura = nova_assinatura
+            yield formatar_evento(notificacoes)
+        else:
+            yield ": keep-alive\n\n"
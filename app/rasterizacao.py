@@ -0,0 +1,100 @@
+"""
+Módulo de rasterização dos gráficos do PDF (app/services.py: gerar_pdf_graficos).
+Cada gráfico é convertido em PNG pelo kaleido, o que é lento e usa um único núcleo por
+figura; aqui as conversões são distribuídas em um pool de processos limitado, reaproveitado
+entre relatórios (cada processo mantém o seu kaleido já iniciado).
+
+As figuras são montadas no processo da requisição (precisam da sessão e do snapshot mensal)
+e enviadas aos processos em JSON; cada processo grava o PNG no caminho informado.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+# Dimensões das imagens geradas para o PDF (mesmas usadas desde a primeira versão do relatório)
+LARGURA_PNG = 1600
+ALTURA_PNG = 800
+ESCALA_PNG = 4
+
+_pool = None
+_processos_pool = 0
+_trava = threading.Lock()
+
+
+def processos_padrao():
+    """
+    Quantidade padrão de processos de rasterização: até 4, limitado aos núcleos da máquina.
+    """
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def rasterizar_figura(figura_json, caminho, largura=LARGURA_PNG, altura=ALTURA_PNG, escala=ESCALA_PNG):
+    """
+    Converte uma figura Plotly (em JSON) em PNG. Executada dentro dos processos do pool.
+
+    Retorna:
+        float: Tempo gasto na conversão (segundos).
+    """
+    import plotly.io as pio
+
+    inicio = time.perf_counter()
+    pio.write_image(pio.from_json(figura_json), caminho, format='png', width=largura, height=altura, scale=escala)
+    return time.perf_counter() - inicio
+
+
+def obter_pool(processos):
+    """
+    Retorna o pool de processos compartilhado, recriando-o se a quantidade mudou.
+    Usa 'spawn' para não copiar threads e conexões do MongoDB do processo do Flask.
+    """
+    global _pool, _processos_pool
+    with _trava:
+        if _pool is None or _processos_pool != processos:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=processos, mp_context=get_context('spawn'))
+            _processos_pool = processos
+        return _pool
+
+
+def descartar_pool():
+    """
+    Encerra o pool compartilhado (ex: após um processo do pool morrer).
+    """
+    global _pool, _processos_pool
+    with _trava:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
+        _processos_pool = 0
+
+
+def rasterizar_figuras(figuras, processos):
+    """
+    Gera os PNGs de várias figuras em paralelo, cada uma no seu caminho.
+
+    Parâmetros:
+        figuras (list): Lista de (caminho, figura Plotly).
+        processos (int): Quantidade máxima de processos simultâneos.
+
+    Retorna:
+        dict: {'parede': tempo total, 'soma': soma dos tempos de cada figura,
+               'processos': processos usados} (soma / parede = ganho do paralelismo).
+    """
+    inicio = time.perf_counter()
+    processos = max(1, min(processos, len(figuras)))
+    tarefas = [(caminho, figura.to_json()) for caminho, figura in figuras]
+    try:
+        pool = obter_pool(processos)
+        futuros = [pool.submit(rasterizar_figura, figura_json, caminho) for caminho, figura_json in tarefas]
+        tempos = [futuro.result() for futuro in futuros]
+    except BrokenProcessPool:
+        # Um processo do pool morreu: descarta o pool e converte aqui mesmo
+        descartar_pool()
+        tempos = [rasterizar_figura(figura_json, caminho) for caminho, figura_json in tarefas]
+        processos = 1
+    return {'parede': time.perf_counter() - inicio, 'soma': sum(tempos), 'processos': processos}
@@ -0,0 +1,1458 @@
+"""
+Módulo do registro de gráficos compartilhado entre o dashboard (app/graficos.py) e o PDF
+(app/download.py).
+
+Cada gráfico registrado é dividido em duas partes:
+    dados   -> consulta o MongoDB (via snapshot mensal) e devolve um dict simples (listas,
+               números e textos), igual para o dashboard e para o PDF;
+    figura  -> monta a go.Figure a partir desses dados, no estilo pedido ('tela' ou 'pdf').
+
+A figura pronta é convertida por renderizar_grafico em HTML, JSON (Plotly.react) ou PNG.
+Os dados calculados ficam no cache versionado dos gráficos (app/cache_graficos.py): o PDF
+de um mês reaproveita os dados que o dashboard já calculou, e vice-versa, sem refazer as
+agregações, mudando apenas o layout da figura.
+"""
+
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+# Objetos de gráfico, Plotly Express (mapa) e conversão de figuras (HTML/JSON/PNG), carregados
+# só no primeiro gráfico gerado (app/carga_tardia.py)
+from app.carga_tardia import importar_tardio
+
+plotly = importar_tardio('plotly')
+go = importar_tardio('plotly.graph_objs')
+pio = importar_tardio('plotly.io')
+px = importar_tardio('plotly.express')
+
+# Pandas para o DataFrame do mapa
+pd = importar_tardio('pandas')
+
+# Monta a URL do plotly.js local dentro de uma requisição
+from flask import has_request_context, url_for
+
+# SON para ordenar os campos do $sort das agregações
+from bson.son import SON
+
+from app.configuracoes import obter_configuracoes
+from app.utils import soma_vendas, NOMES_FAIXAS_PRAZO
+from app.geojson_brasil import carregar_geojson_brasil, url_geojson_brasil
+from app.snapshot import obter_snapshot_mensal, resumir_vendas_por_vendedor, STATUS_FATURADOS
+from app.cache_graficos import cache_grafico
+from app.rasterizacao import LARGURA_PNG, ALTURA_PNG, ESCALA_PNG
+
+# orjson (opcional) serializa as figuras bem mais rápido que o json padrão
+try:
+    import orjson  # noqa: F401
+    MOTOR_JSON = 'orjson'
+except ImportError:
+    MOTOR_JSON = 'json'
+
+# Opções do Plotly no navegador (as mesmas no HTML e no modo figura)
+CONFIG_PLOTLY = {"responsive": True}
+
+# Siglas dos estados do Brasil (mapa de vendas por estado)
+ESTADOS_BRASIL = {
+    'AC': 'Acre', 'AL': 'Alagoas', 'AP': 'Amapá', 'AM': 'Amazonas', 'BA': 'Bahia', 'CE': 'Ceará',
+    'DF': 'Distrito Federal', 'ES': 'Espírito Santo', 'GO': 'Goiás', 'MA': 'Maranhão', 'MT': 'Mato Grosso',
+    'MS': 'Mato Grosso do Sul', 'MG': 'Minas Gerais', 'PA': 'Pará', 'PB': 'Paraíba', 'PR': 'Paraná',
+    'PE': 'Pernambuco', 'PI': 'Piauí', 'RJ': 'Rio de Janeiro', 'RN': 'Rio Grande do Norte',
+    'RS': 'Rio Grande do Sul', 'RO': 'Rondônia', 'RR': 'Roraima', 'SC': 'Santa Catarina',
+    'SP': 'São Paulo', 'SE': 'Sergipe', 'TO': 'Tocantins'
+}
+
+
+def caminho_plotly_js():
+    """
+    Caminho do plotly.js minificado que acompanha o pacote plotly instalado.
+    """
+    return os.path.join(os.path.dirname(plotly.__file__), 'package_data', 'plotly.min.js')
+
+
+def url_plotly_js():
+    """
+    URL do plotly.js servido pela própria aplicação (app/routes/apiGraficoFigura.py).
+    A URL leva a versão do Plotly, então o navegador guarda o arquivo em cache até a próxima
+    atualização do pacote. Fora de uma requisição (scripts, testes) usa o CDN.
+    """
+    if has_request_context():
+        return url_for('api_grafico_figura.plotly_js', versao=plotly.__version__)
+    return 'cdn'
+
+
+def figura_json(fig):
+    """
+    Serializa a figura em JSON compacto ({'data': [...], 'layout': {...}}) para o navegador
+    desenhar com Plotly.react, sem o HTML e os <script> do pio.to_html.
+    """
+    return pio.to_json(fig, validate=False, pretty=False, engine=MOTOR_JSON)
+
+
+def renderizar_grafico(fig, formato='html', include_plotlyjs=False):
+    """
+    Converte a figura no formato pedido pela rota.
+
+    Parâmetros:
+        fig (go.Figure): Figura pronta.
+        formato (str): 'html' (trecho HTML do pio.to_html), 'figura' (JSON da figura) ou
+            'png' (imagem no tamanho usado no PDF, via kaleido).
+        include_plotlyjs (bool | str): Para o HTML; 'cdn' passa a apontar para o plotly.js local.
+
+    Retorna:
+        str | bytes: HTML ou JSON da figura; bytes do PNG.
+    """
+    if formato == 'figura':
+        return figura_json(fig)
+    if formato == 'png':
+        return pio.to_image(fig, format='png', width=LARGURA_PNG, height=ALTURA_PNG, scale=ESCALA_PNG)
+    if include_plotlyjs == 'cdn':
+        include_plotlyjs = url_plotly_js()
+    return pio.to_html(fig, full_html=False, include_plotlyjs=include_plotlyjs, config=CONFIG_PLOTLY)
+
+
+def layout_estilo(estilo, pdf=None, **tela):
+    """
+    Layout base da figura conforme o destino.
+
+    Parâmetros:
+        estilo (str): 'tela' (dashboard) ou 'pdf' (imagem larga, com fonte grande).
+        pdf (dict, opcional): Ajustes do gráfico no PDF (ex: height que cresce com os vendedores).
+        **tela: Ajustes do gráfico no dashboard (ex: height, margin); ignorados no PDF.
+
+    Retorna:
+        dict: Argumentos para fig.update_layout.
+    """
+    if estilo == 'pdf':
+        layout = dict(width=1600, height=600, font=dict(size=30), margin=dict(l=20, r=20, t=60, b=60))
+        layout.update(pdf or {})
+        return layout
+    layout = dict(height=400)
+    layout.update(tela)
+    return layout
+
+
+def formatar_reais(valor, prefixo="R$ "):
+    """
+    Formata um valor no padrão brasileiro (R$ 1.234,56), como nos textos das barras.
+    """
+    return f"{prefixo}{valor:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+class ColecoesGraficos:
+    """
+    Coleções do MongoDB usadas pelas funções de dados. Cada módulo (graficos/download)
+    passa as suas, para que os testes possam substituí-las no módulo chamador.
+    """
+
+    def __init__(self, usuarios, vendas, configs, produtos=None, vendas_diarias=None):
+        self.usuarios = usuarios
+        self.vendas = vendas
+        self.configs = configs
+        self.produtos = produtos
+        self.vendas_diarias = vendas_diarias
+
+
+class Grafico:
+    """
+    Gráfico registrado: função de dados + função de figura.
+
+    Atributos:
+        nome (str): Nome do gráfico (o mesmo das abas do dashboard).
+        dados (callable): dados(colecoes, ano, mes, apenas_ativos, data_escolhida) -> dict.
+        figura (callable): figura(dados, estilo) -> go.Figure.
+        include_plotlyjs (bool | str): Como o HTML do dashboard carrega o plotly.js.
+    """
+
+    def __init__(self, nome, dados, figura, include_plotlyjs=False):
+        self.nome = nome
+        self.dados = dados
+        self.figura = figura
+        self.include_plotlyjs = include_plotlyjs
+
+
+def _snapshot(colecoes, ano, mes):
+    """
+    Snapshot do mês (compartilhado na requisição) com as coleções informadas.
+    """
+    return obter_snapshot_mensal(ano, mes, colecoes.usuarios, colecoes.vendas)
+
+
+def _resumo(colecoes, ano, mes, apenas_ativos):
+    """
+    Resumo por vendedor das vendas faturadas do mês (dos ativos ou de todos os vendedores).
+    """
+    snapshot = _snapshot(colecoes, ano, mes)
+    return snapshot.resumo_ativos if apenas_ativos else snapshot.resumo_todos
+
+
+def _figura_vazia(titulo, eixo_x, estilo):
+    """
+    Figura sem dados: só o título e o aviso no eixo X.
+    """
+    fig = go.Figure()
+    fig.update_layout(title=titulo, xaxis_title=eixo_x, **layout_estilo(estilo))
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Saldo do banco por vendedor
+# ---------------------------------------------------------------------------
+
+def dados_banco_vendedores(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Saldo do banco de cada vendedor: limite atual + movimento das vendas faturadas do mês
+    (valor da venda - valor de tabela, descontando só os descontos não autorizados).
+
+    Retorna:
+        dict: {'sem_vendas': bool, 'saldos': [{'vendedor', 'saldo_atual', 'saldo_calculado', 'saldo_novo'}]}
+    """
+    resumo = _resumo(colecoes, ano, mes, apenas_ativos)
+    if not resumo:
+        return {'sem_vendas': True, 'saldos': []}
+
+    # Limites atuais do banco de cada vendedor (configurações em cache, já numéricas)
+    saldos_atuais = obter_configuracoes(colecoes.configs).limites
+
+    # Entram os vendedores com algum movimento no banco
+    saldos = []
+    for vendedor, dados in resumo.items():
+        if not dados['movimentos_banco']:
+            continue
+        saldo_atual = float(saldos_atuais.get(vendedor, 0))
+        saldos.append({
+            "vendedor": vendedor,
+            "saldo_atual": saldo_atual,
+            "saldo_calculado": dados['banco'],
+            "saldo_novo": saldo_atual + dados['banco']
+        })
+    return {'sem_vendas': False, 'saldos': saldos}
+
+
+def figura_banco_vendedores(dados, estilo='tela'):
+    """
+    Barras com o saldo novo de cada vendedor: verde (subiu), azul (caiu, mas positivo), vermelho (zerado/negativo).
+    """
+    if dados['sem_vendas']:
+        return _figura_vazia("Saldo do Banco por Vendedor", "Sem dados de vendas", estilo)
+
+    cores = []
+    textos = []
+    for d in dados['saldos']:
+        if d['saldo_novo'] < d['saldo_atual'] and d['saldo_novo'] > 0:
+            cores.append("blue")
+        elif d['saldo_novo'] > d['saldo_atual']:
+            cores.append("green")
+        elif d['saldo_novo'] <= 0:
+            cores.append("red")
+        textos.append(formatar_reais(d['saldo_novo'], "Saldo: R$ "))
+
+    fig = go.Figure(go.Bar(
+        x=[d['vendedor'] for d in dados['saldos']],
+        y=[d['saldo_novo'] for d in dados['saldos']],
+        marker_color=cores,
+        text=textos,
+        textposition="auto"
+    ))
+    fig.update_layout(
+        title="Saldo do Banco por Vendedor",
+        xaxis_title="Vendedor",
+        yaxis_title="Saldo Calculado",
+        showlegend=True,
+        **layout_estilo(estilo)
+    )
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Total vendido por vendedor (no mês e no dia)
+# ---------------------------------------------------------------------------
+
+def dados_vendas_vendedor(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Total vendido (R$) por vendedor nas vendas faturadas do mês.
+
+    Retorna:
+        dict: {'nomes': [...], 'totais': [...]}
+    """
+    resumo = _resumo(colecoes, ano, mes, apenas_ativos)
+    nomes = list(resumo.keys())
+    return {'nomes': nomes, 'totais': [resumo[vendedor]['total'] for vendedor in nomes]}
+
+
+def _barras_totais(dados, titulo, estilo):
+    """
+    Barras verdes com o total vendido por vendedor (gráficos do mês e do dia).
+    """
+    if not dados['nomes']:
+        return _figura_vazia(titulo, "Sem dados", estilo)
+
+    fig = go.Figure(go.Bar(
+        x=dados['nomes'],
+        y=dados['totais'],
+        marker_color='green',
+        text=[formatar_reais(valor) for valor in dados['totais']],
+        textposition='auto'
+    ))
+    fig.update_layout(
+        title=titulo,
+        xaxis_title="Vendedor",
+        yaxis_title="Total de Vendas (R$)",
+        yaxis_tickprefix="R$ ",
+        **layout_estilo(estilo, margin=dict(l=40, r=20, t=50, b=40))
+    )
+    return fig
+
+
+def figura_vendas_vendedor(dados, estilo='tela'):
+    """
+    Barras com o total vendido no mês por vendedor.
+    """
+    return _barras_totais(dados, "Total de Vendas por Vendedor", estilo)
+
+
+def dados_vendas_diarias(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Total vendido (R$) por vendedor ativo no dia escolhido ('YYYY-MM-DD'; padrão: hoje).
+    ano e mes não são usados: o mês é o do dia escolhido.
+
+    Retorna:
+        dict: {'dia': 'DD/MM/AAAA', 'nomes': [...], 'totais': [...]}
+    """
+    hoje = datetime.now()
+    dia_ref = datetime(hoje.year, hoje.month, hoje.day)
+    if data_escolhida:
+        try:
+            dia_ref = datetime.strptime(data_escolhida, "%Y-%m-%d")
+        except ValueError:
+            pass
+
+    # Vendedores ativos do mês do dia escolhido (snapshot do mês)
+    snapshot = _snapshot(colecoes, dia_ref.year, dia_ref.month)
+    filtro = {
+        'data_criacao': {'$gte': dia_ref, '$lt': dia_ref + timedelta(days=1)},
+        'status': {'$in': STATUS_FATURADOS}
+    }
+    if apenas_ativos:
+        filtro['vendedor'] = {'$in': snapshot.nomes_ativos}
+
+    # Totaliza no MongoDB as vendas do dia por vendedor
+    resumo = resumir_vendas_por_vendedor(colecoes.vendas, filtro)
+    nomes = list(resumo.keys())
+    return {
+        'dia': dia_ref.strftime('%d/%m/%Y'),
+        'nomes': nomes,
+        'totais': [resumo[vendedor]['total'] for vendedor in nomes]
+    }
+
+
+def figura_vendas_diarias(dados, estilo='tela'):
+    """
+    Barras com o total vendido no dia por vendedor.
+    """
+    return _barras_totais(dados, f"Total de Vendas por Vendedor ({dados['dia']})", estilo)
+
+
+# ---------------------------------------------------------------------------
+# Clientes verdes x vermelhos
+# ---------------------------------------------------------------------------
+
+def dados_verdes_vermelhos_geral(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Quantidade de vendas faturadas do mês para clientes 'Verde' e 'Vermelho'.
+
+    Retorna:
+        dict: {'sem_vendas': bool, 'verdes': int, 'vermelhos': int}
+    """
+    resumo = _resumo(colecoes, ano, mes, apenas_ativos)
+    return {
+        'sem_vendas': not resumo,
+        'verdes': sum(dados['verdes'] for dados in resumo.values()),
+        'vermelhos': sum(dados['vermelhos'] for dados in resumo.values())
+    }
+
+
+def figura_verdes_vermelhos_geral(dados, estilo='tela'):
+    """
+    Donut com a proporção de clientes verdes e vermelhos.
+    """
+    if dados['sem_vendas']:
+        return _figura_vazia("Meta Mensal", "Sem dados de vendas", estilo)
+    if dados['verdes'] == 0 and dados['vermelhos'] == 0:
+        return _figura_vazia("Distribuição de Clientes: Verde x Vermelho", "Sem dados", estilo)
+
+    fig = go.Figure(data=[go.Pie(
+        labels=['Verde', 'Vermelho'],
+        values=[dados['verdes'], dados['vermelhos']],
+        marker=dict(colors=['green', 'red']),
+        textinfo='label+percent+value',
+        hole=0.4
+    )])
+    fig.update_layout(title="Distribuição de Clientes: Verde x Vermelho", **layout_estilo(estilo))
+    return fig
+
+
+def dados_verdes_vermelhos_vendedor(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Vendas faturadas do mês para clientes 'Verde' e 'Vermelho', por vendedor
+    (só vendedores com nome e com alguma venda Verde/Vermelho).
+
+    Retorna:
+        dict: {'sem_vendas': bool, 'vendedores': [...], 'verdes': [...], 'vermelhos': [...]}
+    """
+    resumo = _resumo(colecoes, ano, mes, apenas_ativos)
+    contagem = {}
+    for vendedor, dados in resumo.items():
+        vendedor = (vendedor or '').strip()
+        if vendedor == "" or not (dados['verdes'] or dados['vermelhos']):
+            continue
+        contagem.setdefault(vendedor, {"Verde": 0, "Vermelho": 0})
+        contagem[vendedor]["Verde"] += dados['verdes']
+        contagem[vendedor]["Vermelho"] += dados['vermelhos']
+
+    vendedores = list(contagem.keys())
+    return {
+        'sem_vendas': not resumo,
+        'vendedores': vendedores,
+        'verdes': [contagem[v]["Verde"] for v in vendedores],
+        'vermelhos': [contagem[v]["Vermelho"] for v in vendedores]
+    }
+
+
+def figura_verdes_vermelhos_vendedor(dados, estilo='tela'):
+    """
+    Barras empilhadas com os clientes verdes e vermelhos de cada vendedor.
+    """
+    if dados['sem_vendas']:
+        return _figura_vazia("Meta Mensal", "Sem dados de vendas", estilo)
+    if not dados['vendedores']:
+        return _figura_vazia("Clientes Verdes x Vermelhos por Vendedor", "Sem dados", estilo)
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name='Verde',
+        x=dados['vendedores'],
+        y=dados['verdes'],
+        marker_color='green',
+        text=dados['verdes'],
+        textposition='auto'
+    ))
+    fig.add_trace(go.Bar(
+        name='Vermelho',
+        x=dados['vendedores'],
+        y=dados['vermelhos'],
+        marker_color='red',
+        text=dados['vermelhos'],
+        textposition='auto'
+    ))
+    fig.update_layout(
+        barmode='stack',
+        title="Clientes Verdes x Vermelhos por Vendedor",
+        xaxis_title="Vendedor",
+        yaxis_title="Quantidade de Vendas",
+        **layout_estilo(estilo)
+    )
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Vendas novas x atualizações
+# ---------------------------------------------------------------------------
+
+def dados_tipo_vendas_geral(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Quantidade de vendas novas e de atualizações (produto "Atualização", nas duas grafias)
+    entre as vendas faturadas do mês com produto informado.
+
+    Retorna:
+        dict: {'sem_vendas': bool, 'novas': int, 'atualizacoes': int}
+    """
+    resumo = _resumo(colecoes, ano, mes, apenas_ativos)
+    atualizacoes = sum(dados['atualizacoes'] for dados in resumo.values())
+    return {
+        'sem_vendas': not resumo,
+        'novas': sum(dados['com_produto'] for dados in resumo.values()) - atualizacoes,
+        'atualizacoes': atualizacoes
+    }
+
+
+def figura_tipo_vendas_geral(dados, estilo='tela'):
+    """
+    Pizza com a proporção entre vendas novas e atualizações.
+    """
+    if dados['sem_vendas']:
+        return _figura_vazia("Meta Mensal", "Sem dados de vendas", estilo)
+
+    fig = go.Figure(data=[go.Pie(
+        labels=["Vendas Novas", "Atualizações"],
+        values=[dados['novas'], dados['atualizacoes']],
+        marker=dict(colors=["#1f77b4", "#ff7f0e"]),
+        textinfo='label+percent',
+        hoverinfo='label+value'
+    )])
+    fig.update_layout(title="Distribuição de Vendas no Mês Atual", **layout_estilo(estilo))
+    return fig
+
+
+def dados_tipo_vendas_por_vendedor(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Vendas novas e atualizações por vendedor; vendas sem produto (ou com produto em branco) não entram.
+
+    Retorna:
+        dict: {'sem_vendas': bool, 'vendedores': [...], 'novas': [...], 'atualizacoes': [...]}
+    """
+    resumo = _resumo(colecoes, ano, mes, apenas_ativos)
+    vendedores, novas, atualizacoes = [], [], []
+    for vendedor, dados in resumo.items():
+        com_produto = dados['com_produto'] - dados['produto_vazio']
+        if not com_produto:
+            continue
+        vendedores.append(vendedor if vendedor is not None else 'Desconhecido')
+        novas.append(com_produto - dados['atualizacoes'])
+        atualizacoes.append(dados['atualizacoes'])
+    return {'sem_vendas': not resumo, 'vendedores': vendedores, 'novas': novas, 'atualizacoes': atualizacoes}
+
+
+def figura_tipo_vendas_por_vendedor(dados, estilo='tela'):
+    """
+    Barras empilhadas com as vendas novas e as atualizações de cada vendedor.
+    """
+    if dados['sem_vendas']:
+        return _figura_vazia("Meta Mensal", "Sem dados de vendas", estilo)
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=dados['vendedores'],
+        y=dados['novas'],
+        name='Vendas Novas',
+        marker_color='#1f77b4',
+        text=dados['novas']
+    ))
+    fig.add_trace(go.Bar(
+        x=dados['vendedores'],
+        y=dados['atualizacoes'],
+        name='Atualizações',
+        marker_color='#ff7f0e',
+        text=dados['atualizacoes']
+    ))
+    fig.update_layout(
+        barmode='stack',
+        title='Vendas por Tipo e Vendedor (Mês Atual)',
+        xaxis_title='Vendedor',
+        yaxis_title='Quantidade de Vendas',
+        **layout_estilo(estilo, height=450)
+    )
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Mapa de vendas por estado
+# ---------------------------------------------------------------------------
+
+def dados_mapa_vendas_por_estado(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Vendas faturadas do mês dos vendedores ativos por estado. Endereços sem uma UF válida
+    contam como vendas estrangeiras. O mapa considera sempre apenas os vendedores ativos.
+
+    Retorna:
+        dict: {'vendas_por_sigla': {sigla: int}, 'estrangeiras': int}
+    """
+    snapshot = _snapshot(colecoes, ano, mes)
+    contagem = defaultdict(int)
+    estrangeiras = 0
+    for estado, quantidade in snapshot.estados_ativos:
+        # Estado vem do dict do endereço ou do próprio texto do endereço (dados legados)
+        estado = estado.strip().upper() if isinstance(estado, str) else None
+        if estado in ESTADOS_BRASIL:
+            contagem[estado] += quantidade
+        else:
+            estrangeiras += quantidade
+    return {
+        'vendas_por_sigla': {sigla: contagem.get(sigla, 0) for sigla in sorted(ESTADOS_BRASIL)},
+        'estrangeiras': estrangeiras
+    }
+
+
+def figura_mapa_vendas_por_estado(dados, estilo='tela'):
+    """
+    Mapa coroplético dos estados. No dashboard a geometria vai por URL com cache longo
+    (app/geojson_brasil.py); no PDF (e fora de uma requisição) vai embutida na figura.
+    """
+    df = pd.DataFrame({
+        'sigla': list(dados['vendas_por_sigla'].keys()),
+        'vendas': list(dados['vendas_por_sigla'].values())
+    })
+    if estilo == 'tela' and has_request_context():
+        geojson = url_geojson_brasil()
+    else:
+        geojson = carregar_geojson_brasil()
+
+    fig = px.choropleth(
+        df,
+        geojson=geojson,
+        locations='sigla',
+        featureidkey='properties.sigla',
+        color='vendas',
+        color_continuous_scale='Blues',
+        range_color=(0, df['vendas'].max() if len(df) and df['vendas'].max() > 0 else 1),
+        scope="south america",
+        title="Vendas por Estado (Brasil)"
+    )
+    fig.update_geos(fitbounds="locations", visible=False)
+    fig.update_layout(**layout_estilo(estilo, height=520, margin=dict(l=30, r=30, t=70, b=30)))
+
+    # Anotação para vendas estrangeiras, se houver
+    if dados['estrangeiras'] > 0:
+        fig.add_annotation(
+            text=f"Vendas Estrangeiras: {dados['estrangeiras']}",
+            x=0.5,
+            y=1.08,
+            xref="paper",
+            yref="paper",
+            showarrow=False,
+            font=dict(size=16, color="crimson")
+        )
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Meta mensal da empresa
+# ---------------------------------------------------------------------------
+
+def dados_vendas_geral(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Total vendido no mês (vendas faturadas) e a meta mensal da empresa.
+
+    Retorna:
+        dict: {'sem_vendas': bool, 'total': float, 'meta': float}
+    """
+    snapshot = _snapshot(colecoes, ano, mes)
+    vendas = snapshot.vendas_ativos if apenas_ativos else snapshot.vendas_todos
+    if not vendas:
+        return {'sem_vendas': True, 'total': 0.0, 'meta': 0.0}
+
+    # Meta geral da empresa (configurações em cache)
+    config_geral = obter_configuracoes(colecoes.configs).geral
+    return {'sem_vendas': False, 'total': soma_vendas(vendas), 'meta': config_geral.meta_empresa or 0.0}
+
+
+def figura_vendas_geral(dados, estilo='tela'):
+    """
+    Barras horizontais com o total vendido e quanto falta para a meta da empresa.
+    """
+    if dados['sem_vendas']:
+        return _figura_vazia("Meta Mensal", "Sem dados de vendas", estilo)
+
+    faltando = max(0, dados['meta'] - dados['total'])
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name='Vendido',
+        x=[dados['total']],
+        y=['Vendido'],
+        orientation='h',
+        marker_color='green',
+        text=[formatar_reais(dados['total'])],
+    ))
+    fig.add_trace(go.Bar(
+        name='Faltando',
+        x=[faltando],
+        y=['Faltando'],
+        orientation='h',
+        marker_color='#c34323',
+        text=[formatar_reais(faltando)]
+    ))
+    fig.update_layout(
+        barmode='stack',
+        title=formatar_reais(dados['meta'], "Meta Mensal de "),
+        xaxis_title=formatar_reais(dados['total'], "R$"),
+        showlegend=True,
+        **layout_estilo(estilo)
+    )
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Vendas por status e vendedor
+# ---------------------------------------------------------------------------
+
+def dados_status_vendas(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Quantidade de vendas do mês (qualquer status) por vendedor e status.
+
+    Retorna:
+        dict: {'linhas': [{'vendedor', 'status', 'quantidade'}]}
+    """
+    snapshot = _snapshot(colecoes, ano, mes)
+    pipeline = [
+        {
+            "$addFields": {
+                "data": {"$toDate": "$data_criacao"}
+            }
+        },
+        {
+            "$match": {
+                "data": {"$gte": snapshot.primeiro_dia, "$lt": snapshot.proximo_mes},
+                "vendedor": {"$in": snapshot.nomes_ativos} if apenas_ativos else {"$ne": ""},
+                "status": {"$ne": ""}
+            }
+        },
+        {
+            "$project": {
+                "vendedor": {"$trim": {"input": {"$ifNull": ["$vendedor", ""]}}},
+                "status": {"$trim": {"input": {"$ifNull": ["$status", ""]}}}
+            }
+        },
+        {
+            "$group": {
+                "_id": {
+                    "vendedor": "$vendedor",
+                    "status": "$status"
+                },
+                "quantidade": {"$sum": 1}
+            }
+        },
+        {
+            "$sort": SON([("_id.vendedor", 1), ("_id.status", 1)])
+        }
+    ]
+    return {'linhas': [
+        {
+            "vendedor": r["_id"]["vendedor"].strip(),
+            "status": r["_id"]["status"].strip().capitalize(),
+            "quantidade": int(r["quantidade"])
+        }
+        for r in colecoes.vendas.aggregate(pipeline)
+    ]}
+
+
+def figura_status_vendas(dados, estilo='tela'):
+    """
+    Barras empilhadas com a quantidade de vendas de cada status por vendedor.
+    """
+    if not dados['linhas']:
+        return _figura_vazia("Vendas por Status e Vendedor", "Sem dados", estilo)
+
+    fig = px.bar(
+        pd.DataFrame(dados['linhas']),
+        x="vendedor",
+        y="quantidade",
+        color="status",
+        title="Vendas por Status e Vendedor",
+        labels={"quantidade": "Quantidade", "vendedor": "Vendedor"},
+        text="quantidade",
+        color_discrete_map={
+            "Aguardando": "#FFA500",
+            "Aprovada": "#28a745",
+            "Refazer": "#007bff",
+            "Cancelada": "#dc3545",
+            "Faturado": "#8E44AD"
+        }
+    )
+    fig.update_layout(barmode="stack", **layout_estilo(estilo))
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Metas dos vendedores (mensal, diária e semanal)
+# ---------------------------------------------------------------------------
+
+def dados_metas_vendedor(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Total vendido no mês e quanto falta para a meta mensal (meta_mes do usuário) de cada
+    vendedor (só os ativos ou todos); as vendas de quem não tem meta são ignoradas.
+
+    Retorna:
+        dict: {'vendedores': [...], 'vendidos': [...], 'faltando': [...]}
+    """
+    snapshot = _snapshot(colecoes, ano, mes)
+    vendas = snapshot.vendas_ativos if apenas_ativos else snapshot.vendas_todos
+
+    filtro = {'tipo': 'vendedor'}
+    if apenas_ativos:
+        filtro['status'] = {'$in': ['ativo', 'bloqueado']}
+    dict_metas = {
+        vendedor['nome_completo']: float(vendedor['meta_mes'])
+        for vendedor in colecoes.usuarios.find(filtro, {'_id': 0, 'meta_mes': 1, 'nome_completo': 1})
+    }
+
+    # Total vendido por vendedor com meta (vendas canceladas não contam)
+    totais = {}
+    for venda in vendas:
+        if venda.get('status', '').strip() == 'Cancelada':
+            continue
+        vendedor = venda.get('vendedor', '').strip()
+        if vendedor in dict_metas:
+            totais[vendedor] = totais.get(vendedor, 0) + float(str(venda.get('valor_real', '0')).replace(',', '.'))
+
+    vendedores = list(dict_metas)
+    vendidos = [totais.get(vendedor, 0) for vendedor in vendedores]
+    return {
+        'vendedores': vendedores,
+        'vendidos': vendidos,
+        'faltando': [max(0, dict_metas[vendedor] - vendido) for vendedor, vendido in zip(vendedores, vendidos)]
+    }
+
+
+def figura_metas_vendedor(dados, estilo='tela'):
+    """
+    Barras horizontais empilhadas com o vendido e o que falta para a meta de cada vendedor.
+    """
+    if not dados['vendedores']:
+        return _figura_vazia("Progresso de Vendas por Vendedor", "Sem metas cadastradas", estilo)
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name='Vendido',
+        x=dados['vendidos'],
+        y=dados['vendedores'],
+        orientation='h',
+        marker_color='green',
+        text=[formatar_reais(v) for v in dados['vendidos']],
+        textposition='auto'
+    ))
+    fig.add_trace(go.Bar(
+        name='Faltando',
+        x=dados['faltando'],
+        y=dados['vendedores'],
+        orientation='h',
+        marker_color='#c34323',
+        text=[formatar_reais(f) for f in dados['faltando']],
+        textposition='auto'
+    ))
+    fig.update_layout(
+        barmode='stack',
+        title="Progresso de Vendas por Vendedor",
+        xaxis_title="Valor (R$)",
+        yaxis_title="Vendedor",
+        **layout_estilo(estilo)
+    )
+    return fig
+
+
+def _metas_configuradas(colecoes, snapshot, apenas_ativos):
+    """
+    Metas (MetaVendedor) das configurações, só dos vendedores ativos ou de todos.
+    """
+    metas = obter_configuracoes(colecoes.configs).metas
+    if not apenas_ativos:
+        return list(metas.values())
+    nomes_ativos = set(snapshot.nomes_ativos)
+    return [m for nome, m in metas.items() if nome in nomes_ativos]
+
+
+def _data_venda(venda):
+    """
+    data_criacao da venda como datetime (vendas antigas guardam o texto ISO).
+    """
+    data = venda['data_criacao']
+    return datetime.fromisoformat(data) if isinstance(data, str) else data
+
+
+def dados_metas_diarias_vendedor(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Para cada vendedor com meta e cada dia do mês: quantidade e valor vendidos e se a meta
+    diária foi batida (quantidade OU valor).
+
+    Retorna:
+        dict: {'sem_vendas': bool, 'vendedores': [...],
+               'cards': [{'dia', 'vendedor', 'qtd', 'valor', 'meta_qtd', 'meta_valor', 'bateu'}]}
+    """
+    snapshot = _snapshot(colecoes, ano, mes)
+    vendas = snapshot.vendas_ativos if apenas_ativos else snapshot.vendas_todos
+    if not vendas:
+        return {'sem_vendas': True, 'vendedores': [], 'cards': []}
+
+    metas = _metas_configuradas(colecoes, snapshot, apenas_ativos)
+    vendedores = [m.vendedor_nome for m in metas]
+    dict_metas = {
+        m.vendedor_nome: {
+            'quantidade': 5 if m.meta_dia_quantidade is None else m.meta_dia_quantidade,
+            'valor': 21000 if m.meta_dia_valor is None else m.meta_dia_valor
+        } for m in metas
+    }
+
+    # Todos os dias do mês no formato dd/mm
+    dias_do_mes = [(snapshot.primeiro_dia + timedelta(days=i)).strftime("%d/%m")
+                   for i in range((snapshot.proximo_mes - snapshot.primeiro_dia).days)]
+    vendas_por_dia = {
+        vendedor: {dia: {'qtd': 0, 'valor': 0.0} for dia in dias_do_mes}
+        for vendedor in vendedores
+    }
+    for venda in vendas:
+        vendedor = venda.get('vendedor', '').strip()
+        if vendedor not in dict_metas:
+            continue
+        dia = _data_venda(venda).strftime("%d/%m")
+        if dia in vendas_por_dia[vendedor]:
+            vendas_por_dia[vendedor][dia]['qtd'] += 1
+            vendas_por_dia[vendedor][dia]['valor'] += float(venda['valor_real'])
+
+    cards = []
+    for vendedor in vendedores:
+        meta_qtd = dict_metas[vendedor]['quantidade']
+        meta_valor = dict_metas[vendedor]['valor']
+        for dia in dias_do_mes:
+            qtd = vendas_por_dia[vendedor][dia]['qtd']
+            valor = vendas_por_dia[vendedor][dia]['valor']
+            cards.append({
+                'dia': dia, 'vendedor': vendedor, 'qtd': qtd, 'valor': valor,
+                'meta_qtd': meta_qtd, 'meta_valor': meta_valor,
+                'bateu': (qtd >= meta_qtd) or (valor >= meta_valor)
+            })
+    return {'sem_vendas': False, 'vendedores': vendedores, 'cards': cards}
+
+
+def figura_metas_diarias_vendedor(dados, estilo='tela'):
+    """
+    "Mini-cards" (scatter de quadrados) por vendedor e dia: verde se bateu a meta diária, vermelho se não.
+    """
+    titulo = ("Metas Diárias dos Vendedores (Mini-Cards)<br><sup>Verde: meta batida "
+              "(quantidade OU valor), Vermelho: não</sup>")
+    if dados['sem_vendas']:
+        return _figura_vazia(titulo, "Sem metas cadastradas", estilo)
+
+    textos = []
+    for card in dados['cards']:
+        texto = (
+            f"<b>{card['vendedor']}</b><br>"
+            f"Dia: {card['dia']}<br>"
+            f"Qtd: {card['qtd']} (meta {card['meta_qtd']})<br>"
+            + formatar_reais(card['valor'], "Valor: R$ ") + formatar_reais(card['meta_valor'], " (meta R$ ") + ")"
+        )
+        textos.append(texto + ("<br><b>Meta batida!</b>" if card['bateu'] else "<br>Meta não batida"))
+
+    fig = go.Figure(data=go.Scatter(
+        x=[card['dia'] for card in dados['cards']],
+        y=[card['vendedor'] for card in dados['cards']],
+        mode='markers',
+        marker=dict(
+            size=30,  # tamanho dos mini-cards
+            color=['green' if card['bateu'] else 'red' for card in dados['cards']],
+            line=dict(color='black', width=1),
+            symbol='square'
+        ),
+        text=textos,
+        hoverinfo='text'
+    ))
+    altura = max(350, 45 * len(dados['vendedores']))
+    fig.update_layout(
+        title=titulo,
+        xaxis_title="Dia do Mês",
+        yaxis_title="Vendedor",
+        yaxis=dict(autorange='reversed'),  # Vendedores de cima pra baixo
+        **layout_estilo(estilo, pdf=dict(height=altura, font=dict(size=22)),
+                        height=altura, margin=dict(t=80, l=60, r=20, b=60), font=dict(size=13))
+    )
+    return fig
+
+
+def dados_metas_semanais_vendedor(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Total vendido na semana atual (semana ISO de hoje) por vendedor ativo com meta, e a meta semanal.
+    O gráfico considera sempre apenas os vendedores ativos.
+
+    Retorna:
+        dict: {'semana': int, 'sem_vendas': bool, 'vendedores': [...], 'totais': [...], 'metas': [...]}
+    """
+    semana_atual = datetime.today().isocalendar()[1]
+    snapshot = _snapshot(colecoes, ano, mes)
+    vendas = snapshot.vendas_ativos
+    if not vendas:
+        return {'semana': semana_atual, 'sem_vendas': True, 'vendedores': [], 'totais': [], 'metas': []}
+
+    dict_metas = {
+        m.vendedor_nome: 90000 if m.meta_semana is None else m.meta_semana
+        for m in _metas_configuradas(colecoes, snapshot, apenas_ativos=True)
+    }
+    vendas_semanais = defaultdict(float)
+    for venda in vendas:
+        vendedor = venda.get('vendedor', '').strip()
+        if vendedor in dict_metas and _data_venda(venda).isocalendar()[1] == semana_atual:
+            vendas_semanais[vendedor] += float(venda['valor_real'])
+
+    vendedores = list(dict_metas)
+    return {
+        'semana': semana_atual,
+        'sem_vendas': False,
+        'vendedores': vendedores,
+        'totais': [vendas_semanais.get(vendedor, 0) for vendedor in vendedores],
+        'metas': [dict_metas[vendedor] for vendedor in vendedores]
+    }
+
+
+def figura_metas_semanais_vendedor(dados, estilo='tela'):
+    """
+    Barras com o vendido na semana (verde se bateu a meta, vermelho se não) e a linha das metas semanais.
+    """
+    titulo = f"Vendas Semana Atual (Semana {dados['semana']}) - Por Vendedor"
+    if dados['sem_vendas']:
+        return _figura_vazia(titulo, "Sem metas cadastradas", estilo)
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=dados['vendedores'],
+        y=dados['totais'],
+        marker_color=['green' if total >= meta else 'red' for total, meta in zip(dados['totais'], dados['metas'])],
+        text=[formatar_reais(total) for total in dados['totais']],
+        textposition='auto',
+        name="Vendido"
+    ))
+    # Linha de metas (horizontal individual para cada vendedor)
+    fig.add_trace(go.Scatter(
+        x=dados['vendedores'],
+        y=dados['metas'],
+        mode='lines+markers',
+        line=dict(dash='dash', color='black'),
+        marker=dict(symbol='diamond'),
+        name='Meta semanal'
+    ))
+    altura = 400 + 40 * len(dados['vendedores'])
+    fig.update_layout(
+        title=titulo,
+        xaxis_title="Vendedor",
+        yaxis_title="Total de Vendas (R$)",
+        yaxis_tickprefix="R$ ",
+        legend_title_text='Legenda',
+        barmode='group',
+        **layout_estilo(estilo, pdf=dict(height=altura), height=altura, margin=dict(l=40, r=20, t=60, b=40))
+    )
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Vendas por prazo e vendedor
+# ---------------------------------------------------------------------------
+
+def dados_prazo_vendas_vendedor(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Vendas aprovadas/faturadas do mês dos vendedores ativos por vendedor e faixa de prazo.
+    O gráfico considera sempre apenas os vendedores ativos.
+
+    Retorna:
+        dict: {'linhas': [{'vendedor', 'faixa_prazo', 'quantidade'}]}
+    """
+    snapshot = _snapshot(colecoes, ano, mes)
+    # Prazo e faixa são calculados na gravação (app/utils.py: campos_prazo_venda), então a
+    # agregação é só um $match no mês (índice status_vendedor_data_criacao) + $group
+    pipeline = [
+        {
+            "$match": {
+                "data_criacao": {"$gte": snapshot.primeiro_dia, "$lt": snapshot.proximo_mes},
+                "vendedor": {"$in": snapshot.nomes_ativos},
+                "status": {"$in": ["Aprovada", "Faturado"]},
+                "faixa_prazo": {"$in": NOMES_FAIXAS_PRAZO}
+            }
+        },
+        {
+            "$group": {
+                "_id": {
+                    "vendedor": "$vendedor",
+                    "faixa_prazo": "$faixa_prazo"
+                },
+                "quantidade": {"$sum": 1}
+            }
+        },
+        {
+            "$sort": SON([("_id.vendedor", 1), ("_id.faixa_prazo", 1)])
+        }
+    ]
+    return {'linhas': [
+        {
+            "vendedor": r["_id"]["vendedor"],
+            "faixa_prazo": r["_id"]["faixa_prazo"],
+            "quantidade": r["quantidade"]
+        }
+        for r in colecoes.vendas.aggregate(pipeline)
+    ]}
+
+
+def figura_prazo_vendas_vendedor(dados, estilo='tela'):
+    """
+    Barras empilhadas com as vendas de cada faixa de prazo por vendedor.
+    """
+    if not dados['linhas']:
+        return _figura_vazia("Vendas por Prazo e Vendedor", "Sem dados", estilo)
+
+    df = pd.DataFrame(dados['linhas'])
+    # Faixas na ordem correta
+    df["faixa_prazo"] = pd.Categorical(df["faixa_prazo"], categories=NOMES_FAIXAS_PRAZO, ordered=True)
+    fig = px.bar(
+        df,
+        x="vendedor",
+        y="quantidade",
+        color="faixa_prazo",
+        barmode="stack",
+        title="Vendas por Prazo e Vendedor",
+        labels={"quantidade": "Quantidade", "vendedor": "Vendedor", "faixa_prazo": "Prazo (dias)"},
+        text="quantidade"
+    )
+    fig.update_layout(**layout_estilo(estilo))
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Produtos mais vendidos
+# ---------------------------------------------------------------------------
+
+def dados_produtos_mais_vendidos(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Quantidade de vendas faturadas do mês (de todos os vendedores) por produto cadastrado,
+    só dos produtos com alguma venda, do mais vendido para o menos vendido.
+
+    Retorna:
+        dict: {'produtos': [...], 'quantidades': [...]}
+    """
+    contagem_produtos = {p['nome']: 0 for p in colecoes.produtos.find({}, {'_id': 0, 'nome': 1})}
+    for venda in _snapshot(colecoes, ano, mes).vendas_todos:
+        nome_produto = venda.get('produto', '').strip()
+        if nome_produto in contagem_produtos:
+            contagem_produtos[nome_produto] += 1
+
+    vendidos = sorted(
+        ((nome, quantidade) for nome, quantidade in contagem_produtos.items() if quantidade > 0),
+        key=lambda item: item[1], reverse=True
+    )
+    return {'produtos': [nome for nome, _ in vendidos], 'quantidades': [quantidade for _, quantidade in vendidos]}
+
+
+def figura_produtos_mais_vendidos(dados, estilo='tela'):
+    """
+    Barras horizontais com a quantidade de vendas faturadas de cada produto.
+    """
+    # Sem vendas a barra fica vazia, mas o traço continua na figura
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=dados['produtos'],
+        x=dados['quantidades'],
+        orientation='h',
+        marker_color='#4285F4',
+        text=dados['quantidades'],
+        textposition='auto',
+        name='Aprovada'
+    ))
+    fig.update_layout(
+        title="Produtos mais Vendidos",
+        xaxis_title="Quantidade de Vendas Faturadas" if dados['produtos'] else "Quantidade",
+        yaxis_title="Produto",
+        **layout_estilo(estilo)
+    )
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Vendas por dia do mês (valor e quantidade)
+# ---------------------------------------------------------------------------
+
+def _totais_por_dia(colecoes, ano, mes, status, campo, chave):
+    """
+    Soma `campo` dos totais diários ('vendas_diarias') dos vendedores ativos por dia do mês;
+    `chave` é o nome do total no $group.
+
+    Retorna:
+        dict: {'dias': ['DD/MM', ...], 'valores': [...]}
+    """
+    snapshot = _snapshot(colecoes, ano, mes)
+    # Poucos documentos por dia (um por vendedor e status) em vez de todas as vendas
+    pipeline = [
+        {
+            "$match": {
+                "dia": {"$gte": snapshot.primeiro_dia, "$lt": snapshot.proximo_mes},
+                "status": status,
+                "vendedor": {"$in": snapshot.nomes_ativos}
+            }
+        },
+        {
+            "$group": {
+                "_id": {
+                    "ano": {"$year": "$dia"},
+                    "mes": {"$month": "$dia"},
+                    "dia": {"$dayOfMonth": "$dia"}
+                },
+                chave: {"$sum": f"${campo}"}
+            }
+        },
+        {
+            "$sort": SON([("_id.ano", 1), ("_id.mes", 1), ("_id.dia", 1)])
+        }
+    ]
+    resultados = list(colecoes.vendas_diarias.aggregate(pipeline))
+    return {
+        'dias': [f"{r['_id']['dia']:02d}/{r['_id']['mes']:02d}" for r in resultados],
+        'valores': [r[chave] for r in resultados]
+    }
+
+
+def _linha_por_dia(dados, titulo, eixo_y, cor, textos, rotulo_hover, estilo, **layout):
+    """
+    Linha com marcadores e o valor de cada dia (gráficos de vendas por dia do mês).
+    """
+    if not dados['dias']:
+        return _figura_vazia(titulo, "Sem dados", estilo)
+
+    fig = go.Figure(go.Scatter(
+        x=dados['dias'],
+        y=dados['valores'],
+        mode='lines+markers+text',
+        line=dict(color=cor, width=2),
+        marker=dict(size=6),
+        text=textos,
+        textposition='top center',
+        textfont=dict(size=12),
+        hovertemplate=f"Dia: %{{x}}<br>{rotulo_hover}: %{{text}}<extra></extra>"
+    ))
+    fig.update_layout(
+        title=titulo,
+        xaxis_title="Dia",
+        yaxis_title=eixo_y,
+        **layout,
+        **layout_estilo(estilo, margin=dict(l=40, r=20, t=50, b=40))
+    )
+    return fig
+
+
+def dados_vendas_diarias_linhas(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Valor faturado (aprovadas/faturadas) por dia do mês dos vendedores ativos.
+    O gráfico considera sempre apenas os vendedores ativos.
+    """
+    return _totais_por_dia(colecoes, ano, mes, {"$in": ["Aprovada", "Faturado"]}, 'valor_real', 'total')
+
+
+def figura_vendas_diarias_linhas(dados, estilo='tela'):
+    """
+    Linha verde com o valor vendido em cada dia do mês.
+    """
+    return _linha_por_dia(
+        dados, "Vendas por Dia do Mês", "Total de Vendas (R$)", 'green',
+        [formatar_reais(v) for v in dados['valores']], "Total", estilo, yaxis_tickprefix="R$ "
+    )
+
+
+def dados_quantidade_vendas_diarias(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Quantidade de vendas (exceto canceladas) por dia do mês dos vendedores ativos.
+    O gráfico considera sempre apenas os vendedores ativos.
+    """
+    return _totais_por_dia(colecoes, ano, mes, {"$ne": "Cancelada"}, 'quantidade', 'quantidade')
+
+
+def figura_quantidade_vendas_diarias(dados, estilo='tela'):
+    """
+    Linha azul com a quantidade de vendas de cada dia do mês.
+    """
+    return _linha_por_dia(
+        dados, "Quantidade de Vendas por Dia", "Quantidade de Vendas", 'blue',
+        [f"{q}" for q in dados['valores']], "Quantidades", estilo
+    )
+
+
+# ---------------------------------------------------------------------------
+# Vendas nos fins de semana (valor e quantidade)
+# ---------------------------------------------------------------------------
+
+# Status das vendas de fim de semana, na ordem das barras empilhadas, e suas cores
+STATUS_FIM_DE_SEMANA = {"Faturado": "#8E44AD", "Aprovada": "#28a745", "Aguardando": "#FFA500"}
+
+
+def _fim_de_semana(colecoes, ano, mes, chave, acumulador):
+    """
+    Vendas dos vendedores ativos em sábados e domingos do mês (pela data_real), por
+    vendedor, dia e status; `chave` recebe no $group a expressão `acumulador` (ex: {"$sum": 1}).
+
+    Retorna:
+        dict: {'rotulos': ['Vendedor (DD/MM)', ...], 'valores': {status: [...]}}
+    """
+    snapshot = _snapshot(colecoes, ano, mes)
+    pipeline = [
+        {
+            "$addFields": {
+                "data_real_dt": {"$toDate": "$data_real"},
+                "dia_semana": {"$dayOfWeek": {"$toDate": "$data_real"}}
+            }
+        },
+        {
+            "$match": {
+                "data_real_dt": {"$gte": snapshot.primeiro_dia, "$lt": snapshot.proximo_mes},
+                "status": {"$in": ["Aguardando", "Aprovada", "Faturado"]},
+                "vendedor": {"$in": snapshot.nomes_ativos},
+                "dia_semana": {"$in": [1, 7]}  # 1 = Domingo, 7 = Sábado
+            }
+        },
+        {
+            "$group": {
+                "_id": {
+                    "dia": {"$dayOfMonth": "$data_real_dt"},
+                    "mes": {"$month": "$data_real_dt"},
+                    "ano": {"$year": "$data_real_dt"},
+                    "vendedor": "$vendedor",
+                    "status": "$status"
+                },
+                chave: acumulador
+            }
+        },
+        {
+            "$sort": SON([
+                ("_id.ano", 1),
+                ("_id.mes", 1),
+                ("_id.dia", 1),
+                ("_id.vendedor", 1),
+                ("_id.status", 1)
+            ])
+        }
+    ]
+
+    # {status: {"vendedor (dia)": valor}}
+    por_status = defaultdict(lambda: defaultdict(int))
+    rotulos = set()
+    for r in colecoes.vendas.aggregate(pipeline):
+        rotulo = f"{r['_id']['vendedor']} ({r['_id']['dia']:02d}/{r['_id']['mes']:02d})"
+        por_status[r['_id']['status']][rotulo] += r[chave]
+        rotulos.add(rotulo)
+
+    # Ordena pela data dentro do rótulo
+    rotulos = sorted(rotulos, key=lambda rotulo: rotulo.split('(')[-1])
+    return {
+        'rotulos': rotulos,
+        'valores': {status: [por_status[status].get(rotulo, 0) for rotulo in rotulos] for status in STATUS_FIM_DE_SEMANA}
+    }
+
+
+def _barras_fim_de_semana(dados, titulo, eixo_y, formatar, estilo, **layout):
+    """
+    Barras empilhadas por status para cada vendedor/dia de fim de semana.
+    """
+    if not dados['rotulos']:
+        return _figura_vazia("Vendas por Status no Fim de Semana (por Vendedor)", "Vendedor / Dia", estilo)
+
+    fig = go.Figure()
+    for status, cor in STATUS_FIM_DE_SEMANA.items():
+        valores = dados['valores'][status]
+        fig.add_trace(go.Bar(
+            x=dados['rotulos'],
+            y=valores,
+            name=status,
+            marker_color=cor,
+            text=[formatar(v) for v in valores],
+            textposition="auto"
+        ))
+    fig.update_layout(
+        title=titulo,
+        xaxis_title="Vendedor / Dia",
+        yaxis_title=eixo_y,
+        barmode="stack",
+        **layout,
+        **layout_estilo(estilo, height=500, margin=dict(l=40, r=20, t=50, b=40))
+    )
+    return fig
+
+
+def dados_vendas_fim_de_semana(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Valor vendido (R$) nos fins de semana por vendedor, dia e status (vendedores ativos).
+    O gráfico considera sempre apenas os vendedores ativos.
+    """
+    # valor_real já é numérico (app/migracao_valores.py); $sum ignora o que não for número
+    return _fim_de_semana(colecoes, ano, mes, 'total', {"$sum": "$valor_real"})
+
+
+def figura_vendas_fim_de_semana(dados, estilo='tela'):
+    """
+    Barras empilhadas com o valor vendido em cada fim de semana, por status.
+    """
+    return _barras_fim_de_semana(
+        dados, "Total de Vendas (R$) por Vendedor e Status (Fins de Semana)", "Total (R$)",
+        formatar_reais, estilo, yaxis_tickprefix="R$ "
+    )
+
+
+def dados_quantidade_vendas_fim_de_semana(colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Quantidade de vendas nos fins de semana por vendedor, dia e status (vendedores ativos).
+    O gráfico considera sempre apenas os vendedores ativos.
+    """
+    return _fim_de_semana(colecoes, ano, mes, 'quantidade', {"$sum": 1})
+
+
+def figura_quantidade_vendas_fim_de_semana(dados, estilo='tela'):
+    """
+    Barras empilhadas com a quantidade de vendas em cada fim de semana, por status.
+    """
+    return _barras_fim_de_semana(
+        dados, "Status das Vendas por Vendedor (Fins de Semana)", "Quantidade de Vendas", lambda v: v, estilo
+    )
+
+
+# Gráficos registrados, pelo nome usado nas abas do dashboard
+REGISTRO = {grafico.nome: grafico for grafico in [
+    Grafico('banco_vendedores', dados_banco_vendedores, figura_banco_vendedores),
+    Grafico('vendas_vendedor', dados_vendas_vendedor, figura_vendas_vendedor),
+    Grafico('vendas_diarias', dados_vendas_diarias, figura_vendas_diarias, include_plotlyjs='cdn'),
+    Grafico('verdes_vermelhos_geral', dados_verdes_vermelhos_geral, figura_verdes_vermelhos_geral),
+    Grafico('verdes_vermelhos_vendedor', dados_verdes_vermelhos_vendedor, figura_verdes_vermelhos_vendedor),
+    Grafico('tipo_vendas_geral', dados_tipo_vendas_geral, figura_tipo_vendas_geral),
+    Grafico('tipo_vendas_por_vendedor', dados_tipo_vendas_por_vendedor, figura_tipo_vendas_por_vendedor),
+    Grafico('mapa_vendas_por_estado', dados_mapa_vendas_por_estado, figura_mapa_vendas_por_estado,
+            include_plotlyjs='cdn'),
+    Grafico('vendas_geral', dados_vendas_geral, figura_vendas_geral),
+    Grafico('status_vendas', dados_status_vendas, figura_status_vendas),
+    Grafico('metas_vendedor', dados_metas_vendedor, figura_metas_vendedor),
+    Grafico('metas_diarias_vendedor', dados_metas_diarias_vendedor, figura_metas_diarias_vendedor),
+    Grafico('metas_semanais_vendedor', dados_metas_semanais_vendedor, figura_metas_semanais_vendedor),
+    Grafico('prazo_vendas_vendedor', dados_prazo_vendas_vendedor, figura_prazo_vendas_vendedor),
+    Grafico('produtos_mais_vendidos', dados_produtos_mais_vendidos, figura_produtos_mais_vendidos),
+    Grafico('vendas_diarias_linhas', dados_vendas_diarias_linhas, figura_vendas_diarias_linhas),
+    Grafico('quantidade_vendas_diarias', dados_quantidade_vendas_diarias, figura_quantidade_vendas_diarias),
+    Grafico('vendas_fim_de_semana', dados_vendas_fim_de_semana, figura_vendas_fim_de_semana),
+    Grafico('quantidade_vendas_fim_de_semana', dados_quantidade_vendas_fim_de_semana,
+            figura_quantidade_vendas_fim_de_semana),
+]}
+
+
+@cache_grafico(ignorar=('colecoes',))
+def calcular_dados(nome, colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None):
+    """
+    Calcula (ou busca no cache versionado) os dados de um gráfico registrado.
+    Dashboard e PDF chamam com os mesmos argumentos e compartilham o resultado, que não
+    deve ser modificado.
+
+    Parâmetros:
+        nome (str): Chave de REGISTRO.
+        colecoes (ColecoesGraficos): Coleções usadas na consulta.
+        ano (int, opcional), mes (int, opcional): Período (padrão: mês atual).
+        apenas_ativos (bool): Só vendedores ativos (dashboard) ou todos.
+        data_escolhida (str, opcional): Dia 'YYYY-MM-DD' (gráfico vendas_diarias).
+
+    Retorna:
+        dict: Dados do gráfico.
+    """
+    return REGISTRO[nome].dados(colecoes, ano, mes, apenas_ativos=apenas_ativos, data_escolhida=data_escolhida)
+
+
+def gerar_figura(nome, colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None, estilo='tela'):
+    """
+    Monta a figura de um gráfico registrado no estilo pedido ('tela' ou 'pdf').
+
+    Retorna:
+        go.Figure: Figura pronta.
+
+    Lança:
+        KeyError: Se o gráfico não estiver registrado.
+    """
+    grafico = REGISTRO[nome]
+    dados = calcular_dados(nome, colecoes, ano, mes, apenas_ativos=apenas_ativos, data_escolhida=data_escolhida)
+    return grafico.figura(dados, estilo)
+
+
+def gerar_grafico_registrado(nome, colecoes, ano=None, mes=None, apenas_ativos=True, data_escolhida=None,
+                             formato='html'):
+    """
+    Gera um gráfico registrado já convertido: 'html' e 'figura' no estilo do dashboard,
+    'png' no estilo do PDF.
+
+    Retorna:
+        str | bytes: HTML, JSON da figura ou PNG.
+    """
+    estilo = 'pdf' if formato == 'png' else 'tela'
+    fig = gerar_figura(nome, colecoes, ano, mes, apenas_ativos=apenas_ativos, data_escolhida=data_escolhida,
+                       estilo=estilo)
+    return renderizar_grafico(fig, formato, include_plotlyjs=REGISTRO[nome].include_plotlyjs)
@@ -0,0 +1,272 @@
+"""
+Módulo de relatórios em PDF gerados em segundo plano.
+Em vez de gerar o PDF dentro da requisição (o que prende um worker web durante toda a
+renderização), a rota cria um pedido na coleção 'relatorios_pdf' e devolve o ID; um worker
+em segundo plano executa gerar_pdf_graficos e grava o arquivo no GridFS do MongoDB
+(coleções 'relatorios_pdf_arquivos.*'), de onde o navegador baixa o PDF depois de consultar o
+status. Como o arquivo fica no banco, o download funciona em qualquer worker ou servidor, e não
+só no que gerou o PDF.
+
+Pedidos idênticos (mesmos gráficos, nome, ano, mês e dia escolhido) feitos enquanto um deles
+ainda está na fila ou sendo gerado compartilham o mesmo pedido; o campo 'usuarios' guarda quem
+pediu, e só esses usuários (e os admins) consultam e baixam o relatório.
+
+Status possíveis de um pedido:
+    pendente    -> aguardando o worker
+    processando -> PDF sendo gerado
+    concluido   -> PDF disponível para download até 'expira_em'
+    erro        -> falha na geração (campo 'erro')
+    expirado    -> arquivo removido após o prazo
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from gridfs import GridFS
+from gridfs.errors import NoFile
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.models import relatorios_pdf_collection
+
+# Prefixo das coleções do GridFS onde os PDFs prontos ficam guardados
+COLECAO_ARQUIVOS = "relatorios_pdf_arquivos"
+
+# Tempo que um PDF pronto fica disponível para download
+EXPIRA_MINUTOS = 60
+
+# Pedidos 'processando' há mais tempo que isso voltam para a fila (worker interrompido)
+RESERVA_EXPIRA_MINUTOS = 30
+
+# Avisa o worker deste processo que há um pedido novo (evita esperar o próximo ciclo)
+_novo_pedido = threading.Event()
+
+
+def chave_relatorio(selecao, nome_base, ano, mes, data_escolhida=None):
+    """
+    Calcula a chave que identifica pedidos idênticos.
+
+    Retorna:
+        str: Hash SHA-1 dos parâmetros do relatório.
+    """
+    parametros = [sorted(set(selecao)), nome_base, int(ano), int(mes), data_escolhida]
+    return hashlib.sha1(json.dumps(parametros).encode()).hexdigest()
+
+
+def criar_relatorio(selecao, nome_base, ano, mes, data_escolhida=None, username=None):
+    """
+    Cria um pedido de relatório ou reaproveita um pedido idêntico ainda em andamento.
+
+    Parâmetros:
+        selecao (list): Gráficos selecionados.
+        nome_base (str): Nome base do arquivo PDF.
+        ano (int): Ano dos dados.
+        mes (int): Mês dos dados.
+        data_escolhida (str, opcional): Dia do gráfico de vendas diárias ('YYYY-MM-DD').
+        username (str, opcional): Usuário que pediu o relatório.
+
+    Retorna:
+        dict: Pedido (novo ou existente).
+    """
+    chave = chave_relatorio(selecao, nome_base, ano, mes, data_escolhida)
+    pedido = {
+        "chave": chave,
+        "selecao": list(selecao),
+        "nome_base": nome_base,
+        "ano": int(ano),
+        "mes": int(mes),
+        "data_escolhida": data_escolhida,
+        "username": username,
+        "status": "pendente",
+        "criado_em": datetime.now(),
+        "erro": None
+    }
+    # 'chave_ativa' só existe enquanto o pedido está na fila/sendo gerado; o índice único
+    # parcial nesse campo impede dois pedidos ativos iguais
+    pedido_atual = None
+    for _ in range(3):
+        try:
+            pedido_atual = relatorios_pdf_collection.find_one_and_update(
+                {"chave_ativa": chave},
+                {"$setOnInsert": pedido, "$addToSet": {"usuarios": username}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            break
+        except DuplicateKeyError:
+            # Outro processo criou o mesmo pedido ao mesmo tempo: entra nele
+            pedido_atual = relatorios_pdf_collection.find_one_and_update(
+                {"chave_ativa": chave},
+                {"$addToSet": {"usuarios": username}},
+                return_document=ReturnDocument.AFTER
+            )
+            if pedido_atual:
+                break
+    _novo_pedido.set()
+    return pedido_atual
+
+
+def buscar_relatorio(id_relatorio):
+    """
+    Busca um pedido pelo ID (texto ou ObjectId).
+
+    Retorna:
+        dict | None: Pedido ou None se o ID for inválido/inexistente.
+    """
+    try:
+        return relatorios_pdf_collection.find_one({"_id": ObjectId(id_relatorio)})
+    except (InvalidId, TypeError):
+        return None
+
+
+def pode_acessar_relatorio(pedido, user):
+    """
+    Confere se o usuário da sessão pode consultar e baixar o relatório: quem o pediu
+    (ou pediu um idêntico enquanto estava em andamento) e os admins.
+
+    Parâmetros:
+        pedido (dict): Pedido de relatório.
+        user (dict): Usuário da sessão.
+
+    Retorna:
+        bool: True se o acesso é permitido.
+    """
+    if user.get("tipo") == "admin":
+        return True
+    usuarios = pedido.get("usuarios") or [pedido.get("username")]
+    return user.get("username") is not None and user.get("username") in usuarios
+
+
+def arquivos_relatorios():
+    """
+    GridFS com os PDFs prontos (um arquivo por pedido, com o mesmo _id do pedido).
+    """
+    return GridFS(relatorios_pdf_collection.database, collection=COLECAO_ARQUIVOS)
+
+
+def abrir_relatorio(id_relatorio):
+    """
+    Abre o PDF de um pedido para leitura.
+
+    Retorna:
+        gridfs.GridOut | None: Arquivo (file-like) ou None se não existir (expirado).
+    """
+    try:
+        return arquivos_relatorios().get(id_relatorio)
+    except NoFile:
+        return None
+
+
+def reservar_relatorio(agora=None):
+    """
+    Reserva (status 'processando') o pedido pendente mais antigo, de forma atômica.
+
+    Retorna:
+        dict | None: Pedido reservado ou None se a fila estiver vazia.
+    """
+    agora = agora or datetime.now()
+    return relatorios_pdf_collection.find_one_and_update(
+        {"$or": [
+            {"status": "pendente"},
+            {"status": "processando", "iniciado_em": {"$lt": agora - timedelta(minutes=RESERVA_EXPIRA_MINUTOS)}}
+        ]},
+        {"$set": {"status": "processando", "iniciado_em": agora}},
+        sort=[("criado_em", ASCENDING)],
+        return_document=ReturnDocument.AFTER
+    )
+
+
+def processar_relatorio(pedido, gerar_pdf):
+    """
+    Gera o PDF de um pedido reservado e grava o resultado (arquivo no GridFS + status).
+
+    Parâmetros:
+        pedido (dict): Pedido reservado.
+        gerar_pdf (callable): Função com a assinatura de gerar_pdf_graficos.
+    """
+    try:
+        buffer, nome_arquivo = gerar_pdf(
+            pedido["selecao"], pedido["nome_base"], pedido["ano"], pedido["mes"],
+            data_escolhida=pedido.get("data_escolhida")
+        )
+        if nome_arquivo is None:
+            # gerar_pdf_graficos devolve a mensagem de erro no lugar do buffer
+            raise ValueError(buffer)
+
+        # O GridFS grava os pedaços antes do documento do arquivo: o download nunca vê um
+        # PDF pela metade. Uma reserva expirada pode ter gravado o arquivo antes: substitui
+        arquivos = arquivos_relatorios()
+        arquivos.delete(pedido["_id"])
+        arquivos.put(buffer.getvalue(), _id=pedido["_id"], filename=nome_arquivo,
+                     content_type="application/pdf")
+
+        agora = datetime.now()
+        atualizacao = {
+            "$set": {"status": "concluido", "nome_arquivo": nome_arquivo, "concluido_em": agora,
+                     "expira_em": agora + timedelta(minutes=EXPIRA_MINUTOS), "erro": None},
+            "$unset": {"chave_ativa": ""}
+        }
+    except Exception as e:
+        atualizacao = {
+            "$set": {"status": "erro", "erro": str(e), "concluido_em": datetime.now()},
+            "$unset": {"chave_ativa": ""}
+        }
+    relatorios_pdf_collection.update_one({"_id": pedido["_id"]}, atualizacao)
+
+
+def limpar_relatorios_expirados(agora=None):
+    """
+    Remove do GridFS os PDFs cujo prazo de download acabou.
+
+    Retorna:
+        int: Quantidade de relatórios expirados.
+    """
+    agora = agora or datetime.now()
+    arquivos = arquivos_relatorios()
+    total = 0
+    for pedido in relatorios_pdf_collection.find({"status": "concluido", "expira_em": {"$lt": agora}}, {"_id": 1}):
+        arquivos.delete(pedido["_id"])
+        relatorios_pdf_collection.update_one({"_id": pedido["_id"]}, {"$set": {"status": "expirado"}})
+        total += 1
+    return total
+
+
+def iniciar_worker_relatorios(app, intervalo=5):
+    """
+    Inicia o worker de relatórios em uma thread daemon.
+
+    Parâmetros:
+        app (Flask): Aplicação (os gráficos usam o contexto dela: configurações e snapshot mensal).
+        intervalo (int): Segundos entre verificações da fila.
+
+    Retorna:
+        threading.Event: Evento que, ao ser sinalizado (set), encerra o worker.
+    """
+    # Importado aqui: services importa download/graficos, que não são necessários para criar pedidos
+    from app.services import gerar_pdf_graficos
+
+    parar = threading.Event()
+
+    def executar():
+        while not parar.is_set():
+            try:
+                while not parar.is_set():
+                    pedido = reservar_relatorio()
+                    if pedido is None:
+                        break
+                    # Um contexto por relatório: o snapshot mensal (g) não passa de um pedido para outro
+                    with app.app_context():
+                        processar_relatorio(pedido, gerar_pdf_graficos)
+                limpar_relatorios_expirados()
+            except Exception as e:
+                # Banco indisponível ou erro inesperado: tenta de novo no próximo ciclo
+                print(f"Erro no worker de relatórios: {e}")
+            _novo_pedido.wait(intervalo)
+            _novo_pedido.clear()
+
+    threading.Thread(target=executar, name="worker-relatorios", daemon=True).start()
+    return parar
@@ -0,0 +1,94 @@
+from datetime import datetime
+from flask import Blueprint, request, session, jsonify, send_file, abort, Response, stream_with_context, current_app
+from app.carga_tardia import importar_tardio
+from app.graficos import GRAFICOS_PAINEL, gerar_grafico_painel
+from app.registro_graficos import caminho_plotly_js
+from app.graficos_lote import gerar_graficos_lote, THREADS_PADRAO
+from app.geojson_brasil import ARQUIVO_SIMPLIFICADO, versao_geojson_brasil
+
+api_grafico_figura_bp = Blueprint('api_grafico_figura', __name__)
+
+# Só plotly.__version__ (rota do plotly.js): carregado no primeiro acesso, como em app/registro_graficos.py
+plotly = importar_tardio('plotly')
+
+# Arquivos com a versão na URL (plotly.js e GeoJSON): a URL muda junto com o conteúdo
+CACHE_ARQUIVOS_VERSIONADOS = 365 * 24 * 60 * 60
+
+@api_grafico_figura_bp.route('/api/grafico/<string:nome>/figura')
+def grafico_figura(nome):
+    """
+    Retorna a figura de um gráfico do dashboard em JSON compacto, para o navegador desenhar
+    com Plotly.react (sem o HTML e os <script> de /grafico/<nome>).
+
+    Parâmetros da URL:
+        ano, mes: período (padrão: mês atual).
+        data: dia do gráfico vendas_diarias 'YYYY-MM-DD' (padrão: o escolhido na tela inicial).
+
+    Retorna:
+        JSON {'figura': {'data': [...], 'layout': {...}}}
+    """
+    if not session.get("user"):
+        return jsonify({"erro": "Usuário não autenticado"}), 401
+    if nome not in GRAFICOS_PAINEL:
+        return jsonify({"erro": "Gráfico não encontrado"}), 404
+
+    ano = request.args.get("ano", type=int) or datetime.today().year
+    mes = request.args.get("mes", type=int) or datetime.today().month
+    data_escolhida = request.args.get("data") or session.get("data_grafico_vendas_diarias")
+    try:
+        figura = gerar_grafico_painel(nome, ano, mes, data_escolhida=data_escolhida, formato="figura")
+    except Exception as e:
+        return jsonify({"erro": f"Erro ao gerar gráfico: {str(e)}"}), 500
+
+    # A figura já é JSON: monta a resposta sem decodificar/recodificar
+    return Response('{"figura":' + figura + '}', mimetype="application/json")
+
+@api_grafico_figura_bp.route('/api/graficos/lote')
+def graficos_lote():
+    """
+    Gera vários gráficos do dashboard em paralelo (app/graficos_lote.py) e envia cada figura
+    assim que fica pronta, uma por linha (NDJSON), na ordem em que terminam.
+
+    Parâmetros da URL:
+        graficos: nomes separados por vírgula (ex: vendas_geral,banco_vendedores).
+        ano, mes, data: como em /api/grafico/<nome>/figura.
+
+    Retorna:
+        application/x-ndjson: linhas {"nome": ..., "figura": {...}} ou {"nome": ..., "erro": "..."}
+    """
+    if not session.get("user"):
+        return jsonify({"erro": "Usuário não autenticado"}), 401
+    nomes = [nome.strip() for nome in request.args.get("graficos", "").split(",") if nome.strip()]
+    if not nomes:
+        return jsonify({"erro": "Informe os gráficos"}), 400
+
+    ano = request.args.get("ano", type=int) or datetime.today().year
+    mes = request.args.get("mes", type=int) or datetime.today().month
+    data_escolhida = request.args.get("data") or session.get("data_grafico_vendas_diarias")
+    linhas = gerar_graficos_lote(
+        nomes, ano, mes, data_escolhida=data_escolhida,
+        threads=current_app.config.get("GRAFICOS_THREADS", THREADS_PADRAO)
+    )
+
+    resposta = Response(stream_with_context(linhas), mimetype="application/x-ndjson")
+    resposta.headers['Cache-Control'] = 'no-cache'
+    resposta.headers['X-Accel-Buffering'] = 'no'  # Evita buffer em proxy reverso (nginx)
+    return resposta
+
+@api_grafico_figura_bp.route('/plotly/plotly-<versao>.min.js')
+def plotly_js(versao):
+    """
+    Serve o plotly.js do pacote plotly instalado, com cache longo no navegador.
+    """
+    if versao != plotly.__version__:
+        abort(404)
+    return send_file(caminho_plotly_js(), mimetype="application/javascript", max_age=CACHE_ARQUIVOS_VERSIONADOS)
+
+@api_grafico_figura_bp.route('/geojson/brasil-<versao>.geojson')
+def geojson_brasil(versao):
+    """
+    Serve o GeoJSON simplificado dos estados (app/geojson_brasil.py), com cache longo no navegador.
+    """
+    if versao != versao_geojson_brasil():
+        abort(404)
+    return send_file(ARQUIVO_SIMPLIFICADO, mimetype="application/json", max_age=CACHE_ARQUIVOS_VERSIONADOS)
@@ -0,0 +1,18 @@
+from flask import Blueprint, session, jsonify
+from app.conexao_mongo import estatisticas_pool
+
+api_mongo_pool_bp = Blueprint('api_mongo_pool', __name__)
+
+@api_mongo_pool_bp.route('/api/mongo/pool')
+def mongo_pool():
+    """
+    Estatísticas do pool de conexões MongoDB deste worker (conexões abertas, em uso,
+    esperas e falhas de checkout). Cada worker responde com os próprios números (campo pid).
+    Apenas administradores.
+    """
+    user = session.get("user")
+    if not user:
+        return jsonify({"erro": "Usuário não autenticado"}), 401
+    if user.get("tipo") != "admin":
+        return jsonify({"erro": "Acesso negado"}), 403
+    return jsonify(estatisticas_pool())
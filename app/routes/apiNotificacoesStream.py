@@ -0,0 +1,32 @@
+from flask import Blueprint, session, Response, stream_with_context, current_app
+from app.notificacoes_stream import gerar_eventos, acesso_liberado, reservar_conexao, liberar_conexao
+
+api_notificacoes_stream_bp = Blueprint('api_notificacoes_stream', __name__)
+
+@api_notificacoes_stream_bp.route('/api/notificacoes/stream')
+def api_notificacoes_stream():
+    """
+    Fluxo Server-Sent Events com as notificações não lidas do usuário logado.
+
+    Envia a lista completa (mesmo formato de /api/notificacoes) ao conectar e sempre que ela mudar.
+    Sem usuário na sessão, sem permissão de acesso ou com o limite de conexões do processo
+    atingido (STREAM_CONEXOES), responde 204, o que faz o EventSource do navegador parar de
+    reconectar (a página passa a consultar /api/notificacoes).
+    """
+    user = session.get("user")
+    if not user:
+        return Response(status=204)
+
+    # Copia os dados necessários: o gerador roda depois que a view retorna
+    usuario = {"username": user.get("username"), "tipo": user.get("tipo")}
+    if not acesso_liberado(usuario):
+        return Response(status=204)
+    if not reservar_conexao(current_app.config.get('STREAM_CONEXOES', 0)):
+        return Response(status=204)
+
+    resposta = Response(stream_with_context(gerar_eventos(usuario)), mimetype='text/event-stream')
+    # O servidor fecha a resposta ao fim do fluxo ou quando o cliente desconecta
+    resposta.call_on_close(liberar_conexao)
+    resposta.headers['Cache-Control'] = 'no-cache'
+    resposta.headers['X-Accel-Buffering'] = 'no'  # Evita buffer em proxy reverso (nginx)
+    return resposta
@@ -0,0 +1,79 @@
+from datetime import datetime
+from flask import Blueprint, request, session, jsonify, send_file, url_for
+from app.relatorios_pdf import criar_relatorio, buscar_relatorio, pode_acessar_relatorio, abrir_relatorio
+
+api_relatorios_pdf_bp = Blueprint('api_relatorios_pdf', __name__)
+
+def dados_status(pedido):
+    """
+    Monta a resposta de status de um pedido de relatório.
+    """
+    dados = {
+        "id": str(pedido["_id"]),
+        "status": pedido["status"],
+        "erro": pedido.get("erro")
+    }
+    if pedido["status"] == "concluido":
+        dados["nome_arquivo"] = pedido.get("nome_arquivo")
+        dados["url_download"] = url_for("api_relatorios_pdf.baixar_relatorio_pdf", id_relatorio=dados["id"])
+    return dados
+
+@api_relatorios_pdf_bp.route('/api/relatorios-pdf', methods=['POST'])
+def criar_relatorio_pdf():
+    """
+    Cria um pedido de relatório PDF (gerado em segundo plano) e devolve o ID para acompanhamento.
+    Recebe os mesmos campos do formulário de /baixar-pdf-graficos: graficos, nome, ano, mes.
+    """
+    user = session.get("user")
+    if not user:
+        return jsonify({"erro": "Usuário não autenticado"}), 401
+
+    selecao = request.form.getlist("graficos")
+    if not selecao:
+        return jsonify({"erro": "Selecione ao menos um gráfico."}), 400
+
+    ano = request.form.get("ano", type=int, default=datetime.today().year)
+    mes = request.form.get("mes", type=int, default=datetime.today().month)
+    nome_base = request.form.get("nome") or "relatorio"
+
+    pedido = criar_relatorio(
+        selecao, nome_base, ano, mes,
+        data_escolhida=session.get("data_grafico_vendas_diarias"),
+        username=user.get("username")
+    )
+    return jsonify(dados_status(pedido)), 202
+
+@api_relatorios_pdf_bp.route('/api/relatorios-pdf/<id_relatorio>')
+def status_relatorio_pdf(id_relatorio):
+    """
+    Consulta o status de um pedido de relatório (o navegador consulta até ficar 'concluido' ou 'erro').
+    Só quem pediu o relatório (ou um admin) o consulta; para os demais ele não existe.
+    """
+    user = session.get("user")
+    if not user:
+        return jsonify({"erro": "Usuário não autenticado"}), 401
+
+    pedido = buscar_relatorio(id_relatorio)
+    if not pedido or not pode_acessar_relatorio(pedido, user):
+        return jsonify({"erro": "Relatório não encontrado"}), 404
+    return jsonify(dados_status(pedido))
+
+@api_relatorios_pdf_bp.route('/api/relatorios-pdf/<id_relatorio>/download')
+def baixar_relatorio_pdf(id_relatorio):
+    """
+    Baixa o PDF de um pedido concluído (enquanto não expirar), só para quem o pediu ou um admin.
+    """
+    user = session.get("user")
+    if not user:
+        return jsonify({"erro": "Usuário não autenticado"}), 401
+
+    pedido = buscar_relatorio(id_relatorio)
+    if not pedido or not pode_acessar_relatorio(pedido, user):
+        return jsonify({"erro": "Relatório não encontrado"}), 404
+    if pedido["status"] != "concluido":
+        return jsonify({"erro": "Relatório não disponível", "status": pedido["status"]}), 409
+
+    arquivo = abrir_relatorio(pedido["_id"])
+    if arquivo is None:
+        return jsonify({"erro": "Relatório expirado"}), 410
+    return send_file(arquivo, mimetype="application/pdf", as_attachment=True, download_name=pedido["nome_arquivo"])
@@ -0,0 +1,45 @@
+from flask import Blueprint, request, session, jsonify
+from app.services import verificar_permissao_acesso
+from app.vendas_listagem import montar_filtro_vendas, listar_vendas_pagina, formatar_venda, LIMITE_PADRAO
+
+api_vendas_bp = Blueprint('api_vendas', __name__)
+
+@api_vendas_bp.route('/api/vendas')
+def api_vendas():
+    """
+    Lista as vendas em páginas (mais recentes primeiro), com os mesmos filtros da tela /vendas.
+
+    Parâmetros da URL:
+        busca, data_inicio, data_fim, data, status, ver_todas: filtros da tela de vendas.
+        cursor: valor de 'proximo_cursor' da página anterior (vazio na primeira página).
+        limite: quantidade de vendas por página.
+
+    Retorna:
+        JSON {'vendas': [...], 'proximo_cursor': str ou null}
+    """
+    user = session.get("user")
+    if not user or not verificar_permissao_acesso(username=user.get("username")):
+        return jsonify({"erro": "Usuário não autenticado"}), 401
+
+    filtro = montar_filtro_vendas(
+        user,
+        busca=request.args.get("busca", "").strip(),
+        data_inicio=request.args.get("data_inicio", "").strip(),
+        data_fim=request.args.get("data_fim", "").strip(),
+        data=request.args.get("data", "").strip(),
+        status=request.args.get("status", "").strip(),
+        ver_todas=bool(request.args.get("ver_todas"))
+    )
+    try:
+        pagina = listar_vendas_pagina(
+            filtro,
+            cursor=request.args.get("cursor") or None,
+            limite=request.args.get("limite", LIMITE_PADRAO, type=int)
+        )
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    return jsonify({
+        "vendas": [formatar_venda(v) for v in pagina["vendas"]],
+        "proximo_cursor": pagina["proximo_cursor"]
+    })
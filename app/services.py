@@ -1,22 +1,42 @@
 from app.models import (
-    criar_usuario, nova_venda, usuarios_collection, vendas_collection, produtos_collection, cadastrar_produto, configs_collection, notificacoes_collection
+    criar_usuario, nova_venda, usuarios_collection, vendas_collection, produtos_collection, cadastrar_produto, configs_collection, notificacoes_collection,
+    contadores_collection
 )
 import bcrypt  # Biblioteca para hashing seguro de senhas
+import logging  # Mensagens de diagnóstico (nível debug)
 import smtplib  # Envio de e-mails via SMTP
-from email.message import EmailMessage  # Criação de mensagens de e-mail
 from datetime import datetime, time, timedelta, timezone  # Manipulação de datas e horas
-import plotly.io as pio  # Utilitário para exportar gráficos Plotly
-from reportlab.pdfgen import canvas  # Geração de PDFs com ReportLab
+from app.carga_tardia import importar_tardio  # Plotly/ReportLab só são carregados ao gerar o PDF
+pio = importar_tardio('plotly.io')  # Utilitário para exportar gráficos Plotly
+canvas = importar_tardio('reportlab.pdfgen.canvas')  # Geração de PDFs com ReportLab
 from reportlab.lib.pagesizes import landscape, A4  # Tamanho de página padrão A4 para PDFs
-from reportlab.lib.utils import ImageReader  # Utilitário para inserir imagens em PDF
+reportlab_utils = importar_tardio('reportlab.lib.utils')  # ImageReader: imagens no PDF
 import os  # Operações de sistema de arquivos
 import tempfile  # Criação de arquivos temporários
 from io import BytesIO  # Manipulação de fluxos de bytes em memória
 import time  # Utilitário para medições de tempo
-from app.download import *  # Importa funções utilitárias de download (ajuste conforme sua estrutura)
-from app.utils import soma_vendas
-from flask import session, request
-from pymongo import ASCENDING
+from app.download import (  # Figuras dos gráficos do PDF
+    gerar_fig_vendas_geral, gerar_fig_metas_diarias_vendedor, gerar_fig_metas_semanais_vendedor,
+    gerar_fig_banco_vendedores, gerar_fig_vendas_vendedor, gerar_fig_vendas_diarias,
+    gerar_fig_status_vendas_vendedor, gerar_fig_metas_vendedor, gerar_fig_verdes_vermelhos_geral,
+    gerar_fig_verdes_vermelhos_vendedor, gerar_fig_tipo_vendas_geral, gerar_fig_tipo_vendas_por_vendedor,
+    gerar_fig_mapa_vendas_por_estado, gerar_fig_prazo_vendas_vendedor, gerar_fig_produtos_mais_vendidos,
+    gerar_fig_vendas_diarias_linhas, gerar_fig_quantidade_vendas_diarias, gerar_fig_vendas_fim_de_semana,
+    gerar_fig_quantidade_vendas_fim_de_semana
+)
+from app.utils import soma_vendas, converter_valor_monetario
+from app.email_fila import enfileirar_email, montar_mensagem_email
+from app.notificacoes_stream import publicar_notificacao
+from app.cache_graficos import invalidar_cache_graficos
+from app.catalogo_produtos import obter_catalogo_produtos
+from app.configuracoes import obter_configuracoes
+import copy  # Cópias dos dados do catálogo de produtos
+from app.rasterizacao import rasterizar_figuras, processos_padrao, LARGURA_PNG, ALTURA_PNG, ESCALA_PNG
+from flask import session, request, current_app, has_app_context, has_request_context
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
 
 # Coleção para bloqueios de IP (crie no MongoDB se necessário)
 from app.models import db
@@ -94,8 +114,8 @@ def cadastrar_venda(usuario_id, venda_data):
     condicoes_nome = (venda_data['condicoes'] or '').replace(' ', '').strip().lower()
     condicoes_venda = (venda_data['condicoes_venda'] or '').strip().lower()
 
-    # Testa se tem entrada (> 0 ou diferente de vazio/'0')
-    tem_entrada = valor_entrada not in ['', '0', 0, None]
+    # Testa se tem entrada (diferente de vazio/zero; valores gravados são numéricos, ex: "0.0")
+    tem_entrada = bool(converter_valor_monetario(valor_entrada))
 
     # Testa se é 1+1 (independente de espaço)
     is_1mais1 = condicoes_nome in ['a/c|1+1']
@@ -159,32 +179,26 @@ def cadastrar_venda(usuario_id, venda_data):
 </html>
 """
     # Se houver senha de e-mail, envia a notificação para o vendedor e cópias
-    info_envio = configs_collection.find_one({'tipo': 'geral'})
-    email_principal = info_envio['email_smtp_principal'].split(':')[1]
-    email_secundario = info_envio['email_smtp_secundario'].split(':')[1]
-    servidor = info_envio['smtp']
-    porta = info_envio['porta']
-    copias = info_envio['email_copia']
-    senha_email = info_envio['senha_email_smtp']
-
-    if email_principal == 'true':
-        email_remetente = info_envio['email_smtp_principal'].split(':')[0]
-    elif email_secundario == 'true':
-        email_remetente = info_envio['email_smtp_secundario'].split(':')[0]
-
-    enviar_email(
+    # Configuração 'geral' tipada e em cache (app/configuracoes.py)
+    info_envio = obter_configuracoes(configs_collection).geral
+    servidor = info_envio.smtp
+    porta = info_envio.porta
+    copias = info_envio.email_copia
+    email_remetente = info_envio.email_remetente
+
+    # Apenas enfileira: o envio é feito pelo worker de e-mails (app/email_fila.py), que lê a senha SMTP
+    enfileirar_email(
         assunto=f'{venda_data['nome'].title()}',
         email_remetente=email_remetente,
         corpo=corpo_email,
         copias=copias,
-        senha_email=senha_email,
         email_destinatario=vendedor_doc['email'],
         servidor=servidor,
         porta=porta
     )
 
     # Insere a venda no banco de dados
-    return nova_venda(
+    resultado = nova_venda(
         usuario_id=usuario_id,
         numero_da_venda=venda_data.get("numero_da_venda"),
         nome=venda_data.get("nome"),
@@ -223,6 +237,10 @@ def cadastrar_venda(usuario_id, venda_data):
         condicoes_venda=venda_data.get("condicoes_venda")              # NOVO
     )
 
+    # Nova versão dos dados: os gráficos do mês da venda (e do mês atual) são gerados de novo
+    invalidar_cache_graficos(venda_data.get("data_criacao"))
+    return resultado
+
 def reenviar_venda(data):
     condicoes = ''
     vendedor_nome = data.get("quem")
@@ -239,8 +257,8 @@ def reenviar_venda(data):
     condicoes_nome = (data.get('condicoes', '')).replace(' ', '').strip().lower()
     condicoes_venda = (data.get('condicoes_venda', '')).strip().lower()
 
-    # Testa se tem entrada (> 0 ou diferente de vazio/'0')
-    tem_entrada = valor_entrada not in ['', '0', 0, None]
+    # Testa se tem entrada (diferente de vazio/zero; valores gravados são numéricos, ex: "0.0")
+    tem_entrada = bool(converter_valor_monetario(valor_entrada))
 
     # Testa se é 1+1 (independente de espaço)
     is_1mais1 = condicoes_nome in ['a/c|1+1']
@@ -304,54 +322,86 @@ def reenviar_venda(data):
 </html>
 """
     # Se houver senha de e-mail, envia a notificação para o vendedor e cópias
-    info_envio = configs_collection.find_one({'tipo': 'geral'})
-    email_principal = info_envio['email_smtp_principal'].split(':')[1]
-    email_secundario = info_envio['email_smtp_secundario'].split(':')[1]
-    servidor = info_envio['smtp']
-    porta = info_envio['porta']
-    copias = info_envio['email_copia']
-    senha_email = info_envio['senha_email_smtp']
-
-    if email_principal == 'true':
-        email_remetente = info_envio['email_smtp_principal'].split(':')[0]
-    elif email_secundario == 'true':
-        email_remetente = info_envio['email_smtp_secundario'].split(':')[0]
-
-    enviar_email(
+    # Configuração 'geral' tipada e em cache (app/configuracoes.py)
+    info_envio = obter_configuracoes(configs_collection).geral
+    servidor = info_envio.smtp
+    porta = info_envio.porta
+    copias = info_envio.email_copia
+    email_remetente = info_envio.email_remetente
+
+    # Apenas enfileira: o envio é feito pelo worker de e-mails (app/email_fila.py), que lê a senha SMTP
+    enfileirar_email(
         assunto=f'REENVIO - {data.get('nome').title()}',
         email_remetente=email_remetente,
         corpo=corpo_email,
         copias=copias,
-        senha_email=senha_email,
         email_destinatario=vendedor_doc['email'],
         servidor=servidor,
         porta=porta
     )
 
-def gerar_numero_venda():
+def gerar_numero_venda(prefixo=None):
     """
     Gera um número sequencial único para uma nova venda, baseado no ano e mês atual.
     O formato é 'yyyymmNNNN', onde NNNN é o sequencial no mês.
 
+    O sequencial vem de um contador por mês na coleção 'contadores', incrementado com um
+    único find_one_and_update atômico; assim, requisições simultâneas (mesmo em workers
+    diferentes) nunca recebem o mesmo número.
+
+    Args:
+        prefixo (str, optional): Ano e mês ('yyyymm') do número; padrão: mês atual. Usado ao
+            renumerar vendas repetidas de meses anteriores (app/indices.py).
+
     Returns:
         str: Novo número de venda gerado.
     """
-    now = datetime.now()
-    ano_mes = now.strftime('%Y%m')  # Ex: 202406
-    # Busca a última venda cadastrada no mês corrente
-    prefixo = f"{ano_mes}"
+    prefixo = prefixo or datetime.now().strftime('%Y%m')  # Ex: 202406
+    id_contador = f"venda_{prefixo}"
+    # Incrementa o contador do mês (caso comum: uma única operação no banco)
+    contador = contadores_collection.find_one_and_update(
+        {"_id": id_contador},
+        {"$inc": {"seq": 1}},
+        return_document=ReturnDocument.AFTER
+    )
+    if contador is None:
+        # Primeira venda do mês (ou contador ainda inexistente): inicializa a partir das vendas já gravadas
+        inicializar_contador_venda(prefixo)
+        contador = contadores_collection.find_one_and_update(
+            {"_id": id_contador},
+            {"$inc": {"seq": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    # Retorna no formato: 2024060001, 2024060002, etc
+    return f"{prefixo}{contador['seq']:04d}"
+
+def inicializar_contador_venda(prefixo):
+    """
+    Cria o contador de vendas do mês com o último sequencial já usado em 'vendas'.
+    Necessário para meses que já tinham vendas antes da existência do contador.
+    Usa $max, então pode ser chamada várias vezes (ou em paralelo) sem retroceder o contador.
+
+    Parâmetros:
+        prefixo (str): Ano e mês no formato 'yyyymm'.
+    """
+    # Busca a última venda cadastrada no mês (consulta feita só na inicialização do contador)
     ultima = vendas_collection.find_one(
         {"numero_da_venda": {"$regex": f"^{prefixo}"}},
         sort=[("numero_da_venda", -1)]
     )
-    # Se encontrou alguma, incrementa o sequencial, senão começa em 1
+    ultimo_seq = 0
     if ultima and "numero_da_venda" in ultima:
-        ultimo_seq = int(ultima["numero_da_venda"][-4:])
-        novo_seq = ultimo_seq + 1
-    else:
-        novo_seq = 1
-    # Retorna no formato: 2024060001, 2024060002, etc
-    return f"{prefixo}{novo_seq:04d}"
+        ultimo_seq = int(str(ultima["numero_da_venda"])[-4:])
+    try:
+        contadores_collection.update_one(
+            {"_id": f"venda_{prefixo}"},
+            {"$max": {"seq": ultimo_seq}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # Outro worker criou o contador ao mesmo tempo; o $max dele já vale
+        contadores_collection.update_one({"_id": f"venda_{prefixo}"}, {"$max": {"seq": ultimo_seq}})
 
 def incrementar_tentativas_login(username):
     """
@@ -442,13 +492,13 @@ def notificar_admins_bloqueio_sessao(minutos, tentativas):
     """
     Envia notificação por e-mail para todos admins sobre bloqueio de sessão.
     """
-    config = configs_collection.find_one({'tipo': 'geral'})
+    config = obter_configuracoes(configs_collection).geral
     if not config:
         return
-    servidor = config.get('smtp')
-    porta = config.get('porta')
-    senha_email = config.get('senha_email_smtp')
-    email_principal = config.get('email_smtp_principal', '').split(':')[0]
+    servidor = config.smtp
+    porta = config.porta
+    senha_email = config.senha_email_smtp
+    email_principal = config.remetente_principal
     admins = list(usuarios_collection.find({"tipo": "admin"}, {"email": 1}))
     emails_admin = [adm["email"] for adm in admins if adm.get("email")]
     if not emails_admin or not email_principal or not senha_email:
@@ -462,14 +512,14 @@ def notificar_admins_bloqueio_sessao(minutos, tentativas):
     <p>Tentativas acumuladas nesta sessão: {tentativas}</p>
     <p>Data/hora: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}</p>
     """
+    # Enfileira um e-mail por admin; o worker de e-mails faz o envio
     for email_destinatario in emails_admin:
         try:
-            enviar_email(
+            enfileirar_email(
                 assunto=assunto,
                 email_remetente=email_principal,
                 corpo=corpo,
                 copias="",
-                senha_email=senha_email,
                 email_destinatario=email_destinatario,
                 servidor=servidor,
                 porta=porta
@@ -508,7 +558,8 @@ def autenticar_usuario(username, senha):
 
 def enviar_email(assunto, email_remetente, corpo, servidor, porta, copias, email_destinatario, senha_email):
     """
-    Envia um e-mail de confirmação de venda.
+    Envia um e-mail de confirmação de venda imediatamente (conexão SMTP própria).
+    As rotas usam enfileirar_email; esta função fica para envios síncronos, como o teste de e-mail.
 
     Args:
         email_vendedor (str): E-mail do remetente (vendedor).
@@ -517,23 +568,8 @@ def enviar_email(assunto, email_remetente, corpo, servidor, porta, copias, email
         senha_email (str): Senha do e-mail do remetente.
         email_posvendas (str): E-mail do pós-vendas (destinatário principal).
     """
-    # Cria mensagem de e-mail
-    msg = EmailMessage()
-    msg['Subject'] = assunto
-    msg['From'] = email_remetente
-    msg['To'] = email_destinatario
-
-    # Adiciona destinatários em cópia, se houver
-    todos_destinatarios = [email_destinatario]
-    if copias:
-        copias = copias.split(',')
-        copias_limpa = [c.strip() for c in copias if c.strip()]
-        msg['Cc'] = ', '.join(copias_limpa)
-        todos_destinatarios += copias_limpa
-
-    # Corpo alternativo em HTML
-    msg.set_content("Este e-mail contém uma versão em HTML. Por favor, habilite a visualização de conteúdo.")
-    msg.add_alternative(corpo, subtype='html')
+    # Cria mensagem de e-mail (HTML + destinatários em cópia)
+    msg, todos_destinatarios = montar_mensagem_email(assunto, email_remetente, corpo, copias, email_destinatario)
 
     # Envia o e-mail via SMTP (usando Hostinger/simplobr)
     with smtplib.SMTP_SSL(servidor, porta) as smtp:
@@ -562,6 +598,7 @@ def cadastrar_produto_service(data):
         and fp.get('parcelas') not in [None, '', 0, '0']
         and fp.get('valor_parcela') not in [None, '', 0, '0']
     ]
+    # Produto novo: a escrita em produtos_collection invalida o catálogo em todos os workers
     return cadastrar_produto(codigo, nome, formas_pagamento_filtradas)
 
 def dados_valores_venda():
@@ -579,25 +616,10 @@ def dados_valores_venda():
                 ...
             }
     """
-    # Busca todos os produtos cadastrados no banco (sem o campo _id)
-    produtos = list(produtos_collection.find({}, {'_id': 0}))
-    
-    dict_produtos = {}
-    # Para cada produto, monta uma lista de condições de pagamento formatadas
-    for produto in produtos:
-        lista_condicoes = []
-        for condicoes in produto.get('formas_pagamento', []):
-            condicao_formatada = {
-                'condicao': f"{condicoes['tipo']} | {condicoes['parcelas']}",
-                'valor': condicoes['valor_total']
-            }
-            lista_condicoes.append(condicao_formatada)
-        
-        dict_produtos[produto['nome']] = lista_condicoes
-    
-    return dict_produtos
+    # Montado uma vez no catálogo de produtos (app/catalogo_produtos.py); a cópia protege o catálogo
+    return copy.deepcopy(obter_catalogo_produtos(produtos_collection).valores_venda)
 
-def gerar_pdf_graficos(selecao, nome_base, ano, mes):
+def gerar_pdf_graficos(selecao, nome_base, ano, mes, data_escolhida=None):
     """
     Gera um arquivo PDF contendo os gráficos selecionados pelo usuário, para o período (ano/mes) informado.
     Salva temporariamente as imagens dos gráficos e monta o PDF com cada gráfico em uma página.
@@ -607,15 +629,19 @@ def gerar_pdf_graficos(selecao, nome_base, ano, mes):
         nome_base (str): Nome base do arquivo PDF gerado.
         ano (int): Ano dos dados a serem exibidos.
         mes (int): Mês dos dados a serem exibidos.
+        data_escolhida (str, optional): Dia do gráfico de vendas diárias ('YYYY-MM-DD').
+            Se não informado, usa o dia guardado na sessão (quando há requisição).
 
     Returns:
         tuple: (buffer_pdf, nome_arquivo)
             buffer_pdf: arquivo PDF em memória (BytesIO)
             nome_arquivo: nome sugerido para download
     """
-    start = time.time()
-    data = session.get('data_grafico_vendas_diarias')
-    print(data)
+    start = time.perf_counter()
+    # Fora de uma requisição (worker de relatórios) o dia vem do pedido
+    data = data_escolhida
+    if data is None and has_request_context():
+        data = session.get('data_grafico_vendas_diarias')
 
     graficos_disponiveis = {
         "vendas_geral": ("grafico_vendas_geral.png", lambda a, m: gerar_fig_vendas_geral(soma_vendas)),
@@ -646,14 +672,35 @@ def gerar_pdf_graficos(selecao, nome_base, ano, mes):
     if not graficos_escolhidos:
         return "Nenhum gráfico selecionado.", None
 
+    tempo_montagem = time.perf_counter() - start
+
+    # Processos usados na conversão para PNG (PDF_PROCESSOS na configuração da aplicação)
+    processos = processos_padrao()
+    if has_app_context():
+        processos = current_app.config.get('PDF_PROCESSOS', processos)
+
     buffer = BytesIO()
 
     data_geracao = datetime.now().strftime("Gerado em: %d/%m/%Y %H:%M")
 
     with tempfile.TemporaryDirectory() as temp_dir:
-        for nome_arquivo, figura in graficos_escolhidos:
-            caminho = os.path.join(temp_dir, nome_arquivo)
-            pio.write_image(figura, caminho, format='png', width=1600, height=800, scale=4)
+        figuras = [(os.path.join(temp_dir, nome_arquivo), figura) for nome_arquivo, figura in graficos_escolhidos]
+        if processos > 1 and len(figuras) > 1:
+            # Conversões em paralelo no pool de processos (app/rasterizacao.py)
+            tempos = rasterizar_figuras(figuras, processos)
+        else:
+            inicio = time.perf_counter()
+            for caminho, figura in figuras:
+                pio.write_image(figura, caminho, format='png', width=LARGURA_PNG, height=ALTURA_PNG, scale=ESCALA_PNG)
+            duracao = time.perf_counter() - inicio
+            tempos = {'parede': duracao, 'soma': duracao, 'processos': 1}
+
+        # Tempos do relatório (debug): soma/parede mostra o ganho do paralelismo
+        logger.debug(
+            "PDF gráficos: %d figuras | montagem %.1fs | rasterização %.1fs (soma %.1fs, %.1fx com %d processo(s))",
+            len(figuras), tempo_montagem, tempos['parede'], tempos['soma'],
+            tempos['soma'] / max(tempos['parede'], 1e-9), tempos['processos']
+        )
 
         c = canvas.Canvas(buffer, pagesize=landscape(A4))
         largura, altura = landscape(A4)
@@ -664,12 +711,12 @@ def gerar_pdf_graficos(selecao, nome_base, ano, mes):
         for i in range(0, len(graficos_escolhidos), 2):
             if i < len(graficos_escolhidos):
                 img1_path = os.path.join(temp_dir, graficos_escolhidos[i][0])
-                img1 = ImageReader(img1_path)
+                img1 = reportlab_utils.ImageReader(img1_path)
 
                 if i + 1 < len(graficos_escolhidos):
                     # Dois gráficos na mesma página
                     img2_path = os.path.join(temp_dir, graficos_escolhidos[i + 1][0])
-                    img2 = ImageReader(img2_path)
+                    img2 = reportlab_utils.ImageReader(img2_path)
 
                     largura_img = largura - 40
                     altura_img = (altura - 60) / 2  # espaço para dois gráficos
@@ -704,7 +751,8 @@ def verificar_permissao_acesso(username):
     Retorno:
         bool: True se acesso aceito, False se bloqueado ou não encontrado.
     """
-    print(f"Verificando permissão de acesso para o usuário: {username}")
+    # Chamada a cada conferência do fluxo de notificações: só em nível debug
+    logger.debug("Verificando permissão de acesso para o usuário: %s", username)
     filtro = {}
     if username:
         filtro["username"] = username
@@ -729,8 +777,8 @@ def verifica_fone(fones_list: list) -> tuple:
     return (True, None) if fones_list else (True, None)
 
 def verifica_produto(produto: str) -> bool:
-    todos_produtos = list(produtos_collection.find({}, {'_id': 0, 'nome': 1}))
-    nomes_produtos = [p['nome'] for p in todos_produtos]
+    # Conjunto de nomes do catálogo de produtos em memória
+    nomes_produtos = obter_catalogo_produtos(produtos_collection).nomes
 
     if produto.startswith('Personalizado:'):
         # Considera "Personalizado: Produto X, Produto Y"
@@ -746,18 +794,8 @@ def verifica_produto(produto: str) -> bool:
     return produto in nomes_produtos
         
 def verifica_condicoes(condicoes: str) -> bool:
-    todas_condicoes = list(produtos_collection.find({}, {'_id': 0, 'formas_pagamento': 1}))
-
-    validacao = []
-
-    for produto in todas_condicoes:
-        formas_pagamento = produto.get('formas_pagamento', [])
-        for forma in formas_pagamento:
-            tipo = forma.get('tipo', '').strip()
-            parcelas = forma.get('parcelas', '').strip()
-            validacao.append(f"{tipo} | {parcelas}")
-    
-    return condicoes in validacao
+    # Conjunto 'TIPO | PARCELAS' do catálogo de produtos em memória
+    return condicoes in obter_catalogo_produtos(produtos_collection).condicoes
 
 def verifica_tipo_cliente(tipo_cliente:str) -> bool:
     possiveis_tipos_clientes = ['', 'verde', 'vermelho']
@@ -788,44 +826,54 @@ def verifica_status_vendas(status_venda:str) -> bool:
 
 def normalizar_valor(valor, padrao="0"):
     """
-    Converte valores para string com separador decimal ".", removendo ","
-    Se estiver vazio ou None, retorna o valor padrão.
+    Converte um valor monetário do formulário ("1.234,56", "10,50", 100) para float, como na
+    gravação de vendas novas (app/utils.py: converter_valor_monetario). Usada pela edição de
+    vendas: gravar texto faria o $sum dos gráficos ignorar a venda editada.
+    Se estiver vazio ou for inválido, retorna o valor padrão (convertido para número quando possível).
     """
-    if not valor:
-        return padrao
-    try:
-        # Substitui vírgula por ponto e remove espaços
-        valor_str = str(valor).replace(",", ".").strip()
-        float(valor_str)  # valida se é um número
-        return valor_str
-    except ValueError:
-        return padrao
+    numero = converter_valor_monetario(valor)
+    if numero is None:
+        padrao_numero = converter_valor_monetario(padrao)
+        return padrao if padrao_numero is None else padrao_numero
+    return numero
 
 from datetime import datetime, time as dt_time
 
+# Horários em que os acessos de todos os usuários são desligados (tarefa 'desligar_acessos'
+# do agendador, app/agendador.py)
+HORARIOS_DESLIGAMENTO = [
+    dt_time(19, 30, 5),
+    dt_time(20, 30, 5),
+    dt_time(21, 30, 5),
+    dt_time(23, 30, 5),
+    dt_time(0, 30, 5),
+    dt_time(1, 30, 5),
+    dt_time(2, 30, 5),
+    dt_time(3, 30, 5),
+    dt_time(4, 30, 5),
+    dt_time(5, 30, 5),
+]
+
+def desligar_acessos_usuarios():
+    """
+    Desliga a permissão de acesso de todos os usuários.
+
+    Retorna:
+        int: Quantidade de usuários desligados.
+    """
+    resultado = usuarios_collection.update_many(
+        {"permissa_acesso": {"$ne": "desligado"}},
+        {"$set": {"permissa_acesso": "desligado"}}
+    )
+    print("Todos deslogados")
+    return getattr(resultado, "modified_count", 0)
+
 def desligar_permissao_acesso_usuarios():
     agora = datetime.now()
     hora_atual = dt_time(agora.hour, agora.minute, agora.second)  # pega só hora e minuto
 
-    lista_horarios = [
-        dt_time(19, 30, 5),
-        dt_time(20, 30, 5),
-        dt_time(21, 30, 5),
-        dt_time(23, 30, 5),
-        dt_time(0, 30, 5),
-        dt_time(1, 30, 5),
-        dt_time(2, 30, 5),
-        dt_time(3, 30, 5),
-        dt_time(4, 30, 5),
-        dt_time(5, 30, 5),
-    ]
-
-    if hora_atual in lista_horarios:
-        usuarios_collection.update_many(
-            {"permissa_acesso": {"$ne": "desligado"}},
-            {"$set": {"permissa_acesso": "desligado"}}
-        )
-        print("Todos deslogados")
+    if hora_atual in HORARIOS_DESLIGAMENTO:
+        desligar_acessos_usuarios()
         return True
     return False
 
@@ -850,4 +898,19 @@ def registrar_notificacao(tipo, mensagem, venda=None, envolvidos=None):
         "envolvidos": envolvidos or [],              # Usernames que devem receber o aviso
         "venda_numero": venda.get("numero_da_venda") if venda else None  # Número da venda, se aplicável
     }
-    notificacoes_collection.insert_one(notificacao)   # Salva a notificação na collection
\ No newline at end of file
+    notificacoes_collection.insert_one(notificacao)   # Salva a notificação na collection
+    publicar_notificacao()                             # Acorda as conexões SSE abertas (/api/notificacoes/stream)
+
+def limpar_notificacoes_antigas(dias):
+    """
+    Remove as notificações registradas há mais de `dias` dias (tarefa 'limpar_notificacoes_logs'
+    do agendador).
+
+    Parâmetros:
+        dias (int): Dias de retenção.
+
+    Retorna:
+        int: Quantidade de notificações removidas.
+    """
+    limite = datetime.now() - timedelta(days=dias)
+    return notificacoes_collection.delete_many({"data_hora": {"$lt": limite}}).deleted_count
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+Módulo de sessão no servidor.
+Substitui a sessão em cookie assinado do Flask: os dados da sessão (usuário logado, venda em
+edição etc.) ficam guardados no servidor e o cookie carrega apenas o ID da sessão (assinado).
+
+Armazenamentos disponíveis:
+    ArmazenamentoMongo   -> coleção 'sessoes' com índice TTL (produção)
+    ArmazenamentoMemoria -> dicionário em memória (testes / desenvolvimento)
+"""
+
+import secrets
+from copy import deepcopy
+from datetime import datetime, timezone
+
+from flask.sessions import SessionInterface, SessionMixin
+from flask.json.tag import TaggedJSONSerializer
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+
+def _agora():
+    """
+    Data/hora atual em UTC (com fuso).
+    """
+    return datetime.now(timezone.utc)
+
+
+def _utc(data):
+    """
+    Garante fuso UTC (o MongoDB devolve datas sem fuso, já em UTC).
+    """
+    if data is not None and data.tzinfo is None:
+        return data.replace(tzinfo=timezone.utc)
+    return data
+
+
+class SessaoServidor(CallbackDict, SessionMixin):
+    """
+    Sessão guardada no servidor. Marca `modified` sempre que algum valor é alterado.
+    """
+
+    def __init__(self, dados=None, sid=None, nova=False, expira_em=None):
+        def ao_alterar(self):
+            self.modified = True
+        super().__init__(dados, ao_alterar)
+        self.sid = sid
+        self.new = nova
+        self.expira_em = expira_em
+        self.modified = False
+
+
+class ArmazenamentoMemoria:
+    """
+    Armazena as sessões em um dicionário do processo (não compartilhado entre workers).
+    """
+
+    def __init__(self):
+        self._sessoes = {}   # sid -> (dados serializados, expira_em)
+
+    def carregar(self, sid):
+        registro = self._sessoes.get(sid)
+        if registro is None:
+            return None
+        dados, expira_em = registro
+        if expira_em <= _agora():
+            self._sessoes.pop(sid, None)
+            return None
+        return deepcopy(dados), expira_em
+
+    def salvar(self, sid, dados, expira_em):
+        self._sessoes[sid] = (deepcopy(dados), expira_em)
+
+    def renovar(self, sid, expira_em):
+        if sid in self._sessoes:
+            self._sessoes[sid] = (self._sessoes[sid][0], expira_em)
+
+    def remover(self, sid):
+        self._sessoes.pop(sid, None)
+
+
+class ArmazenamentoMongo:
+    """
+    Armazena as sessões em uma coleção do MongoDB. O índice TTL em 'expira_em'
+    (declarado em app/indices.py) faz o próprio MongoDB apagar as sessões expiradas.
+    """
+
+    def __init__(self, colecao):
+        self.colecao = colecao
+
+    def carregar(self, sid):
+        documento = self.colecao.find_one({'_id': sid})
+        if documento is None:
+            return None
+        expira_em = _utc(documento['expira_em'])
+        # O TTL do MongoDB roda a cada ~60s; confere a expiração aqui também
+        if expira_em <= _agora():
+            return None
+        return documento['dados'], expira_em
+
+    def salvar(self, sid, dados, expira_em):
+        self.colecao.update_one(
+            {'_id': sid},
+            {'$set': {'dados': dados, 'expira_em': expira_em}},
+            upsert=True
+        )
+
+    def renovar(self, sid, expira_em):
+        self.colecao.update_one({'_id': sid}, {'$set': {'expira_em': expira_em}})
+
+    def remover(self, sid):
+        self.colecao.delete_one({'_id': sid})
+
+
+class SessaoServidorInterface(SessionInterface):
+    """
+    SessionInterface do Flask que guarda os dados no armazenamento informado
+    e coloca no cookie apenas o ID da sessão, assinado com a secret_key.
+
+    Para não gravar no banco a cada requisição, sessões não alteradas só têm a
+    expiração renovada quando já passou metade do tempo de vida.
+    """
+
+    serializador = TaggedJSONSerializer()
+    salt = 'sessao-servidor'
+
+    def __init__(self, armazenamento):
+        self.armazenamento = armazenamento
+
+    def _assinador(self, app):
+        return Signer(app.secret_key, salt=self.salt)
+
+    def _nova_sessao(self):
+        return SessaoServidor(sid=secrets.token_urlsafe(32), nova=True)
+
+    def open_session(self, app, request):
+        if not app.secret_key:
+            return None
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if not cookie:
+            return self._nova_sessao()
+        try:
+            sid = self._assinador(app).unsign(cookie).decode()
+        except BadSignature:
+            return self._nova_sessao()
+        registro = self.armazenamento.carregar(sid)
+        if registro is None:
+            return self._nova_sessao()
+        dados, expira_em = registro
+        return SessaoServidor(self.serializador.loads(dados), sid=sid, expira_em=expira_em)
+
+    def save_session(self, app, session, response):
+        nome = self.get_cookie_name(app)
+        dominio = self.get_cookie_domain(app)
+        caminho = self.get_cookie_path(app)
+
+        # Sessão esvaziada: apaga do armazenamento e remove o cookie
+        if not session:
+            if session.modified:
+                self.armazenamento.remover(session.sid)
+                response.delete_cookie(nome, domain=dominio, path=caminho)
+            return
+
+        expira_em = _agora() + app.permanent_session_lifetime
+        if session.modified or session.new:
+            self.armazenamento.salvar(session.sid, self.serializador.dumps(dict(session)), expira_em)
+        elif session.expira_em and session.expira_em - _agora() < app.permanent_session_lifetime / 2:
+            self.armazenamento.renovar(session.sid, expira_em)
+        else:
+            return
+
+        response.set_cookie(
+            nome,
+            self._assinador(app).sign(session.sid).decode(),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=dominio,
+            path=caminho,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
+
+
+def criar_interface_sessao(testing=False, backend=None):
+    """
+    Cria a interface de sessão conforme o ambiente.
+
+    Parâmetros:
+        testing (bool): Em testes usa o armazenamento em memória.
+        backend (str, opcional): 'mongo' ou 'memoria' (sobrepõe o padrão).
+
+    Retorna:
+        SessaoServidorInterface: Interface pronta para app.session_interface.
+    """
+    backend = backend or ('memoria' if testing else 'mongo')
+    if backend == 'memoria':
+        return SessaoServidorInterface(ArmazenamentoMemoria())
+    from app.models import db
+    armazenamento = ArmazenamentoMongo(db['sessoes'])
+    return SessaoServidorInterface(armazenamento)
@@ -0,0 +1,377 @@
+"""
+Módulo de snapshot mensal de vendas.
+Carrega uma única vez, por requisição, os vendedores ativos e as vendas aprovadas/faturadas
+de um mês (ano, mes) e compartilha esses dados entre todas as funções de gráficos
+(app/graficos.py) e de figuras para PDF (app/download.py).
+
+Assim, um dashboard completo ou um relatório em PDF faz uma ou duas consultas ao MongoDB
+por mês consultado, em vez de repetir a mesma busca em cada gráfico.
+
+Os gráficos que só precisam de totais por vendedor ou por estado (valor vendido, banco,
+verdes/vermelhos, novas/atualizações, mapa) usam os resumos agregados no próprio MongoDB
+($group): chega ao Python uma linha por vendedor (ou por estado), e não todas as vendas do mês.
+"""
+
+import threading
+from datetime import datetime
+
+# g guarda os snapshots durante a requisição; has_app_context evita erro fora do Flask
+from flask import g, has_app_context
+
+from app.utils import converter_valor_monetario
+
+# Status de vendas consideradas nos gráficos (aprovadas ou faturadas)
+STATUS_FATURADOS = ['Aprovada', 'Faturado']
+
+# Status de usuários considerados "ativos" para os gráficos
+STATUS_VENDEDORES_ATIVOS = ['ativo', 'bloqueado']
+
+# Campos da venda usados pelos gráficos (evita trafegar logs, observações etc.)
+CAMPOS_SNAPSHOT = {
+    '_id': 0,
+    'vendedor': 1,
+    'status': 1,
+    'data_criacao': 1,
+    'valor_real': 1,
+    'valor_tabela': 1,
+    'desconto_autorizado': 1,
+    'tipo_cliente': 1,
+    'produto': 1,
+    'endereco': 1
+}
+
+# Classificações usadas nos resumos (equivalem a .strip() + comparação sem maiúsculas)
+REGEX_VERDE = r'^\s*verde\s*$'
+REGEX_VERMELHO = r'^\s*vermelho\s*$'
+# "Atualização" com ou sem acento
+REGEX_ATUALIZACAO = r'^\s*atualiza[çÇcC][ãÃaA]o\s*$'
+
+
+# Campos monetários usados no resumo por vendedor
+CAMPOS_VALORES_RESUMO = ('valor_real', 'valor_tabela')
+
+
+def _numero(campo):
+    """
+    Expressão de agregação: o valor do campo se for número, senão 0 (vazio ou texto; as vendas
+    com texto são corrigidas em resumir_vendas_por_vendedor).
+    """
+    return {'$cond': [{'$isNumber': campo}, campo, 0]}
+
+
+def _eh_numero(valor):
+    """
+    Equivalente a $isNumber (bool não é número).
+    """
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+def _movimento_banco(valor_real, valor_tabela, desconto_autorizado):
+    """
+    Movimento no banco do vendedor calculado em Python (mesma regra de _MOVIMENTO_BANCO).
+    """
+    diferenca = valor_real - valor_tabela
+    return 0 if diferenca < 0 and desconto_autorizado is True else diferenca
+
+
+def _conta_se_casar(campo, regex):
+    """
+    Expressão de agregação: 1 se o texto do campo casar com a regex (sem diferenciar maiúsculas), senão 0.
+    """
+    # $regexMatch exige texto: números viram texto e campos vazios/ausentes viram ''
+    texto = {'$ifNull': [{'$toString': campo}, '']}
+    return {'$cond': [{'$regexMatch': {'input': texto, 'regex': regex, 'options': 'i'}}, 1, 0]}
+
+
+# Diferença entre o valor da venda e o valor de tabela
+_DIFERENCA = {'$subtract': [_numero('$valor_real'), _numero('$valor_tabela')]}
+
+# Movimento no banco do vendedor: desconto autorizado não desconta; o resto entra como diferença
+_MOVIMENTO_BANCO = {'$cond': [
+    {'$and': [{'$lt': [_DIFERENCA, 0]}, {'$eq': ['$desconto_autorizado', True]}]}, 0, _DIFERENCA
+]}
+
+
+def pipeline_resumo_vendedores(filtro):
+    """
+    Monta o pipeline que resume as vendas do filtro em uma linha por vendedor.
+
+    O resultado é um único documento com duas listas ($facet, uma só consulta):
+        resumo: uma linha por vendedor.
+        valores_texto: vendas com valor_real/valor_tabela em texto (gravadas antes da migração
+            ou pela edição antiga), que o resumo conta como 0 e resumir_vendas_por_vendedor corrige.
+
+    Cada linha do resumo traz:
+        total: soma de valor_real (textos como "1.234,56" também somam, ver valores_texto).
+        quantidade: número de vendas.
+        banco: soma dos movimentos do banco (valor_real - valor_tabela, sem descontos autorizados).
+        movimentos_banco: vendas que movimentaram o banco (diferença diferente de zero).
+        verdes, vermelhos: vendas por tipo de cliente.
+        com_produto: vendas com o campo produto (não nulo); produto_vazio: as com produto ''.
+        atualizacoes: vendas de "Atualização".
+
+    Parâmetros:
+        filtro (dict): Filtro das vendas ($match).
+
+    Retorna:
+        list: Pipeline para vendas_collection.aggregate.
+    """
+    resumo = [
+        {
+            '$group': {
+                '_id': '$vendedor',
+                # $sum ignora o que não for número (texto é corrigido em resumir_vendas_por_vendedor)
+                'total': {'$sum': '$valor_real'},
+                'quantidade': {'$sum': 1},
+                'banco': {'$sum': _MOVIMENTO_BANCO},
+                'movimentos_banco': {'$sum': {'$cond': [{'$ne': [_MOVIMENTO_BANCO, 0]}, 1, 0]}},
+                'verdes': {'$sum': _conta_se_casar('$tipo_cliente', REGEX_VERDE)},
+                'vermelhos': {'$sum': _conta_se_casar('$tipo_cliente', REGEX_VERMELHO)},
+                'com_produto': {'$sum': {'$cond': [{'$eq': [{'$ifNull': ['$produto', None]}, None]}, 0, 1]}},
+                'produto_vazio': {'$sum': {'$cond': [{'$eq': ['$produto', '']}, 1, 0]}},
+                'atualizacoes': {'$sum': _conta_se_casar('$produto', REGEX_ATUALIZACAO)}
+            }
+        },
+        {'$sort': {'_id': 1}}
+    ]
+    # $convert não entende o formato brasileiro ("1.234,56"); os poucos documentos com texto
+    # voltam crus e são convertidos com a mesma função da gravação (converter_valor_monetario)
+    valores_texto = [
+        {'$match': {'$or': [{campo: {'$type': 'string'}} for campo in CAMPOS_VALORES_RESUMO]}},
+        {'$project': {'_id': 0, 'vendedor': 1, 'valor_real': 1, 'valor_tabela': 1, 'desconto_autorizado': 1}}
+    ]
+    return [
+        {'$match': filtro},
+        {'$facet': {'resumo': resumo, 'valores_texto': valores_texto}}
+    ]
+
+
+def _corrigir_valores_texto(resumo, vendas_texto):
+    """
+    Ajusta total, banco e movimentos_banco do resumo para as vendas com valores em texto,
+    que o pipeline contou como 0.
+
+    Parâmetros:
+        resumo (dict): {vendedor: linha} de resumir_vendas_por_vendedor.
+        vendas_texto (list): Vendas da lista 'valores_texto' do pipeline.
+    """
+    for venda in vendas_texto:
+        linha = resumo.get(venda.get('vendedor'))
+        if linha is None:
+            continue
+        desconto = venda.get('desconto_autorizado')
+        # Como o pipeline enxergou a venda e como ela deveria ser somada
+        vistos = [venda.get(campo) if _eh_numero(venda.get(campo)) else 0 for campo in CAMPOS_VALORES_RESUMO]
+        corretos = [converter_valor_monetario(venda.get(campo)) or 0 for campo in CAMPOS_VALORES_RESUMO]
+
+        linha['total'] += corretos[0] - vistos[0]
+        antes = _movimento_banco(*vistos, desconto)
+        depois = _movimento_banco(*corretos, desconto)
+        linha['banco'] += depois - antes
+        linha['movimentos_banco'] += (depois != 0) - (antes != 0)
+
+
+def resumir_vendas_por_vendedor(vendas_collection, filtro):
+    """
+    Resume no MongoDB as vendas do filtro, uma linha por vendedor (ver pipeline_resumo_vendedores).
+
+    Parâmetros:
+        vendas_collection: Coleção de vendas.
+        filtro (dict): Filtro das vendas.
+
+    Retorna:
+        dict: {vendedor: {'total', 'quantidade', 'banco', 'movimentos_banco', 'verdes',
+               'vermelhos', 'com_produto', 'produto_vazio', 'atualizacoes'}}, em ordem de nome.
+    """
+    resultado = next(iter(vendas_collection.aggregate(pipeline_resumo_vendedores(filtro))), {})
+    resumo = {}
+    for linha in resultado.get('resumo', []):
+        resumo[linha.pop('_id')] = linha
+    _corrigir_valores_texto(resumo, resultado.get('valores_texto', []))
+    for linha in resumo.values():
+        linha['total'] = round(linha['total'], 2)
+        linha['banco'] = round(linha['banco'], 2)
+    return resumo
+
+
+def contar_vendas_por_estado(vendas_collection, filtro):
+    """
+    Conta no MongoDB as vendas do filtro por estado do endereço.
+
+    O endereço pode ser um dict com 'estado' ou, em vendas antigas, o próprio texto do estado;
+    a chave devolvida é o valor como está no banco (sem normalizar), e None/dict quando
+    não há estado. Quem chama normaliza as poucas chaves distintas.
+
+    Parâmetros:
+        vendas_collection: Coleção de vendas.
+        filtro (dict): Filtro das vendas.
+
+    Retorna:
+        list: [(estado, quantidade), ...]
+    """
+    pipeline = [
+        {'$match': filtro},
+        {'$group': {'_id': {'$ifNull': ['$endereco.estado', '$endereco']}, 'quantidade': {'$sum': 1}}}
+    ]
+    return [(linha['_id'], linha['quantidade']) for linha in vendas_collection.aggregate(pipeline)]
+
+
+def periodo_mes(ano=None, mes=None):
+    """
+    Calcula o intervalo [primeiro_dia, proximo_mes) de um mês.
+
+    Parâmetros:
+        ano (int, opcional): Ano de referência (padrão: ano atual).
+        mes (int, opcional): Mês de referência (padrão: mês atual).
+
+    Retorna:
+        tuple: (ano, mes, primeiro_dia, proximo_mes)
+    """
+    hoje = datetime.today()
+    ano = ano or hoje.year
+    mes = mes or hoje.month
+    primeiro_dia = datetime(ano, mes, 1)
+    if mes == 12:
+        proximo_mes = datetime(ano + 1, 1, 1)
+    else:
+        proximo_mes = datetime(ano, mes + 1, 1)
+    return ano, mes, primeiro_dia, proximo_mes
+
+
+class SnapshotMensal:
+    """
+    Dados de um mês carregados sob demanda e reaproveitados entre os gráficos.
+
+    Cada parte (vendedores ativos, vendas dos ativos, vendas de todos e os resumos agregados)
+    só é buscada no banco na primeira vez em que é acessada; os acessos seguintes usam o que já
+    foi carregado. Os dados retornados são compartilhados e não devem ser modificados pelos gráficos.
+
+    O snapshot pode ser usado por várias threads ao mesmo tempo (gráficos gerados em paralelo,
+    app/graficos_lote.py): cada parte é carregada por uma só thread e as demais esperam por ela.
+    """
+
+    def __init__(self, ano, mes, usuarios_collection, vendas_collection):
+        self.ano, self.mes, self.primeiro_dia, self.proximo_mes = periodo_mes(ano, mes)
+        self._usuarios_collection = usuarios_collection
+        self._vendas_collection = vendas_collection
+        self._dados = {}
+        self._travas = {}
+        self._trava = threading.Lock()
+
+    def _carregar(self, chave, carregar):
+        """
+        Retorna a parte `chave` do snapshot, chamando carregar() só na primeira vez.
+        """
+        if chave not in self._dados:
+            with self._trava:
+                trava = self._travas.setdefault(chave, threading.Lock())
+            with trava:
+                if chave not in self._dados:
+                    self._dados[chave] = carregar()
+        return self._dados[chave]
+
+    def filtro_mes(self, apenas_ativos=True):
+        """
+        Filtro das vendas aprovadas/faturadas do mês (opcionalmente só dos vendedores ativos).
+        """
+        filtro = {
+            'data_criacao': {'$gte': self.primeiro_dia, '$lt': self.proximo_mes},
+            'status': {'$in': STATUS_FATURADOS}
+        }
+        if apenas_ativos:
+            filtro['vendedor'] = {'$in': self.nomes_ativos}
+        return filtro
+
+    def _agregado(self, chave, funcao, apenas_ativos):
+        """
+        Executa (uma vez) uma agregação sobre as vendas do mês e guarda o resultado.
+        """
+        return self._carregar(
+            (chave, apenas_ativos), lambda: funcao(self._vendas_collection, self.filtro_mes(apenas_ativos))
+        )
+
+    @property
+    def vendedores_ativos(self):
+        """
+        Lista de vendedores com status 'ativo' ou 'bloqueado' (apenas 'nome_completo').
+        """
+        return self._carregar('vendedores_ativos', lambda: list(self._usuarios_collection.find(
+            {'status': {'$in': STATUS_VENDEDORES_ATIVOS}}, {'_id': 0, 'nome_completo': 1}
+        )))
+
+    @property
+    def nomes_ativos(self):
+        """
+        Lista com os nomes completos dos vendedores ativos.
+        """
+        return [v['nome_completo'] for v in self.vendedores_ativos]
+
+    @property
+    def vendas_ativos(self):
+        """
+        Vendas aprovadas/faturadas do mês feitas apenas por vendedores ativos.
+        """
+        return self._carregar('vendas_ativos', lambda: list(
+            self._vendas_collection.find(self.filtro_mes(), CAMPOS_SNAPSHOT)
+        ))
+
+    @property
+    def vendas_todos(self):
+        """
+        Vendas aprovadas/faturadas do mês de todos os vendedores (usado pelas figuras do PDF).
+        """
+        return self._carregar('vendas_todos', lambda: list(
+            self._vendas_collection.find(self.filtro_mes(apenas_ativos=False), CAMPOS_SNAPSHOT)
+        ))
+
+    @property
+    def resumo_ativos(self):
+        """
+        Resumo por vendedor (resumir_vendas_por_vendedor) das vendas do mês dos vendedores ativos.
+        """
+        return self._agregado('resumo', resumir_vendas_por_vendedor, apenas_ativos=True)
+
+    @property
+    def resumo_todos(self):
+        """
+        Resumo por vendedor das vendas do mês de todos os vendedores (figuras do PDF).
+        """
+        return self._agregado('resumo', resumir_vendas_por_vendedor, apenas_ativos=False)
+
+    @property
+    def estados_ativos(self):
+        """
+        Contagem por estado (contar_vendas_por_estado) das vendas do mês dos vendedores ativos.
+        """
+        return self._agregado('estados', contar_vendas_por_estado, apenas_ativos=True)
+
+
+def obter_snapshot_mensal(ano, mes, usuarios_collection, vendas_collection):
+    """
+    Retorna o snapshot do mês (ano, mes), reaproveitando o da requisição atual se já existir.
+
+    Dentro de um contexto Flask, o snapshot fica em `g` e é compartilhado por todos os
+    gráficos da mesma requisição (ex: todas as figuras de um PDF). Fora do Flask
+    (scripts, testes), um novo snapshot é criado a cada chamada.
+
+    Parâmetros:
+        ano (int): Ano de referência.
+        mes (int): Mês de referência.
+        usuarios_collection: Coleção de usuários usada pelo módulo chamador.
+        vendas_collection: Coleção de vendas usada pelo módulo chamador.
+
+    Retorna:
+        SnapshotMensal: Dados do mês carregados sob demanda.
+    """
+    if not has_app_context():
+        return SnapshotMensal(ano, mes, usuarios_collection, vendas_collection)
+
+    snapshots = g.setdefault('snapshots_mensais', {})
+    ano, mes, _, _ = periodo_mes(ano, mes)
+    # As coleções entram na chave para que módulos com coleções diferentes não se misturem
+    chave = (ano, mes, id(usuarios_collection), id(vendas_collection))
+    snapshot = snapshots.get(chave)
+    if snapshot is None:
+        # setdefault é atômico: threads da mesma requisição ficam todas com o mesmo snapshot
+        snapshot = snapshots.setdefault(chave, SnapshotMensal(ano, mes, usuarios_collection, vendas_collection))
+    return snapshot
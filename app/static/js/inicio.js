@@ -90,33 +90,87 @@ document.addEventListener('DOMContentLoaded', function() {
     mapa_vendas_por_estado: 'Mapa Vendas por Estado'
   };
 
+  // Figuras já recebidas pelo lote (/api/graficos/lote), desenhadas quando a aba é aberta
+  const figurasLote = {};
+
+  const abaAtiva = () => {
+    const aba = document.querySelector('.tab-menu.active');
+    return aba ? aba.getAttribute('data-tab') : null;
+  };
+
   const carregarGrafico = (idGrafico) => {
     const container = document.querySelector(`.grafico-tab.${idGrafico} .grafico-conteudo`);
-    if (!container || container.dataset.carregado === "true") return;
+    if (!container || container.dataset.carregado === "true" || container.dataset.carregando === "true") return;
+    container.dataset.carregando = "true";
   
     const params = new URLSearchParams(window.location.search);
   
-    fetch(`/grafico/${idGrafico}?${params}`)
-      .then(res => res.json())
-      .then(data => {
-        container.innerHTML = data.grafico_html;
-
-        // Força execução dos <script> dentro do HTML inserido
-        const scripts = container.querySelectorAll("script");
-        scripts.forEach(oldScript => {
-          const newScript = document.createElement("script");
-          if (oldScript.src) {
-            newScript.src = oldScript.src;
-          } else {
-            newScript.textContent = oldScript.textContent;
-          }
-          oldScript.parentNode.replaceChild(newScript, oldScript);
-        });
-
+    // Usa a figura do lote, se já chegou; senão pede só este gráfico.
+    // Só a figura (JSON) vem do servidor; o plotly.js local (já em cache) desenha com Plotly.react
+    const figura = figurasLote[idGrafico]
+      ? Promise.resolve(figurasLote[idGrafico])
+      : fetch(`/api/grafico/${idGrafico}/figura?${params}`)
+          .then(res => {
+            if (!res.ok) throw new Error(res.status);
+            return res.json();
+          })
+          .then(data => data.figura);
+
+    figura
+      .then(fig => {
+        container.innerHTML = "";
+        return Plotly.react(container, fig.data, fig.layout, { responsive: true });
+      })
+      .then(() => {
         container.dataset.carregado = "true";
       })
       .catch(() => {
         container.innerHTML = "<p>Erro ao carregar gráfico.</p>";
+      })
+      .finally(() => {
+        container.dataset.carregando = "false";
+      });
+  };
+
+  // Pede todos os gráficos numa só requisição: o servidor gera em paralelo e envia cada
+  // figura (uma linha NDJSON) assim que fica pronta. A aba ativa é desenhada ao chegar.
+  const carregarLote = () => {
+    const ids = Array.from(tabs).map(tab => tab.getAttribute('data-tab'));
+    const params = new URLSearchParams(window.location.search);
+    params.set('graficos', ids.join(','));
+
+    const processarLinha = (linha) => {
+      if (!linha.trim()) return;
+      const item = JSON.parse(linha);
+      // Gráfico com erro: a aba pede o gráfico sozinho quando for aberta
+      if (!item.figura) return;
+      figurasLote[item.nome] = item.figura;
+      if (item.nome === abaAtiva()) carregarGrafico(item.nome);
+    };
+
+    fetch(`/api/graficos/lote?${params}`)
+      .then(res => {
+        if (!res.ok || !res.body) throw new Error(res.status);
+        const leitor = res.body.getReader();
+        const decodificador = new TextDecoder();
+        let pendente = "";
+        const ler = () => leitor.read().then(({ done, value }) => {
+          if (done) {
+            processarLinha(pendente);
+            return;
+          }
+          pendente += decodificador.decode(value, { stream: true });
+          const linhas = pendente.split("\n");
+          pendente = linhas.pop();
+          linhas.forEach(processarLinha);
+          return ler();
+        });
+        return ler();
+      })
+      .catch(() => {})
+      .finally(() => {
+        // Sem o lote (ou com erro no gráfico), a aba ativa busca o próprio gráfico
+        if (abaAtiva()) carregarGrafico(abaAtiva());
       });
   };
 
@@ -137,11 +191,10 @@ document.addEventListener('DOMContentLoaded', function() {
         }
       }, 100);
     });
-
-    const abaAtiva = document.querySelector('.tab-menu.active');
-    if (abaAtiva) carregarGrafico(abaAtiva.getAttribute('data-tab'));
   });
 
+  carregarLote();
+
   // Força resize do gráfico ativo ao carregar (corrige bug inicial)
   setTimeout(() => {
     const activeTab = document.querySelector('.grafico-tab.active .js-plotly-plot');
@@ -344,94 +344,126 @@ if (!['vanessa.rocha', 'douglas.bessa'].includes(user.username)) {
   // Controle de notificações já exibidas (evita repetir)
   let notificacoesExibidas = new Set();
 
+  // Busca as notificações uma vez (usado no fallback e após marcar como lidas)
   function atualizarNotificacoes() {
     const user = JSON.parse(localStorage.getItem('user') || '{}');
     if (!user.username) return;
     fetch('/api/notificacoes')
       .then(r => r.json())
-      .then(notifs => {
-        const badge = document.querySelector('.notificacoes .badge');
-        if (badge) {
-          badge.textContent = notifs.length > 0 ? notifs.length : '';
-          badge.style.display = notifs.length > 0 ? '' : 'none';
+      .then(renderizarNotificacoes);
+  }
+
+  // Atualiza badge, lista e notificações do navegador com a lista recebida
+  function renderizarNotificacoes(notifs) {
+    const badge = document.querySelector('.notificacoes .badge');
+    if (badge) {
+      badge.textContent = notifs.length > 0 ? notifs.length : '';
+      badge.style.display = notifs.length > 0 ? '' : 'none';
+    }
+    // Exibe lista ao clicar no sino
+    const icone = document.querySelector('.notificacoes .icone-notificacao');
+    if (icone) {
+      icone.onclick = function() {
+        let lista = document.getElementById('notificacoes-lista');
+        if (!lista) {
+          lista = document.createElement('div');
+          lista.id = 'notificacoes-lista';
+          lista.style.position = 'absolute';
+          lista.style.top = '30px';
+          lista.style.right = '0';
+          lista.style.background = '#fff';
+          lista.style.border = '1px solid #ccc';
+          lista.style.zIndex = 9999;
+          lista.style.minWidth = '250px';
+          lista.style.maxWidth = '350px';
+          lista.style.maxHeight = '350px';
+          lista.style.overflowY = 'auto';
+          lista.style.boxShadow = '0 2px 8px rgba(0,0,0,0.15)';
+          document.querySelector('.notificacoes').appendChild(lista);
         }
-        // Exibe lista ao clicar no sino
-        const icone = document.querySelector('.notificacoes .icone-notificacao');
-        if (icone) {
-          icone.onclick = function() {
-            let lista = document.getElementById('notificacoes-lista');
-            if (!lista) {
-              lista = document.createElement('div');
-              lista.id = 'notificacoes-lista';
-              lista.style.position = 'absolute';
-              lista.style.top = '30px';
-              lista.style.right = '0';
-              lista.style.background = '#fff';
-              lista.style.border = '1px solid #ccc';
-              lista.style.zIndex = 9999;
-              lista.style.minWidth = '250px';
-              lista.style.maxWidth = '350px';
-              lista.style.maxHeight = '350px';
-              lista.style.overflowY = 'auto';
-              lista.style.boxShadow = '0 2px 8px rgba(0,0,0,0.15)';
-              document.querySelector('.notificacoes').appendChild(lista);
-            }
-            lista.innerHTML = '';
-            if (notifs.length === 0) {
-              lista.innerHTML = '<div style="padding:12px;">Sem notificações novas.</div>';
-            } else {
-              notifs.forEach(n => {
-                const div = document.createElement('div');
-                div.style.padding = '10px';
-                div.style.borderBottom = '1px solid #eee';
-                div.style.cursor = 'pointer';
-                div.innerHTML = `<b>${n.mensagem}</b><br><small>${n.data_hora}</small>`;
-                lista.appendChild(div);
-              });
-              // Marca todas como lidas ao abrir a lista
-              const ids = notifs.map(n => n._id);
-              if (ids.length > 0) {
-                fetch('/api/notificacoes/marcar_lida', {
-                  method: 'POST',
-                  headers: {
-                    'Content-Type': 'application/json'
-                  },
-                  body: JSON.stringify({id: ids})
-                }).then(() => {
-                  setTimeout(atualizarNotificacoes, 300); // Atualiza badge após marcar lidas
-                });
-              }
-            }
-            // Fecha ao clicar fora
-            document.addEventListener('click', function handler(e) {
-              if (!lista.contains(e.target) && !icone.contains(e.target)) {
-                lista.remove();
-                document.removeEventListener('click', handler);
-              }
+        lista.innerHTML = '';
+        if (notifs.length === 0) {
+          lista.innerHTML = '<div style="padding:12px;">Sem notificações novas.</div>';
+        } else {
+          notifs.forEach(n => {
+            const div = document.createElement('div');
+            div.style.padding = '10px';
+            div.style.borderBottom = '1px solid #eee';
+            div.style.cursor = 'pointer';
+            div.innerHTML = `<b>${n.mensagem}</b><br><small>${n.data_hora}</small>`;
+            lista.appendChild(div);
+          });
+          // Marca todas como lidas ao abrir a lista
+          const ids = notifs.map(n => n._id);
+          if (ids.length > 0) {
+            fetch('/api/notificacoes/marcar_lida', {
+              method: 'POST',
+              headers: {
+                'Content-Type': 'application/json'
+              },
+              body: JSON.stringify({id: ids})
+            }).then(() => {
+              setTimeout(atualizarNotificacoes, 300); // Atualiza badge após marcar lidas
             });
-          };
+          }
         }
+        // Fecha ao clicar fora
+        document.addEventListener('click', function handler(e) {
+          if (!lista.contains(e.target) && !icone.contains(e.target)) {
+            lista.remove();
+            document.removeEventListener('click', handler);
+          }
+        });
+      };
+    }
 
-        // Notificação navegador + som para novas notificações
-        if (window.Notification && Notification.permission === "granted") {
-          notifs.forEach(n => {
-            if (!notificacoesExibidas.has(n._id)) {
-              // Detecta status da mensagem
-              let status = '';
-              if (n.mensagem && typeof n.mensagem === 'string') {
-                const msg = n.mensagem.toLowerCase();
-                if (msg.includes('status: aprovada')) status = 'aprovada';
-                else if (msg.includes('status: marcada para refazer') || msg.includes('status: refazer')) status = 'refazer';
-              }
-              notificarNavegador("Nova notificação", n.mensagem, status);
-              notificacoesExibidas.add(n._id);
-            }
-          });
+    // Notificação navegador + som para novas notificações
+    if (window.Notification && Notification.permission === "granted") {
+      notifs.forEach(n => {
+        if (!notificacoesExibidas.has(n._id)) {
+          // Detecta status da mensagem
+          let status = '';
+          if (n.mensagem && typeof n.mensagem === 'string') {
+            const msg = n.mensagem.toLowerCase();
+            if (msg.includes('status: aprovada')) status = 'aprovada';
+            else if (msg.includes('status: marcada para refazer') || msg.includes('status: refazer')) status = 'refazer';
+          }
+          notificarNavegador("Nova notificação", n.mensagem, status);
+          notificacoesExibidas.add(n._id);
         }
       });
+    }
+  }
+
+  // Intervalo da consulta de reserva, usada só se o stream não estiver disponível (30s)
+  const INTERVALO_FALLBACK_MS = 30000;
+  let fallbackAtivo = null;
+
+  function iniciarFallbackNotificacoes() {
+    if (fallbackAtivo) return;
+    atualizarNotificacoes();
+    fallbackAtivo = setInterval(atualizarNotificacoes, INTERVALO_FALLBACK_MS);
+  }
+
+  // Recebe as notificações por Server-Sent Events: o servidor só envia quando a lista muda
+  function iniciarStreamNotificacoes() {
+    const user = JSON.parse(localStorage.getItem('user') || '{}');
+    if (!user.username) return;
+    if (!window.EventSource) {
+      iniciarFallbackNotificacoes();
+      return;
+    }
+    const stream = new EventSource('/api/notificacoes/stream');
+    stream.onmessage = function(evento) {
+      renderizarNotificacoes(JSON.parse(evento.data));
+    };
+    stream.onerror = function() {
+      // O navegador reconecta sozinho; se a conexão foi encerrada de vez, usa a consulta periódica
+      if (stream.readyState === EventSource.CLOSED) {
+        iniciarFallbackNotificacoes();
+      }
+    };
   }
 
-  // Atualiza a cada 1s
-  setInterval(atualizarNotificacoes, 1000);
-  document.addEventListener('DOMContentLoaded', atualizarNotificacoes);
+  document.addEventListener('DOMContentLoaded', iniciarStreamNotificacoes);
 }
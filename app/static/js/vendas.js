@@ -1,117 +1,100 @@
-// Paginação em JS
-  document.addEventListener('DOMContentLoaded', function() {
-    const linhas = Array.from(document.querySelectorAll('#tabela-vendas-body tr'));
-    const linhasPorPagina = 8;
-    let paginaAtual = 1;
-    const totalPaginas = Math.ceil(linhas.length / linhasPorPagina);
-    const paginacaoDiv = document.getElementById('paginacao-vendas');
-
-    function renderTabela() {
-      linhas.forEach((linha, idx) => {
-        linha.style.display = (
-          idx >= (paginaAtual-1)*linhasPorPagina && idx < paginaAtual*linhasPorPagina
-        ) ? '' : 'none';
-      });
+// Carregamento incremental da tabela: busca as próximas páginas em /api/vendas ao rolar a tela
+  const CORES_STATUS = {
+    aprovada: ['#27ae60', 'white', 'Aprovada'],
+    cancelada: ['#e74c3c', 'white', 'Cancelada'],
+    finalizada: ['#2980f2', 'white', 'Finalizada'],
+    aguardando: ['#f1c40f', '#333', 'Aguardando'],
+    refazer: ['#34495e', 'white', 'Refazer'],
+    faturado: ['#8e44ad', 'white', 'Faturado']
+  };
 
-      // Preencher linhas vazias para manter 5 linhas
-      let tbody = document.getElementById('tabela-vendas-body');
-      // Removes linhas vazias antigas
-      Array.from(tbody.querySelectorAll('tr.linha-vazia')).forEach(tr => tr.remove());
-      let linhasVisiveis = linhas.filter((_, idx) =>
-        idx >= (paginaAtual-1)*linhasPorPagina && idx < paginaAtual*linhasPorPagina
-      ).length;
-      for (let i = linhasVisiveis; i < linhasPorPagina; i++) {
-        let tr = document.createElement('tr');
-        tr.className = 'linha-vazia';
-        tr.innerHTML = '<td colspan="9" style="visibility:hidden;">&nbsp;</td>';
-        tbody.appendChild(tr);
-      }
+  // Cria uma célula com texto (sem interpretar HTML) e, opcionalmente, com corte + title
+  function criarCelula(texto, corte) {
+    const td = document.createElement('td');
+    td.textContent = texto;
+    if (corte) {
+      td.className = 'td-corte';
+      td.title = texto;
     }
+    return td;
+  }
 
-    function renderPaginacao() {
-      paginacaoDiv.innerHTML = '';
-      // Botão anterior
-      let btnAnt = document.createElement('button');
-      btnAnt.innerHTML = '&laquo;';
-      btnAnt.disabled = paginaAtual === 1;
-      btnAnt.onclick = () => { paginaAtual--; atualizar(); };
-      paginacaoDiv.appendChild(btnAnt);
+  // Monta a linha da tabela de uma venda (mesmo formato das linhas renderizadas em vendas.html)
+  function criarLinhaVenda(venda) {
+    const status = (venda.status || '').toLowerCase();
+    const tr = document.createElement('tr');
+    tr.dataset.numeroVenda = venda.numero_da_venda || '';
+    tr.dataset.status = status;
 
-      // Lógica de paginação compacta
-      // Exemplo: (1) ... (10)(11)(12) ... (26)
-      if (totalPaginas <= 5) {
-        // Poucas páginas: mostra todas
-        for (let p = 1; p <= totalPaginas; p++) {
-          let btn = document.createElement('button');
-          btn.textContent = p;
-          if (p === paginaAtual) btn.className = 'ativo';
-          btn.onclick = () => { paginaAtual = p; atualizar(); };
-          paginacaoDiv.appendChild(btn);
-        }
-      } else {
-        // Sempre mostra o primeiro botão
-        let btnPrimeiro = document.createElement('button');
-        btnPrimeiro.textContent = 1;
-        if (paginaAtual === 1) btnPrimeiro.className = 'ativo';
-        btnPrimeiro.onclick = () => { paginaAtual = 1; atualizar(); };
-        paginacaoDiv.appendChild(btnPrimeiro);
+    tr.appendChild(criarCelula(venda.numero_da_venda || ''));
+    tr.appendChild(criarCelula(venda.vendedor || '', true));
+    tr.appendChild(criarCelula(venda.nome || '', true));
+    tr.appendChild(criarCelula(venda.cnpj_cpf || '', true));
+    tr.appendChild(criarCelula(venda.produto === 'Atualização' ? 'Atualização' : 'Venda nova'));
+    tr.appendChild(criarCelula(venda.produto || '', true));
+    tr.appendChild(criarCelula(venda.valor_tabela !== undefined ? 'R$' + venda.valor_tabela : '-'));
+    tr.appendChild(criarCelula('R$' + (venda.valor_real ?? '')));
 
-        // Reticências após o primeiro, se necessário
-        if (paginaAtual > 3) {
-          let span = document.createElement('span');
-          span.textContent = '...';
-          span.style.margin = '0 4px';
-          paginacaoDiv.appendChild(span);
-        }
+    const tdStatus = document.createElement('td');
+    tdStatus.className = 'td-corte';
+    if (status === 'cancelada' && venda.obs_vendas) {
+      tdStatus.dataset.obsVendas = venda.obs_vendas;
+      tdStatus.style.cursor = 'pointer';
+      tdStatus.style.position = 'relative';
+    }
+    const span = document.createElement('span');
+    const cores = CORES_STATUS[status];
+    if (cores) {
+      span.style.cssText = `background:${cores[0]};color:${cores[1]};padding:2px 10px;border-radius:10px;`;
+      span.textContent = cores[2];
+    } else {
+      span.textContent = status.charAt(0).toUpperCase() + status.slice(1);
+    }
+    tdStatus.appendChild(span);
+    tr.appendChild(tdStatus);
+    return tr;
+  }
 
-        // Botões centrais dinâmicos
-        let start = Math.max(2, paginaAtual - 1);
-        let end = Math.min(totalPaginas - 1, paginaAtual + 1);
-        if (paginaAtual <= 2) {
-          end = 4;
-        }
-        if (paginaAtual >= totalPaginas - 1) {
-          start = totalPaginas - 3;
-        }
-        for (let p = start; p <= end; p++) {
-          if (p <= 1 || p >= totalPaginas) continue;
-          let btn = document.createElement('button');
-          btn.textContent = p;
-          if (p === paginaAtual) btn.className = 'ativo';
-          btn.onclick = () => { paginaAtual = p; atualizar(); };
-          paginacaoDiv.appendChild(btn);
-        }
+  document.addEventListener('DOMContentLoaded', function() {
+    const tbody = document.getElementById('tabela-vendas-body');
+    const indicador = document.getElementById('paginacao-vendas');
+    if (!tbody || !indicador) return;
 
-        // Reticências antes do último, se necessário
-        if (paginaAtual < totalPaginas - 2) {
-          let span = document.createElement('span');
-          span.textContent = '...';
-          span.style.margin = '0 4px';
-          paginacaoDiv.appendChild(span);
-        }
+    let proximoCursor = tbody.dataset.proximoCursor || '';
+    let carregando = false;
 
-        // Sempre mostra o último botão
-        let btnUltimo = document.createElement('button');
-        btnUltimo.textContent = totalPaginas;
-        if (paginaAtual === totalPaginas) btnUltimo.className = 'ativo';
-        btnUltimo.onclick = () => { paginaAtual = totalPaginas; atualizar(); };
-        paginacaoDiv.appendChild(btnUltimo);
+    async function carregarProximaPagina() {
+      if (carregando || !proximoCursor) return;
+      carregando = true;
+      indicador.textContent = 'Carregando vendas...';
+      try {
+        // Repete os filtros da tela (busca, período, status) e acrescenta o cursor
+        const params = new URLSearchParams(window.location.search);
+        params.set('cursor', proximoCursor);
+        const resposta = await fetch('/api/vendas?' + params.toString());
+        if (!resposta.ok) throw new Error();
+        const pagina = await resposta.json();
+        pagina.vendas.forEach(venda => tbody.appendChild(criarLinhaVenda(venda)));
+        proximoCursor = pagina.proximo_cursor || '';
+        indicador.textContent = '';
+      } catch (e) {
+        indicador.textContent = 'Erro ao carregar mais vendas.';
+        proximoCursor = '';
+      }
+      carregando = false;
+      // Se a página ainda não encheu a tela, o observador não dispara de novo: continua carregando
+      if (proximoCursor && indicador.getBoundingClientRect().top < window.innerHeight) {
+        carregarProximaPagina();
       }
-
-      // Botão próximo
-      let btnProx = document.createElement('button');
-      btnProx.innerHTML = '&raquo;';
-      btnProx.disabled = paginaAtual === totalPaginas;
-      btnProx.onclick = () => { paginaAtual++; atualizar(); };
-      paginacaoDiv.appendChild(btnProx);
     }
 
-    function atualizar() {
-      renderTabela();
-      renderPaginacao();
+    // Carrega a próxima página quando o fim da tabela aparece na tela
+    if (proximoCursor) {
+      const observador = new IntersectionObserver(entradas => {
+        if (entradas.some(e => e.isIntersecting)) carregarProximaPagina();
+      }, { rootMargin: '200px' });
+      observador.observe(indicador);
     }
-
-    atualizar();
   });
 
   // Seleção unitária de venda
@@ -135,16 +118,17 @@
       }
     }
 
-    Array.from(tabelaBody.querySelectorAll('tr')).forEach(tr => {
+    // Delegação: vale também para as linhas carregadas depois, ao rolar a tabela
+    tabelaBody.addEventListener('click', function(e) {
+      const tr = e.target.closest('tr[data-numero-venda]');
+      if (!tr) return;
       const numeroVenda = tr.dataset.numeroVenda;
-      tr.addEventListener('click', function() {
-        if (vendaSelecionadaNumero === numeroVenda) {
-          vendaSelecionadaNumero = null;
-        } else {
-          vendaSelecionadaNumero = numeroVenda;
-        }
-        atualizarSelecao();
-      });
+      if (vendaSelecionadaNumero === numeroVenda) {
+        vendaSelecionadaNumero = null;
+      } else {
+        vendaSelecionadaNumero = numeroVenda;
+      }
+      atualizarSelecao();
     });
 
     if (btnEditar) {
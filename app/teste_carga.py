@@ -0,0 +1,138 @@
+"""
+Teste de carga simples (somente biblioteca padrão) para comparar servidores: o servidor de
+desenvolvimento (python run.py) com o de produção (gunicorn -c gunicorn.conf.py wsgi:app).
+
+Cada cliente é uma thread com conexão keep-alive própria que repete as requisições (alternando
+entre os caminhos informados) durante o tempo definido. O resultado traz requisições por
+segundo, latências (p50/p95/p99) e erros.
+
+Uso pela linha de comando:
+    python -m app.teste_carga http://127.0.0.1:5000 /api/notificacoes /api/vendas \\
+        --clientes 32 --segundos 20 --cookie "session=..."
+"""
+
+import argparse
+import http.client
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def percentil(valores, p):
+    """
+    Percentil `p` (0-100) de uma lista já ordenada (vizinho mais próximo).
+    """
+    if not valores:
+        return 0.0
+    indice = min(len(valores) - 1, max(0, round(p / 100 * len(valores)) - 1))
+    return valores[indice]
+
+
+def resumir_carga(latencias, erros, segundos):
+    """
+    Resume as medições.
+
+    Args:
+        latencias (list): Latências (s) das respostas com sucesso (status < 500).
+        erros (int): Respostas 5xx e falhas de conexão.
+        segundos (float): Duração efetiva do teste.
+
+    Returns:
+        dict: requisicoes, erros, req_s, p50_ms, p95_ms, p99_ms, max_ms.
+    """
+    latencias = sorted(latencias)
+    return {
+        'requisicoes': len(latencias),
+        'erros': erros,
+        'req_s': round(len(latencias) / segundos, 1) if segundos else 0.0,
+        'p50_ms': round(percentil(latencias, 50) * 1000, 1),
+        'p95_ms': round(percentil(latencias, 95) * 1000, 1),
+        'p99_ms': round(percentil(latencias, 99) * 1000, 1),
+        'max_ms': round(latencias[-1] * 1000, 1) if latencias else 0.0,
+    }
+
+
+def medir_carga(url, caminhos, clientes=16, segundos=10, cookie=None):
+    """
+    Executa o teste de carga.
+
+    Args:
+        url (str): Endereço do servidor (ex: http://127.0.0.1:5000).
+        caminhos (list): Caminhos requisitados em rodízio por cada cliente.
+        clientes (int): Clientes simultâneos.
+        segundos (float): Duração do teste.
+        cookie (str, opcional): Cabeçalho Cookie (ex: sessão de um usuário logado).
+
+    Returns:
+        dict: Resultado de resumir_carga.
+    """
+    partes = urlsplit(url)
+    cabecalhos = {'Cookie': cookie} if cookie else {}
+    latencias = []
+    erros = [0]
+    trava = threading.Lock()
+    fim = time.perf_counter() + segundos
+
+    def cliente(deslocamento):
+        conexao = None
+        minhas, meus_erros, i = [], 0, deslocamento
+        while time.perf_counter() < fim:
+            caminho = caminhos[i % len(caminhos)]
+            i += 1
+            inicio = time.perf_counter()
+            try:
+                try:
+                    if conexao is None:
+                        conexao = http.client.HTTPConnection(partes.hostname, partes.port or 80, timeout=30)
+                    conexao.request('GET', caminho, headers=cabecalhos)
+                    resposta = conexao.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    # Conexão keep-alive fechada pelo servidor (ex: worker reciclado): tenta
+                    # de novo uma vez em conexão nova, como fazem os navegadores
+                    conexao.close()
+                    conexao = http.client.HTTPConnection(partes.hostname, partes.port or 80, timeout=30)
+                    conexao.request('GET', caminho, headers=cabecalhos)
+                    resposta = conexao.getresponse()
+                resposta.read()
+                if resposta.status >= 500:
+                    meus_erros += 1
+                else:
+                    minhas.append(time.perf_counter() - inicio)
+                if resposta.will_close:
+                    conexao.close()
+                    conexao = None
+            except (OSError, http.client.HTTPException):
+                meus_erros += 1
+                if conexao is not None:
+                    conexao.close()
+                conexao = None
+        if conexao is not None:
+            conexao.close()
+        with trava:
+            latencias.extend(minhas)
+            erros[0] += meus_erros
+
+    inicio = time.perf_counter()
+    threads = [threading.Thread(target=cliente, args=(n,)) for n in range(clientes)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return resumir_carga(latencias, erros[0], time.perf_counter() - inicio)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Teste de carga HTTP')
+    parser.add_argument('url')
+    parser.add_argument('caminhos', nargs='+')
+    parser.add_argument('--clientes', type=int, default=16)
+    parser.add_argument('--segundos', type=float, default=10)
+    parser.add_argument('--cookie')
+    argumentos = parser.parse_args()
+
+    resultado = medir_carga(argumentos.url, argumentos.caminhos, argumentos.clientes,
+                            argumentos.segundos, argumentos.cookie)
+    print(f"Requisições: {resultado['requisicoes']}  erros: {resultado['erros']}")
+    print(f"Vazão: {resultado['req_s']} req/s")
+    print(f"Latência: p50 {resultado['p50_ms']} ms  p95 {resultado['p95_ms']} ms  "
+          f"p99 {resultado['p99_ms']} ms  máx {resultado['max_ms']} ms")
@@ -0,0 +1,63 @@
+import pytest
+from datetime import datetime
+
+from app.agendador import AgendaCron, cron_horarios, ler_campo_cron
+from app.services import HORARIOS_DESLIGAMENTO
+
+def test_ler_campo_cron():
+    assert ler_campo_cron("*", 0, 5) == {0, 1, 2, 3, 4, 5}
+    assert ler_campo_cron("*/15", 0, 59) == {0, 15, 30, 45}
+    assert ler_campo_cron("1-3,10", 0, 59) == {1, 2, 3, 10}
+    assert ler_campo_cron("50/5", 0, 59) == {50, 55}
+
+@pytest.mark.parametrize("campo", ["60", "5-2", "*/0", "x", ""])
+def test_ler_campo_cron_invalido(campo):
+    with pytest.raises(ValueError):
+        ler_campo_cron(campo, 0, 59)
+
+def test_agenda_invalida():
+    with pytest.raises(ValueError):
+        AgendaCron("* * *")
+
+def test_proxima_cinco_campos():
+    agenda = AgendaCron("30 3 * * *")
+    assert agenda.proxima(datetime(2025, 7, 10, 3, 29, 59)) == datetime(2025, 7, 10, 3, 30)
+    # Estritamente depois: no próprio horário vai para o dia seguinte
+    assert agenda.proxima(datetime(2025, 7, 10, 3, 30)) == datetime(2025, 7, 11, 3, 30)
+    # Virada de mês e de ano
+    assert agenda.proxima(datetime(2025, 12, 31, 4, 0)) == datetime(2026, 1, 1, 3, 30)
+
+def test_proxima_com_segundos_e_passo():
+    agenda = AgendaCron("*/20 * * * * *")
+    assert agenda.proxima(datetime(2025, 7, 10, 10, 0, 41, 500)) == datetime(2025, 7, 10, 10, 1, 0)
+    assert AgendaCron("*/5 * * * *").proxima(datetime(2025, 7, 10, 10, 7, 3)) == datetime(2025, 7, 10, 10, 10)
+
+def test_proxima_dia_da_semana():
+    # 2025-07-10 é quinta-feira; 1 = segunda
+    agenda = AgendaCron("0 8 * * 1")
+    assert agenda.proxima(datetime(2025, 7, 10, 12, 0)) == datetime(2025, 7, 14, 8, 0)
+    # 7 também é domingo
+    assert AgendaCron("0 8 * * 7").proxima(datetime(2025, 7, 10)) == datetime(2025, 7, 13, 8, 0)
+
+def test_proxima_dia_do_mes_ou_semana():
+    # Dia 15 ou qualquer segunda-feira (como no cron)
+    agenda = AgendaCron("0 0 15 * 1")
+    assert agenda.proxima(datetime(2025, 7, 10)) == datetime(2025, 7, 14)
+    assert agenda.proxima(datetime(2025, 7, 14)) == datetime(2025, 7, 15)
+
+def test_proxima_data_inexistente():
+    with pytest.raises(ValueError):
+        AgendaCron("0 0 31 2 *").proxima(datetime(2025, 1, 1))
+
+def test_cron_horarios_desligamento():
+    agenda = AgendaCron(cron_horarios(HORARIOS_DESLIGAMENTO))
+    assert agenda.proxima(datetime(2025, 7, 10, 19, 0)) == datetime(2025, 7, 10, 19, 30, 5)
+    assert agenda.proxima(datetime(2025, 7, 10, 21, 30, 5)) == datetime(2025, 7, 10, 23, 30, 5)
+    # 22:30 não está na lista
+    assert agenda.proxima(datetime(2025, 7, 10, 22, 0)) == datetime(2025, 7, 10, 23, 30, 5)
+    assert agenda.proxima(datetime(2025, 7, 11, 5, 31)) == datetime(2025, 7, 11, 19, 30, 5)
+
+def test_cron_horarios_nao_representaveis():
+    from datetime import time
+    with pytest.raises(ValueError):
+        cron_horarios([time(19, 30), time(20, 15)])
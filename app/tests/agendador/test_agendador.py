@@ -0,0 +1,151 @@
+import threading
+import pytest
+import mongomock
+from datetime import datetime, timedelta
+
+from app.agendador import Agendador, Tarefa
+
+@pytest.fixture
+def colecao():
+    return mongomock.MongoClient().db.agendamentos
+
+def contador():
+    chamadas = []
+    def funcao():
+        chamadas.append(1)
+        return len(chamadas)
+    return funcao, chamadas
+
+def test_cada_horario_executa_uma_vez_entre_processos(colecao):
+    funcao, chamadas = contador()
+    tarefa = Tarefa("limpeza", funcao, "30 3 * * *")
+    processos = [Agendador([tarefa], colecao=colecao, dono=dono) for dono in ("a", "b", "c")]
+    inicio = datetime(2025, 7, 10, 3, 0)
+    for processo in processos:
+        assert processo.executar_pendentes(inicio, aguardar=True) == []
+
+    horario = datetime(2025, 7, 10, 3, 30)
+    executadas = [processo.executar_pendentes(horario, aguardar=True) for processo in processos]
+    assert executadas == [["limpeza"], [], []]
+    assert len(chamadas) == 1
+
+    documento = colecao.find_one({"_id": "limpeza"})
+    assert documento["proxima_execucao"] == datetime(2025, 7, 11, 3, 30)
+    assert documento["lease_ate"] is None
+    assert documento["execucoes"] == 1
+    assert documento["ultimo_resultado"] == 1
+    assert documento["ultimo_erro"] is None
+
+    # Os outros processos passam a esperar o próximo horário sem reservar de novo
+    assert processos[1].proximas["limpeza"] == datetime(2025, 7, 11, 3, 30)
+    assert processos[2].executar_pendentes(datetime(2025, 7, 11, 3, 30), aguardar=True) == ["limpeza"]
+    assert len(chamadas) == 2
+
+def test_lease_evita_execucao_sobreposta(colecao):
+    liberar = threading.Event()
+    tarefa = Tarefa("rollup", lambda: liberar.wait(5), "* * * * *", lease=600)
+    a = Agendador([tarefa], colecao=colecao, dono="a")
+    b = Agendador([tarefa], colecao=colecao, dono="b")
+    a.executar_pendentes(datetime(2025, 7, 10, 3, 0))
+    assert a.executar_pendentes(datetime(2025, 7, 10, 3, 1)) == ["rollup"]
+
+    # Enquanto 'a' executa (lease ativo), o horário seguinte não é reservado por 'b'
+    assert "rollup" in a.em_execucao
+    assert b.executar_pendentes(datetime(2025, 7, 10, 3, 2)) == []
+    liberar.set()
+    while a.em_execucao:
+        liberar.wait(0.01)
+    # 'b' tenta de novo depois de ESPERA_RETENTATIVA segundos
+    assert b.executar_pendentes(datetime(2025, 7, 10, 3, 2, 1), aguardar=True) == []
+    assert b.executar_pendentes(datetime(2025, 7, 10, 3, 2, 5), aguardar=True) == ["rollup"]
+
+def test_lease_vencido_permite_outro_processo(colecao):
+    tarefa = Tarefa("rollup", lambda: None, "* * * * *", lease=60)
+    a = Agendador([tarefa], colecao=colecao, dono="a")
+    a.executar_pendentes(datetime(2025, 7, 10, 3, 0))
+    # Processo 'a' morreu com o lease ativo
+    colecao.update_one({"_id": "rollup"}, {"$set": {"dono": "a", "lease_ate": datetime(2025, 7, 10, 3, 2)}})
+    b = Agendador([tarefa], colecao=colecao, dono="b")
+    assert b.executar_pendentes(datetime(2025, 7, 10, 3, 1, 30), aguardar=True) == []
+    assert b.executar_pendentes(datetime(2025, 7, 10, 3, 2, 30), aguardar=True) == ["rollup"]
+
+def test_horario_perdido_alem_da_tolerancia(colecao):
+    funcao, chamadas = contador()
+    tarefa = Tarefa("desligar_acessos", funcao, "5 30 19 * * *", tolerancia=600)
+    Agendador([tarefa], colecao=colecao, dono="a").executar_pendentes(datetime(2025, 7, 10, 19, 0))
+
+    # Servidor voltou só no dia seguinte às 10h: não desliga, mas agenda o próximo horário
+    b = Agendador([tarefa], colecao=colecao, dono="b")
+    assert b.executar_pendentes(datetime(2025, 7, 11, 10, 0), aguardar=True) == []
+    assert chamadas == []
+    documento = colecao.find_one({"_id": "desligar_acessos"})
+    assert documento["proxima_execucao"] == datetime(2025, 7, 11, 19, 30, 5)
+    assert documento["lease_ate"] is None
+
+    # Dentro da tolerância executa
+    assert b.executar_pendentes(datetime(2025, 7, 11, 19, 32), aguardar=True) == ["desligar_acessos"]
+    assert chamadas == [1]
+
+def test_horario_perdido_sem_tolerancia_executa_uma_vez(colecao):
+    funcao, chamadas = contador()
+    tarefa = Tarefa("limpeza", funcao, "30 3 * * *")
+    a = Agendador([tarefa], colecao=colecao, dono="a")
+    a.executar_pendentes(datetime(2025, 7, 1, 0, 0))
+    # Três dias parado: uma execução só
+    assert a.executar_pendentes(datetime(2025, 7, 4, 12, 0), aguardar=True) == ["limpeza"]
+    assert a.executar_pendentes(datetime(2025, 7, 4, 12, 0, 1), aguardar=True) == []
+    assert len(chamadas) == 1
+
+def test_erro_da_tarefa_registrado(colecao):
+    def falha():
+        raise RuntimeError("banco indisponível")
+    tarefa = Tarefa("limpeza", falha, "* * * * *")
+    a = Agendador([tarefa], colecao=colecao, dono="a")
+    a.executar_pendentes(datetime(2025, 7, 10, 3, 0))
+    assert a.executar_pendentes(datetime(2025, 7, 10, 3, 1), aguardar=True) == ["limpeza"]
+    documento = colecao.find_one({"_id": "limpeza"})
+    assert documento["ultimo_erro"] == "banco indisponível"
+    assert documento["lease_ate"] is None
+    assert a.em_execucao == {}
+
+def test_agenda_alterada_reagenda(colecao):
+    Agendador([Tarefa("limpeza", lambda: None, "30 3 * * *")], colecao=colecao, dono="a") \
+        .executar_pendentes(datetime(2025, 7, 10, 0, 0))
+    Agendador([Tarefa("limpeza", lambda: None, "0 1 * * *")], colecao=colecao, dono="b") \
+        .executar_pendentes(datetime(2025, 7, 10, 0, 0))
+    documento = colecao.find_one({"_id": "limpeza"})
+    assert documento["agenda"] == "0 1 * * *"
+    assert documento["proxima_execucao"] == datetime(2025, 7, 10, 1, 0)
+
+def test_executa_no_contexto_da_aplicacao(colecao):
+    from flask import Flask, current_app
+    app = Flask("teste")
+    nomes = []
+    tarefa = Tarefa("limpeza", lambda: nomes.append(current_app.name), "* * * * *")
+    a = Agendador([tarefa], app=app, colecao=colecao, dono="a")
+    a.executar_pendentes(datetime(2025, 7, 10, 3, 0))
+    a.executar_pendentes(datetime(2025, 7, 10, 3, 1), aguardar=True)
+    assert nomes == ["teste"]
+
+def test_renovar_leases(colecao, monkeypatch):
+    liberar = threading.Event()
+    tarefa = Tarefa("rollup", lambda: liberar.wait(5), "* * * * *", lease=30)
+    a = Agendador([tarefa], colecao=colecao, dono="a")
+    a.executar_pendentes(datetime(2025, 7, 10, 3, 0))
+    a.executar_pendentes(datetime(2025, 7, 10, 3, 1))
+    # Simula 10 s (1/3 do lease) desde a reserva
+    a.em_execucao["rollup"] -= 10
+    antes = datetime.now()
+    a.renovar_leases()
+    assert colecao.find_one({"_id": "rollup"})["lease_ate"] >= antes + timedelta(seconds=29)
+    liberar.set()
+
+def test_espera_ate_o_proximo_horario(colecao):
+    tarefa = Tarefa("limpeza", lambda: None, "30 3 * * *")
+    a = Agendador([tarefa], colecao=colecao, dono="a")
+    a.proximas["limpeza"] = datetime.now() + timedelta(seconds=2)
+    assert 1 < a.espera() <= 2
+    a.proximas["limpeza"] = datetime.now() - timedelta(seconds=2)
+    assert a.espera() == 0.05
+    a.proximas["limpeza"] = datetime.now() + timedelta(days=1)
+    assert a.espera() == 30
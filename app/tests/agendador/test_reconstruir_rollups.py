@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from app.agendador import reconstruir_rollups
+
+def test_reconstruir_rollups_mes_atual_e_anterior(monkeypatch):
+    reconstruidos, invalidados = [], []
+
+    def fake_reconstruir(ano, mes):
+        reconstruidos.append((ano, mes))
+        return 10
+
+    monkeypatch.setattr("app.agendador.reconstruir_vendas_diarias", fake_reconstruir)
+    monkeypatch.setattr("app.agendador.invalidar_cache_graficos", invalidados.append)
+
+    assert reconstruir_rollups(datetime(2025, 1, 15, 3, 0)) == 20
+    assert reconstruidos == [(2024, 12), (2025, 1)]
+    assert invalidados == [datetime(2024, 12, 1), datetime(2025, 1, 1)]
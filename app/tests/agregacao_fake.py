@@ -0,0 +1,13 @@
+import mongomock
+
+def agregar_em_memoria(documentos, pipeline):
+    """
+    Executa um pipeline de agregação sobre documentos em memória (coleção mongomock), para os
+    fakes de coleção dos testes. O $match inicial é ignorado, como os fakes fazem com o filtro do find.
+    """
+    colecao = mongomock.MongoClient().db.vendas
+    documentos = [dict(d) for d in documentos]
+    if documentos:
+        colecao.insert_many(documentos)
+    etapas = [etapa for etapa in pipeline if '$match' not in etapa]
+    return list(colecao.aggregate(etapas))
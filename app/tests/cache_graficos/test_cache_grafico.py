@@ -0,0 +1,120 @@
+import json
+import pytest
+import mongomock
+from datetime import datetime
+from flask import Flask
+
+import app.cache_graficos as cache_mod
+from app.cache_graficos import cache_grafico, invalidar_cache_graficos, versao_dados
+
+@pytest.fixture
+def contadores(monkeypatch):
+    colecao = mongomock.MongoClient().db.contadores
+    monkeypatch.setattr("app.cache_graficos.contadores_collection", colecao)
+    cache_mod.limpar_cache_graficos()
+    yield colecao
+    cache_mod.limpar_cache_graficos()
+
+@pytest.fixture
+def app_cache():
+    app = Flask(__name__)
+    app.config['CACHE_GRAFICOS'] = True
+    with app.app_context():
+        yield app
+
+@pytest.fixture
+def grafico():
+    chamadas = []
+
+    @cache_grafico
+    def gerar_grafico_teste(ano=None, mes=None):
+        chamadas.append((ano, mes))
+        return f"<div>{len(chamadas)}</div>"
+
+    gerar_grafico_teste.chamadas = chamadas
+    return gerar_grafico_teste
+
+def test_cache_grafico_reaproveita_html(contadores, app_cache, grafico):
+    hoje = datetime.today()
+    assert grafico(hoje.year, hoje.month) == "<div>1</div>"
+    assert grafico(hoje.year, hoje.month) == "<div>1</div>"
+    # Sem ano/mês é o mesmo mês atual
+    assert grafico() == "<div>1</div>"
+    assert len(grafico.chamadas) == 1
+
+def test_cache_grafico_mes_atual_invalida_a_cada_escrita(contadores, app_cache, grafico):
+    grafico()
+    invalidar_cache_graficos()
+    assert grafico() == "<div>2</div>"
+
+def test_cache_grafico_mes_anterior_so_invalida_pelo_proprio_mes(contadores, app_cache, grafico):
+    grafico(2024, 3)
+    # Escritas de vendas no mês atual não afetam meses anteriores
+    invalidar_cache_graficos()
+    invalidar_cache_graficos(datetime.today())
+    assert grafico(2024, 3) == "<div>1</div>"
+    # Edição de uma venda de março/2024
+    invalidar_cache_graficos(datetime(2024, 3, 15))
+    assert grafico(2024, 3) == "<div>2</div>"
+
+def test_cache_grafico_desligado_fora_da_aplicacao(contadores, grafico):
+    grafico(2024, 3)
+    grafico(2024, 3)
+    assert len(grafico.chamadas) == 2
+
+def test_versao_dados(contadores):
+    hoje = datetime(2025, 7, 10)
+    invalidar_cache_graficos(datetime(2025, 6, 1))
+    invalidar_cache_graficos()
+    assert versao_dados(2025, 7, hoje) == ('geral', 2, hoje.date())
+    assert versao_dados(2025, 6, hoje) == ('mes', 1, 0)
+    assert versao_dados(2025, 5, hoje) == ('mes', 0, 0)
+    # Escrita em configs: muda a versão do mês atual e dos anteriores
+    invalidar_cache_graficos(configuracoes=True)
+    assert versao_dados(2025, 7, hoje) == ('geral', 3, hoje.date())
+    assert versao_dados(2025, 5, hoje) == ('mes', 0, 1)
+
+def test_cache_grafico_ignora_argumentos(contadores, app_cache):
+    chamadas = []
+
+    @cache_grafico(ignorar=('colecao',))
+    def dados_teste(colecao, ano=None, mes=None, escopo='todos'):
+        chamadas.append(colecao)
+        return len(chamadas)
+
+    # A coleção não entra na chave; os demais argumentos, sim
+    assert dados_teste(object(), 2024, 3) == 1
+    assert dados_teste(object(), 2024, 3) == 1
+    assert dados_teste(object(), 2024, 3, escopo='ativos') == 2
+
+def test_cache_grafico_expira_pela_idade(contadores, app_cache, grafico, monkeypatch):
+    grafico(2024, 3)
+    # Escrita feita fora da aplicação (sem mudança de versão): vale até IDADE_MAXIMA
+    agora = cache_mod.time.monotonic()
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: agora + cache_mod.IDADE_MAXIMA - 1)
+    assert grafico(2024, 3) == "<div>1</div>"
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: agora + cache_mod.IDADE_MAXIMA + 1)
+    assert grafico(2024, 3) == "<div>2</div>"
+
+def test_meta_alterada_regera_grafico_em_cache(monkeypatch, app_cache):
+    # Escrita em configs pela coleção da aplicação (como salvar_meta_vendedor e /api/configs/*)
+    from app.graficos import gerar_grafico_metas_semanais_vendedor
+    from app.models import salvar_meta_vendedor
+    cliente = mongomock.MongoClient()
+    monkeypatch.setattr("app.models.obter_cliente", lambda: cliente)
+    db = cliente["sistemaVendas"]
+    db.usuarios.insert_one({"nome_completo": "Maria", "status": "ativo"})
+    db.vendas.insert_one({"vendedor": "Maria", "status": "Faturado", "valor_real": 1000.0, "data_criacao": datetime(2024, 3, 15)})
+    salvar_meta_vendedor("1", "Maria", 5, 1000, 5000)
+    cache_mod.limpar_cache_graficos()
+
+    def meta_semanal():
+        figura = json.loads(gerar_grafico_metas_semanais_vendedor(2024, 3, formato="figura"))
+        return figura["data"][1]["y"]
+
+    assert meta_semanal() == [5000]
+    salvar_meta_vendedor("1", "Maria", 5, 1000, 9000)
+    assert meta_semanal() == [9000]
+    # Mês anterior também: a versão de configs entra na chave de todos os meses
+    assert db.contadores.find_one({"_id": "versao_graficos"})["configs"] == 2
+    cache_mod.limpar_cache_graficos()
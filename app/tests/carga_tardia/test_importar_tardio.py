@@ -0,0 +1,55 @@
+import sys
+import threading
+import types
+import pytest
+
+from app.carga_tardia import importar_tardio
+
+@pytest.fixture
+def sem_colorsys():
+    # colorsys: módulo pequeno da biblioteca padrão que a aplicação não importa
+    sys.modules.pop("colorsys", None)
+    yield
+    sys.modules.pop("colorsys", None)
+
+def test_importar_tardio_carrega_no_primeiro_acesso(sem_colorsys):
+    modulo = importar_tardio("colorsys")
+    assert sys.modules["colorsys"] is modulo
+    # Ainda não executado: o LazyLoader só troca a classe do módulo no primeiro acesso
+    assert type(modulo) is not types.ModuleType
+    assert modulo.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert type(modulo) is types.ModuleType
+
+def test_importar_tardio_primeiro_acesso_concorrente(sem_colorsys, monkeypatch):
+    # Força o módulo tardio próprio, usado antes do Python 3.12.3 (LazyLoader sem trava)
+    monkeypatch.setattr("app.carga_tardia.LAZYLOADER_SEGURO", (99,))
+    modulo = importar_tardio("colorsys")
+    assert type(modulo).__name__ == "_ModuloTardioSeguro"
+
+    barreira = threading.Barrier(8)
+    resultados = []
+    def acessar():
+        barreira.wait()
+        resultados.append(modulo.rgb_to_hsv(1.0, 0.0, 0.0))
+    threads = [threading.Thread(target=acessar) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Todas as threads encontraram o módulo carregado (nenhum AttributeError)
+    assert resultados == [(0.0, 1.0, 1.0)] * 8
+    assert type(modulo) is types.ModuleType
+
+def test_importar_tardio_modulo_ja_importado():
+    import json
+    assert importar_tardio("json") is json
+
+def test_importar_tardio_submodulo_no_pai():
+    modulo = importar_tardio("email.mime.text")
+    import email.mime
+    assert email.mime.text is modulo
+
+def test_importar_tardio_inexistente():
+    with pytest.raises(ModuleNotFoundError):
+        importar_tardio("modulo_que_nao_existe_xyz")
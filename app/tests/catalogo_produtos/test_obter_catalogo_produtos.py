@@ -0,0 +1,78 @@
+import pytest
+import mongomock
+from flask import Flask
+
+import app.catalogo_produtos as catalogo_produtos
+from app.catalogo_produtos import obter_catalogo_produtos, invalidar_catalogo_produtos
+
+class ProdutosContados:
+    # Coleção que conta quantas vezes os produtos foram lidos
+    def __init__(self, colecao):
+        self.colecao = colecao
+        self.leituras = 0
+
+    def find(self, filtro, proj):
+        self.leituras += 1
+        return self.colecao.find(filtro, proj)
+
+@pytest.fixture
+def db(monkeypatch):
+    db = mongomock.MongoClient().db
+    monkeypatch.setattr("app.catalogo_produtos.contadores_collection", db.contadores)
+    monkeypatch.setattr("app.catalogo_produtos._catalogo", None)
+    db.produtos.insert_many([
+        {"codigo": "1", "nome": "Sistema", "formas_pagamento": [{"tipo": "A/C", "parcelas": "1+1", "valor_total": 1500}]},
+        {"codigo": "2", "nome": "Atualização", "formas_pagamento": [{"tipo": "BOLETO", "parcelas": 3, "valor_total": 900}]},
+    ])
+    return db
+
+@pytest.fixture
+def app_cache():
+    app = Flask(__name__)
+    app.config["CACHE_PRODUTOS"] = True
+    with app.app_context():
+        yield app
+
+def test_catalogo_conjuntos(db):
+    catalogo = obter_catalogo_produtos(db.produtos)
+    assert catalogo.nomes == {"Sistema", "Atualização"}
+    assert catalogo.condicoes == {"A/C | 1+1", "BOLETO | 3"}
+    assert catalogo.valores_venda["Sistema"] == [{"condicao": "A/C | 1+1", "valor": 1500}]
+    assert all("_id" not in p for p in catalogo.produtos)
+
+def test_catalogo_sem_app_sempre_le(db):
+    produtos = ProdutosContados(db.produtos)
+    obter_catalogo_produtos(produtos)
+    obter_catalogo_produtos(produtos)
+    assert produtos.leituras == 2
+
+def test_catalogo_reaproveitado_ate_invalidar(db, app_cache):
+    produtos = ProdutosContados(db.produtos)
+    assert obter_catalogo_produtos(produtos) is obter_catalogo_produtos(produtos)
+    assert produtos.leituras == 1
+
+    db.produtos.insert_one({"codigo": "3", "nome": "Novo", "formas_pagamento": []})
+    invalidar_catalogo_produtos()
+    assert "Novo" in obter_catalogo_produtos(produtos).nomes
+    assert produtos.leituras == 2
+
+def test_catalogo_versao_de_outro_worker(db, app_cache, monkeypatch):
+    produtos = ProdutosContados(db.produtos)
+    obter_catalogo_produtos(produtos)
+    # Outro worker incrementou a versão; após o intervalo de verificação o catálogo é recarregado
+    db.contadores.update_one({"_id": "versao_produtos"}, {"$inc": {"versao": 1}}, upsert=True)
+    monkeypatch.setattr(catalogo_produtos, "INTERVALO_VERIFICACAO", 0)
+    obter_catalogo_produtos(produtos)
+    assert produtos.leituras == 2
+    # Versão igual: só confere a versão, sem reler os produtos
+    obter_catalogo_produtos(produtos)
+    assert produtos.leituras == 2
+
+def test_catalogo_relido_apos_idade_maxima(db, app_cache, monkeypatch):
+    produtos = ProdutosContados(db.produtos)
+    obter_catalogo_produtos(produtos)
+    # Escrita feita fora da aplicação (sem mudar a versão): vale após a idade máxima
+    db.produtos.insert_one({"codigo": "3", "nome": "Novo", "formas_pagamento": []})
+    monkeypatch.setattr(catalogo_produtos, "IDADE_MAXIMA", 0)
+    assert "Novo" in obter_catalogo_produtos(produtos).nomes
+    assert produtos.leituras == 2
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+import app.conexao_mongo as conexao_mongo
+from app.conexao_mongo import EstatisticasPool, estatisticas_pool
+
+def evento(**campos):
+    return SimpleNamespace(address=("localhost", 27017), **campos)
+
+def test_estatisticas_contadores():
+    pool = EstatisticasPool()
+    pool.connection_created(evento(connection_id=1))
+    pool.connection_created(evento(connection_id=2))
+    for _ in range(2):
+        pool.connection_check_out_started(evento())
+    pool.connection_checked_out(evento(connection_id=1, duration=0.002))
+    pool.connection_checked_out(evento(connection_id=2, duration=0.010))
+    pool.connection_check_out_started(evento())
+    pool.connection_check_out_failed(evento(reason="timeout", duration=0.5))
+    pool.connection_checked_in(evento(connection_id=1))
+    pool.connection_closed(evento(connection_id=2, reason="idle"))
+    pool.pool_cleared(evento())
+
+    resumo = pool.resumo()
+    assert resumo["conexoes_abertas"] == 1
+    assert resumo["em_uso"] == 1
+    assert resumo["aguardando"] == 0
+    assert resumo["max_aguardando"] == 2
+    assert resumo["checkouts"] == 2
+    assert resumo["falhas_checkout"] == {"timeout": 1}
+    assert resumo["espera_max_ms"] == 500.0
+    assert resumo["espera_media_ms"] == 256.0
+    assert resumo["pools_limpos"] == 1
+
+def test_estatisticas_zerar():
+    pool = EstatisticasPool()
+    pool.connection_created(evento(connection_id=1))
+    pool.zerar()
+    assert pool.resumo()["conexoes_abertas"] == 0
+    assert pool.resumo()["espera_media_ms"] == 0.0
+
+def test_estatisticas_pool_inclui_opcoes(monkeypatch):
+    monkeypatch.setattr(conexao_mongo, "_opcoes", {"maxPoolSize": 12, "waitQueueTimeoutMS": 800})
+    dados = estatisticas_pool()
+    assert dados["max_pool_size"] == 12
+    assert dados["wait_queue_timeout_ms"] == 800
+    assert dados["pid"] > 0
+    assert "em_uso" in dados and "falhas_checkout" in dados
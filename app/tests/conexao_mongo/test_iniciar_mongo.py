@@ -0,0 +1,73 @@
+import os
+import pytest
+import mongomock
+
+import app.conexao_mongo as conexao_mongo
+import app.models as models
+from app.conexao_mongo import iniciar_mongo, obter_cliente
+from app.models import ColecaoMongo
+
+@pytest.fixture
+def clientes(monkeypatch):
+    # MongoClient trocado pelo mongomock, registrando a URI e as opções de cada cliente criado
+    criados = []
+    def criar(uri=None, **opcoes):
+        criados.append((uri, opcoes))
+        return mongomock.MongoClient()
+    monkeypatch.setattr(conexao_mongo, "MongoClient", criar)
+    monkeypatch.setattr(conexao_mongo, "_cliente", None)
+    monkeypatch.setattr(conexao_mongo, "_opcoes", None)
+    return criados
+
+def test_colecao_nao_conecta_ate_o_uso(clientes):
+    colecao = ColecaoMongo("vendas")
+    assert clientes == []
+    colecao.insert_one({"vendedor": "Maria"})
+    assert colecao.count_documents({}) == 1
+    assert len(clientes) == 1
+
+def test_iniciar_mongo_usa_uri_e_troca_o_cliente(clientes):
+    colecao = ColecaoMongo("vendas")
+    colecao.insert_one({"vendedor": "Maria"})
+    iniciar_mongo("mongodb://servidor:27017", {"maxPoolSize": 5})
+    uri, opcoes = clientes[-1]
+    assert uri == "mongodb://servidor:27017"
+    assert opcoes["maxPoolSize"] == 5
+    # Sem conexões antes da primeira operação, e com as estatísticas do pool ligadas
+    assert opcoes["connect"] is False
+    assert opcoes["event_listeners"] == [conexao_mongo.estatisticas]
+    # A coleção passa a usar o novo cliente (mongomock novo: banco vazio)
+    assert colecao.count_documents({}) == 0
+    assert obter_cliente() is colecao._cliente
+
+def test_db_item_devolve_colecao_tardia(clientes):
+    assert isinstance(models.db["ip_bloqueios"], ColecaoMongo)
+    assert clientes == []
+
+def test_cliente_recriado_em_outro_processo(clientes, monkeypatch):
+    iniciar_mongo("mongodb://servidor:27017", {"maxPoolSize": 5})
+    cliente_pai = obter_cliente()
+    # Simula o worker após o fork: PID diferente do processo que criou o cliente
+    pid_filho = os.getpid() + 1
+    monkeypatch.setattr(conexao_mongo.os, "getpid", lambda: pid_filho)
+    cliente_filho = obter_cliente()
+    assert cliente_filho is not cliente_pai
+    # Mesma URI e opções do cliente do processo pai
+    assert clientes[-1][0] == "mongodb://servidor:27017"
+    assert clientes[-1][1]["maxPoolSize"] == 5
+    assert obter_cliente() is cliente_filho
+
+def test_descartar_cliente_apos_fork(clientes):
+    iniciar_mongo()
+    conexao_mongo._descartar_cliente_apos_fork()
+    assert conexao_mongo._cliente is None
+    obter_cliente()
+    assert len(clientes) == 2
+
+def test_fechar_mongo(clientes):
+    iniciar_mongo()
+    conexao_mongo.fechar_mongo()
+    assert conexao_mongo._cliente is None
+    # Próximo uso cria um cliente novo
+    assert obter_cliente() is not None
+    assert len(clientes) == 2
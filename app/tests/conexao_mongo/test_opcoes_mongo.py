@@ -0,0 +1,23 @@
+from app.conexao_mongo import opcoes_mongo, OPCOES_PADRAO
+
+def test_opcoes_mongo_padrao():
+    assert opcoes_mongo({}) == OPCOES_PADRAO
+
+def test_opcoes_mongo_ambiente():
+    opcoes = opcoes_mongo({
+        "MONGO_MAX_POOL_SIZE": "50",
+        "MONGO_MIN_POOL_SIZE": "2",
+        "MONGO_WAIT_QUEUE_TIMEOUT_MS": "1000",
+        "MONGO_COMPRESSORS": "zstd,zlib",
+        "MONGO_READ_PREFERENCE": "secondaryPreferred",
+        "MONGO_SOCKET_TIMEOUT_MS": "",
+    })
+    assert opcoes["maxPoolSize"] == 50
+    assert opcoes["minPoolSize"] == 2
+    assert opcoes["waitQueueTimeoutMS"] == 1000
+    assert opcoes["compressors"] == "zstd,zlib"
+    assert opcoes["readPreference"] == "secondaryPreferred"
+    # Variável vazia é ignorada
+    assert "socketTimeoutMS" not in opcoes
+    # As demais ficam no padrão
+    assert opcoes["serverSelectionTimeoutMS"] == OPCOES_PADRAO["serverSelectionTimeoutMS"]
@@ -0,0 +1,82 @@
+import pytest
+import mongomock
+from flask import Flask
+
+import app.configuracoes as configuracoes
+from app.configuracoes import obter_configuracoes, invalidar_configuracoes
+
+class ConfigsContadas:
+    # Coleção que conta quantas leituras foram feitas em 'configs'
+    def __init__(self, colecao):
+        self.colecao = colecao
+        self.database = colecao.database
+        self.leituras = 0
+
+    def find(self, filtro, proj):
+        self.leituras += 1
+        return self.colecao.find(filtro, proj)
+
+    def find_one(self, filtro):
+        self.leituras += 1
+        return self.colecao.find_one(filtro)
+
+@pytest.fixture
+def db(monkeypatch):
+    db = mongomock.MongoClient().db
+    monkeypatch.setattr("app.configuracoes._configuracoes", None)
+    db.configs.insert_many([
+        {"tipo": "geral", "smtp": "smtp.teste.com", "porta": "587", "meta_empresa": "100000",
+         "email_smtp_principal": "a@teste.com:false", "email_smtp_secundario": "b@teste.com:true"},
+        {"tipo": "meta_vendedor", "vendedor_nome": "Maria", "meta_dia_quantidade": "3", "meta_dia_valor": "21000", "meta_semana": ""},
+        {"tipo": "limite_vendedor", "vendedor_nome": "Maria", "limite": "1.500,50"},
+        {"tipo": "fim_expediente", "data": "01/07/2025", "hora": "18:30:00"},
+    ])
+    return db
+
+@pytest.fixture
+def app_cache():
+    app = Flask(__name__)
+    app.config["CACHE_CONFIGS"] = True
+    with app.app_context():
+        yield app
+
+def test_configuracoes_tipadas(db):
+    cfg = obter_configuracoes(db.configs)
+    assert cfg.geral.porta == 587
+    assert cfg.geral.meta_empresa == 100000.0
+    assert cfg.geral.email_remetente == "b@teste.com"
+    assert cfg.limites == {"Maria": 1500.5}
+    meta = cfg.meta_vendedor("Maria")
+    assert (meta.meta_dia_quantidade, meta.meta_dia_valor, meta.meta_semana) == (3, 21000.0, None)
+    assert cfg.meta_vendedor("João") is None
+    assert cfg.fim_expediente.momento.strftime("%d/%m/%Y %H:%M") == "01/07/2025 18:30"
+    assert cfg.valor_acesso is None
+
+def test_configuracoes_sem_app_sempre_leem(db):
+    configs = ConfigsContadas(db.configs)
+    obter_configuracoes(configs).geral
+    obter_configuracoes(configs).geral
+    assert configs.leituras == 2
+
+def test_configuracoes_reaproveitadas_ate_invalidar(db, app_cache):
+    configs = ConfigsContadas(db.configs)
+    assert obter_configuracoes(configs).geral is obter_configuracoes(configs).geral
+    assert configs.leituras == 1
+
+    db.configs.update_one({"tipo": "geral"}, {"$set": {"meta_empresa": "120000"}})
+    invalidar_configuracoes(configs)
+    assert db.contadores.find_one({"_id": "versao_configs"})["versao"] == 1
+    assert obter_configuracoes(configs).geral.meta_empresa == 120000.0
+    assert configs.leituras == 2
+
+def test_configuracoes_versao_de_outro_worker(db, app_cache, monkeypatch):
+    configs = ConfigsContadas(db.configs)
+    obter_configuracoes(configs).limites
+    # Outro worker gravou um limite; após o intervalo de verificação as seções são relidas
+    db.contadores.update_one({"_id": "versao_configs"}, {"$inc": {"versao": 1}}, upsert=True)
+    monkeypatch.setattr(configuracoes, "INTERVALO_VERIFICACAO", 0)
+    obter_configuracoes(configs).limites
+    assert configs.leituras == 2
+    # Versão igual: só confere a versão, sem reler as configurações
+    obter_configuracoes(configs).limites
+    assert configs.leituras == 2
@@ -1,8 +1,11 @@
 import pytest
 from app.download import gerar_fig_banco_vendedores
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_fig_banco_vendedores_vazio(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
     class FakeConfigsCollection:
@@ -20,6 +23,8 @@ def test_fig_banco_vendedores_vazio(monkeypatch):
 
 def test_fig_banco_vendedores_com_dados(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             # Maria tem desconto NÃO autorizado (-200), João teve ganho (+100)
             return [
@@ -56,6 +61,8 @@ def test_fig_banco_vendedores_com_dados(monkeypatch):
 
 def test_fig_banco_vendedores_dezembro(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             # Não importa muito os dados, só queremos cobrir o if mes == 12
             return []
@@ -70,6 +77,8 @@ def test_fig_banco_vendedores_dezembro(monkeypatch):
 
 def test_fig_banco_vendedores_todos_negativos(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
                 {'vendedor': 'Maria', 'valor_tabela': 1000, 'valor_real': 200, 'desconto_autorizado': False},
@@ -3,12 +3,15 @@ import pandas as pd
 from collections import defaultdict
 import builtins
 from app.download import gerar_fig_mapa_vendas_por_estado
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_fig_mapa_vendas_por_estado_vazio(monkeypatch):
     class FakeUsuariosCollection:
         def find(self, filtro, proj):
             return [{"nome_completo": "Fulano"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
 
@@ -37,6 +40,8 @@ def test_fig_mapa_vendas_por_estado_normal(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Fulano"}, {"nome_completo": "Beltrano"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
                 {"endereco": {"estado": "SP"}},
@@ -71,6 +76,8 @@ def test_fig_mapa_vendas_por_estado_normal_dezembro(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Fulano"}, {"nome_completo": "Beltrano"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
                 {"endereco": {"estado": "SP"}},
@@ -100,6 +107,8 @@ def test_fig_mapa_vendas_por_estado_estrangeira(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Fulano"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
                 {"endereco": {"estado": "XX"}},  # Estrangeira
@@ -129,6 +138,8 @@ def test_fig_mapa_vendas_por_estado_excecao_geojson(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Fulano"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [{"endereco": {"estado": "SP"}}]
     def fake_open(*args, **kwargs):
@@ -9,7 +9,7 @@ def test_fig_quantidade_vendas_diarias_vazio(monkeypatch):
         def aggregate(self, pipeline):
             return []
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.download.vendas_diarias_collection", FakeVendasCollection())
 
     fig = gerar_fig_quantidade_vendas_diarias()
     import plotly.graph_objs as go
@@ -28,7 +28,7 @@ def test_fig_quantidade_vendas_diarias_com_dados(monkeypatch):
                 {"_id": {"ano": 2025, "mes": 7, "dia": 2}, "quantidade": 2}
             ]
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.download.vendas_diarias_collection", FakeVendasCollection())
 
     fig = gerar_fig_quantidade_vendas_diarias()
     linhas = fig.data[0]
@@ -48,7 +48,7 @@ def test_fig_quantidade_vendas_diarias_um_dia(monkeypatch):
         def aggregate(self, pipeline):
             return [{"_id": {"ano": 2025, "mes": 7, "dia": 10}, "quantidade": 7}]
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.download.vendas_diarias_collection", FakeVendasCollection())
 
     fig = gerar_fig_quantidade_vendas_diarias()
     linhas = fig.data[0]
@@ -68,7 +68,7 @@ def test_fig_quantidade_vendas_diarias_dias_nao_sequenciais(monkeypatch):
                 {"_id": {"ano": 2025, "mes": 7, "dia": 30}, "quantidade": 9},
             ]
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.download.vendas_diarias_collection", FakeVendasCollection())
 
     fig = gerar_fig_quantidade_vendas_diarias()
     linhas = fig.data[0]
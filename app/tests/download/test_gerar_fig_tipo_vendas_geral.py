@@ -1,8 +1,11 @@
 import pytest
 from app.download import gerar_fig_tipo_vendas_geral
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_fig_tipo_vendas_geral_vazio(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return []
     monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
@@ -11,6 +14,8 @@ def test_fig_tipo_vendas_geral_vazio(monkeypatch):
 
 def test_fig_tipo_vendas_geral_apenas_novas(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"produto": "Contrato"},
@@ -28,6 +33,8 @@ def test_fig_tipo_vendas_geral_apenas_novas(monkeypatch):
 
 def test_fig_tipo_vendas_geral_apenas_novas_dezembro(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"produto": "Contrato"},
@@ -40,6 +47,8 @@ def test_fig_tipo_vendas_geral_apenas_novas_dezembro(monkeypatch):
 
 def test_fig_tipo_vendas_geral_produto_nao_eh_str(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"produto": 123}
@@ -50,6 +59,8 @@ def test_fig_tipo_vendas_geral_produto_nao_eh_str(monkeypatch):
 
 def test_fig_tipo_vendas_geral_apenas_atualizacoes(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"produto": "atualização"},
@@ -67,6 +78,8 @@ def test_fig_tipo_vendas_geral_apenas_atualizacoes(monkeypatch):
 
 def test_fig_tipo_vendas_geral_misto(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"produto": "Contrato"},
@@ -82,6 +95,8 @@ def test_fig_tipo_vendas_geral_misto(monkeypatch):
 
 def test_fig_tipo_vendas_geral_casos_estranhos(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"produto": ""},
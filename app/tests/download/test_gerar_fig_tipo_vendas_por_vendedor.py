@@ -2,9 +2,12 @@ import pytest
 from collections import defaultdict
 from datetime import datetime
 from app.download import gerar_fig_tipo_vendas_por_vendedor
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_fig_tipo_vendas_por_vendedor_vazio(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
 
@@ -16,6 +19,8 @@ def test_fig_tipo_vendas_por_vendedor_vazio(monkeypatch):
 
 def test_fig_tipo_vendas_por_vendedor_um_vendedor(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             # Um vendedor, duas vendas novas, uma atualização
             return [
@@ -35,6 +40,8 @@ def test_fig_tipo_vendas_por_vendedor_um_vendedor(monkeypatch):
 
 def test_fig_tipo_vendas_por_vendedor_um_vendedor_dezembro(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             # Um vendedor, duas vendas novas, uma atualização
             return [
@@ -49,6 +56,8 @@ def test_fig_tipo_vendas_por_vendedor_um_vendedor_dezembro(monkeypatch):
 
 def test_fig_tipo_vendas_por_vendedor_varios(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
                 {"vendedor": "Maria", "produto": "produto abc"},
@@ -72,6 +81,8 @@ def test_fig_tipo_vendas_por_vendedor_varios(monkeypatch):
 
 def test_fig_tipo_vendas_por_vendedor_none_empty(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             # Casos estranhos: campo produto None ou em branco é considerado "nova"
             return [
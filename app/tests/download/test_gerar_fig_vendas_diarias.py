@@ -1,12 +1,15 @@
 import pytest
 from datetime import datetime, timedelta
 from app.download import gerar_fig_vendas_diarias
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_fig_vendas_diarias_vazio(monkeypatch):
     class FakeUsuariosCollection:
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
@@ -24,16 +27,17 @@ def test_fig_vendas_diarias_um_vendedor(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {'vendedor': 'Maria', 'valor_real': '2500'},
-                {'vendedor': 'Maria', 'valor_real': '200'},
+                {'vendedor': 'Maria', 'valor_real': 2500},
+                {'vendedor': 'Maria', 'valor_real': 200},
             ]
     def soma_vendas(lista):
         return sum(float(v.get("valor_real", 0)) for v in lista)
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
     monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
-    monkeypatch.setattr("app.download.soma_vendas", soma_vendas)
     fig = gerar_fig_vendas_diarias(data_escolhida="2025-07-20")
     bars = fig.data[0]
     assert bars.x[0] == "Maria"
@@ -47,17 +51,18 @@ def test_fig_vendas_diarias_varios_vendedores(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {'vendedor': 'Maria', 'valor_real': '800'},
-                {'vendedor': 'João', 'valor_real': '1200'},
-                {'vendedor': 'Maria', 'valor_real': '200'},
+                {'vendedor': 'Maria', 'valor_real': 800},
+                {'vendedor': 'João', 'valor_real': 1200},
+                {'vendedor': 'Maria', 'valor_real': 200},
             ]
     def soma_vendas(lista):
         return sum(float(v.get("valor_real", 0)) for v in lista)
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
     monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
-    monkeypatch.setattr("app.download.soma_vendas", soma_vendas)
     fig = gerar_fig_vendas_diarias(data_escolhida="2025-07-20")
     bars = fig.data[0]
     nomes = set(bars.x)
@@ -77,6 +82,8 @@ def test_fig_vendas_diarias_data_invalida(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
@@ -90,6 +97,8 @@ def test_fig_vendas_diarias_data_vazia(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
@@ -9,7 +9,7 @@ def test_fig_vendas_diarias_linhas_vazio(monkeypatch):
         def aggregate(self, pipeline):
             return []
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.download.vendas_diarias_collection", FakeVendasCollection())
 
     fig = gerar_fig_vendas_diarias_linhas()
     import plotly.graph_objs as go
@@ -28,7 +28,7 @@ def test_fig_vendas_diarias_linhas_com_dados(monkeypatch):
                 {"_id": {"ano": 2025, "mes": 7, "dia": 2}, "total": 2345.5}
             ]
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.download.vendas_diarias_collection", FakeVendasCollection())
 
     fig = gerar_fig_vendas_diarias_linhas()
     linhas = fig.data[0]
@@ -51,7 +51,7 @@ def test_fig_vendas_diarias_linhas_com_dados_dezembro(monkeypatch):
                 {"_id": {"ano": 2025, "mes": 7, "dia": 2}, "total": 2345.5}
             ]
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.download.vendas_diarias_collection", FakeVendasCollection())
 
     fig = gerar_fig_vendas_diarias_linhas(mes=12)
     assert fig.layout.title.text.startswith("Vendas por Dia do Mês")
@@ -64,7 +64,7 @@ def test_fig_vendas_diarias_linhas_um_dia(monkeypatch):
         def aggregate(self, pipeline):
             return [{"_id": {"ano": 2025, "mes": 7, "dia": 3}, "total": 555.0}]
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.download.vendas_diarias_collection", FakeVendasCollection())
 
     fig = gerar_fig_vendas_diarias_linhas()
     linhas = fig.data[0]
@@ -84,7 +84,7 @@ def test_fig_vendas_diarias_linhas_dias_nao_sequenciais(monkeypatch):
                 {"_id": {"ano": 2025, "mes": 7, "dia": 30}, "total": 40},
             ]
     monkeypatch.setattr("app.download.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.download.vendas_diarias_collection", FakeVendasCollection())
 
     fig = gerar_fig_vendas_diarias_linhas()
     linhas = fig.data[0]
@@ -8,6 +8,8 @@ def test_fig_vendas_geral_vazio(monkeypatch):
     class FakeConfigsCollection:
         def find(self, filtro, proj):
             return []
+        def find_one(self, filtro):
+            return None
 
     monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
     monkeypatch.setattr("app.download.configs_collection", FakeConfigsCollection())
@@ -22,10 +24,12 @@ def test_fig_vendas_geral_com_dados(monkeypatch):
     class FakeVendasCollection:
         def find(self, filtro, proj):
             # Simula 2 vendas com valor total 8000
-            return [{}, {}]
+            return [{'valor_real': 5000}, {'valor_real': 3000}]
     class FakeConfigsCollection:
         def find(self, filtro, proj):
             return [{'meta_empresa': 10000}]
+        def find_one(self, filtro):
+            return {'meta_empresa': 10000}
     def soma_vendas(lista):
         return 8000
     monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
@@ -53,6 +57,8 @@ def test_fig_vendas_geral_dezembro(monkeypatch):
     class FakeConfigsCollection:
         def find(self, filtro, proj):
             return [{'meta_empresa': 10000}]
+        def find_one(self, filtro):
+            return {'meta_empresa': 10000}
     def soma_vendas(lista):
         return 8000
     monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
@@ -63,10 +69,12 @@ def test_fig_vendas_geral_dezembro(monkeypatch):
 def test_fig_vendas_geral_bateu_meta(monkeypatch):
     class FakeVendasCollection:
         def find(self, filtro, proj):
-            return [{}, {}, {}, {}]
+            return [{'valor_real': 3000}, {'valor_real': 3000}, {'valor_real': 3000}, {'valor_real': 3000}]
     class FakeConfigsCollection:
         def find(self, filtro, proj):
             return [{'meta_empresa': 10000}]
+        def find_one(self, filtro):
+            return {'meta_empresa': 10000}
     def soma_vendas(lista):
         return 12000
     monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
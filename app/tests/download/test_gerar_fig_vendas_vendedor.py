@@ -1,8 +1,11 @@
 import pytest
 from app.download import gerar_fig_vendas_vendedor
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_fig_vendas_vendedor_vazio(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
         
@@ -16,10 +19,12 @@ def test_fig_vendas_vendedor_vazio(monkeypatch):
 
 def test_fig_vendas_vendedor_um_vendedor(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {'vendedor': 'Maria', 'valor_real': '1000'},
-                {'vendedor': 'Maria', 'valor_real': '1500'},
+                {'vendedor': 'Maria', 'valor_real': 1000},
+                {'vendedor': 'Maria', 'valor_real': 1500},
             ]
     def soma_vendas(lista):
         # Soma o campo valor_real, mesmo se string
@@ -35,11 +40,13 @@ def test_fig_vendas_vendedor_um_vendedor(monkeypatch):
 
 def test_fig_vendas_vendedor_varios_vendedores(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {'vendedor': 'Maria', 'valor_real': '1000'},
-                {'vendedor': 'João', 'valor_real': '700'},
-                {'vendedor': 'Maria', 'valor_real': '250'},
+                {'vendedor': 'Maria', 'valor_real': 1000},
+                {'vendedor': 'João', 'valor_real': 700},
+                {'vendedor': 'Maria', 'valor_real': 250},
             ]
     def soma_vendas(lista):
         return sum(float(v.get("valor_real", 0)) for v in lista)
@@ -60,10 +67,12 @@ def test_fig_vendas_vendedor_varios_vendedores(monkeypatch):
 
 def test_fig_vendas_vendedor_um_vendedor_dezembro(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {'vendedor': 'Maria', 'valor_real': '1000'},
-                {'vendedor': 'Maria', 'valor_real': '1500'},
+                {'vendedor': 'Maria', 'valor_real': 1000},
+                {'vendedor': 'Maria', 'valor_real': 1500},
             ]
     def soma_vendas(lista):
         # Soma o campo valor_real, mesmo se string
@@ -74,11 +83,13 @@ def test_fig_vendas_vendedor_um_vendedor_dezembro(monkeypatch):
 
 def test_fig_vendas_vendedor_varios_vendedores_dezembro(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {'vendedor': 'Maria', 'valor_real': '1000'},
-                {'vendedor': 'João', 'valor_real': '700'},
-                {'vendedor': 'Maria', 'valor_real': '250'},
+                {'vendedor': 'Maria', 'valor_real': 1000},
+                {'vendedor': 'João', 'valor_real': 700},
+                {'vendedor': 'Maria', 'valor_real': 250},
             ]
     def soma_vendas(lista):
         return sum(float(v.get("valor_real", 0)) for v in lista)
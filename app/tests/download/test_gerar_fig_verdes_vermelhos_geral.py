@@ -1,8 +1,11 @@
 import pytest
 from app.download import gerar_fig_verdes_vermelhos_geral
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_fig_verdes_vermelhos_geral_vazio(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return []
     monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
@@ -12,6 +15,8 @@ def test_fig_verdes_vermelhos_geral_vazio(monkeypatch):
 
 def test_fig_verdes_vermelhos_geral_apenas_verdes(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"tipo_cliente": "Verde"},
@@ -29,6 +34,8 @@ def test_fig_verdes_vermelhos_geral_apenas_verdes(monkeypatch):
 
 def test_fig_verdes_vermelhos_geral_apenas_vermelhos(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"tipo_cliente": "Vermelho"},
@@ -45,6 +52,8 @@ def test_fig_verdes_vermelhos_geral_apenas_vermelhos(monkeypatch):
 
 def test_fig_verdes_vermelhos_geral_misto(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"tipo_cliente": "Verde"},
@@ -65,6 +74,8 @@ def test_fig_verdes_vermelhos_geral_misto(monkeypatch):
 
 def test_fig_verdes_vermelhos_geral_ignora_outros(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"tipo_cliente": "Verde"},
@@ -81,6 +92,8 @@ def test_fig_verdes_vermelhos_geral_ignora_outros(monkeypatch):
 
 def test_fig_verdes_vermelhos_geral_apenas_verdes_dezembro(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"tipo_cliente": "Verde"},
@@ -95,6 +108,8 @@ def test_fig_verdes_vermelhos_geral_apenas_verdes_dezembro(monkeypatch):
 
 def test_fig_verdes_vermelhos_geral_apenas_vermelhos_dezembro(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"tipo_cliente": "Vermelho"},
@@ -107,6 +122,8 @@ def test_fig_verdes_vermelhos_geral_apenas_vermelhos_dezembro(monkeypatch):
 
 def test_fig_verdes_vermelhos_geral_misto_dezembro(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"tipo_cliente": "Verde"},
@@ -122,6 +139,8 @@ def test_fig_verdes_vermelhos_geral_misto_dezembro(monkeypatch):
 
 def test_fig_verdes_vermelhos_geral_ignora_outros_dezembro(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"tipo_cliente": "Verde"},
@@ -136,6 +155,8 @@ def test_fig_verdes_vermelhos_geral_ignora_outros_dezembro(monkeypatch):
 
 def test_fig_verdes_vermelhos_geral_total_zero(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"tipo_cliente": "Azul"},
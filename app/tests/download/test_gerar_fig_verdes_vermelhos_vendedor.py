@@ -1,8 +1,11 @@
 import pytest
 from app.download import gerar_fig_verdes_vermelhos_vendedor
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_fig_verdes_vermelhos_vendedor_vazio(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return []
     monkeypatch.setattr("app.download.vendas_collection", FakeVendasCollection())
@@ -11,6 +14,8 @@ def test_fig_verdes_vermelhos_vendedor_vazio(monkeypatch):
 
 def test_fig_verdes_vermelhos_vendedor_somente_verdes(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"vendedor": "Maria", "tipo_cliente": "Verde"},
@@ -25,6 +30,8 @@ def test_fig_verdes_vermelhos_vendedor_somente_verdes(monkeypatch):
 
 def test_fig_verdes_vermelhos_vendedor_somente_verdes_dezembro(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"vendedor": "Maria", "tipo_cliente": "Verde"},
@@ -37,6 +44,8 @@ def test_fig_verdes_vermelhos_vendedor_somente_verdes_dezembro(monkeypatch):
 
 def test_fig_verdes_vermelhos_vendedor_vendedor_nao_existe(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"vendedor": None, "tipo_cliente": "Verde"}
@@ -47,6 +56,8 @@ def test_fig_verdes_vermelhos_vendedor_vendedor_nao_existe(monkeypatch):
 
 def test_fig_verdes_vermelhos_vendedor_tipo_cliente_nao_existe(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"vendedor": "Maria", "tipo_cliente": None}
@@ -57,6 +68,8 @@ def test_fig_verdes_vermelhos_vendedor_tipo_cliente_nao_existe(monkeypatch):
 
 def test_fig_verdes_vermelhos_vendedor_somente_vermelhos(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"vendedor": "João", "tipo_cliente": "vermelho"},
@@ -70,6 +83,8 @@ def test_fig_verdes_vermelhos_vendedor_somente_vermelhos(monkeypatch):
 
 def test_fig_verdes_vermelhos_vendedor_misto(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"vendedor": "Maria", "tipo_cliente": "verde"},
@@ -90,6 +105,8 @@ def test_fig_verdes_vermelhos_vendedor_misto(monkeypatch):
 
 def test_fig_verdes_vermelhos_vendedor_ignora_sem_status(monkeypatch):
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, *a, **k):
             return [
                 {"vendedor": "Maria", "tipo_cliente": ""},
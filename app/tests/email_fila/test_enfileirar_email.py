@@ -0,0 +1,27 @@
+import pytest
+import mongomock
+
+from app.email_fila import enfileirar_email, status_email
+
+@pytest.fixture
+def fila(monkeypatch):
+    colecao = mongomock.MongoClient().db.email_fila
+    monkeypatch.setattr("app.email_fila.email_fila_collection", colecao)
+    return colecao
+
+def test_enfileirar_email_grava_pendente(fila):
+    id_mensagem = enfileirar_email(
+        assunto="Venda", email_remetente="r@x.com", corpo="<p>Oi</p>", servidor="smtp.x.com",
+        porta=465, copias=None, email_destinatario="d@x.com"
+    )
+    mensagem = fila.find_one({"_id": id_mensagem})
+    assert mensagem["status"] == "pendente"
+    assert mensagem["tentativas"] == 0
+    assert mensagem["copias"] == ""
+    assert mensagem["email_destinatario"] == "d@x.com"
+    # A senha SMTP não é gravada na fila
+    assert "senha_email" not in mensagem
+
+def test_status_email(fila):
+    id_mensagem = enfileirar_email("A", "r@x.com", "c", "smtp", 465, "", "d@x.com")
+    assert status_email(id_mensagem) == {"status": "pendente", "tentativas": 0, "erro": None, "enviado_em": None}
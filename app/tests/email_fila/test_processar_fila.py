@@ -0,0 +1,131 @@
+import smtplib
+import pytest
+import mongomock
+from datetime import datetime, timedelta
+
+from app.email_fila import EnviadorEmail, enfileirar_email, MAX_TENTATIVAS
+
+@pytest.fixture
+def fila(monkeypatch):
+    colecao = mongomock.MongoClient().db.email_fila
+    monkeypatch.setattr("app.email_fila.email_fila_collection", colecao)
+    return colecao
+
+@pytest.fixture(autouse=True)
+def configs(monkeypatch):
+    # Senha SMTP lida das configurações no envio
+    colecao = mongomock.MongoClient().db.configs
+    colecao.insert_one({"tipo": "geral", "senha_email_smtp": "segredo"})
+    monkeypatch.setattr("app.email_fila.configs_collection", colecao)
+    return colecao
+
+@pytest.fixture
+def smtp_fake(monkeypatch):
+    registro = {"conexoes": 0, "logins": 0, "enviados": [], "senhas": [], "falhar_envio": False, "falhar_login": False}
+
+    class FakeSMTP:
+        def __init__(self, servidor, porta):
+            registro["conexoes"] += 1
+        def login(self, email, senha):
+            if registro["falhar_login"]:
+                raise smtplib.SMTPAuthenticationError(535, b"senha invalida")
+            registro["logins"] += 1
+            registro["senhas"].append(senha)
+        def noop(self):
+            return (250, b"ok")
+        def send_message(self, msg, to_addrs):
+            if registro["falhar_envio"]:
+                raise smtplib.SMTPServerDisconnected("caiu")
+            registro["enviados"].append((msg["Subject"], to_addrs))
+        def quit(self):
+            pass
+        def close(self):
+            pass
+
+    monkeypatch.setattr("app.email_fila.smtplib.SMTP_SSL", FakeSMTP)
+    return registro
+
+def enfileirar(assunto, remetente="r@x.com"):
+    return enfileirar_email(assunto, remetente, "<p>corpo</p>", "smtp.x.com", 465, "c@x.com", "d@x.com")
+
+def test_processar_fila_reaproveita_conexao(fila, smtp_fake):
+    for i in range(3):
+        enfileirar(f"Venda {i}")
+    enviador = EnviadorEmail()
+    assert enviador.processar_fila() == {"enviados": 3, "falhas": 0}
+    # Uma única conexão autenticada para o lote inteiro
+    assert smtp_fake["conexoes"] == 1
+    assert smtp_fake["logins"] == 1
+    assert smtp_fake["senhas"] == ["segredo"]
+    assert smtp_fake["enviados"][0] == ("Venda 0", ["d@x.com", "c@x.com"])
+    # Próximo lote reaproveita a conexão aberta
+    enfileirar("Venda 3")
+    enviador.processar_fila()
+    assert smtp_fake["conexoes"] == 1
+    # Status final e senha descartada
+    for mensagem in fila.find():
+        assert mensagem["status"] == "enviado"
+        assert "senha_email" not in mensagem
+
+def test_processar_fila_remetentes_diferentes(fila, smtp_fake):
+    enfileirar("A", "um@x.com")
+    enfileirar("B", "dois@x.com")
+    EnviadorEmail().processar_fila()
+    assert smtp_fake["logins"] == 2
+
+def test_processar_fila_falha_agenda_nova_tentativa(fila, smtp_fake):
+    id_mensagem = enfileirar("Venda")
+    smtp_fake["falhar_envio"] = True
+    antes = datetime.now()
+    assert EnviadorEmail().processar_fila() == {"enviados": 0, "falhas": 1}
+    mensagem = fila.find_one({"_id": id_mensagem})
+    assert mensagem["status"] == "pendente"
+    assert mensagem["tentativas"] == 1
+    assert "caiu" in mensagem["erro"]
+    assert mensagem["proxima_tentativa"] >= antes + timedelta(seconds=30)
+    # Ainda não chegou a hora da nova tentativa
+    smtp_fake["falhar_envio"] = False
+    assert EnviadorEmail().processar_fila() == {"enviados": 0, "falhas": 0}
+
+def test_processar_fila_backoff_e_falha_final(fila, smtp_fake):
+    id_mensagem = enfileirar("Venda")
+    smtp_fake["falhar_login"] = True
+    enviador = EnviadorEmail()
+    for _ in range(MAX_TENTATIVAS):
+        # Libera a nova tentativa imediatamente
+        fila.update_one({"_id": id_mensagem}, {"$set": {"proxima_tentativa": datetime.now() - timedelta(seconds=1)}})
+        enviador.processar_fila()
+    mensagem = fila.find_one({"_id": id_mensagem})
+    assert mensagem["status"] == "falhou"
+    assert mensagem["tentativas"] == MAX_TENTATIVAS
+    assert "senha_email" not in mensagem
+
+def test_processar_fila_recupera_reserva_expirada(fila, smtp_fake):
+    id_mensagem = enfileirar("Venda")
+    fila.update_one({"_id": id_mensagem}, {"$set": {"status": "enviando", "reservado_em": datetime.now() - timedelta(hours=1)}})
+    assert EnviadorEmail().processar_fila()["enviados"] == 1
+
+def test_processar_fila_erro_inesperado_vira_falha(fila, smtp_fake, monkeypatch):
+    primeira = enfileirar("Venda 1")
+    enfileirar("Venda 2")
+    original = EnviadorEmail._conexao
+
+    def conexao(self, mensagem):
+        # Erro fora do SMTP (ex: dados inválidos na mensagem) só na primeira
+        if mensagem["_id"] == primeira:
+            raise KeyError("servidor")
+        return original(self, mensagem)
+
+    monkeypatch.setattr(EnviadorEmail, "_conexao", conexao)
+    assert EnviadorEmail().processar_fila() == {"enviados": 1, "falhas": 1}
+    mensagem = fila.find_one({"_id": primeira})
+    # Não fica presa em 'enviando': volta para a fila com o erro registrado
+    assert mensagem["status"] == "pendente"
+    assert "servidor" in mensagem["erro"]
+
+def test_processar_fila_sem_senha_configurada(fila, smtp_fake, configs):
+    id_mensagem = enfileirar("Venda")
+    configs.update_one({"tipo": "geral"}, {"$unset": {"senha_email_smtp": ""}})
+    assert EnviadorEmail().processar_fila() == {"enviados": 0, "falhas": 1}
+    assert smtp_fake["conexoes"] == 0
+    assert "Senha SMTP" in fila.find_one({"_id": id_mensagem})["erro"]
@@ -0,0 +1,37 @@
+from app.geojson_brasil import simplificar_geojson
+
+def quadrado(sigla, x0, fronteira):
+    # Quadrado 1x1 a partir de x0; 'fronteira' são pontos quase retos no lado x = 1
+    if x0 == 0:
+        anel = [[0, 0], [1, 0]] + fronteira + [[1, 1], [0, 1], [0, 0]]
+    else:
+        anel = [[1, 1]] + fronteira[::-1] + [[1, 0], [2, 0], [2, 1], [1, 1]]
+    return {"type": "Feature", "properties": {"sigla": sigla, "name": sigla, "extra": 1},
+            "geometry": {"type": "Polygon", "coordinates": [anel]}}
+
+def test_simplificar_geojson_fronteira_igual_nos_vizinhos():
+    # Fronteira com pequenas oscilações (abaixo da tolerância) e uma saliência grande
+    fronteira = [[1 + (0.0001 if i % 2 else -0.0001), i / 100] for i in range(1, 100)]
+    fronteira[50] = [1.2, 0.51]
+    geojson = {"type": "FeatureCollection", "features": [quadrado("AA", 0, fronteira), quadrado("BB", 1, fronteira)]}
+
+    simplificado = simplificar_geojson(geojson, tolerancia=0.01, casas=3)
+    a, b = [f["geometry"]["coordinates"][0] for f in simplificado["features"]]
+    # Os pontos mantidos da fronteira são os mesmos nos dois estados
+    borda_a = {tuple(p) for p in a if p[0] != 0 and 0 < p[1] < 1}
+    borda_b = {tuple(p) for p in b if p[0] != 2 and 0 < p[1] < 1}
+    assert borda_a == borda_b
+    assert (1.2, 0.51) in borda_a
+    assert len(a) < 10 and a[0] == a[-1]
+
+def test_simplificar_geojson_propriedades_e_quantizacao():
+    geojson = {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {"sigla": "SP", "name": "São Paulo", "cartodb_id": 9},
+         "geometry": {"type": "MultiPolygon", "coordinates": [[[[0.12345, 0], [1, 0], [1, 1], [0, 1], [0.12345, 0]]]]}},
+        {"type": "Feature", "properties": {"sigla": "XX"}, "geometry": None},
+    ]}
+    simplificado = simplificar_geojson(geojson, casas=2)
+    assert len(simplificado["features"]) == 1
+    feature = simplificado["features"][0]
+    assert feature["properties"] == {"sigla": "SP", "name": "São Paulo"}
+    assert [0.12, 0] in feature["geometry"]["coordinates"][0][0]
@@ -2,6 +2,7 @@ import pytest
 from datetime import datetime
 
 from app.graficos import gerar_grafico_banco_vendedores
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_gerar_grafico_banco_vendedores_sem_vendas(monkeypatch):
     # Mock collections
@@ -9,6 +10,8 @@ def test_gerar_grafico_banco_vendedores_sem_vendas(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "João", "status": "ativo"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
     class FakeConfigsCollection:
@@ -35,11 +38,13 @@ def test_gerar_grafico_banco_vendedores_com_vendas(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria", "status": "ativo"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {"vendedor": "Maria", "valor_tabela": "1000", "valor_real": "1100", "desconto_autorizado": False},
-                {"vendedor": "Maria", "valor_tabela": "800", "valor_real": "700", "desconto_autorizado": False},  # desconto não autorizado
-                {"vendedor": "Maria", "valor_tabela": "600", "valor_real": "600", "desconto_autorizado": True},   # zero, autorizado
+                {"vendedor": "Maria", "valor_tabela": 1000, "valor_real": 1100, "desconto_autorizado": False},
+                {"vendedor": "Maria", "valor_tabela": 800, "valor_real": 700, "desconto_autorizado": False},  # desconto não autorizado
+                {"vendedor": "Maria", "valor_tabela": 600, "valor_real": 600, "desconto_autorizado": True},   # zero, autorizado
             ]
     class FakeConfigsCollection:
         def find(self, filtro, proj):
@@ -65,11 +70,13 @@ def test_gerar_grafico_banco_vendedores_com_vendas_dezembro(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria", "status": "ativo"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {"vendedor": "Maria", "valor_tabela": "1000", "valor_real": "1100", "desconto_autorizado": False},
-                {"vendedor": "Maria", "valor_tabela": "800", "valor_real": "700", "desconto_autorizado": False},  # desconto não autorizado
-                {"vendedor": "Maria", "valor_tabela": "600", "valor_real": "600", "desconto_autorizado": True},   # zero, autorizado
+                {"vendedor": "Maria", "valor_tabela": 1000, "valor_real": 1100, "desconto_autorizado": False},
+                {"vendedor": "Maria", "valor_tabela": 800, "valor_real": 700, "desconto_autorizado": False},  # desconto não autorizado
+                {"vendedor": "Maria", "valor_tabela": 600, "valor_real": 600, "desconto_autorizado": True},   # zero, autorizado
             ]
     class FakeConfigsCollection:
         def find(self, filtro, proj):
@@ -93,11 +100,13 @@ def test_gerar_grafico_banco_vendedores_com_vendas_erro_valor_tabela(monkeypatch
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria", "status": "ativo"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {"vendedor": "Maria", "valor_tabela": "erro", "valor_real": "1100", "desconto_autorizado": False},
-                {"vendedor": "Maria", "valor_tabela": "800", "valor_real": "700", "desconto_autorizado": False},  # desconto não autorizado
-                {"vendedor": "Maria", "valor_tabela": "600", "valor_real": "600", "desconto_autorizado": True},   # zero, autorizado
+                {"vendedor": "Maria", "valor_tabela": "erro", "valor_real": 1100, "desconto_autorizado": False},
+                {"vendedor": "Maria", "valor_tabela": 800, "valor_real": 700, "desconto_autorizado": False},  # desconto não autorizado
+                {"vendedor": "Maria", "valor_tabela": 600, "valor_real": 600, "desconto_autorizado": True},   # zero, autorizado
             ]
     class FakeConfigsCollection:
         def find(self, filtro, proj):
@@ -121,11 +130,13 @@ def test_gerar_grafico_banco_vendedores_com_vendas_erro_valor_real(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria", "status": "ativo"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {"vendedor": "Maria", "valor_tabela": "1000", "valor_real": "erro", "desconto_autorizado": False},
-                {"vendedor": "Maria", "valor_tabela": "800", "valor_real": "700", "desconto_autorizado": False},  # desconto não autorizado
-                {"vendedor": "Maria", "valor_tabela": "600", "valor_real": "600", "desconto_autorizado": True},   # zero, autorizado
+                {"vendedor": "Maria", "valor_tabela": 1000, "valor_real": "erro", "desconto_autorizado": False},
+                {"vendedor": "Maria", "valor_tabela": 800, "valor_real": 700, "desconto_autorizado": False},  # desconto não autorizado
+                {"vendedor": "Maria", "valor_tabela": 600, "valor_real": 600, "desconto_autorizado": True},   # zero, autorizado
             ]
     class FakeConfigsCollection:
         def find(self, filtro, proj):
@@ -150,11 +161,13 @@ def test_gerar_grafico_banco_vendedores_com_vendas_vendedor_inativo(monkeypatch)
             return []
         
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {"vendedor": "Maria", "valor_tabela": "1000", "valor_real": "1100", "desconto_autorizado": False},
-                {"vendedor": "Maria", "valor_tabela": "800", "valor_real": "700", "desconto_autorizado": False},  # desconto não autorizado
-                {"vendedor": "Maria", "valor_tabela": "600", "valor_real": "600", "desconto_autorizado": True},   # zero, autorizado
+                {"vendedor": "Maria", "valor_tabela": 1000, "valor_real": 1100, "desconto_autorizado": False},
+                {"vendedor": "Maria", "valor_tabela": 800, "valor_real": 700, "desconto_autorizado": False},  # desconto não autorizado
+                {"vendedor": "Maria", "valor_tabela": 600, "valor_real": 600, "desconto_autorizado": True},   # zero, autorizado
             ]
     class FakeConfigsCollection:
         def find(self, filtro, proj):
@@ -178,9 +191,11 @@ def test_gerar_grafico_banco_vendedores_com_vendas_saldo_novo_entre_zero_e_saldo
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria", "status": "ativo"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {"vendedor": "Maria", "valor_tabela": "1000", "valor_real": "900", "desconto_autorizado": False}
+                {"vendedor": "Maria", "valor_tabela": 1000, "valor_real": 900, "desconto_autorizado": False}
             ]
     class FakeConfigsCollection:
         def find(self, filtro, proj):
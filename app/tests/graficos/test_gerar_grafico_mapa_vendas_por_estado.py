@@ -3,12 +3,15 @@ from collections import defaultdict
 import json
 import builtins
 from app.graficos import gerar_grafico_mapa_vendas_por_estado
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_grafico_mapa_sem_vendas(monkeypatch):
     class FakeUsuariosCollection:
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
     def fake_open(path, encoding=None):
@@ -29,7 +32,7 @@ def test_grafico_mapa_sem_vendas(monkeypatch):
     monkeypatch.setattr("app.graficos.usuarios_collection", FakeUsuariosCollection())
     monkeypatch.setattr("app.graficos.vendas_collection", FakeVendasCollection())
     monkeypatch.setattr("builtins.open", fake_open)
-    monkeypatch.setattr("app.graficos.json.load", fake_json_load)
+    monkeypatch.setattr("json.load", fake_json_load)
     monkeypatch.setattr("app.graficos.pio.to_html", fake_to_html)
 
     html = gerar_grafico_mapa_vendas_por_estado(2025, 7)
@@ -40,6 +43,8 @@ def test_grafico_mapa_com_vendas(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             # Uma venda em SP, outra estrangeira
             return [
@@ -78,7 +83,7 @@ def test_grafico_mapa_com_vendas(monkeypatch):
     monkeypatch.setattr("app.graficos.usuarios_collection", FakeUsuariosCollection())
     monkeypatch.setattr("app.graficos.vendas_collection", FakeVendasCollection())
     monkeypatch.setattr("builtins.open", fake_open)
-    monkeypatch.setattr("app.graficos.json.load", fake_json_load)
+    monkeypatch.setattr("json.load", fake_json_load)
     monkeypatch.setattr("app.graficos.pio.to_html", fake_to_html)
 
     html = gerar_grafico_mapa_vendas_por_estado(2025, 7)
@@ -89,6 +94,8 @@ def test_grafico_mapa_com_vendas_dezembro(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             # Uma venda em SP, outra estrangeira
             return [
@@ -114,7 +121,7 @@ def test_grafico_mapa_com_vendas_dezembro(monkeypatch):
     monkeypatch.setattr("app.graficos.usuarios_collection", FakeUsuariosCollection())
     monkeypatch.setattr("app.graficos.vendas_collection", FakeVendasCollection())
     monkeypatch.setattr("builtins.open", fake_open)
-    monkeypatch.setattr("app.graficos.json.load", lambda f: f)
+    monkeypatch.setattr("json.load", lambda f: f)
     monkeypatch.setattr("app.graficos.pio.to_html", fake_to_html)
 
     html = gerar_grafico_mapa_vendas_por_estado(2025, 12)
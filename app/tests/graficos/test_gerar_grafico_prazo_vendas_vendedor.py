@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime
 from app.graficos import gerar_grafico_prazo_vendas_vendedor
 
 def test_grafico_prazo_vazio(monkeypatch):
@@ -93,3 +94,24 @@ def test_grafico_prazo_com_dados_dezembro(monkeypatch):
 
     html = gerar_grafico_prazo_vendas_vendedor(2025, 12)
     assert html == "<div>grafico-prazo-dados</div>"
+
+def test_grafico_prazo_pipeline_usa_faixa_gravada(monkeypatch):
+    pipelines = []
+    class FakeUsuariosCollection:
+        def find(self, filtro, proj):
+            return [{"nome_completo": "Maria"}]
+    class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            pipelines.append(pipeline)
+            return []
+
+    monkeypatch.setattr("app.graficos.usuarios_collection", FakeUsuariosCollection())
+    monkeypatch.setattr("app.graficos.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.graficos.pio.to_html", lambda fig, **kwargs: "")
+
+    gerar_grafico_prazo_vendas_vendedor(2025, 7)
+    # O primeiro estágio é um $match direto em data_criacao (sem conversões antes)
+    match = pipelines[0][0]["$match"]
+    assert match["data_criacao"] == {"$gte": datetime(2025, 7, 1), "$lt": datetime(2025, 8, 1)}
+    assert match["faixa_prazo"] == {"$in": ["≤ 30 dias", "31-39 dias", "40-49 dias", "50-150 dias"]}
+    assert "$group" in pipelines[0][1]
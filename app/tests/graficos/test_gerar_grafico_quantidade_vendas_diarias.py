@@ -14,7 +14,7 @@ def test_grafico_quantidade_vendas_diarias_vazio(monkeypatch):
         return "<div>grafico-linha-qtd-vazio</div>"
 
     monkeypatch.setattr("app.graficos.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.graficos.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.graficos.vendas_diarias_collection", FakeVendasCollection())
     monkeypatch.setattr("app.graficos.pio.to_html", fake_to_html)
 
     html = gerar_grafico_quantidade_vendas_diarias(2025, 7)
@@ -42,7 +42,7 @@ def test_grafico_quantidade_vendas_diarias_com_dados(monkeypatch):
         return "<div>grafico-linha-qtd-dados</div>"
 
     monkeypatch.setattr("app.graficos.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.graficos.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.graficos.vendas_diarias_collection", FakeVendasCollection())
     monkeypatch.setattr("app.graficos.pio.to_html", fake_to_html)
 
     html = gerar_grafico_quantidade_vendas_diarias(2025, 7)
@@ -62,7 +62,7 @@ def test_grafico_quantidade_vendas_diarias_um_dia(monkeypatch):
         return "<div>grafico-linha-qtd-um-dia</div>"
 
     monkeypatch.setattr("app.graficos.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.graficos.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.graficos.vendas_diarias_collection", FakeVendasCollection())
     monkeypatch.setattr("app.graficos.pio.to_html", fake_to_html)
 
     html = gerar_grafico_quantidade_vendas_diarias(2025, 7)
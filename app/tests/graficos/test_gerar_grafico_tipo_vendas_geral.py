@@ -1,11 +1,14 @@
 import pytest
 from app.graficos import gerar_grafico_tipo_vendas_geral
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_grafico_tipo_vendas_geral_sem_vendas(monkeypatch):
     class FakeUsuariosCollection:
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
     chamado = {}
@@ -25,6 +28,8 @@ def test_grafico_tipo_vendas_geral_com_dados(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
                 {"produto": "X1"},               # nova
@@ -55,6 +60,8 @@ def test_grafico_tipo_vendas_geral_com_dados_dezembro(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
                 {"produto": "X1"},               # nova
@@ -84,6 +91,8 @@ def test_grafico_tipo_vendas_geral_so_novas(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [{"produto": "Qualquer"} for _ in range(5)]
     def fake_to_html(fig, **kwargs):
@@ -105,6 +114,8 @@ def test_grafico_tipo_vendas_geral_so_atualizacoes(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [{"produto": "atualização"}, {"produto": "atualizacao"}]
     def fake_to_html(fig, **kwargs):
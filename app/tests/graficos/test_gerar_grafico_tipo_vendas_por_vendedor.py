@@ -1,12 +1,15 @@
 import pytest
 from collections import defaultdict
 from app.graficos import gerar_grafico_tipo_vendas_por_vendedor
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_grafico_tipo_vendas_sem_vendas(monkeypatch):
     class FakeUsuariosCollection:
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
     chamado = {}
@@ -25,6 +28,8 @@ def test_grafico_tipo_vendas_novas_e_atualizacoes(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             # Maria faz 2 novas e 1 atualização, João só 1 nova
             return [
@@ -58,6 +63,8 @@ def test_grafico_tipo_vendas_novas_e_atualizacoes_dezembro(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             # Maria faz 2 novas e 1 atualização, João só 1 nova
             return [
@@ -91,6 +98,8 @@ def test_grafico_tipo_vendas_produto_none(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             # Maria faz 2 novas e 1 atualização, João só 1 nova
             return [
@@ -124,6 +133,8 @@ def test_grafico_tipo_vendas_somente_novas(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
                 {"vendedor": "Maria", "produto": "Produto X"},
@@ -146,6 +157,8 @@ def test_grafico_tipo_vendas_somente_atualizacoes(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
                 {"vendedor": "Maria", "produto": "Atualização"},
@@ -1,11 +1,14 @@
 import pytest
 from app.graficos import gerar_grafico_vendas_diarias
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_gerar_grafico_vendas_diarias_sem_vendas(monkeypatch):
     class FakeUsuariosCollection:
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
     chamado = {}
@@ -26,11 +29,13 @@ def test_gerar_grafico_vendas_diarias_com_vendas(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {"vendedor": "Maria", "status": "Aprovada", "valor_real": "1000"},
-                {"vendedor": "Maria", "status": "Faturado", "valor_real": "500"},
-                {"vendedor": "João", "status": "Faturado", "valor_real": "1200"},
+                {"vendedor": "Maria", "status": "Aprovada", "valor_real": 1000},
+                {"vendedor": "Maria", "status": "Faturado", "valor_real": 500},
+                {"vendedor": "João", "status": "Faturado", "valor_real": 1200},
             ]
     def fake_soma_vendas(vendas):
         return sum(float(v["valor_real"]) for v in vendas)
@@ -56,11 +61,13 @@ def test_gerar_grafico_vendas_diarias_erro_data(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {"vendedor": "Maria", "status": "Aprovada", "valor_real": "1000"},
-                {"vendedor": "Maria", "status": "Faturado", "valor_real": "500"},
-                {"vendedor": "João", "status": "Faturado", "valor_real": "1200"},
+                {"vendedor": "Maria", "status": "Aprovada", "valor_real": 1000},
+                {"vendedor": "Maria", "status": "Faturado", "valor_real": 500},
+                {"vendedor": "João", "status": "Faturado", "valor_real": 1200},
             ]
     def fake_soma_vendas(vendas):
         return sum(float(v["valor_real"]) for v in vendas)
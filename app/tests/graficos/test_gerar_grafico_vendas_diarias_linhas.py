@@ -14,7 +14,7 @@ def test_grafico_vendas_diarias_linhas_vazio(monkeypatch):
         return "<div>grafico-linha-vazio</div>"
 
     monkeypatch.setattr("app.graficos.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.graficos.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.graficos.vendas_diarias_collection", FakeVendasCollection())
     monkeypatch.setattr("app.graficos.pio.to_html", fake_to_html)
 
     html = gerar_grafico_vendas_diarias_linhas(2025, 7)
@@ -43,7 +43,7 @@ def test_grafico_vendas_diarias_linhas_com_dados(monkeypatch):
         return "<div>grafico-linha-dados</div>"
 
     monkeypatch.setattr("app.graficos.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.graficos.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.graficos.vendas_diarias_collection", FakeVendasCollection())
     monkeypatch.setattr("app.graficos.pio.to_html", fake_to_html)
 
     html = gerar_grafico_vendas_diarias_linhas(2025, 7)
@@ -72,7 +72,7 @@ def test_grafico_vendas_diarias_linhas_com_dados_dezembro(monkeypatch):
         return "<div>grafico-linha-dados</div>"
 
     monkeypatch.setattr("app.graficos.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.graficos.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.graficos.vendas_diarias_collection", FakeVendasCollection())
     monkeypatch.setattr("app.graficos.pio.to_html", fake_to_html)
 
     html = gerar_grafico_vendas_diarias_linhas(2025, 12)
@@ -92,7 +92,7 @@ def test_grafico_vendas_diarias_linhas_apenas_um_dia(monkeypatch):
         return "<div>grafico-linha-um-dia</div>"
 
     monkeypatch.setattr("app.graficos.usuarios_collection", FakeUsuariosCollection())
-    monkeypatch.setattr("app.graficos.vendas_collection", FakeVendasCollection())
+    monkeypatch.setattr("app.graficos.vendas_diarias_collection", FakeVendasCollection())
     monkeypatch.setattr("app.graficos.pio.to_html", fake_to_html)
 
     html = gerar_grafico_vendas_diarias_linhas(2025, 7)
@@ -12,6 +12,8 @@ def test_gerar_grafico_vendas_geral_sem_vendas(monkeypatch):
     class FakeConfigsCollection:
         def find(self, filtro, proj):
             return [{"meta_empresa": "100000"}]
+        def find_one(self, filtro):
+            return {"meta_empresa": "100000"}
     # Mock pio.to_html
     chamado = {}
     def fake_to_html(fig, **kwargs):
@@ -41,6 +43,8 @@ def test_gerar_grafico_vendas_geral_com_vendas(monkeypatch):
     class FakeConfigsCollection:
         def find(self, filtro, proj):
             return [{"meta_empresa": "20000"}]
+        def find_one(self, filtro):
+            return {"meta_empresa": "20000"}
 
     def fake_to_html(fig, **kwargs):
         bars = fig.data
@@ -79,6 +83,8 @@ def test_gerar_grafico_vendas_geral_dezembro(monkeypatch):
     class FakeConfigsCollection:
         def find(self, filtro, proj):
             return [{"meta_empresa": "20000"}]
+        def find_one(self, filtro):
+            return {"meta_empresa": "20000"}
 
     def fake_to_html(fig, **kwargs):
         assert fig.layout.title.text.startswith("Meta Mensal")
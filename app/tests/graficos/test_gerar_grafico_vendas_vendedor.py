@@ -1,11 +1,14 @@
 import pytest
 from app.graficos import gerar_grafico_vendas_vendedor
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_gerar_grafico_vendas_vendedor_sem_vendas(monkeypatch):
     class FakeUsuariosCollection:
         def find(self, filtro, proj):
             return [{"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
     chamado = {}
@@ -26,11 +29,13 @@ def test_gerar_grafico_vendas_vendedor_com_vendas(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {"vendedor": "Maria", "status": "Aprovada", "valor_real": "1000"},
-                {"vendedor": "Maria", "status": "Faturado", "valor_real": "500"},
-                {"vendedor": "João", "status": "Aprovada", "valor_real": "300"},
+                {"vendedor": "Maria", "status": "Aprovada", "valor_real": 1000},
+                {"vendedor": "Maria", "status": "Faturado", "valor_real": 500},
+                {"vendedor": "João", "status": "Aprovada", "valor_real": 300},
             ]
     def fake_soma_vendas(vendas):
         return sum(float(v["valor_real"]) for v in vendas)
@@ -57,11 +62,13 @@ def test_gerar_grafico_vendas_vendedor_dezembro(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
-                {"vendedor": "Maria", "status": "Aprovada", "valor_real": "1000"},
-                {"vendedor": "Maria", "status": "Faturado", "valor_real": "500"},
-                {"vendedor": "João", "status": "Aprovada", "valor_real": "300"},
+                {"vendedor": "Maria", "status": "Aprovada", "valor_real": 1000},
+                {"vendedor": "Maria", "status": "Faturado", "valor_real": 500},
+                {"vendedor": "João", "status": "Aprovada", "valor_real": 300},
             ]
     def fake_soma_vendas(vendas):
         return sum(float(v["valor_real"]) for v in vendas)
@@ -1,12 +1,15 @@
 import pytest
 from datetime import datetime
 from app.graficos import gerar_grafico_verdes_vermelhos_geral
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_grafico_verdes_vermelhos_geral_sem_vendas(monkeypatch):
     class FakeUsuariosCollection:
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
     chamado = {}
@@ -25,6 +28,8 @@ def test_grafico_verdes_vermelhos_geral_todos(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             # 3 verdes, 2 vermelhos, 1 outro
             return [
@@ -54,6 +59,8 @@ def test_grafico_verdes_vermelhos_geral_todos_dezembro(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             # 3 verdes, 2 vermelhos, 1 outro
             return [
@@ -83,6 +90,8 @@ def test_grafico_verdes_vermelhos_geral_sem_verde_e_vermelho(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             # 3 verdes, 2 vermelhos, 1 outro
             return [
@@ -108,6 +117,8 @@ def test_grafico_verdes_vermelhos_geral_somente_verde(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [{"tipo_cliente": "verde"} for _ in range(5)]
     def fake_to_html(fig, **kwargs):
@@ -127,6 +138,8 @@ def test_grafico_verdes_vermelhos_geral_somente_vermelho(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [{"tipo_cliente": "vermelho"} for _ in range(4)]
     def fake_to_html(fig, **kwargs):
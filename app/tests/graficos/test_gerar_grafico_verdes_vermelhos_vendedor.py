@@ -1,11 +1,14 @@
 import pytest
 from app.graficos import gerar_grafico_verdes_vermelhos_vendedor
+from app.tests.agregacao_fake import agregar_em_memoria
 
 def test_grafico_verdes_vermelhos_vendedor_sem_vendas(monkeypatch):
     class FakeUsuariosCollection:
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return []
     chamado = {}
@@ -25,6 +28,8 @@ def test_grafico_verdes_vermelhos_vendedor_com_vendas(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
                 {"vendedor": "Maria", "tipo_cliente": "verde"},
@@ -67,6 +72,8 @@ def test_grafico_verdes_vermelhos_vendedor_com_vendas_dezembro(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
                 {"vendedor": "Maria", "tipo_cliente": "verde"},
@@ -109,6 +116,8 @@ def test_grafico_verdes_vermelhos_vendedor_com_vendas_sem_verde_e_vermelho(monke
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}, {"nome_completo": "João"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [
                 {"vendedor": "Maria", "tipo_cliente": "azul"},
@@ -136,6 +145,8 @@ def test_grafico_verdes_vermelhos_vendedor_somente_um_tipo(monkeypatch):
         def find(self, filtro, proj):
             return [{"nome_completo": "Maria"}]
     class FakeVendasCollection:
+        def aggregate(self, pipeline):
+            return agregar_em_memoria(self.find({}, {}), pipeline)
         def find(self, filtro, proj):
             return [{"vendedor": "Maria", "tipo_cliente": "verde"} for _ in range(3)]
     def fake_to_html(fig, **kwargs):
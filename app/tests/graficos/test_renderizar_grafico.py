@@ -0,0 +1,37 @@
+import json
+import plotly.graph_objs as go
+from flask import Flask
+
+from app.graficos import renderizar_grafico, gerar_grafico_painel, GRAFICOS_PAINEL
+from app.routes.apiGraficoFigura import api_grafico_figura_bp
+
+def test_renderizar_grafico_figura_json():
+    fig = go.Figure(go.Bar(x=["Maria"], y=[10]))
+    fig.update_layout(title="Teste")
+    dados = json.loads(renderizar_grafico(fig, "figura"))
+    assert dados["data"][0]["type"] == "bar"
+    assert dados["layout"]["title"]["text"] == "Teste"
+
+def test_renderizar_grafico_html_sem_plotlyjs():
+    html = renderizar_grafico(go.Figure(), "html")
+    assert "<div" in html
+    assert "src=" not in html
+
+def test_renderizar_grafico_cdn_vira_plotlyjs_local():
+    app = Flask(__name__)
+    app.register_blueprint(api_grafico_figura_bp)
+    with app.test_request_context("/"):
+        html = renderizar_grafico(go.Figure(), "html", include_plotlyjs="cdn")
+    assert 'src="/plotly/plotly-' in html
+    assert "cdn.plot.ly" not in html
+
+def test_gerar_grafico_painel_repassa_formato(monkeypatch):
+    chamadas = []
+    monkeypatch.setitem(GRAFICOS_PAINEL, "vendas_geral", lambda **kw: chamadas.append(kw) or "{}")
+    monkeypatch.setitem(GRAFICOS_PAINEL, "vendas_diarias", lambda **kw: chamadas.append(kw) or "{}")
+    gerar_grafico_painel("vendas_geral", 2025, 7, formato="figura")
+    gerar_grafico_painel("vendas_diarias", data_escolhida="2025-07-01", formato="figura")
+    assert chamadas == [
+        {"ano": 2025, "mes": 7, "formato": "figura"},
+        {"data_escolhida": "2025-07-01", "formato": "figura"},
+    ]
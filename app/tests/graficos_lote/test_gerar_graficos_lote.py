@@ -0,0 +1,46 @@
+import json
+import threading
+import pytest
+from flask import Flask, g
+
+from app.graficos_lote import gerar_graficos_lote
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+    with app.test_request_context("/api/graficos/lote"):
+        yield app
+
+def test_graficos_lote_em_paralelo(monkeypatch, app):
+    # Os dois gráficos só terminam se rodarem ao mesmo tempo
+    barreira = threading.Barrier(2, timeout=5)
+    snapshots = []
+    def fake_gerar_grafico_painel(nome, ano=None, mes=None, data_escolhida=None, formato="html"):
+        barreira.wait()
+        snapshots.append(g.snapshots_mensais)
+        return json.dumps({"data": [], "layout": {"title": {"text": nome}}, "ano": ano, "formato": formato})
+    monkeypatch.setattr("app.graficos_lote.gerar_grafico_painel", fake_gerar_grafico_painel)
+
+    linhas = [json.loads(linha) for linha in gerar_graficos_lote(["vendas_geral", "banco_vendedores"], 2025, 7, threads=2)]
+    assert sorted(linha["nome"] for linha in linhas) == ["banco_vendedores", "vendas_geral"]
+    assert all(linha["figura"]["ano"] == 2025 and linha["figura"]["formato"] == "figura" for linha in linhas)
+    # As threads usam os snapshots mensais da requisição
+    assert snapshots[0] is snapshots[1] is g.snapshots_mensais
+
+def test_graficos_lote_erros(monkeypatch, app):
+    def fake_gerar_grafico_painel(nome, *args, **kwargs):
+        if nome == "banco_vendedores":
+            raise RuntimeError("falhou")
+        return '{"data":[],"layout":{}}'
+    monkeypatch.setattr("app.graficos_lote.gerar_grafico_painel", fake_gerar_grafico_painel)
+
+    linhas = [json.loads(linha) for linha in gerar_graficos_lote(
+        ["nao_existe", "vendas_geral", "banco_vendedores", "vendas_geral"], threads=1
+    )]
+    # Desconhecidos vêm primeiro; repetidos são gerados uma vez
+    assert linhas[0] == {"nome": "nao_existe", "erro": "Gráfico não encontrado"}
+    por_nome = {linha["nome"]: linha for linha in linhas[1:]}
+    assert len(linhas) == 3
+    assert por_nome["vendas_geral"]["figura"] == {"data": [], "layout": {}}
+    assert "falhou" in por_nome["banco_vendedores"]["erro"]
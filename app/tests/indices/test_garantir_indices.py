@@ -0,0 +1,117 @@
+import mongomock
+from pymongo.errors import OperationFailure, ServerSelectionTimeoutError
+
+from app.indices import (
+    INDICES, garantir_indices, numeros_venda_duplicados, corrigir_numeros_duplicados, mensagem_duplicados
+)
+
+def test_garantir_indices_cria_todos():
+    db = mongomock.MongoClient().db
+    resultado = garantir_indices(db)
+    assert resultado['erros'] == []
+    for nome_colecao, indices in INDICES.items():
+        existentes = db[nome_colecao].index_information()
+        for indice in indices:
+            assert indice.document['name'] in existentes
+
+def test_garantir_indices_idempotente():
+    db = mongomock.MongoClient().db
+    garantir_indices(db)
+    resultado = garantir_indices(db)
+    assert resultado['erros'] == []
+    assert len(db['vendas'].index_information()) == len(INDICES['vendas']) + 1  # + _id
+
+def test_garantir_indices_username_unico():
+    db = mongomock.MongoClient().db
+    garantir_indices(db)
+    assert db['usuarios'].index_information()['username'].get('unique') is True
+
+def test_garantir_indices_numero_da_venda_unico():
+    db = mongomock.MongoClient().db
+    garantir_indices(db)
+    assert db['vendas'].index_information()['numero_da_venda'].get('unique') is True
+
+def test_garantir_indices_registra_erro_e_continua(monkeypatch):
+    db = mongomock.MongoClient().db
+    db['usuarios'].insert_many([{"username": "maria"}, {"username": "maria"}])
+    original = mongomock.Collection.create_indexes
+    def create_indexes_falha(self, indexes, *args, **kwargs):
+        if indexes[0].document['name'] == 'username':
+            raise OperationFailure("E11000 duplicate key error")
+        return original(self, indexes, *args, **kwargs)
+    monkeypatch.setattr(mongomock.Collection, "create_indexes", create_indexes_falha)
+    resultado = garantir_indices(db)
+    assert resultado['erros'][0][:2] == ('usuarios', 'username')
+    assert ('usuarios', 'status') in resultado['criados']
+    assert ('notificacoes', 'envolvidos_data_hora') in resultado['criados']
+
+def test_garantir_indices_para_sem_conexao():
+    chamadas = []
+    class FakeCollection:
+        def create_indexes(self, indexes):
+            chamadas.append(indexes)
+            raise ServerSelectionTimeoutError("sem conexão")
+    class FakeDB:
+        def __getitem__(self, nome):
+            return FakeCollection()
+    resultado = garantir_indices(FakeDB())
+    assert len(chamadas) == 1
+    assert len(resultado['erros']) == 1
+    assert resultado['criados'] == []
+
+def vendas_duplicadas(db):
+    db['vendas'].insert_many([
+        {"numero_da_venda": "2025070001", "nome": "a"},
+        {"numero_da_venda": "2025070001", "nome": "b"},
+        {"numero_da_venda": "2025070001", "nome": "c"},
+        {"numero_da_venda": "2025070002", "nome": "d"},
+        {"numero_da_venda": "2024120005", "nome": "e"},
+        {"numero_da_venda": "2024120005", "nome": "f"},
+        {"numero_da_venda": "", "nome": "sem número"},
+        {"numero_da_venda": "", "nome": "sem número 2"},
+    ])
+
+def test_numeros_venda_duplicados():
+    db = mongomock.MongoClient().db
+    vendas_duplicadas(db)
+    duplicados = numeros_venda_duplicados(db)
+    assert [d['numero_da_venda'] for d in duplicados] == ["2024120005", "2025070001"]
+    # IDs da venda mais antiga para a mais nova
+    nomes = [db['vendas'].find_one({"_id": i})["nome"] for i in duplicados[1]['ids']]
+    assert nomes == ["a", "b", "c"]
+
+def test_garantir_indices_lista_duplicados_do_numero_da_venda(monkeypatch):
+    db = mongomock.MongoClient().db
+    vendas_duplicadas(db)
+    original = mongomock.Collection.create_indexes
+    def create_indexes_falha(self, indexes, *args, **kwargs):
+        # Como no MongoDB: o índice único não é criado com valores repetidos
+        if indexes[0].document['name'] == 'numero_da_venda':
+            raise OperationFailure("E11000 duplicate key error")
+        return original(self, indexes, *args, **kwargs)
+    monkeypatch.setattr(mongomock.Collection, "create_indexes", create_indexes_falha)
+    resultado = garantir_indices(db)
+    assert [d['numero_da_venda'] for d in resultado['duplicados']] == ["2024120005", "2025070001"]
+    mensagem = mensagem_duplicados(resultado['duplicados'])
+    assert "2 número(s) de venda repetido(s)" in mensagem
+    assert "--corrigir-duplicados" in mensagem
+
+def test_corrigir_numeros_duplicados():
+    db = mongomock.MongoClient().db
+    vendas_duplicadas(db)
+    sequencias = {}
+    def fake_gerar_numero(prefixo):
+        sequencias[prefixo] = sequencias.get(prefixo, 90) + 1
+        return f"{prefixo}{sequencias[prefixo]:04d}"
+
+    alteracoes = corrigir_numeros_duplicados(db, fake_gerar_numero)
+    assert [(antigo, novo) for _, antigo, novo in alteracoes] == [
+        ("2024120005", "2024120091"), ("2025070001", "2025070091"), ("2025070001", "2025070092")
+    ]
+    # A venda mais antiga mantém o número
+    assert db['vendas'].find_one({"nome": "a"})["numero_da_venda"] == "2025070001"
+    assert db['vendas'].find_one({"nome": "c"})["numero_da_venda"] == "2025070092"
+    assert numeros_venda_duplicados(db) == []
+    # O mongomock não aplica o filtro parcial no índice único: tira as vendas sem número
+    db['vendas'].delete_many({"numero_da_venda": ""})
+    assert garantir_indices(db)['erros'] == []
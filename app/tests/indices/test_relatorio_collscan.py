@@ -0,0 +1,56 @@
+from pymongo.errors import OperationFailure
+
+from app.indices import possui_collscan, relatorio_collscan
+
+PLANO_COLLSCAN = {"queryPlanner": {"winningPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}}}
+PLANO_IXSCAN = {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "username"}}}}
+PLANO_AGGREGATE = {"stages": [{"$cursor": {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}}, {"$group": {}}]}
+
+class FakeCursor:
+    def __init__(self, plano):
+        self.plano = plano
+        self.ordenacao = None
+    def sort(self, ordenacao):
+        self.ordenacao = ordenacao
+        return self
+    def explain(self):
+        return self.plano
+
+class FakeCollection:
+    def __init__(self, plano):
+        self.plano = plano
+    def find(self, filtro):
+        return FakeCursor(self.plano)
+
+class FakeDB:
+    def __init__(self, planos):
+        self.planos = planos
+    def __getitem__(self, nome):
+        return FakeCollection(self.planos[nome])
+    def command(self, comando, colecao, pipeline=None, explain=False):
+        assert comando == 'aggregate' and explain
+        if colecao == 'erro':
+            raise OperationFailure("explain não suportado")
+        return PLANO_AGGREGATE
+
+def test_possui_collscan():
+    assert possui_collscan(PLANO_COLLSCAN) is True
+    assert possui_collscan(PLANO_IXSCAN) is False
+    assert possui_collscan(PLANO_AGGREGATE) is True
+
+def test_relatorio_collscan():
+    db = FakeDB({'vendas': PLANO_COLLSCAN, 'usuarios': PLANO_IXSCAN})
+    consultas = [
+        {'nome': 'vendas', 'colecao': 'vendas', 'filtro': {}, 'sort': [('numero_da_venda', -1)]},
+        {'nome': 'login', 'colecao': 'usuarios', 'filtro': {'username': 'x'}},
+        {'nome': 'pipeline', 'colecao': 'vendas', 'pipeline': [{'$match': {}}]},
+        {'nome': 'falha', 'colecao': 'erro', 'pipeline': []},
+    ]
+    relatorio = relatorio_collscan(db, consultas)
+    assert [item['collscan'] for item in relatorio] == [True, False, True, None]
+    assert "explain não suportado" in relatorio[3]['erro']
+
+def test_relatorio_collscan_padrao_cobre_colecoes():
+    planos = {'vendas': PLANO_IXSCAN, 'usuarios': PLANO_IXSCAN, 'notificacoes': PLANO_IXSCAN, 'configs': PLANO_IXSCAN}
+    relatorio = relatorio_collscan(FakeDB(planos))
+    assert {item['colecao'] for item in relatorio} == set(planos)
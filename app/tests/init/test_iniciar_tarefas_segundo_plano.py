@@ -0,0 +1,25 @@
+import app
+
+def registrar_chamadas(monkeypatch):
+    chamadas = []
+    monkeypatch.setattr(app, "iniciar_worker_email", lambda intervalo: chamadas.append(("email", intervalo)))
+    monkeypatch.setattr(app, "iniciar_worker_relatorios", lambda flask_app, intervalo: chamadas.append(("relatorios", intervalo)))
+    monkeypatch.setattr(app, "iniciar_agendador", lambda flask_app: chamadas.append(("agendador",)))
+    return chamadas
+
+def test_iniciar_tarefas_segundo_plano(monkeypatch):
+    chamadas = registrar_chamadas(monkeypatch)
+    monkeypatch.setenv("EMAIL_WORKER_INTERVALO", "7")
+    monkeypatch.delenv("EMAIL_WORKER", raising=False)
+    monkeypatch.delenv("RELATORIOS_WORKER", raising=False)
+    monkeypatch.delenv("AGENDADOR", raising=False)
+    app.iniciar_tarefas_segundo_plano(object())
+    assert chamadas == [("email", 7), ("relatorios", 5), ("agendador",)]
+
+def test_iniciar_tarefas_segundo_plano_desativadas(monkeypatch):
+    chamadas = registrar_chamadas(monkeypatch)
+    monkeypatch.setenv("EMAIL_WORKER", "False")
+    monkeypatch.setenv("RELATORIOS_WORKER", "False")
+    monkeypatch.setenv("AGENDADOR", "False")
+    app.iniciar_tarefas_segundo_plano(object())
+    assert chamadas == []
@@ -0,0 +1,18 @@
+from app.medir_inicializacao import ler_importtime
+
+RELATORIO = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 | _io
+import time:        80 |         80 |   json.decoder
+import time:       300 |        380 | json
+outra linha qualquer
+"""
+
+def test_ler_importtime():
+    assert ler_importtime(RELATORIO) == [
+        ("_io", 120, 120, 0),
+        ("json.decoder", 80, 80, 1),
+        ("json", 300, 380, 0),
+    ]
+
+def test_ler_importtime_vazio():
+    assert ler_importtime("") == []
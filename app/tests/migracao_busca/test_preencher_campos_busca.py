@@ -0,0 +1,29 @@
+import pytest
+import mongomock
+
+from app.migracao_busca import preencher_campos_busca
+
+@pytest.fixture
+def db(monkeypatch):
+    db = mongomock.MongoClient().db
+    monkeypatch.setattr("app.migracao_busca.vendas_collection", db.vendas)
+    db.vendas.insert_many([
+        {"cnpj_cpf": "12.345.678/0001-90", "nome": "Padaria São João", "vendedor": "Maria"},
+        {"cnpj_cpf": "123.456.789-00", "nome": "José", "vendedor": "João Souza"},
+        {"cnpj_cpf": "999", "nome": "Já migrada", "vendedor": "Ana", "busca_documento": "999",
+         "busca_nome": ["ja migrada", "migrada"], "busca_vendedor": ["ana"]},
+    ])
+    return db
+
+def test_preencher_campos_busca_todas(db):
+    assert preencher_campos_busca() == 2  # a já migrada não muda
+    venda = db.vendas.find_one({"nome": "Padaria São João"})
+    assert venda["busca_documento"] == "12345678000190"
+    assert venda["busca_nome"] == ["padaria sao joao", "sao joao", "joao"]
+    assert venda["busca_vendedor"] == ["maria"]
+
+def test_preencher_campos_busca_somente_faltando(db):
+    db.vendas.update_one({"nome": "José"}, {"$set": {"busca_documento": "x"}})
+    assert preencher_campos_busca(somente_faltando=True) == 1
+    assert db.vendas.find_one({"nome": "José"})["busca_documento"] == "x"
+    assert db.vendas.find_one({"nome": "Padaria São João"})["busca_vendedor"] == ["maria"]
@@ -0,0 +1,27 @@
+import pytest
+import mongomock
+from datetime import datetime
+
+from app.migracao_prazo import preencher_campos_prazo
+
+@pytest.fixture
+def db(monkeypatch):
+    db = mongomock.MongoClient().db
+    monkeypatch.setattr("app.migracao_prazo.vendas_collection", db.vendas)
+    db.vendas.insert_many([
+        {"nome": "A", "data_criacao": datetime(2025, 7, 1, 12), "data_prestacao_inicial": "2025-07-31"},
+        {"nome": "B", "data_criacao": datetime(2025, 7, 1, 12), "data_prestacao_inicial": ""},
+    ])
+    return db
+
+def test_preencher_campos_prazo(db):
+    assert preencher_campos_prazo() == 2
+    venda = db.vendas.find_one({"nome": "A"})
+    assert venda["data_prestacao_inicial"] == datetime(2025, 7, 31)
+    assert venda["prazo_dias"] == 29.5
+    assert venda["faixa_prazo"] == "≤ 30 dias"
+    venda = db.vendas.find_one({"nome": "B"})
+    assert venda["data_prestacao_inicial"] is None
+    assert venda["faixa_prazo"] is None
+    # Segunda execução não regrava nada
+    assert preencher_campos_prazo() == 0
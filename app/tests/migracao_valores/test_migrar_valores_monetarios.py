@@ -0,0 +1,31 @@
+import pytest
+import mongomock
+
+from app.migracao_valores import migrar_valores_monetarios
+
+@pytest.fixture
+def db(monkeypatch):
+    db = mongomock.MongoClient().db
+    monkeypatch.setattr("app.migracao_valores.vendas_collection", db.vendas)
+    db.vendas.insert_many([
+        {"nome": "A", "valor_real": "1.234,56", "valor_tabela": "1500.50", "valor_parcelas": "300,25", "valor_entrada": ""},
+        {"nome": "B", "valor_real": 100.0, "valor_tabela": 120, "valor_parcelas": "abc"},
+        {"nome": "C", "valor_real": 50.0, "valor_tabela": 50.0},
+    ])
+    return db
+
+def test_migrar_valores_monetarios(db):
+    assert migrar_valores_monetarios() == {"atualizadas": 1, "nao_convertidos": 1}
+    venda = db.vendas.find_one({"nome": "A"})
+    assert venda["valor_real"] == 1234.56
+    assert venda["valor_tabela"] == 1500.5
+    assert venda["valor_parcelas"] == 300.25
+    assert venda["valor_entrada"] is None
+    # Texto inválido é mantido; números não são regravados
+    venda = db.vendas.find_one({"nome": "B"})
+    assert venda["valor_parcelas"] == "abc"
+    assert venda["valor_tabela"] == 120
+
+def test_migrar_valores_monetarios_repetida(db):
+    migrar_valores_monetarios()
+    assert migrar_valores_monetarios() == {"atualizadas": 0, "nao_convertidos": 1}
@@ -0,0 +1,111 @@
+import pytest
+import mongomock
+from datetime import datetime
+
+import app.models as models
+from app.models import ColecaoVendas, atualizar_venda, excluir_venda
+
+@pytest.fixture
+def banco(monkeypatch):
+    db = mongomock.MongoClient().db
+    monkeypatch.setattr("app.models.vendas_collection", db.vendas)
+    monkeypatch.setattr("app.cache_graficos.contadores_collection", db.contadores)
+    monkeypatch.setattr("app.models.vendas_diarias_collection", db.vendas_diarias)
+    db.vendas.insert_one({
+        "numero_da_venda": "20240315-01", "vendedor": "Maria", "status": "Pendente",
+        "valor_real": 1000.0, "data_criacao": datetime(2024, 3, 15, 10, 0)
+    })
+    return db
+
+def versoes(db):
+    return db.contadores.find_one({"_id": "versao_graficos"}) or {}
+
+def test_atualizar_venda_invalida_mes_da_venda(banco):
+    resultado = atualizar_venda({"numero_da_venda": "20240315-01"}, {"$set": {"status": "Aprovada"}})
+    assert (resultado.matched_count, resultado.modified_count) == (1, 1)
+    assert banco.vendas.find_one()["status"] == "Aprovada"
+    # Venda de março/2024: invalida o mês dela (meses anteriores não usam a versão geral)
+    assert versoes(banco)["meses"] == {"202403": 1}
+    assert versoes(banco)["geral"] == 1
+
+def test_atualizar_venda_troca_de_mes_invalida_os_dois(banco):
+    atualizar_venda({"numero_da_venda": "20240315-01"}, {"$set": {"data_criacao": datetime(2024, 4, 2)}})
+    assert versoes(banco)["meses"] == {"202403": 1, "202404": 1}
+
+def test_atualizar_venda_sem_alteracao_nao_invalida(banco):
+    resultado = atualizar_venda({"numero_da_venda": "20240315-01"}, {"$set": {"status": "Pendente"}})
+    assert (resultado.matched_count, resultado.modified_count) == (1, 0)
+    assert versoes(banco) == {}
+
+def test_atualizar_venda_inexistente(banco):
+    resultado = atualizar_venda({"numero_da_venda": "x"}, {"$set": {"status": "Aprovada"}})
+    assert resultado.matched_count == 0
+    assert versoes(banco) == {}
+
+def test_atualizar_venda_outros_operadores(banco):
+    atualizar_venda({"numero_da_venda": "20240315-01"}, {"$push": {"logs": "editada"}})
+    assert banco.vendas.find_one()["logs"] == ["editada"]
+    assert versoes(banco)["meses"] == {"202403": 1}
+
+def test_excluir_venda(banco):
+    assert excluir_venda({"numero_da_venda": "20240315-01"}).deleted_count == 1
+    assert banco.vendas.count_documents({}) == 0
+    assert versoes(banco)["meses"] == {"202403": 1}
+    assert excluir_venda({"numero_da_venda": "20240315-01"}).deleted_count == 0
+
+def totais_dia(db, status):
+    return db.vendas_diarias.find_one({"dia": datetime(2024, 3, 15), "vendedor": "Maria", "status": status}, {"_id": 0, "quantidade": 1, "valor_real": 1})
+
+def test_atualizar_venda_ajusta_vendas_diarias(banco):
+    # Aprovação de status e valor editado: sai de 'Pendente' e entra em 'Aprovada'
+    # (a venda do fixture foi inserida sem nova_venda, então só os ajustes aparecem)
+    atualizar_venda({"numero_da_venda": "20240315-01"}, {"$set": {"status": "Aprovada", "valor_real": 1200.0}})
+    assert totais_dia(banco, "Pendente") == {"quantidade": -1, "valor_real": -1000.0}
+    assert totais_dia(banco, "Aprovada") == {"quantidade": 1, "valor_real": 1200.0}
+
+def test_excluir_venda_retira_de_vendas_diarias(banco):
+    excluir_venda({"numero_da_venda": "20240315-01"})
+    assert totais_dia(banco, "Pendente") == {"quantidade": -1, "valor_real": -1000.0}
+
+def test_colecao_vendas_direciona_escritas(monkeypatch):
+    # Rotas que usam vendas_collection.update_one/delete_one passam pelas funções acima
+    chamadas = []
+    monkeypatch.setattr(models, "atualizar_venda", lambda f, a, **o: chamadas.append(("atualizar", f, a, o)))
+    monkeypatch.setattr(models, "excluir_venda", lambda f, **o: chamadas.append(("excluir", f, o)))
+    colecao = ColecaoVendas("vendas")
+    colecao.update_one({"numero_da_venda": "1"}, {"$set": {"status": "Aprovada"}})
+    colecao.update_one({"numero_da_venda": "1"}, {"$set": {"status": "Aprovada"}}, upsert=True, session=None)
+    colecao.delete_one({"numero_da_venda": "1"}, hint="numero_da_venda_1")
+    assert chamadas == [
+        ("atualizar", {"numero_da_venda": "1"}, {"$set": {"status": "Aprovada"}}, {}),
+        ("atualizar", {"numero_da_venda": "1"}, {"$set": {"status": "Aprovada"}}, {"upsert": True, "session": None}),
+        ("excluir", {"numero_da_venda": "1"}, {"hint": "numero_da_venda_1"}),
+    ]
+
+def test_atualizar_venda_upsert_insere_como_venda_nova(banco):
+    resultado = atualizar_venda(
+        {"numero_da_venda": "20240315-02"},
+        {"$set": {"vendedor": "Maria", "status": "Pendente", "valor_real": 500.0, "data_criacao": datetime(2024, 3, 15, 11, 0)}},
+        upsert=True,
+    )
+    venda = banco.vendas.find_one({"numero_da_venda": "20240315-02"})
+    assert resultado.upserted_id == venda["_id"]
+    assert (resultado.matched_count, resultado.modified_count) == (0, 0)
+    assert totais_dia(banco, "Pendente") == {"quantidade": 1, "valor_real": 500.0}
+    assert versoes(banco)["meses"] == {"202403": 1}
+
+def test_atualizar_venda_upsert_de_venda_existente(banco):
+    resultado = atualizar_venda({"numero_da_venda": "20240315-01"}, {"$set": {"status": "Aprovada"}}, upsert=True)
+    assert (resultado.matched_count, resultado.modified_count, resultado.upserted_id) == (1, 1, None)
+    assert banco.vendas.count_documents({}) == 1
+    assert totais_dia(banco, "Aprovada") == {"quantidade": 1, "valor_real": 1000.0}
+
+def test_opcoes_repassadas_ao_pymongo(banco, monkeypatch):
+    recebidas = []
+    original_update, original_delete = banco.vendas.find_one_and_update, banco.vendas.find_one_and_delete
+    monkeypatch.setattr(banco.vendas, "find_one_and_update", lambda *a, **o: recebidas.append(o) or original_update(*a, **o), raising=False)
+    monkeypatch.setattr(banco.vendas, "find_one_and_delete", lambda *a, **o: recebidas.append(o) or original_delete(*a, **o), raising=False)
+    atualizar_venda({"numero_da_venda": "20240315-01"}, {"$set": {"status": "Aprovada"}}, session=None)
+    excluir_venda({"numero_da_venda": "20240315-01"}, session=None)
+    assert recebidas[0]["session"] is None and recebidas[1] == {"session": None}
+    assert banco.vendas.count_documents({}) == 0
@@ -0,0 +1,60 @@
+import pytest
+import mongomock
+from datetime import datetime
+
+from app.models import atualizar_vendas_diarias, atualizar_vendas_diarias_edicao, contribuicao_venda
+
+@pytest.fixture
+def vendas_diarias(monkeypatch):
+    colecao = mongomock.MongoClient().db.vendas_diarias
+    monkeypatch.setattr("app.models.vendas_diarias_collection", colecao)
+    return colecao
+
+def venda(**campos):
+    base = {
+        "data_criacao": datetime(2025, 7, 7, 15, 30),
+        "vendedor": "Maria",
+        "status": "Aprovada",
+        "valor_real": "1500,50",
+        "produto": "Sistema",
+        "tipo_cliente": "verde"
+    }
+    base.update(campos)
+    return base
+
+def test_contribuicao_venda():
+    chave, totais = contribuicao_venda(venda())
+    assert chave == {"dia": datetime(2025, 7, 7), "vendedor": "Maria", "status": "Aprovada"}
+    assert totais == {"quantidade": 1, "valor_real": 1500.5, "novas": 1, "atualizacoes": 0, "verdes": 1, "vermelhos": 0}
+
+def test_contribuicao_venda_atualizacao_vermelho():
+    _, totais = contribuicao_venda(venda(produto="Atualização", tipo_cliente="Vermelho", valor_real=200))
+    assert totais["atualizacoes"] == 1 and totais["novas"] == 0
+    assert totais["vermelhos"] == 1 and totais["verdes"] == 0
+    assert totais["valor_real"] == 200.0
+
+def test_contribuicao_venda_sem_data():
+    assert contribuicao_venda(venda(data_criacao=None)) is None
+
+def test_atualizar_vendas_diarias_soma(vendas_diarias):
+    atualizar_vendas_diarias(venda())
+    atualizar_vendas_diarias(venda(valor_real="500"))
+    doc = vendas_diarias.find_one({"dia": datetime(2025, 7, 7), "vendedor": "Maria", "status": "Aprovada"})
+    assert doc["quantidade"] == 2
+    assert doc["valor_real"] == 2000.5
+    assert vendas_diarias.count_documents({}) == 1
+
+def test_atualizar_vendas_diarias_edicao_muda_status(vendas_diarias):
+    antes = venda(status="Aguardando")
+    atualizar_vendas_diarias(antes)
+    depois = dict(antes, status="Faturado")
+    atualizar_vendas_diarias_edicao(antes, depois)
+    aguardando = vendas_diarias.find_one({"status": "Aguardando"})
+    faturado = vendas_diarias.find_one({"status": "Faturado"})
+    assert aguardando["quantidade"] == 0 and aguardando["valor_real"] == 0
+    assert faturado["quantidade"] == 1 and faturado["valor_real"] == 1500.5
+
+def test_atualizar_vendas_diarias_edicao_sem_mudanca(vendas_diarias):
+    antes = venda()
+    atualizar_vendas_diarias_edicao(antes, dict(antes, obs="nova observação"))
+    assert vendas_diarias.count_documents({}) == 0
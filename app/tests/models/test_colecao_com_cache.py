@@ -0,0 +1,55 @@
+import pytest
+import mongomock
+from pymongo.errors import DuplicateKeyError
+
+import app.catalogo_produtos as catalogo_produtos
+from app.models import ColecaoComCache, produtos_collection, cadastrar_produto
+from app.configuracoes import invalidar_configuracoes
+
+@pytest.fixture
+def cliente(monkeypatch):
+    cliente = mongomock.MongoClient()
+    monkeypatch.setattr("app.models.obter_cliente", lambda: cliente)
+    return cliente
+
+def test_escritas_invalidam(cliente):
+    invalidacoes = []
+    colecao = ColecaoComCache("produtos", invalidacoes.append)
+
+    colecao.insert_one({"nome": "Sistema"})
+    colecao.update_one({"nome": "Sistema"}, {"$set": {"status": "inativo"}})
+    colecao.delete_many({})
+    assert invalidacoes == [colecao, colecao, colecao]
+
+    # Leituras não invalidam
+    colecao.find_one({})
+    list(colecao.find({}))
+    assert len(invalidacoes) == 3
+
+def test_erro_na_escrita_nao_invalida(cliente):
+    colecao = ColecaoComCache("produtos", lambda c: None)
+    colecao.insert_one({"_id": 1})
+    invalidacoes = []
+    colecao._invalidar = invalidacoes.append
+    with pytest.raises(DuplicateKeyError):
+        colecao.insert_one({"_id": 1})
+    assert invalidacoes == []
+
+def test_configs_rota_invalida_versao(cliente):
+    # Como /api/configs/geral: update_one direto na coleção
+    configs = ColecaoComCache("configs", invalidar_configuracoes)
+    configs.update_one({"tipo": "geral"}, {"$set": {"email": "a@b.com"}}, upsert=True)
+    versao = cliente["sistemaVendas"]["contadores"].find_one({"_id": "versao_configs"})
+    assert versao["versao"] == 1
+
+def test_produtos_escritas_invalidam_catalogo(cliente, monkeypatch):
+    monkeypatch.setattr(catalogo_produtos, "_catalogo", object())
+    contadores = cliente["sistemaVendas"]["contadores"]
+
+    cadastrar_produto("1", "Sistema", [])
+    # Como /api/produto_update: update_one direto na coleção
+    produtos_collection.update_one({"codigo": "1"}, {"$set": {"nome": "Sistema Plus"}})
+    produtos_collection.delete_one({"codigo": "1"})
+
+    assert contadores.find_one({"_id": "versao_produtos"})["versao"] == 3
+    assert catalogo_produtos._catalogo is None
@@ -0,0 +1,26 @@
+import pytest
+import mongomock
+from bson import ObjectId
+from datetime import datetime, timedelta, timezone
+
+from app.models import limpar_logs_antigos
+
+@pytest.fixture
+def fake_logs_collection(monkeypatch):
+    mock_db = mongomock.MongoClient().db
+    monkeypatch.setattr("app.models.logs_collection", mock_db.logs)
+    return mock_db.logs
+
+def test_limpar_logs_antigos(fake_logs_collection):
+    agora = datetime.now(timezone.utc)
+    # A data de gravação vem do _id
+    antigo = ObjectId.from_datetime(agora - timedelta(days=400))
+    recente = ObjectId.from_datetime(agora - timedelta(days=10))
+    fake_logs_collection.insert_many([
+        {"_id": antigo, "data": "01/01/2024", "modificacao": "antigo"},
+        {"_id": recente, "data": "10/07/2025", "modificacao": "recente"},
+    ])
+
+    assert limpar_logs_antigos(365) == 1
+    assert [log["_id"] for log in fake_logs_collection.find()] == [recente]
+    assert limpar_logs_antigos(365) == 0
@@ -10,6 +10,7 @@ def fake_vendas_collection(monkeypatch):
     # Cria uma coleção de vendas fake (em memória)
     mock_db = mongomock.MongoClient().db
     monkeypatch.setattr("app.models.vendas_collection", mock_db.vendas)
+    monkeypatch.setattr("app.models.vendas_diarias_collection", mock_db.vendas_diarias)
     return mock_db.vendas
 
 def test_nova_venda_insercao(fake_vendas_collection):
@@ -123,3 +124,30 @@ def test_nova_venda_logs_opcional(fake_vendas_collection):
     assert venda_db is not None
     assert venda_db["logs"] == []
 
+
+def test_nova_venda_valores_numericos(fake_vendas_collection):
+    # Valores em texto do formulário são gravados como número
+    nova_venda(
+        "1", "1003", "Nome", "Contato", {}, "00000-000", "000", "RS", "IE", "P",
+        "1.500,00", "a prazo", "500,50", "2025-07-07", "email", "normal", "cli@ex.com", ["11000"], "119", "vend@ex.com", "Vend",
+        "Obs", "Novo", "Maria", datetime.now(), datetime.now(), "1400.5",
+        valor_entrada="", valor_venda_avista="0"
+    )
+    venda_db = fake_vendas_collection.find_one({"numero_da_venda": "1003"})
+    assert venda_db["valor_tabela"] == 1500.0
+    assert venda_db["valor_parcelas"] == 500.5
+    assert venda_db["valor_real"] == 1400.5
+    assert venda_db["valor_entrada"] is None
+    assert venda_db["valor_venda_avista"] == 0.0
+
+def test_nova_venda_campos_prazo(fake_vendas_collection):
+    # Prestação inicial gravada como data, com prazo e faixa calculados
+    nova_venda(
+        "1", "1004", "Nome", "Contato", {}, "00000-000", "000", "RS", "IE", "P",
+        200.0, "a prazo", "50", "2025-08-05", "email", "normal", "cli@ex.com", ["11000"], "119", "vend@ex.com", "Vend",
+        "Obs", "Aprovada", "Maria", datetime(2025, 7, 1, 12), datetime(2025, 7, 1, 12), 199.0
+    )
+    venda_db = fake_vendas_collection.find_one({"numero_da_venda": "1004"})
+    assert venda_db["data_prestacao_inicial"] == datetime(2025, 8, 5)
+    assert venda_db["prazo_dias"] == 34.5
+    assert venda_db["faixa_prazo"] == "31-39 dias"
@@ -0,0 +1,107 @@
+import json
+import threading
+import pytest
+import mongomock
+from datetime import datetime
+
+from app.notificacoes_stream import (
+    acesso_liberado, aguardar_notificacao, conexoes_abertas, gerar_eventos, liberar_conexao,
+    listar_notificacoes_nao_lidas, publicar_notificacao, reservar_conexao, versao_atual
+)
+
+@pytest.fixture
+def notificacoes(monkeypatch):
+    colecao = mongomock.MongoClient().db.notificacoes
+    monkeypatch.setattr("app.notificacoes_stream.notificacoes_collection", colecao)
+    return colecao
+
+@pytest.fixture(autouse=True)
+def acesso(monkeypatch):
+    # Permissão de acesso do usuário, conferida a cada intervalo do fluxo
+    estado = {"liberado": True, "verificacoes": 0}
+    def fake_acesso_liberado(usuario):
+        estado["verificacoes"] += 1
+        return estado["liberado"]
+    monkeypatch.setattr("app.notificacoes_stream.acesso_liberado", fake_acesso_liberado)
+    return estado
+
+def nova(colecao, mensagem, envolvidos, lida_por=None, data_hora=None):
+    return colecao.insert_one({
+        "tipo": "venda", "mensagem": mensagem, "data_hora": data_hora or datetime(2025, 7, 5, 9, 0),
+        "lida_por": lida_por or [], "envolvidos": envolvidos, "venda_numero": None
+    }).inserted_id
+
+def dados_evento(evento):
+    assert evento.startswith("data: ")
+    return json.loads(evento[len("data: "):])
+
+def test_listar_notificacoes_nao_lidas_vendedor(notificacoes):
+    nova(notificacoes, "para joao", ["joao"])
+    nova(notificacoes, "lida", ["joao"], lida_por=["joao"])
+    nova(notificacoes, "para maria", ["maria"])
+    resultado = listar_notificacoes_nao_lidas({"username": "joao", "tipo": "vendedor"})
+    assert [n["mensagem"] for n in resultado] == ["para joao"]
+    assert resultado[0]["data_hora"] == "05/07/2025 09:00"
+    assert isinstance(resultado[0]["_id"], str)
+
+def test_listar_notificacoes_nao_lidas_admin_ve_todas(notificacoes):
+    nova(notificacoes, "a", ["joao"], data_hora=datetime(2025, 7, 5, 9, 0))
+    nova(notificacoes, "b", ["maria"], data_hora=datetime(2025, 7, 6, 9, 0))
+    resultado = listar_notificacoes_nao_lidas({"username": "admin", "tipo": "admin"})
+    assert [n["mensagem"] for n in resultado] == ["b", "a"]
+
+def test_aguardar_notificacao_acorda_ao_publicar():
+    versao = versao_atual()
+    threading.Timer(0.05, publicar_notificacao).start()
+    assert aguardar_notificacao(versao, timeout=5) == versao + 1
+
+def test_aguardar_notificacao_timeout():
+    versao = versao_atual()
+    assert aguardar_notificacao(versao, timeout=0.01) == versao
+
+def test_gerar_eventos_envia_inicial_e_mudancas(notificacoes):
+    nova(notificacoes, "primeira", ["joao"])
+    eventos = gerar_eventos({"username": "joao", "tipo": "vendedor"}, intervalo=0.01, duracao_maxima=5)
+    assert next(eventos).startswith("retry: ")
+    assert [n["mensagem"] for n in dados_evento(next(eventos))] == ["primeira"]
+    # Sem mudanças: apenas keep-alive
+    assert next(eventos) == ": keep-alive\n\n"
+    # Nova notificação gera um evento com a lista atualizada
+    nova(notificacoes, "segunda", ["joao"], data_hora=datetime(2025, 7, 6, 9, 0))
+    publicar_notificacao()
+    assert [n["mensagem"] for n in dados_evento(next(eventos))] == ["segunda", "primeira"]
+
+def test_gerar_eventos_encerra_apos_duracao_maxima(notificacoes):
+    eventos = list(gerar_eventos({"username": "joao", "tipo": "vendedor"}, intervalo=0.01, duracao_maxima=0))
+    assert len(eventos) == 2
+    assert dados_evento(eventos[1]) == []
+
+def test_gerar_eventos_encerra_ao_desligar_acesso(notificacoes, acesso):
+    eventos = gerar_eventos({"username": "joao", "tipo": "vendedor"}, intervalo=0.01, duracao_maxima=5)
+    next(eventos)
+    next(eventos)
+    assert next(eventos) == ": keep-alive\n\n"
+    assert acesso["verificacoes"] == 1
+    # Permissão desligada (ex: fim do expediente): o fluxo termina na próxima conferência
+    acesso["liberado"] = False
+    assert list(eventos) == []
+
+def test_acesso_liberado_confere_permissao(monkeypatch):
+    chamadas = []
+    monkeypatch.setattr("app.services.desligar_permissao_acesso_usuarios", lambda: pytest.fail("desligamento é do agendador"))
+    monkeypatch.setattr("app.services.verificar_permissao_acesso",
+                        lambda username: chamadas.append(username) or username == "joao")
+    assert acesso_liberado({"username": "joao", "tipo": "vendedor"}) is True
+    assert acesso_liberado({"username": "maria", "tipo": "vendedor"}) is False
+    assert chamadas == ["joao", "maria"]
+
+def test_reservar_conexao_respeita_limite(monkeypatch):
+    monkeypatch.setattr("app.notificacoes_stream._conexoes_abertas", 0)
+    assert reservar_conexao(2) and reservar_conexao(2)
+    assert reservar_conexao(2) is False
+    liberar_conexao()
+    assert conexoes_abertas() == 1
+    assert reservar_conexao(2)
+    # 0 = sem limite
+    assert reservar_conexao(0)
+    assert conexoes_abertas() == 3
@@ -0,0 +1,52 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import plotly.graph_objs as go
+
+import app.rasterizacao as rasterizacao
+from app.rasterizacao import rasterizar_figuras
+
+def figura(titulo):
+    return go.Figure(layout={"title": {"text": titulo}})
+
+@pytest.fixture
+def convertidas(monkeypatch):
+    # Registra as conversões em vez de chamar o kaleido
+    chamadas = []
+    def fake_rasterizar_figura(figura_json, caminho, *a):
+        chamadas.append((caminho, figura_json))
+        return 0.5
+    monkeypatch.setattr(rasterizacao, "rasterizar_figura", fake_rasterizar_figura)
+    return chamadas
+
+def test_rasterizar_figuras_em_paralelo(monkeypatch, convertidas):
+    processos_pedidos = []
+    def fake_obter_pool(processos):
+        processos_pedidos.append(processos)
+        return ThreadPoolExecutor(max_workers=processos)
+    monkeypatch.setattr(rasterizacao, "obter_pool", fake_obter_pool)
+
+    figuras = [(f"/tmp/g{i}.png", figura(f"g{i}")) for i in range(3)]
+    tempos = rasterizar_figuras(figuras, processos=8)
+
+    # O pool nunca é maior que a quantidade de figuras
+    assert processos_pedidos == [3]
+    assert sorted(c for c, _ in convertidas) == ["/tmp/g0.png", "/tmp/g1.png", "/tmp/g2.png"]
+    assert all('"g' in j for _, j in convertidas)
+    assert tempos["soma"] == 1.5
+    assert tempos["processos"] == 3
+    assert tempos["parede"] >= 0
+
+def test_rasterizar_figuras_pool_quebrado(monkeypatch, convertidas):
+    class PoolQuebrado:
+        def submit(self, *a, **kw):
+            raise BrokenProcessPool("processo morreu")
+    monkeypatch.setattr(rasterizacao, "obter_pool", lambda processos: PoolQuebrado())
+    monkeypatch.setattr(rasterizacao, "descartar_pool", lambda: None)
+
+    tempos = rasterizar_figuras([("/tmp/a.png", figura("a")), ("/tmp/b.png", figura("b"))], processos=2)
+
+    # Converte no próprio processo, na ordem
+    assert [c for c, _ in convertidas] == ["/tmp/a.png", "/tmp/b.png"]
+    assert tempos["processos"] == 1
@@ -0,0 +1,77 @@
+import json
+import pytest
+import mongomock
+from datetime import datetime
+from flask import Flask
+
+import app.cache_graficos as cache_mod
+from app.registro_graficos import REGISTRO, ColecoesGraficos, gerar_figura, gerar_grafico_registrado
+from app.graficos import GRAFICOS_PAINEL
+
+class ContadorCollection:
+    """Envolve uma coleção mongomock contando as chamadas de aggregate()."""
+    def __init__(self, collection):
+        self.collection = collection
+        self.agregacoes = 0
+    def find(self, *args, **kwargs):
+        return self.collection.find(*args, **kwargs)
+    def aggregate(self, pipeline):
+        self.agregacoes += 1
+        return self.collection.aggregate(pipeline)
+
+@pytest.fixture
+def colecoes():
+    db = mongomock.MongoClient().db
+    db.usuarios.insert_many([{"nome_completo": "Maria", "status": "ativo"}])
+    db.vendas.insert_many([
+        {"vendedor": "Maria", "status": "Aprovada", "valor_real": 100.0, "valor_tabela": 100.0,
+         "data_criacao": datetime(2025, 7, 3), "endereco": {"estado": "SP"}},
+        {"vendedor": "Pedro", "status": "Faturado", "valor_real": 200.0, "valor_tabela": 200.0,
+         "data_criacao": datetime(2025, 7, 4), "endereco": {"estado": "RJ"}},
+    ])
+    return ColecoesGraficos(db.usuarios, ContadorCollection(db.vendas), db.configs)
+
+def test_registro_usa_os_nomes_do_dashboard():
+    assert set(REGISTRO) <= set(GRAFICOS_PAINEL)
+
+def test_mesmos_dados_com_layout_de_tela_e_de_pdf(colecoes):
+    tela = gerar_figura("vendas_vendedor", colecoes, 2025, 7, apenas_ativos=False)
+    pdf = gerar_figura("vendas_vendedor", colecoes, 2025, 7, apenas_ativos=False, estilo="pdf")
+    assert list(tela.data[0].x) == list(pdf.data[0].x) == ["Maria", "Pedro"]
+    assert list(tela.data[0].y) == list(pdf.data[0].y) == [100.0, 200.0]
+    assert (tela.layout.height, tela.layout.width) == (400, None)
+    assert (pdf.layout.height, pdf.layout.width, pdf.layout.font.size) == (600, 1600, 30)
+
+def test_apenas_ativos(colecoes):
+    fig = gerar_figura("vendas_vendedor", colecoes, 2025, 7)
+    assert list(fig.data[0].x) == ["Maria"]
+
+def test_formatos(monkeypatch, colecoes):
+    figura = json.loads(gerar_grafico_registrado("banco_vendedores", colecoes, 2025, 7, formato="figura"))
+    assert figura["layout"]["title"]["text"] == "Saldo do Banco por Vendedor"
+
+    chamadas = []
+    def fake_to_image(fig, **kwargs):
+        chamadas.append((fig.layout.width, kwargs["format"]))
+        return b"png"
+    monkeypatch.setattr("app.registro_graficos.pio.to_image", fake_to_image)
+    assert gerar_grafico_registrado("banco_vendedores", colecoes, 2025, 7, formato="png") == b"png"
+    # O PNG usa o layout do PDF
+    assert chamadas == [(1600, "png")]
+
+def test_pdf_reaproveita_os_dados_do_dashboard(monkeypatch, colecoes):
+    monkeypatch.setattr("app.cache_graficos.contadores_collection", mongomock.MongoClient().db.contadores)
+    cache_mod.limpar_cache_graficos()
+    app = Flask(__name__)
+    app.config["CACHE_GRAFICOS"] = True
+    try:
+        # Requisições diferentes (sem o snapshot da anterior): dashboard e depois o PDF
+        with app.app_context():
+            gerar_grafico_registrado("mapa_vendas_por_estado", colecoes, 2025, 7, formato="figura")
+        with app.app_context():
+            fig = gerar_figura("mapa_vendas_por_estado", colecoes, 2025, 7, estilo="pdf")
+        assert colecoes.vendas.agregacoes == 1
+        vendas = dict(zip(fig.data[0].locations, fig.data[0].z))
+        assert (vendas["SP"], vendas["RJ"]) == (1, 0)
+    finally:
+        cache_mod.limpar_cache_graficos()
@@ -0,0 +1,108 @@
+import io
+import pytest
+import mongomock
+import mongomock.gridfs
+from datetime import datetime, timedelta
+
+import app.relatorios_pdf as relatorios_mod
+from app.relatorios_pdf import (
+    criar_relatorio, reservar_relatorio, processar_relatorio, limpar_relatorios_expirados,
+    buscar_relatorio, abrir_relatorio, pode_acessar_relatorio
+)
+
+# GridFS sobre o banco do mongomock
+mongomock.gridfs.enable_gridfs_integration()
+
+@pytest.fixture
+def relatorios(monkeypatch):
+    colecao = mongomock.MongoClient().db.relatorios_pdf
+    monkeypatch.setattr("app.relatorios_pdf.relatorios_pdf_collection", colecao)
+    return colecao
+
+def test_criar_relatorio_compartilha_pedido_ativo(relatorios):
+    p1 = criar_relatorio(["vendas_geral", "banco_vendedores"], "relatorio", 2025, 7, username="ana")
+    # Mesma seleção em outra ordem: mesmo pedido
+    p2 = criar_relatorio(["banco_vendedores", "vendas_geral"], "relatorio", 2025, 7, username="bia")
+    assert p1["_id"] == p2["_id"]
+    assert p1["status"] == "pendente"
+    # Os dois usuários que pediram podem acompanhar o pedido compartilhado
+    assert p2["usuarios"] == ["ana", "bia"]
+    # Parâmetros diferentes: outro pedido
+    p3 = criar_relatorio(["vendas_geral"], "relatorio", 2025, 7)
+    assert p3["_id"] != p1["_id"]
+    assert relatorios.count_documents({}) == 2
+
+def test_criar_relatorio_novo_apos_conclusao(relatorios):
+    p1 = criar_relatorio(["vendas_geral"], "relatorio", 2025, 7)
+    processar_relatorio(reservar_relatorio(), lambda *a, **kw: (io.BytesIO(b"%PDF"), "relatorio_7_2025.pdf"))
+    p2 = criar_relatorio(["vendas_geral"], "relatorio", 2025, 7)
+    assert p2["_id"] != p1["_id"]
+
+def test_processar_relatorio_grava_arquivo(relatorios):
+    pedido = criar_relatorio(["vendas_geral"], "relatorio", 2025, 7, data_escolhida="2025-07-10")
+    chamadas = []
+    def fake_gerar_pdf(selecao, nome_base, ano, mes, data_escolhida=None):
+        chamadas.append((selecao, nome_base, ano, mes, data_escolhida))
+        return io.BytesIO(b"%PDF-1.4 teste"), "relatorio_7_2025.pdf"
+
+    reservado = reservar_relatorio()
+    assert reservado["_id"] == pedido["_id"] and reservado["status"] == "processando"
+    assert reservar_relatorio() is None
+
+    processar_relatorio(reservado, fake_gerar_pdf)
+    assert chamadas == [(["vendas_geral"], "relatorio", 2025, 7, "2025-07-10")]
+    concluido = buscar_relatorio(str(pedido["_id"]))
+    assert concluido["status"] == "concluido"
+    assert concluido["nome_arquivo"] == "relatorio_7_2025.pdf"
+    assert "chave_ativa" not in concluido
+    arquivo = abrir_relatorio(pedido["_id"])
+    assert arquivo.read() == b"%PDF-1.4 teste"
+    assert arquivo.filename == "relatorio_7_2025.pdf"
+
+def test_processar_relatorio_reprocessado_substitui_arquivo(relatorios):
+    pedido = criar_relatorio(["vendas_geral"], "relatorio", 2025, 7)
+    reservado = reservar_relatorio()
+    processar_relatorio(reservado, lambda *a, **kw: (io.BytesIO(b"%PDF antigo"), "r.pdf"))
+    # Reserva expirada processada de novo: um único arquivo, o mais recente
+    processar_relatorio(reservado, lambda *a, **kw: (io.BytesIO(b"%PDF novo"), "r.pdf"))
+    assert abrir_relatorio(pedido["_id"]).read() == b"%PDF novo"
+    assert relatorios.database["relatorios_pdf_arquivos.files"].count_documents({}) == 1
+
+def test_processar_relatorio_erro(relatorios):
+    criar_relatorio(["vendas_geral"], "relatorio", 2025, 7)
+    def fake_gerar_pdf(*a, **kw):
+        raise RuntimeError("kaleido indisponível")
+    pedido = reservar_relatorio()
+    processar_relatorio(pedido, fake_gerar_pdf)
+    falhou = buscar_relatorio(pedido["_id"])
+    assert falhou["status"] == "erro"
+    assert falhou["erro"] == "kaleido indisponível"
+
+def test_reservar_relatorio_recupera_processando_antigo(relatorios):
+    criar_relatorio(["vendas_geral"], "relatorio", 2025, 7)
+    inicio = datetime(2025, 7, 1, 10, 0)
+    assert reservar_relatorio(agora=inicio) is not None
+    assert reservar_relatorio(agora=inicio + timedelta(minutes=5)) is None
+    assert reservar_relatorio(agora=inicio + timedelta(minutes=relatorios_mod.RESERVA_EXPIRA_MINUTOS + 1)) is not None
+
+def test_limpar_relatorios_expirados(relatorios):
+    criar_relatorio(["vendas_geral"], "relatorio", 2025, 7)
+    pedido = reservar_relatorio()
+    processar_relatorio(pedido, lambda *a, **kw: (io.BytesIO(b"%PDF"), "r.pdf"))
+    assert limpar_relatorios_expirados() == 0
+    assert abrir_relatorio(pedido["_id"]) is not None
+    assert limpar_relatorios_expirados(agora=datetime.now() + timedelta(minutes=relatorios_mod.EXPIRA_MINUTOS + 1)) == 1
+    assert abrir_relatorio(pedido["_id"]) is None
+    assert buscar_relatorio(pedido["_id"])["status"] == "expirado"
+
+def test_buscar_relatorio_id_invalido(relatorios):
+    assert buscar_relatorio("nao-e-um-id") is None
+
+def test_pode_acessar_relatorio():
+    pedido = {"username": "ana", "usuarios": ["ana", "bia"]}
+    assert pode_acessar_relatorio(pedido, {"username": "bia", "tipo": "vendedor"})
+    assert not pode_acessar_relatorio(pedido, {"username": "caio", "tipo": "vendedor"})
+    assert pode_acessar_relatorio(pedido, {"username": "caio", "tipo": "admin"})
+    # Pedidos criados antes do campo 'usuarios': vale o 'username'
+    assert pode_acessar_relatorio({"username": "ana"}, {"username": "ana", "tipo": "vendedor"})
+    assert not pode_acessar_relatorio({"username": None}, {"tipo": "vendedor"})
@@ -0,0 +1,96 @@
+import json
+import plotly
+import pytest
+from flask import Flask
+from app.routes.apiGraficoFigura import api_grafico_figura_bp
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.secret_key = "fake-key"
+    app.register_blueprint(api_grafico_figura_bp)
+    app.config["TESTING"] = True
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def logado(client):
+    with client.session_transaction() as sess:
+        sess["user"] = {"username": "admin", "tipo": "admin"}
+    return client
+
+def test_grafico_figura_sem_usuario(client):
+    resp = client.get("/api/grafico/vendas_geral/figura")
+    assert resp.status_code == 401
+
+def test_grafico_figura_inexistente(logado):
+    resp = logado.get("/api/grafico/nao_existe/figura")
+    assert resp.status_code == 404
+
+def test_grafico_figura_json(monkeypatch, logado):
+    recebido = {}
+    def fake_gerar_grafico_painel(nome, ano=None, mes=None, data_escolhida=None, formato="html"):
+        recebido.update(nome=nome, ano=ano, mes=mes, formato=formato)
+        return '{"data":[{"type":"bar"}],"layout":{}}'
+    monkeypatch.setattr("app.routes.apiGraficoFigura.gerar_grafico_painel", fake_gerar_grafico_painel)
+
+    resp = logado.get("/api/grafico/vendas_geral/figura?ano=2025&mes=7")
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/json"
+    assert json.loads(resp.data)["figura"]["data"][0]["type"] == "bar"
+    assert recebido == {"nome": "vendas_geral", "ano": 2025, "mes": 7, "formato": "figura"}
+
+def test_grafico_figura_erro(monkeypatch, logado):
+    def fake_gerar_grafico_painel(*args, **kwargs):
+        raise RuntimeError("falhou")
+    monkeypatch.setattr("app.routes.apiGraficoFigura.gerar_grafico_painel", fake_gerar_grafico_painel)
+    resp = logado.get("/api/grafico/vendas_geral/figura")
+    assert resp.status_code == 500
+    assert "falhou" in resp.get_json()["erro"]
+
+def test_plotly_js_local_com_cache(client):
+    resp = client.get(f"/plotly/plotly-{plotly.__version__}.min.js")
+    assert resp.status_code == 200
+    assert resp.cache_control.max_age == 365 * 24 * 60 * 60
+    resp.close()
+
+def test_plotly_js_outra_versao(client):
+    resp = client.get("/plotly/plotly-0.0.0.min.js")
+    assert resp.status_code == 404
+
+def test_geojson_brasil_versionado_com_cache(client):
+    from app.geojson_brasil import versao_geojson_brasil
+    resp = client.get(f"/geojson/brasil-{versao_geojson_brasil()}.geojson")
+    assert resp.status_code == 200
+    assert resp.cache_control.max_age == 365 * 24 * 60 * 60
+    assert b'"sigla":"SP"' in resp.data
+    resp.close()
+    assert client.get("/geojson/brasil-antigo.geojson").status_code == 404
+
+def test_graficos_lote_sem_usuario(client):
+    resp = client.get("/api/graficos/lote?graficos=vendas_geral")
+    assert resp.status_code == 401
+
+def test_graficos_lote_sem_graficos(logado):
+    resp = logado.get("/api/graficos/lote?graficos=")
+    assert resp.status_code == 400
+
+def test_graficos_lote_ndjson(monkeypatch, logado):
+    recebido = []
+    def fake_gerar_grafico_painel(nome, ano=None, mes=None, data_escolhida=None, formato="html"):
+        recebido.append((nome, ano, mes, data_escolhida, formato))
+        return '{"data":[],"layout":{}}'
+    monkeypatch.setattr("app.graficos_lote.gerar_grafico_painel", fake_gerar_grafico_painel)
+
+    resp = logado.get("/api/graficos/lote?graficos=vendas_geral,vendas_diarias&ano=2025&mes=7&data=2025-07-20")
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    linhas = [json.loads(linha) for linha in resp.get_data(as_text=True).splitlines()]
+    assert sorted(linha["nome"] for linha in linhas) == ["vendas_diarias", "vendas_geral"]
+    assert sorted(recebido) == [
+        ("vendas_diarias", 2025, 7, "2025-07-20", "figura"),
+        ("vendas_geral", 2025, 7, "2025-07-20", "figura"),
+    ]
@@ -0,0 +1,34 @@
+import pytest
+from flask import Flask
+from app.routes.apiMongoPool import api_mongo_pool_bp
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.secret_key = "fake-key"
+    app.register_blueprint(api_mongo_pool_bp)
+    app.config["TESTING"] = True
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def logar(client, tipo):
+    with client.session_transaction() as sess:
+        sess["user"] = {"username": "joao", "tipo": tipo}
+
+def test_mongo_pool_sem_usuario(client):
+    assert client.get("/api/mongo/pool").status_code == 401
+
+def test_mongo_pool_nao_admin(client):
+    logar(client, "vendedor")
+    assert client.get("/api/mongo/pool").status_code == 403
+
+def test_mongo_pool_admin(monkeypatch, client):
+    monkeypatch.setattr("app.routes.apiMongoPool.estatisticas_pool",
+                        lambda: {"pid": 10, "max_pool_size": 20, "em_uso": 3})
+    logar(client, "admin")
+    resp = client.get("/api/mongo/pool")
+    assert resp.status_code == 200
+    assert resp.get_json() == {"pid": 10, "max_pool_size": 20, "em_uso": 3}
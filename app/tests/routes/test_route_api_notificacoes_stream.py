@@ -0,0 +1,70 @@
+import pytest
+from flask import Flask
+from app.routes.apiNotificacoesStream import api_notificacoes_stream_bp
+from app.notificacoes_stream import conexoes_abertas
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.secret_key = "fake-key"
+    app.register_blueprint(api_notificacoes_stream_bp)
+    app.config["TESTING"] = True
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture(autouse=True)
+def acesso(monkeypatch):
+    # Usuários com acesso liberado, exceto os listados em 'negados'
+    estado = {"negados": set()}
+    monkeypatch.setattr("app.routes.apiNotificacoesStream.acesso_liberado",
+                        lambda usuario: usuario["username"] not in estado["negados"])
+    return estado
+
+def test_api_notificacoes_stream_sem_usuario(client):
+    resp = client.get("/api/notificacoes/stream")
+    assert resp.status_code == 204
+
+def test_api_notificacoes_stream_usuario(monkeypatch, client):
+    recebido = {}
+    def fake_gerar_eventos(usuario):
+        recebido["usuario"] = usuario
+        yield "data: []\n\n"
+    monkeypatch.setattr("app.routes.apiNotificacoesStream.gerar_eventos", fake_gerar_eventos)
+
+    with client.session_transaction() as sess:
+        sess["user"] = {"username": "joao", "tipo": "vendedor", "email": "j@x.com"}
+    resp = client.get("/api/notificacoes/stream")
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/event-stream"
+    assert resp.headers["Cache-Control"] == "no-cache"
+    assert resp.get_data(as_text=True) == "data: []\n\n"
+    assert recebido["usuario"] == {"username": "joao", "tipo": "vendedor"}
+
+def test_api_notificacoes_stream_sem_permissao(monkeypatch, client, acesso):
+    monkeypatch.setattr("app.routes.apiNotificacoesStream.gerar_eventos", lambda usuario: pytest.fail("não deve abrir o fluxo"))
+    acesso["negados"].add("joao")
+    with client.session_transaction() as sess:
+        sess["user"] = {"username": "joao", "tipo": "vendedor"}
+    resp = client.get("/api/notificacoes/stream")
+    assert resp.status_code == 204
+
+def test_api_notificacoes_stream_limite_de_conexoes(monkeypatch, app, client):
+    monkeypatch.setattr("app.notificacoes_stream._conexoes_abertas", 0)
+    def fake_gerar_eventos(usuario):
+        yield "data: []\n\n"
+    monkeypatch.setattr("app.routes.apiNotificacoesStream.gerar_eventos", fake_gerar_eventos)
+    app.config["STREAM_CONEXOES"] = 1
+    with client.session_transaction() as sess:
+        sess["user"] = {"username": "joao", "tipo": "vendedor"}
+
+    aberta = client.get("/api/notificacoes/stream", buffered=False)
+    assert aberta.status_code == 200
+    # Limite do processo atingido: a aba usa a consulta periódica
+    assert client.get("/api/notificacoes/stream").status_code == 204
+    # Conexão encerrada libera a vaga
+    aberta.close()
+    assert conexoes_abertas() == 0
+    assert client.get("/api/notificacoes/stream").status_code == 200
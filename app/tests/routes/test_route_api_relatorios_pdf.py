@@ -0,0 +1,121 @@
+import io
+import pytest
+from bson import ObjectId
+from flask import Flask
+from app.routes.apiRelatoriosPdf import api_relatorios_pdf_bp
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.secret_key = "fake-key"
+    app.register_blueprint(api_relatorios_pdf_bp)
+    app.config["TESTING"] = True
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def logado(client):
+    with client.session_transaction() as sess:
+        sess["user"] = {"username": "joao", "tipo": "admin"}
+        sess["data_grafico_vendas_diarias"] = "2025-07-10"
+    return client
+
+@pytest.fixture
+def vendedor(client):
+    with client.session_transaction() as sess:
+        sess["user"] = {"username": "ana", "tipo": "vendedor"}
+    return client
+
+def test_criar_relatorio_pdf_sem_usuario(client):
+    resp = client.post("/api/relatorios-pdf", data={"graficos": ["vendas_geral"]})
+    assert resp.status_code == 401
+
+def test_criar_relatorio_pdf_sem_graficos(logado):
+    resp = logado.post("/api/relatorios-pdf", data={"nome": "relatorio"})
+    assert resp.status_code == 400
+    assert resp.get_json()["erro"] == "Selecione ao menos um gráfico."
+
+def test_criar_relatorio_pdf(monkeypatch, logado):
+    recebido = {}
+    id_pedido = ObjectId()
+    def fake_criar_relatorio(selecao, nome_base, ano, mes, data_escolhida=None, username=None):
+        recebido.update(selecao=selecao, nome_base=nome_base, ano=ano, mes=mes,
+                        data_escolhida=data_escolhida, username=username)
+        return {"_id": id_pedido, "status": "pendente"}
+    monkeypatch.setattr("app.routes.apiRelatoriosPdf.criar_relatorio", fake_criar_relatorio)
+
+    resp = logado.post("/api/relatorios-pdf", data={
+        "graficos": ["vendas_geral", "banco_vendedores"], "nome": "rel", "ano": 2025, "mes": 7
+    })
+    assert resp.status_code == 202
+    assert resp.get_json() == {"id": str(id_pedido), "status": "pendente", "erro": None}
+    assert recebido == {"selecao": ["vendas_geral", "banco_vendedores"], "nome_base": "rel", "ano": 2025,
+                        "mes": 7, "data_escolhida": "2025-07-10", "username": "joao"}
+
+def test_status_relatorio_pdf_concluido(monkeypatch, logado):
+    id_pedido = ObjectId()
+    monkeypatch.setattr("app.routes.apiRelatoriosPdf.buscar_relatorio", lambda i: {
+        "_id": id_pedido, "status": "concluido", "nome_arquivo": "rel_7_2025.pdf", "erro": None
+    })
+    resp = logado.get(f"/api/relatorios-pdf/{id_pedido}")
+    dados = resp.get_json()
+    assert resp.status_code == 200
+    assert dados["status"] == "concluido"
+    assert dados["url_download"] == f"/api/relatorios-pdf/{id_pedido}/download"
+
+def test_status_relatorio_pdf_inexistente(monkeypatch, logado):
+    monkeypatch.setattr("app.routes.apiRelatoriosPdf.buscar_relatorio", lambda i: None)
+    resp = logado.get("/api/relatorios-pdf/abc")
+    assert resp.status_code == 404
+
+def test_status_relatorio_pdf_de_outro_usuario(monkeypatch, vendedor):
+    monkeypatch.setattr("app.routes.apiRelatoriosPdf.buscar_relatorio", lambda i: {
+        "_id": ObjectId(), "status": "pendente", "username": "bia", "usuarios": ["bia"]
+    })
+    resp = vendedor.get(f"/api/relatorios-pdf/{ObjectId()}")
+    assert resp.status_code == 404
+
+def test_status_relatorio_pdf_do_proprio_usuario(monkeypatch, vendedor):
+    monkeypatch.setattr("app.routes.apiRelatoriosPdf.buscar_relatorio", lambda i: {
+        "_id": ObjectId(), "status": "pendente", "username": "bia", "usuarios": ["bia", "ana"]
+    })
+    resp = vendedor.get(f"/api/relatorios-pdf/{ObjectId()}")
+    assert resp.status_code == 200
+
+def test_baixar_relatorio_pdf(monkeypatch, logado):
+    id_pedido = ObjectId()
+    monkeypatch.setattr("app.routes.apiRelatoriosPdf.buscar_relatorio", lambda i: {
+        "_id": id_pedido, "status": "concluido", "nome_arquivo": "rel_7_2025.pdf"
+    })
+    monkeypatch.setattr("app.routes.apiRelatoriosPdf.abrir_relatorio", lambda i: io.BytesIO(b"%PDF-1.4 teste"))
+    resp = logado.get(f"/api/relatorios-pdf/{id_pedido}/download")
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/pdf"
+    assert resp.data == b"%PDF-1.4 teste"
+    assert "rel_7_2025.pdf" in resp.headers["Content-Disposition"]
+
+def test_baixar_relatorio_pdf_em_andamento(monkeypatch, logado):
+    monkeypatch.setattr("app.routes.apiRelatoriosPdf.buscar_relatorio", lambda i: {
+        "_id": ObjectId(), "status": "processando"
+    })
+    resp = logado.get(f"/api/relatorios-pdf/{ObjectId()}/download")
+    assert resp.status_code == 409
+
+def test_baixar_relatorio_pdf_de_outro_usuario(monkeypatch, vendedor):
+    monkeypatch.setattr("app.routes.apiRelatoriosPdf.buscar_relatorio", lambda i: {
+        "_id": ObjectId(), "status": "concluido", "nome_arquivo": "r.pdf", "username": "bia", "usuarios": ["bia"]
+    })
+    monkeypatch.setattr("app.routes.apiRelatoriosPdf.abrir_relatorio", lambda i: pytest.fail("não deve abrir o arquivo"))
+    resp = vendedor.get(f"/api/relatorios-pdf/{ObjectId()}/download")
+    assert resp.status_code == 404
+
+def test_baixar_relatorio_pdf_expirado(monkeypatch, logado):
+    monkeypatch.setattr("app.routes.apiRelatoriosPdf.buscar_relatorio", lambda i: {
+        "_id": ObjectId(), "status": "concluido", "nome_arquivo": "r.pdf"
+    })
+    monkeypatch.setattr("app.routes.apiRelatoriosPdf.abrir_relatorio", lambda i: None)
+    resp = logado.get(f"/api/relatorios-pdf/{ObjectId()}/download")
+    assert resp.status_code == 410
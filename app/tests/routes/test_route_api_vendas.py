@@ -0,0 +1,53 @@
+import pytest
+from datetime import datetime
+from bson import ObjectId
+from flask import Flask
+from app.routes.apiVendas import api_vendas_bp
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.secret_key = "fake-key"
+    app.register_blueprint(api_vendas_bp)
+    app.config["TESTING"] = True
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def logado(monkeypatch, client):
+    monkeypatch.setattr("app.routes.apiVendas.verificar_permissao_acesso", lambda username: True)
+    with client.session_transaction() as sess:
+        sess["user"] = {"username": "admin", "tipo": "admin"}
+    return client
+
+def test_api_vendas_sem_usuario(client):
+    resp = client.get("/api/vendas")
+    assert resp.status_code == 401
+
+def test_api_vendas_pagina(monkeypatch, logado):
+    recebido = {}
+    id_venda = ObjectId()
+    def fake_listar_vendas_pagina(filtro, cursor=None, limite=50):
+        recebido.update(filtro=filtro, cursor=cursor, limite=limite)
+        return {"vendas": [{"_id": id_venda, "nome": "Cliente A", "data_criacao": datetime(2025, 7, 1, 10, 30)}],
+                "proximo_cursor": "abc"}
+    monkeypatch.setattr("app.routes.apiVendas.listar_vendas_pagina", fake_listar_vendas_pagina)
+
+    resp = logado.get("/api/vendas?ver_todas=1&status=Aprovada&cursor=xyz&limite=20")
+    assert resp.status_code == 200
+    assert resp.get_json() == {
+        "vendas": [{"_id": str(id_venda), "nome": "Cliente A", "data_criacao": "01/07/2025 10:30"}],
+        "proximo_cursor": "abc"
+    }
+    assert recebido == {"filtro": {"status": "Aprovada"}, "cursor": "xyz", "limite": 20}
+
+def test_api_vendas_cursor_invalido(monkeypatch, logado):
+    def fake_listar_vendas_pagina(filtro, cursor=None, limite=50):
+        raise ValueError("Cursor inválido")
+    monkeypatch.setattr("app.routes.apiVendas.listar_vendas_pagina", fake_listar_vendas_pagina)
+    resp = logado.get("/api/vendas?cursor=quebrado")
+    assert resp.status_code == 400
+    assert resp.get_json()["erro"] == "Cursor inválido"
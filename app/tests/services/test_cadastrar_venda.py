@@ -3,6 +3,13 @@ from datetime import datetime
 
 from app.services import cadastrar_venda
 
+@pytest.fixture(autouse=True)
+def versoes_invalidadas(monkeypatch):
+    # Registra as invalidações do cache de gráficos em vez de gravar no MongoDB
+    chamadas = []
+    monkeypatch.setattr("app.services.invalidar_cache_graficos", lambda data=None: chamadas.append(data))
+    return chamadas
+
 def test_cadastrar_venda_com_entrada_1mais1_parcela(monkeypatch):
     # Simula o vendedor buscado
     vendedor_fake = {
@@ -44,7 +51,7 @@ def test_cadastrar_venda_com_entrada_1mais1_parcela(monkeypatch):
     # Patch nas dependências
     monkeypatch.setattr("app.services.usuarios_collection.find_one", fake_find_one_usuarios)
     monkeypatch.setattr("app.services.configs_collection.find_one", fake_find_one_configs)
-    monkeypatch.setattr("app.services.enviar_email", fake_enviar_email)
+    monkeypatch.setattr("app.services.enfileirar_email", fake_enviar_email)
     monkeypatch.setattr("app.services.nova_venda", fake_nova_venda)
 
     # Dados da venda simulada
@@ -146,7 +153,7 @@ def test_cadastrar_venda_sem_entrada_1mais1_avista(monkeypatch):
     # Patch nas dependências
     monkeypatch.setattr("app.services.usuarios_collection.find_one", fake_find_one_usuarios)
     monkeypatch.setattr("app.services.configs_collection.find_one", fake_find_one_configs)
-    monkeypatch.setattr("app.services.enviar_email", fake_enviar_email)
+    monkeypatch.setattr("app.services.enfileirar_email", fake_enviar_email)
     monkeypatch.setattr("app.services.nova_venda", fake_nova_venda)
 
     # Dados da venda simulada
@@ -248,7 +255,7 @@ def test_cadastrar_venda_sem_entrada_condicao(monkeypatch):
     # Patch nas dependências
     monkeypatch.setattr("app.services.usuarios_collection.find_one", fake_find_one_usuarios)
     monkeypatch.setattr("app.services.configs_collection.find_one", fake_find_one_configs)
-    monkeypatch.setattr("app.services.enviar_email", fake_enviar_email)
+    monkeypatch.setattr("app.services.enfileirar_email", fake_enviar_email)
     monkeypatch.setattr("app.services.nova_venda", fake_nova_venda)
 
     # Dados da venda simulada
@@ -350,7 +357,7 @@ def test_cadastrar_venda_com_entrada_condicao(monkeypatch):
     # Patch nas dependências
     monkeypatch.setattr("app.services.usuarios_collection.find_one", fake_find_one_usuarios)
     monkeypatch.setattr("app.services.configs_collection.find_one", fake_find_one_configs)
-    monkeypatch.setattr("app.services.enviar_email", fake_enviar_email)
+    monkeypatch.setattr("app.services.enfileirar_email", fake_enviar_email)
     monkeypatch.setattr("app.services.nova_venda", fake_nova_venda)
 
     # Dados da venda simulada
@@ -411,7 +418,7 @@ def test_cadastrar_venda_com_entrada_condicao(monkeypatch):
     # Checa se retorna o resultado de nova_venda
     assert resultado == "resultado_insert"
 
-def test_cadastrar_venda_email_secundario(monkeypatch):
+def test_cadastrar_venda_email_secundario(monkeypatch, versoes_invalidadas):
     # Simula o vendedor buscado
     vendedor_fake = {
         "nome_completo": "João Vendedor",
@@ -452,7 +459,7 @@ def test_cadastrar_venda_email_secundario(monkeypatch):
     # Patch nas dependências
     monkeypatch.setattr("app.services.usuarios_collection.find_one", fake_find_one_usuarios)
     monkeypatch.setattr("app.services.configs_collection.find_one", fake_find_one_configs)
-    monkeypatch.setattr("app.services.enviar_email", fake_enviar_email)
+    monkeypatch.setattr("app.services.enfileirar_email", fake_enviar_email)
     monkeypatch.setattr("app.services.nova_venda", fake_nova_venda)
 
     # Dados da venda simulada
@@ -512,3 +519,6 @@ def test_cadastrar_venda_email_secundario(monkeypatch):
 
     # Checa se retorna o resultado de nova_venda
     assert resultado == "resultado_insert"
+
+    # Checa se a versão dos gráficos foi incrementada após gravar a venda
+    assert versoes_invalidadas == [venda_data.get("data_criacao")]
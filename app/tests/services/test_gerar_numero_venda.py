@@ -1,8 +1,16 @@
 import pytest
+import mongomock
 from datetime import datetime
 
 from app.services import gerar_numero_venda
 
+@pytest.fixture(autouse=True)
+def contadores_mock(monkeypatch):
+    # Coleção de contadores em memória (uma por teste)
+    contadores = mongomock.MongoClient().db.contadores
+    monkeypatch.setattr("app.services.contadores_collection", contadores)
+    return contadores
+
 @pytest.fixture
 def fake_vendas_collection(monkeypatch):
     class FakeVendasCollection:
@@ -45,3 +53,35 @@ def test_gerar_numero_venda_outro_mes(monkeypatch, fake_vendas_collection):
 
     numero = gerar_numero_venda()
     assert numero == "2025080001"
+
+def test_gerar_numero_venda_sequencial_pelo_contador(monkeypatch, fake_vendas_collection, contadores_mock):
+    data_fixa = datetime(2025, 7, 7, 14, 0, 0)
+    monkeypatch.setattr("app.services.datetime", type("FakeDateTime", (), {"now": staticmethod(lambda: data_fixa), "strftime": datetime.strftime}))
+
+    class VendasContaConsultas:
+        consultas = 0
+        def find_one(self, filtro, sort=None):
+            VendasContaConsultas.consultas += 1
+            return {"numero_da_venda": "2025070025"}
+    monkeypatch.setattr("app.services.vendas_collection", VendasContaConsultas())
+
+    numeros = [gerar_numero_venda() for _ in range(3)]
+    assert numeros == ["2025070026", "2025070027", "2025070028"]
+    # As vendas só são consultadas para inicializar o contador do mês
+    assert VendasContaConsultas.consultas == 1
+    assert contadores_mock.find_one({"_id": "venda_202507"})["seq"] == 28
+
+def test_gerar_numero_venda_contador_nao_retrocede(monkeypatch, fake_vendas_collection, contadores_mock):
+    data_fixa = datetime(2025, 7, 7, 14, 0, 0)
+    monkeypatch.setattr("app.services.datetime", type("FakeDateTime", (), {"now": staticmethod(lambda: data_fixa), "strftime": datetime.strftime}))
+    monkeypatch.setattr("app.services.vendas_collection", fake_vendas_collection(ultima_venda={"numero_da_venda": "2025070003"}))
+
+    # Contador já existente à frente das vendas gravadas
+    contadores_mock.insert_one({"_id": "venda_202507", "seq": 10})
+    assert gerar_numero_venda() == "2025070011"
+
+def test_gerar_numero_venda_prefixo_de_outro_mes(monkeypatch, fake_vendas_collection, contadores_mock):
+    # Renumeração de vendas repetidas de meses anteriores (app/indices.py)
+    monkeypatch.setattr("app.services.vendas_collection", fake_vendas_collection(ultima_venda={"numero_da_venda": "2024030042"}))
+    assert gerar_numero_venda("202403") == "2024030043"
+    assert contadores_mock.find_one({"_id": "venda_202403"})["seq"] == 43
@@ -1,3 +1,4 @@
+import os
 import pytest
 
 from app.services import gerar_pdf_graficos
@@ -7,7 +8,7 @@ def test_gerar_pdf_graficos_nenhum_selecionado(app):
         resposta = gerar_pdf_graficos([], "relatorio", 2025, 7)
         assert resposta == ("Nenhum gráfico selecionado.", None)
 
-def test_gerar_pdf_graficos_gera_pdf(monkeypatch, app):
+def test_gerar_pdf_graficos_gera_pdf(monkeypatch, app, caplog):
     # Mocks dos gráficos
     fake_figura = object()
     def fake_gerar_fig_vendas_geral(soma_vendas):
@@ -38,10 +39,11 @@ def test_gerar_pdf_graficos_gera_pdf(monkeypatch, app):
     monkeypatch.setattr("app.services.soma_vendas", lambda x: x)
     monkeypatch.setattr("app.services.pio.write_image", fake_write_image)
     monkeypatch.setattr("app.services.canvas.Canvas", FakeCanvas)
-    monkeypatch.setattr("app.services.ImageReader", lambda p: object())
+    monkeypatch.setattr("app.services.reportlab_utils.ImageReader", lambda p: object())
     monkeypatch.setattr("app.services.tempfile.TemporaryDirectory", lambda: FakeTempDir())
 
     # Chama a função com um gráfico válido
+    caplog.set_level("DEBUG", logger="app.services")
     with app.test_request_context():
         selecao = ["vendas_geral"]
         buffer_pdf, nome_arquivo = gerar_pdf_graficos(selecao, "relatorio", 2025, 7)
@@ -49,6 +51,8 @@ def test_gerar_pdf_graficos_gera_pdf(monkeypatch, app):
         assert nome_arquivo == "relatorio_7_2025.pdf"
         # Confere que o write_image foi chamado
         assert any("grafico_vendas_geral.png" in k for k in chamado_write)
+    # Tempos da geração registrados em nível debug
+    assert any(r.levelname == "DEBUG" and "PDF gráficos: 1 figuras" in r.getMessage() for r in caplog.records)
 
 def test_gerar_pdf_graficos_gera_pdf_mais_de_um_escolhido(monkeypatch, app):
     # Mocks dos gráficos
@@ -81,7 +85,7 @@ def test_gerar_pdf_graficos_gera_pdf_mais_de_um_escolhido(monkeypatch, app):
     monkeypatch.setattr("app.services.soma_vendas", lambda x: x)
     monkeypatch.setattr("app.services.pio.write_image", fake_write_image)
     monkeypatch.setattr("app.services.canvas.Canvas", FakeCanvas)
-    monkeypatch.setattr("app.services.ImageReader", lambda p: object())
+    monkeypatch.setattr("app.services.reportlab_utils.ImageReader", lambda p: object())
     monkeypatch.setattr("app.services.tempfile.TemporaryDirectory", lambda: FakeTempDir())
 
     # Chama a função com um gráfico válido
@@ -92,3 +96,45 @@ def test_gerar_pdf_graficos_gera_pdf_mais_de_um_escolhido(monkeypatch, app):
         assert nome_arquivo == "relatorio_7_2025.pdf"
         # Confere que o write_image foi chamado
         assert any("grafico_vendas_geral.png" in k for k in chamado_write)
+
+def test_gerar_pdf_graficos_rasteriza_em_paralelo(monkeypatch, app):
+    # Mocks dos gráficos
+    figura_geral, figura_banco = object(), object()
+    monkeypatch.setattr("app.services.gerar_fig_vendas_geral", lambda soma_vendas: figura_geral)
+    monkeypatch.setattr("app.services.gerar_fig_banco_vendedores", lambda ano, mes: figura_banco)
+    monkeypatch.setattr("app.services.soma_vendas", lambda x: x)
+
+    # Mock do pool de processos: registra as figuras na ordem recebida
+    recebidas = {}
+    def fake_rasterizar_figuras(figuras, processos):
+        recebidas["figuras"] = figuras
+        recebidas["processos"] = processos
+        return {"parede": 1.0, "soma": 2.0, "processos": processos}
+
+    desenhadas = []
+    class FakeCanvas:
+        def __init__(self, buffer, pagesize): pass
+        def setFont(self, *a, **kw): pass
+        def drawRightString(self, *a, **kw): pass
+        def showPage(self): pass
+        def drawImage(self, img, *a, **kw): desenhadas.append(img)
+        def save(self): pass
+
+    class FakeTempDir:
+        def __enter__(self): return "/tmp"
+        def __exit__(self, *a): pass
+
+    monkeypatch.setattr("app.services.rasterizar_figuras", fake_rasterizar_figuras)
+    monkeypatch.setattr("app.services.canvas.Canvas", FakeCanvas)
+    monkeypatch.setattr("app.services.reportlab_utils.ImageReader", lambda p: p)
+    monkeypatch.setattr("app.services.tempfile.TemporaryDirectory", lambda: FakeTempDir())
+
+    app.config["PDF_PROCESSOS"] = 4
+    with app.test_request_context():
+        buffer_pdf, nome_arquivo = gerar_pdf_graficos(["vendas_geral", "banco_vendedores"], "relatorio", 2025, 7)
+
+    assert nome_arquivo == "relatorio_7_2025.pdf"
+    assert recebidas["processos"] == 4
+    assert [f for _, f in recebidas["figuras"]] == [figura_geral, figura_banco]
+    # As imagens entram no PDF na ordem da seleção
+    assert [os.path.basename(p) for p in desenhadas] == ["grafico_vendas_geral.png", "grafico_banco_vendedores.png"]
@@ -0,0 +1,21 @@
+import pytest
+import mongomock
+from datetime import datetime, timedelta
+
+from app.services import limpar_notificacoes_antigas
+
+@pytest.fixture
+def fake_notificacoes_collection(monkeypatch):
+    mock_db = mongomock.MongoClient().db
+    monkeypatch.setattr("app.services.notificacoes_collection", mock_db.notificacoes)
+    return mock_db.notificacoes
+
+def test_limpar_notificacoes_antigas(fake_notificacoes_collection):
+    agora = datetime.now()
+    fake_notificacoes_collection.insert_many([
+        {"mensagem": "antiga", "data_hora": agora - timedelta(days=91)},
+        {"mensagem": "recente", "data_hora": agora - timedelta(days=1)},
+    ])
+
+    assert limpar_notificacoes_antigas(90) == 1
+    assert [n["mensagem"] for n in fake_notificacoes_collection.find()] == ["recente"]
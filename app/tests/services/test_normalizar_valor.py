@@ -1,27 +1,33 @@
 from app.services import normalizar_valor
 
 def test_normalizar_valor_decimal_virgula():
-    assert normalizar_valor("10,50") == "10.50"
+    assert normalizar_valor("10,50") == 10.5
 
 def test_normalizar_valor_decimal_ponto():
-    assert normalizar_valor("123.45") == "123.45"
+    assert normalizar_valor("123.45") == 123.45
 
 def test_normalizar_valor_com_espacos():
-    assert normalizar_valor("   99,9   ") == "99.9"
+    assert normalizar_valor("   99,9   ") == 99.9
 
 def test_normalizar_valor_inteiro():
-    assert normalizar_valor(100) == "100"
+    assert normalizar_valor(100) == 100.0
 
 def test_normalizar_valor_string_vazia():
-    assert normalizar_valor("") == "0"
-    assert normalizar_valor("", padrao="42") == "42"
+    assert normalizar_valor("") == 0.0
+    assert normalizar_valor("", padrao="42") == 42.0
 
 def test_normalizar_valor_none():
-    assert normalizar_valor(None) == "0"
+    assert normalizar_valor(None) == 0.0
     assert normalizar_valor(None, padrao="xxx") == "xxx"
 
 def test_normalizar_valor_invalido():
-    assert normalizar_valor("errado") == "0"
-    assert normalizar_valor("R$ 100") == "0"
-    assert normalizar_valor("15-09") == "0"
+    assert normalizar_valor("errado") == 0.0
+    assert normalizar_valor("R$ 100") == 0.0
+    assert normalizar_valor("15-09") == 0.0
     assert normalizar_valor("errado", padrao="nao") == "nao"
+
+def test_normalizar_valor_formato_brasileiro_numero():
+    # Gravado como número para que o $sum dos gráficos considere a venda editada
+    valor = normalizar_valor("1.234,56")
+    assert valor == 1234.56
+    assert isinstance(valor, float)
@@ -30,7 +30,7 @@ def test_notificar_admins_envia_email(app, monkeypatch):
 
     monkeypatch.setattr("app.services.usuarios_collection", FakeUsuarios())
     monkeypatch.setattr("app.services.configs_collection", FakeConfigs())
-    monkeypatch.setattr("app.services.enviar_email", fake_enviar_email)
+    monkeypatch.setattr("app.services.enfileirar_email", fake_enviar_email)
 
     with app.test_request_context(environ_base={"REMOTE_ADDR": "127.0.0.1"}):
         session["usuario_tentativa_login"] = "usuario_x"
@@ -40,7 +40,7 @@ def test_notificar_admins_envia_email(app, monkeypatch):
     for chamado in chamados:
         assert chamado["assunto"].startswith("Bloqueio de sessão")
         assert chamado["email_remetente"] == "remetente1@empresa.com"
-        assert chamado["senha_email"] == "segredo"
+        assert "senha_email" not in chamado  # Lida das configurações pelo worker
         assert chamado["email_destinatario"] in ("admin1@empresa.com", "admin2@empresa.com")
         assert "usuario_x" in chamado["corpo"]
         assert "127.0.0.1" not in chamado["corpo"]  # O IP está no corpo? (ajuste conforme seu template)
@@ -71,7 +71,7 @@ def test_notificar_admins_envia_email_erro(app, monkeypatch):
 
     monkeypatch.setattr("app.services.usuarios_collection", FakeUsuarios())
     monkeypatch.setattr("app.services.configs_collection", FakeConfigs())
-    monkeypatch.setattr("app.services.enviar_email", lambda x: x)
+    monkeypatch.setattr("app.services.enfileirar_email", lambda x: x)
 
     with app.test_request_context(environ_base={"REMOTE_ADDR": "127.0.0.1"}):
         session["usuario_tentativa_login"] = "usuario_x"
@@ -91,7 +91,7 @@ def test_notificar_admins_config_vazio(app, monkeypatch):
 
     monkeypatch.setattr("app.services.usuarios_collection", FakeUsuarios())
     monkeypatch.setattr("app.services.configs_collection", FakeConfigs())
-    monkeypatch.setattr("app.services.enviar_email", lambda x: x)
+    monkeypatch.setattr("app.services.enfileirar_email", lambda x: x)
 
     with app.test_request_context(environ_base={"REMOTE_ADDR": "127.0.0.1"}):
         session["usuario_tentativa_login"] = "usuario_x"
@@ -119,7 +119,7 @@ def test_notificar_admins_nao_envia_sem_admin(app, monkeypatch):
 
     monkeypatch.setattr("app.services.usuarios_collection", FakeUsuarios())
     monkeypatch.setattr("app.services.configs_collection", FakeConfigs())
-    monkeypatch.setattr("app.services.enviar_email", lambda x: x)
+    monkeypatch.setattr("app.services.enfileirar_email", lambda x: x)
 
     with app.test_request_context():
         session["usuario_tentativa_login"] = "usuario_x"
@@ -40,7 +40,7 @@ def test_reenviar_venda_com_entrada_1mais1_entrada(monkeypatch):
     # Monkeypatch nas dependências
     monkeypatch.setattr("app.services.usuarios_collection.find_one", fake_find_one_usuarios)
     monkeypatch.setattr("app.services.configs_collection.find_one", fake_find_one_configs)
-    monkeypatch.setattr("app.services.enviar_email", fake_enviar_email)
+    monkeypatch.setattr("app.services.enfileirar_email", fake_enviar_email)
 
     # Dados de venda para reenvio
     data = {
@@ -76,7 +76,7 @@ def test_reenviar_venda_com_entrada_1mais1_entrada(monkeypatch):
     assert email_enviado["assunto"].startswith("REENVIO - Cliente X")
     assert email_enviado["email_remetente"] == "vendas@empresa.com"
     assert email_enviado["copias"] == "copia@empresa.com"
-    assert email_enviado["senha_email"] == "segredo"
+    assert "senha_email" not in email_enviado  # Lida das configurações pelo worker
     assert email_enviado["servidor"] == "smtp.empresa.com"
     assert email_enviado["porta"] == 587
     assert email_enviado["email_destinatario"] == "joao@empresa.com"
@@ -123,7 +123,7 @@ def test_reenviar_venda_sem_entrada_1mais1_avista(monkeypatch):
     # Monkeypatch nas dependências
     monkeypatch.setattr("app.services.usuarios_collection.find_one", fake_find_one_usuarios)
     monkeypatch.setattr("app.services.configs_collection.find_one", fake_find_one_configs)
-    monkeypatch.setattr("app.services.enviar_email", fake_enviar_email)
+    monkeypatch.setattr("app.services.enfileirar_email", fake_enviar_email)
 
     # Dados de venda para reenvio
     data = {
@@ -159,7 +159,7 @@ def test_reenviar_venda_sem_entrada_1mais1_avista(monkeypatch):
     assert email_enviado["assunto"].startswith("REENVIO - Cliente X")
     assert email_enviado["email_remetente"] == "vendas@empresa.com"
     assert email_enviado["copias"] == "copia@empresa.com"
-    assert email_enviado["senha_email"] == "segredo"
+    assert "senha_email" not in email_enviado  # Lida das configurações pelo worker
     assert email_enviado["servidor"] == "smtp.empresa.com"
     assert email_enviado["porta"] == 587
     assert email_enviado["email_destinatario"] == "joao@empresa.com"
@@ -206,7 +206,7 @@ def test_reenviar_venda_sem_entrada_condicao(monkeypatch):
     # Monkeypatch nas dependências
     monkeypatch.setattr("app.services.usuarios_collection.find_one", fake_find_one_usuarios)
     monkeypatch.setattr("app.services.configs_collection.find_one", fake_find_one_configs)
-    monkeypatch.setattr("app.services.enviar_email", fake_enviar_email)
+    monkeypatch.setattr("app.services.enfileirar_email", fake_enviar_email)
 
     # Dados de venda para reenvio
     data = {
@@ -242,7 +242,7 @@ def test_reenviar_venda_sem_entrada_condicao(monkeypatch):
     assert email_enviado["assunto"].startswith("REENVIO - Cliente X")
     assert email_enviado["email_remetente"] == "vendas@empresa.com"
     assert email_enviado["copias"] == "copia@empresa.com"
-    assert email_enviado["senha_email"] == "segredo"
+    assert "senha_email" not in email_enviado  # Lida das configurações pelo worker
     assert email_enviado["servidor"] == "smtp.empresa.com"
     assert email_enviado["porta"] == 587
     assert email_enviado["email_destinatario"] == "joao@empresa.com"
@@ -289,7 +289,7 @@ def test_reenviar_venda_com_entrada_condicao(monkeypatch):
     # Monkeypatch nas dependências
     monkeypatch.setattr("app.services.usuarios_collection.find_one", fake_find_one_usuarios)
     monkeypatch.setattr("app.services.configs_collection.find_one", fake_find_one_configs)
-    monkeypatch.setattr("app.services.enviar_email", fake_enviar_email)
+    monkeypatch.setattr("app.services.enfileirar_email", fake_enviar_email)
 
     # Dados de venda para reenvio
     data = {
@@ -325,7 +325,7 @@ def test_reenviar_venda_com_entrada_condicao(monkeypatch):
     assert email_enviado["assunto"].startswith("REENVIO - Cliente X")
     assert email_enviado["email_remetente"] == "vendas@empresa.com"
     assert email_enviado["copias"] == "copia@empresa.com"
-    assert email_enviado["senha_email"] == "segredo"
+    assert "senha_email" not in email_enviado  # Lida das configurações pelo worker
     assert email_enviado["servidor"] == "smtp.empresa.com"
     assert email_enviado["porta"] == 587
     assert email_enviado["email_destinatario"] == "joao@empresa.com"
@@ -372,7 +372,7 @@ def test_reenviar_venda_email_secundario(monkeypatch):
     # Monkeypatch nas dependências
     monkeypatch.setattr("app.services.usuarios_collection.find_one", fake_find_one_usuarios)
     monkeypatch.setattr("app.services.configs_collection.find_one", fake_find_one_configs)
-    monkeypatch.setattr("app.services.enviar_email", fake_enviar_email)
+    monkeypatch.setattr("app.services.enfileirar_email", fake_enviar_email)
 
     # Dados de venda para reenvio
     data = {
@@ -408,7 +408,7 @@ def test_reenviar_venda_email_secundario(monkeypatch):
     assert email_enviado["assunto"].startswith("REENVIO - Cliente X")
     assert email_enviado["email_remetente"] == "backup@empresa.com"
     assert email_enviado["copias"] == "copia@empresa.com"
-    assert email_enviado["senha_email"] == "segredo"
+    assert "senha_email" not in email_enviado  # Lida das configurações pelo worker
     assert email_enviado["servidor"] == "smtp.empresa.com"
     assert email_enviado["porta"] == 587
     assert email_enviado["email_destinatario"] == "joao@empresa.com"
@@ -0,0 +1,85 @@
+import pytest
+import mongomock
+from datetime import datetime, timedelta, timezone
+from flask import Flask, session
+
+from app.sessao import ArmazenamentoMemoria, ArmazenamentoMongo, SessaoServidorInterface, criar_interface_sessao
+
+def criar_app(armazenamento):
+    app = Flask(__name__)
+    app.secret_key = "fake-key"
+    app.session_interface = SessaoServidorInterface(armazenamento)
+
+    @app.route("/salvar", methods=["POST"])
+    def salvar():
+        session["user"] = {"username": "joao", "tipo": "vendedor"}
+        session["venda_edicao"] = {"numero_da_venda": "2025070001", "logs": ["x" * 5000] * 5}
+        return "ok"
+
+    @app.route("/ler")
+    def ler():
+        return {"user": session.get("user"), "venda": session.get("venda_edicao", {}).get("numero_da_venda")}
+
+    @app.route("/sair")
+    def sair():
+        session.clear()
+        return "ok"
+
+    return app
+
+@pytest.fixture(params=["memoria", "mongo"])
+def armazenamento(request):
+    if request.param == "memoria":
+        return ArmazenamentoMemoria()
+    return ArmazenamentoMongo(mongomock.MongoClient().db.sessoes)
+
+def cookie_sessao(client):
+    return client.get_cookie("session")
+
+def test_sessao_guarda_dados_no_servidor(armazenamento):
+    client = criar_app(armazenamento).test_client()
+    client.post("/salvar")
+    cookie = cookie_sessao(client)
+    # Cookie pequeno: apenas o ID assinado, sem os logs da venda
+    assert len(cookie.value) < 100
+    assert "joao" not in cookie.value
+    dados = client.get("/ler").get_json()
+    assert dados == {"user": {"username": "joao", "tipo": "vendedor"}, "venda": "2025070001"}
+
+def test_sessao_sem_alteracao_nao_grava(armazenamento):
+    client = criar_app(armazenamento).test_client()
+    resp = client.get("/ler")
+    assert "Set-Cookie" not in resp.headers
+
+def test_sessao_cookie_adulterado_inicia_nova(armazenamento):
+    app = criar_app(armazenamento)
+    client = app.test_client()
+    client.post("/salvar")
+    client.set_cookie("session", cookie_sessao(client).value + "x")
+    assert client.get("/ler").get_json()["user"] is None
+
+def test_sessao_clear_remove_do_armazenamento(armazenamento):
+    client = criar_app(armazenamento).test_client()
+    client.post("/salvar")
+    sid = cookie_sessao(client).value.rsplit(".", 1)[0]
+    assert armazenamento.carregar(sid) is not None
+    client.get("/sair")
+    assert armazenamento.carregar(sid) is None
+    assert cookie_sessao(client) is None
+
+def test_sessao_expirada_nao_carrega(armazenamento):
+    passado = datetime.now(timezone.utc) - timedelta(seconds=1)
+    armazenamento.salvar("abc", "{}", passado)
+    assert armazenamento.carregar("abc") is None
+
+def test_sessao_mongo_grava_expiracao(monkeypatch):
+    colecao = mongomock.MongoClient().db.sessoes
+    client = criar_app(ArmazenamentoMongo(colecao)).test_client()
+    client.post("/salvar")
+    documento = colecao.find_one()
+    assert isinstance(documento["dados"], str)
+    assert documento["expira_em"].replace(tzinfo=timezone.utc) > datetime.now(timezone.utc) + timedelta(days=30)
+
+def test_criar_interface_sessao_testing_usa_memoria():
+    interface = criar_interface_sessao(testing=True)
+    assert isinstance(interface.armazenamento, ArmazenamentoMemoria)
@@ -0,0 +1,100 @@
+import threading
+import time
+import pytest
+import mongomock
+from datetime import datetime
+
+from app.snapshot import obter_snapshot_mensal, periodo_mes
+
+class ContadorCollection:
+    """Envolve uma coleção mongomock contando quantas vezes find() foi chamado."""
+    def __init__(self, collection):
+        self.collection = collection
+        self.chamadas = 0
+    def find(self, filtro, proj):
+        self.chamadas += 1
+        return self.collection.find(filtro, proj)
+
+@pytest.fixture
+def colecoes():
+    db = mongomock.MongoClient().db
+    db.usuarios.insert_many([
+        {"nome_completo": "Maria", "status": "ativo"},
+        {"nome_completo": "João", "status": "bloqueado"},
+        {"nome_completo": "Pedro", "status": "inativo"},
+    ])
+    db.vendas.insert_many([
+        {"vendedor": "Maria", "status": "Aprovada", "valor_real": "100", "data_criacao": datetime(2025, 7, 3), "logs": ["x"]},
+        {"vendedor": "João", "status": "Faturado", "valor_real": "200", "data_criacao": datetime(2025, 7, 31, 23)},
+        {"vendedor": "Pedro", "status": "Aprovada", "valor_real": "300", "data_criacao": datetime(2025, 7, 10)},
+        {"vendedor": "Maria", "status": "Cancelada", "valor_real": "400", "data_criacao": datetime(2025, 7, 10)},
+        {"vendedor": "Maria", "status": "Aprovada", "valor_real": "500", "data_criacao": datetime(2025, 8, 1)},
+    ])
+    return ContadorCollection(db.usuarios), ContadorCollection(db.vendas)
+
+def test_snapshot_vendas_ativos(colecoes):
+    usuarios, vendas = colecoes
+    snapshot = obter_snapshot_mensal(2025, 7, usuarios, vendas)
+    assert sorted(snapshot.nomes_ativos) == ["João", "Maria"]
+    valores = sorted(v["valor_real"] for v in snapshot.vendas_ativos)
+    assert valores == ["100", "200"]
+    # Campos pesados (logs) não entram no snapshot
+    assert all("logs" not in v and "_id" not in v for v in snapshot.vendas_ativos)
+
+def test_snapshot_vendas_todos(colecoes):
+    usuarios, vendas = colecoes
+    snapshot = obter_snapshot_mensal(2025, 7, usuarios, vendas)
+    valores = sorted(v["valor_real"] for v in snapshot.vendas_todos)
+    assert valores == ["100", "200", "300"]
+    # vendas_todos não precisa consultar usuários
+    assert usuarios.chamadas == 0
+
+def test_snapshot_carrega_uma_vez(colecoes):
+    usuarios, vendas = colecoes
+    snapshot = obter_snapshot_mensal(2025, 7, usuarios, vendas)
+    for _ in range(3):
+        snapshot.nomes_ativos
+        snapshot.vendas_ativos
+    assert usuarios.chamadas == 1
+    assert vendas.chamadas == 1
+
+def test_snapshot_compartilhado_na_requisicao(app, colecoes):
+    usuarios, vendas = colecoes
+    with app.test_request_context():
+        primeiro = obter_snapshot_mensal(2025, 7, usuarios, vendas)
+        segundo = obter_snapshot_mensal(2025, 7, usuarios, vendas)
+        outro_mes = obter_snapshot_mensal(2025, 8, usuarios, vendas)
+        assert primeiro is segundo
+        assert outro_mes is not primeiro
+        primeiro.vendas_ativos
+        segundo.vendas_ativos
+        assert vendas.chamadas == 1
+
+def test_snapshot_fora_do_flask_nao_compartilha(colecoes):
+    usuarios, vendas = colecoes
+    assert obter_snapshot_mensal(2025, 7, usuarios, vendas) is not obter_snapshot_mensal(2025, 7, usuarios, vendas)
+
+def test_periodo_mes_dezembro():
+    ano, mes, primeiro_dia, proximo_mes = periodo_mes(2025, 12)
+    assert (ano, mes) == (2025, 12)
+    assert primeiro_dia == datetime(2025, 12, 1)
+    assert proximo_mes == datetime(2026, 1, 1)
+
+def test_snapshot_carrega_uma_vez_com_varias_threads(colecoes):
+    usuarios, vendas = colecoes
+    find_original = vendas.find
+    def find_lento(filtro, proj):
+        time.sleep(0.05)
+        return find_original(filtro, proj)
+    vendas.find = find_lento
+
+    snapshot = obter_snapshot_mensal(2025, 7, usuarios, vendas)
+    resultados = []
+    threads = [threading.Thread(target=lambda: resultados.append(snapshot.vendas_ativos)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # As threads esperam a primeira carga em vez de repetir a consulta
+    assert vendas.chamadas == 1
+    assert all(resultado is resultados[0] for resultado in resultados)
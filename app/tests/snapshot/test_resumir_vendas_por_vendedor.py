@@ -0,0 +1,101 @@
+import pytest
+import mongomock
+from datetime import datetime
+
+from app.snapshot import obter_snapshot_mensal, resumir_vendas_por_vendedor, contar_vendas_por_estado
+
+class ContadorCollection:
+    """Envolve uma coleção mongomock contando as chamadas de find() e aggregate()."""
+    def __init__(self, collection):
+        self.collection = collection
+        self.chamadas = 0
+    def find(self, filtro, proj):
+        self.chamadas += 1
+        return self.collection.find(filtro, proj)
+    def aggregate(self, pipeline):
+        self.chamadas += 1
+        return self.collection.aggregate(pipeline)
+
+@pytest.fixture
+def vendas():
+    db = mongomock.MongoClient().db
+    db.vendas.insert_many([
+        {"vendedor": "Maria", "valor_real": 1100.0, "valor_tabela": 1000.0, "desconto_autorizado": False,
+         "tipo_cliente": " verde ", "produto": "Atualização", "endereco": {"estado": "SP"}},
+        {"vendedor": "Maria", "valor_real": 700.0, "valor_tabela": 800.0, "desconto_autorizado": False,
+         "tipo_cliente": "VERMELHO", "produto": "Sistema", "endereco": "rj"},
+        {"vendedor": "Maria", "valor_real": 500.0, "valor_tabela": 600.0, "desconto_autorizado": True,
+         "tipo_cliente": "Azul", "produto": "atualizacao", "endereco": {"estado": "SP"}},
+        {"vendedor": "João", "valor_real": 300.0, "valor_tabela": 300.0, "produto": None},
+        {"vendedor": "João", "valor_real": "texto", "valor_tabela": 100.0, "tipo_cliente": "Verde", "produto": ""},
+    ])
+    return db.vendas
+
+def test_resumo_por_vendedor(vendas):
+    resumo = resumir_vendas_por_vendedor(vendas, {})
+    # Em ordem de nome
+    assert list(resumo) == ["João", "Maria"]
+
+    maria = resumo["Maria"]
+    assert maria["quantidade"] == 3
+    assert maria["total"] == 2300.0
+    # +100 (acima da tabela) -100 (desconto não autorizado); o desconto autorizado não conta
+    assert maria["banco"] == 0.0
+    assert maria["movimentos_banco"] == 2
+    assert (maria["verdes"], maria["vermelhos"]) == (1, 1)
+    assert maria["atualizacoes"] == 2
+    assert maria["com_produto"] == 3
+
+def test_resumo_valores_invalidos_e_produto_vazio(vendas):
+    joao = resumir_vendas_por_vendedor(vendas, {})["João"]
+    # Valor em texto não soma; na diferença conta como 0
+    assert joao["total"] == 300.0
+    assert joao["banco"] == -100.0
+    assert joao["movimentos_banco"] == 1
+    assert joao["com_produto"] == 1
+    assert joao["produto_vazio"] == 1
+    assert joao["atualizacoes"] == 0
+
+def test_resumo_valores_em_texto_somam():
+    db = mongomock.MongoClient().db
+    db.vendas.insert_many([
+        # Gravadas como texto pela edição antiga ou antes da migração dos valores
+        {"vendedor": "Ana", "valor_real": "1.234,56", "valor_tabela": 1000.0, "desconto_autorizado": False},
+        {"vendedor": "Ana", "valor_real": 500.0, "valor_tabela": "600,00", "desconto_autorizado": True},
+        {"vendedor": "Ana", "valor_real": "300.00", "valor_tabela": "300", "desconto_autorizado": False},
+        {"vendedor": "Ana", "valor_real": 100.0, "valor_tabela": 100.0},
+    ])
+    ana = resumir_vendas_por_vendedor(db.vendas, {})["Ana"]
+    assert ana["total"] == 2134.56
+    # Só a primeira movimenta o banco: o desconto autorizado não conta e a terceira empata
+    assert ana["banco"] == 234.56
+    assert ana["movimentos_banco"] == 1
+    assert ana["quantidade"] == 4
+
+def test_resumo_aplica_filtro(vendas):
+    resumo = resumir_vendas_por_vendedor(vendas, {"vendedor": "João"})
+    assert list(resumo) == ["João"]
+    assert resumir_vendas_por_vendedor(vendas, {"vendedor": "Pedro"}) == {}
+
+def test_contar_vendas_por_estado(vendas):
+    contagem = dict((str(estado), quantidade) for estado, quantidade in contar_vendas_por_estado(vendas, {}))
+    # Chaves sem normalizar: dict com estado, texto legado e vendas sem endereço (None)
+    assert contagem == {"SP": 2, "rj": 1, "None": 2}
+
+def test_snapshot_resumo_agrega_uma_vez():
+    db = mongomock.MongoClient().db
+    db.usuarios.insert_many([{"nome_completo": "Maria", "status": "ativo"}])
+    db.vendas.insert_many([
+        {"vendedor": "Maria", "status": "Aprovada", "valor_real": 100.0, "data_criacao": datetime(2025, 7, 3)},
+        {"vendedor": "Pedro", "status": "Faturado", "valor_real": 200.0, "data_criacao": datetime(2025, 7, 4)},
+        {"vendedor": "Maria", "status": "Cancelada", "valor_real": 400.0, "data_criacao": datetime(2025, 7, 5)},
+    ])
+    vendas = ContadorCollection(db.vendas)
+    snapshot = obter_snapshot_mensal(2025, 7, db.usuarios, vendas)
+    for _ in range(3):
+        assert list(snapshot.resumo_ativos) == ["Maria"]
+        assert snapshot.resumo_ativos["Maria"]["total"] == 100.0
+    assert vendas.chamadas == 1
+    # Sem o filtro de vendedores ativos
+    assert list(snapshot.resumo_todos) == ["Maria", "Pedro"]
+    assert vendas.chamadas == 2
@@ -0,0 +1,35 @@
+import threading
+import pytest
+from flask import Flask
+from werkzeug.serving import make_server
+
+from app.teste_carga import medir_carga
+
+@pytest.fixture
+def servidor():
+    app = Flask(__name__)
+
+    @app.route("/ok")
+    def ok():
+        return "ok"
+
+    @app.route("/falha")
+    def falha():
+        return "erro", 500
+
+    servidor = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{servidor.server_port}"
+    servidor.shutdown()
+
+def test_medir_carga(servidor):
+    resultado = medir_carga(servidor, ["/ok"], clientes=2, segundos=0.3)
+    assert resultado["requisicoes"] > 0
+    assert resultado["erros"] == 0
+    assert resultado["req_s"] > 0
+
+def test_medir_carga_conta_erros_5xx(servidor):
+    resultado = medir_carga(servidor, ["/ok", "/falha"], clientes=1, segundos=0.3)
+    assert resultado["requisicoes"] > 0
+    assert resultado["erros"] > 0
@@ -0,0 +1,22 @@
+from app.teste_carga import percentil, resumir_carga
+
+def test_percentil():
+    valores = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+    assert percentil(valores, 50) == 0.05
+    assert percentil(valores, 95) == 0.095
+    assert percentil(valores, 100) == 0.1
+    assert percentil([], 50) == 0.0
+
+def test_resumir_carga():
+    resultado = resumir_carga([0.003, 0.001, 0.002, 0.010], erros=2, segundos=2)
+    assert resultado["requisicoes"] == 4
+    assert resultado["erros"] == 2
+    assert resultado["req_s"] == 2.0
+    assert resultado["p50_ms"] == 2.0
+    assert resultado["max_ms"] == 10.0
+
+def test_resumir_carga_sem_respostas():
+    resultado = resumir_carga([], erros=5, segundos=1)
+    assert resultado["requisicoes"] == 0
+    assert resultado["req_s"] == 0.0
+    assert resultado["max_ms"] == 0.0
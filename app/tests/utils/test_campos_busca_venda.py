@@ -0,0 +1,22 @@
+from app.utils import campos_busca_venda, normalizar_texto_busca, somente_digitos
+
+def test_normalizar_texto_busca():
+    assert normalizar_texto_busca("José  da Silva-ME") == "jose da silva me"
+    assert normalizar_texto_busca(None) == ""
+
+def test_somente_digitos():
+    assert somente_digitos("12.345.678/0001-90") == "12345678000190"
+    assert somente_digitos(None) == ""
+
+def test_campos_busca_venda():
+    campos = campos_busca_venda({"cnpj_cpf": "123.456.789-00", "nome": "Ótica Ávila", "vendedor": "João"})
+    assert campos == {
+        "busca_documento": "12345678900",
+        "busca_nome": ["otica avila", "avila"],
+        "busca_vendedor": ["joao"],
+    }
+
+def test_campos_busca_venda_limita_termos():
+    campos = campos_busca_venda({"nome": " ".join(f"p{i}" for i in range(20))})
+    assert len(campos["busca_nome"]) == 10
+    assert campos["busca_documento"] == ""
@@ -0,0 +1,29 @@
+from datetime import date, datetime
+
+from app.utils import campos_prazo_venda, faixa_prazo, formatar_data_iso
+
+def test_faixa_prazo_limites():
+    assert faixa_prazo(-2) == "≤ 30 dias"
+    assert faixa_prazo(30) == "≤ 30 dias"
+    assert faixa_prazo(30.5) == "31-39 dias"
+    assert faixa_prazo(39.5) == "40-49 dias"
+    assert faixa_prazo(150) == "50-150 dias"
+    assert faixa_prazo(150.1) is None
+
+def test_campos_prazo_venda():
+    campos = campos_prazo_venda({"data_criacao": datetime(2025, 7, 1, 18), "data_prestacao_inicial": "2025-08-10"})
+    assert campos == {
+        "data_prestacao_inicial": datetime(2025, 8, 10),
+        "prazo_dias": 39.25,
+        "faixa_prazo": "40-49 dias",
+    }
+
+def test_campos_prazo_venda_sem_datas():
+    campos = campos_prazo_venda({"data_criacao": None, "data_prestacao_inicial": date(2025, 8, 10)})
+    assert campos == {"data_prestacao_inicial": datetime(2025, 8, 10), "prazo_dias": None, "faixa_prazo": None}
+    assert campos_prazo_venda({"data_prestacao_inicial": "10/08"})["data_prestacao_inicial"] == "10/08"
+
+def test_formatar_data_iso():
+    assert formatar_data_iso(datetime(2025, 8, 10)) == "2025-08-10"
+    assert formatar_data_iso("2025-08-10") == "2025-08-10"
+    assert formatar_data_iso(None) == ""
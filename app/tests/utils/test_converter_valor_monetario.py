@@ -0,0 +1,24 @@
+from app.utils import converter_valor_monetario, formatar_moeda, normalizar_valores_monetarios
+
+def test_converter_valor_monetario_formatos():
+    assert converter_valor_monetario("1.234,56") == 1234.56
+    assert converter_valor_monetario("1,234.56") == 1234.56
+    assert converter_valor_monetario(" 300,25 ") == 300.25
+    assert converter_valor_monetario("1500.5") == 1500.5
+    assert converter_valor_monetario(1500) == 1500.0
+
+def test_converter_valor_monetario_invalidos():
+    assert converter_valor_monetario("") is None
+    assert converter_valor_monetario(None) is None
+    assert converter_valor_monetario("abc") is None
+    assert converter_valor_monetario(True) is None
+
+def test_normalizar_valores_monetarios():
+    venda = {"valor_real": "5.000,00", "valor_entrada": "", "valor_parcelas": "x", "nome": "Cliente"}
+    assert normalizar_valores_monetarios(venda) == {"valor_real": 5000.0, "valor_entrada": None, "valor_parcelas": "x"}
+
+def test_formatar_moeda():
+    assert formatar_moeda(1234.5) == "1.234,50"
+    assert formatar_moeda("300,25") == "300,25"
+    assert formatar_moeda(None) == ""
+    assert formatar_moeda("abc") == "abc"
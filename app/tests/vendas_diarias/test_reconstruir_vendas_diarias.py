@@ -0,0 +1,55 @@
+import pytest
+import mongomock
+from datetime import datetime
+
+from app.vendas_diarias import reconstruir_vendas_diarias
+
+@pytest.fixture
+def db(monkeypatch):
+    db = mongomock.MongoClient().db
+    monkeypatch.setattr("app.vendas_diarias.vendas_collection", db.vendas)
+    monkeypatch.setattr("app.vendas_diarias.vendas_diarias_collection", db.vendas_diarias)
+    db.vendas.insert_many([
+        {"data_criacao": datetime(2025, 7, 1, 9), "vendedor": "Maria", "status": "Aprovada", "valor_real": "100", "produto": "Sistema", "tipo_cliente": "Verde"},
+        {"data_criacao": datetime(2025, 7, 1, 18), "vendedor": "Maria", "status": "Aprovada", "valor_real": "50,5", "produto": "Atualização", "tipo_cliente": "Vermelho"},
+        {"data_criacao": datetime(2025, 7, 2, 10), "vendedor": "João", "status": "Cancelada", "valor_real": "300", "produto": "Sistema"},
+        {"data_criacao": datetime(2025, 8, 1, 10), "vendedor": "João", "status": "Faturado", "valor_real": "700", "produto": "Sistema"},
+    ])
+    return db
+
+def test_reconstruir_vendas_diarias_mes(db):
+    # Documento desatualizado do mês deve ser substituído
+    db.vendas_diarias.insert_one({"dia": datetime(2025, 7, 1), "vendedor": "Maria", "status": "Aprovada", "quantidade": 99})
+    assert reconstruir_vendas_diarias(2025, 7) == 2
+    maria = db.vendas_diarias.find_one({"vendedor": "Maria"})
+    assert maria["quantidade"] == 2
+    assert maria["valor_real"] == 150.5
+    assert (maria["novas"], maria["atualizacoes"], maria["verdes"], maria["vermelhos"]) == (1, 1, 1, 1)
+    # Agosto não foi tocado
+    assert db.vendas_diarias.count_documents({"dia": datetime(2025, 8, 1)}) == 0
+
+def test_reconstruir_vendas_diarias_tudo(db):
+    assert reconstruir_vendas_diarias() == 3
+    assert db.vendas_diarias.find_one({"status": "Faturado"})["valor_real"] == 700.0
+
+def test_reconstruir_vendas_diarias_sem_apagar_o_periodo(db, monkeypatch):
+    reconstruir_vendas_diarias(2025, 7)
+    maria = db.vendas_diarias.find_one({"vendedor": "Maria"})
+    # Chave que não existe mais (venda trocou de status) é removida
+    db.vendas_diarias.insert_one({"dia": datetime(2025, 7, 3), "vendedor": "Pedro", "status": "Aprovada", "quantidade": 1})
+    apagados = []
+    colecao = db.vendas_diarias
+    class ColecaoSemDeleteDoPeriodo:
+        def __getattr__(self, nome):
+            return getattr(colecao, nome)
+        def delete_many(self, filtro):
+            # Só remove por _id (as chaves obsoletas), nunca o período inteiro
+            assert list(filtro) == ["_id"]
+            apagados.extend(filtro["_id"]["$in"])
+            return colecao.delete_many(filtro)
+    monkeypatch.setattr("app.vendas_diarias.vendas_diarias_collection", ColecaoSemDeleteDoPeriodo())
+    assert reconstruir_vendas_diarias(2025, 7) == 2
+    assert len(apagados) == 1
+    assert db.vendas_diarias.count_documents({"vendedor": "Pedro"}) == 0
+    # O documento existente é substituído no lugar (mesmo _id)
+    assert db.vendas_diarias.find_one({"vendedor": "Maria"})["_id"] == maria["_id"]
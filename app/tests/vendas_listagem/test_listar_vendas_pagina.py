@@ -0,0 +1,57 @@
+import pytest
+import mongomock
+from datetime import datetime
+from bson import ObjectId
+
+from app.vendas_listagem import listar_vendas_pagina, decodificar_cursor
+
+@pytest.fixture
+def vendas(monkeypatch):
+    colecao = mongomock.MongoClient().db.vendas
+    monkeypatch.setattr("app.vendas_listagem.vendas_collection", colecao)
+    # 5 vendas: duas com a mesma data (desempate por _id) e uma sem data
+    documentos = [
+        {"_id": ObjectId(), "numero_da_venda": "1", "data_criacao": datetime(2025, 7, 1, 9), "logs": ["x"]},
+        {"_id": ObjectId(), "numero_da_venda": "2", "data_criacao": datetime(2025, 7, 2, 9)},
+        {"_id": ObjectId(), "numero_da_venda": "3", "data_criacao": datetime(2025, 7, 2, 9)},
+        {"_id": ObjectId(), "numero_da_venda": "4", "data_criacao": datetime(2025, 7, 3, 9)},
+        {"_id": ObjectId(), "numero_da_venda": "5"},
+    ]
+    colecao.insert_many(documentos)
+    return colecao
+
+def test_listar_vendas_pagina_percorre_tudo_sem_repetir(vendas):
+    numeros = []
+    cursor = None
+    paginas = 0
+    while True:
+        pagina = listar_vendas_pagina({}, cursor=cursor, limite=2)
+        numeros += [v["numero_da_venda"] for v in pagina["vendas"]]
+        paginas += 1
+        cursor = pagina["proximo_cursor"]
+        if not cursor:
+            break
+    assert numeros == ["4", "3", "2", "1", "5"]
+    assert paginas == 3
+
+def test_listar_vendas_pagina_projecao_enxuta(vendas):
+    pagina = listar_vendas_pagina({"numero_da_venda": "1"})
+    assert "logs" not in pagina["vendas"][0]
+    assert pagina["proximo_cursor"] is None
+
+def test_listar_vendas_pagina_com_filtro(vendas):
+    filtro = {"data_criacao": {"$gte": datetime(2025, 7, 2), "$lt": datetime(2025, 7, 3)}}
+    primeira = listar_vendas_pagina(filtro, limite=1)
+    segunda = listar_vendas_pagina(filtro, cursor=primeira["proximo_cursor"], limite=1)
+    assert [v["numero_da_venda"] for v in primeira["vendas"] + segunda["vendas"]] == ["3", "2"]
+    assert segunda["proximo_cursor"] is None
+
+def test_listar_vendas_pagina_cursor_invalido(vendas):
+    with pytest.raises(ValueError):
+        listar_vendas_pagina({}, cursor="invalido")
+
+def test_decodificar_cursor(vendas):
+    pagina = listar_vendas_pagina({}, limite=1)
+    data_criacao, id_venda = decodificar_cursor(pagina["proximo_cursor"])
+    assert data_criacao == datetime(2025, 7, 3, 9)
+    assert id_venda == pagina["vendas"][0]["_id"]
@@ -0,0 +1,54 @@
+import mongomock
+from datetime import datetime, date
+from bson import ObjectId
+
+from app.utils import campos_busca_venda
+from app.vendas_listagem import montar_filtro_vendas
+
+def test_montar_filtro_vendas_padrao_hoje():
+    hoje = datetime.combine(date.today(), datetime.min.time())
+    filtro = montar_filtro_vendas({"tipo": "admin"})
+    assert filtro == {"data_criacao": {"$gte": hoje, "$lte": hoje.replace(hour=23, minute=59, second=59)}}
+
+def test_montar_filtro_vendas_ver_todas():
+    assert montar_filtro_vendas({"tipo": "admin"}, ver_todas=True) == {}
+
+def test_montar_filtro_vendas_vendedor_com_busca_e_status():
+    user_id = ObjectId()
+    filtro = montar_filtro_vendas({"tipo": "vendedor", "user_id": str(user_id)}, busca="a.b", status="Aprovada", ver_todas=True)
+    condicoes = filtro["$and"]
+    assert condicoes[0] == {"usuario_id": user_id}
+    # A busca é por prefixo ancorado e literal (caracteres especiais escapados)
+    assert condicoes[1]["$or"] == [
+        {"numero_da_venda": {"$regex": r"^a\.b"}},
+        {"busca_nome": {"$regex": r"^a\ b"}},
+        {"busca_vendedor": {"$regex": r"^a\ b"}},
+    ]
+    assert condicoes[2] == {"status": "Aprovada"}
+
+def test_montar_filtro_vendas_pos_vendas_e_periodo():
+    filtro = montar_filtro_vendas({"tipo": "pos_vendas", "username": "ana"}, data_inicio="2025-07-01", data_fim="2025-07-31")
+    assert filtro["$and"][0] == {"posvendas": {"$regex": r"(?:^|,)\s*ana\s*(?:,|$)"}}
+    assert filtro["$and"][1] == {"data_criacao": {"$gte": datetime(2025, 7, 1), "$lte": datetime(2025, 7, 31, 23, 59, 59)}}
+
+def test_montar_filtro_vendas_data_unica_fim_do_mes():
+    filtro = montar_filtro_vendas({"tipo": "admin"}, data="2025-07-31", ver_todas=True)
+    assert filtro == {"data_criacao": {"$gte": datetime(2025, 7, 31), "$lt": datetime(2025, 8, 1)}}
+
+def test_montar_filtro_vendas_busca_normalizada():
+    db = mongomock.MongoClient().db
+    for nome, cnpj in [("Padaria São João", "12.345.678/0001-90"), ("Mercado Central", "98.765.432/0001-10")]:
+        venda = {"nome": nome, "cnpj_cpf": cnpj, "vendedor": "Maria", "numero_da_venda": "2025070001"}
+        venda.update(campos_busca_venda(venda))
+        db.vendas.insert_one(venda)
+
+    def buscar(texto):
+        filtro = montar_filtro_vendas({"tipo": "admin"}, busca=texto, ver_todas=True)
+        return sorted(v["nome"] for v in db.vendas.find(filtro))
+
+    # Sem acento/maiúsculas, início de qualquer palavra do nome e CNPJ com ou sem pontuação
+    assert buscar("SAO jo") == ["Padaria São João"]
+    assert buscar("12.345") == ["Padaria São João"]
+    assert buscar("98765432") == ["Mercado Central"]
+    # Não é mais busca por trecho no meio da palavra
+    assert buscar("ntral") == []
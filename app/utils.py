@@ -1,3 +1,7 @@
+import unicodedata  # Remoção de acentos nos campos de busca
+from datetime import date, datetime
+
+
 def soma_vendas(todas_vendas):
     """
     Soma o valor total das vendas (exceto canceladas), lidando com diferentes formatos de valor_real.
@@ -16,43 +20,251 @@ def soma_vendas(todas_vendas):
 
         valor = venda.get('valor_real', '')
 
-        # Se já for número, apenas soma
-        if isinstance(valor, (int, float)):
+        # Se já for número (vendas gravadas/migradas com valores numéricos), apenas soma
+        if isinstance(valor, (int, float)) and not isinstance(valor, bool):
             total += valor
             continue
 
-        # Se for string, tenta converter
-        if isinstance(valor, str):
-            valor_str = valor.strip()
-
-            if not valor_str:
-                continue
-
-            try:
-                # Trata formatos como "1.234,56"
-                match [(',' in valor_str), ('.' in valor_str)]:
-                    case [False, True]:
-                        total += float(valor_str)
-                        continue
-                    case [True, False]:
-                        valor_normalizado = valor_str.replace(',', '.')
-                        total += float(valor_normalizado)
-                        continue
-                    case [True, True]:
-                        posicao_virgula = valor_str.find(',')
-                        posicao_ponto = valor_str.find('.')
-                        if posicao_virgula < posicao_ponto:
-                            valor_normalizado = valor_str.replace(',', '')
-                        else:
-                            valor_normalizado = valor_str.replace('.', '').replace(',', '.')
-
-                        total += float(valor_normalizado)
-                        continue
-                    case _:
-                        total += float(valor_str)
-                        continue
-            except ValueError:
-                # Ignora se não for possível converter
-                continue
+        # Vendas antigas ainda em texto: converte (valores vazios ou inválidos são ignorados)
+        valor = converter_valor_monetario(valor)
+        if valor is not None:
+            total += valor
 
     return round(total, 2)
+
+
+# Campos monetários da venda, gravados sempre como número (float com 2 casas)
+CAMPOS_MONETARIOS = ('valor_tabela', 'valor_real', 'valor_parcelas', 'valor_entrada', 'valor_venda_avista')
+
+
+def converter_valor_monetario(valor):
+    """
+    Converte um valor monetário (número ou texto em formato brasileiro/americano) para float.
+
+    Args:
+        valor: Número ou texto, ex: 1500, "1500.50", "1.234,56", "1,234.56", "300,25".
+
+    Returns:
+        float | None: Valor com 2 casas decimais ou None se estiver vazio ou for inválido.
+    """
+    if isinstance(valor, bool) or valor is None:
+        return None
+    if isinstance(valor, (int, float)):
+        return round(float(valor), 2)
+    if not isinstance(valor, str):
+        return None
+
+    valor_str = valor.strip()
+    if not valor_str:
+        return None
+
+    # Trata formatos como "1.234,56": o último separador é o decimal
+    match [(',' in valor_str), ('.' in valor_str)]:
+        case [True, False]:
+            valor_str = valor_str.replace(',', '.')
+        case [True, True]:
+            if valor_str.find(',') < valor_str.find('.'):
+                valor_str = valor_str.replace(',', '')
+            else:
+                valor_str = valor_str.replace('.', '').replace(',', '.')
+    try:
+        return round(float(valor_str), 2)
+    except ValueError:
+        return None
+
+
+def normalizar_valores_monetarios(venda):
+    """
+    Converte os campos monetários presentes na venda para número (ver converter_valor_monetario).
+    Valores vazios viram None; textos que não são número são mantidos como estão.
+
+    Args:
+        venda (dict): Venda (ou parte dela, como os campos de uma edição).
+
+    Returns:
+        dict: Somente os campos monetários presentes, já convertidos.
+    """
+    valores = {}
+    for campo in CAMPOS_MONETARIOS:
+        if campo not in venda:
+            continue
+        valor = venda[campo]
+        convertido = converter_valor_monetario(valor)
+        if convertido is not None:
+            valores[campo] = convertido
+        elif valor is None or (isinstance(valor, str) and not valor.strip()):
+            valores[campo] = None
+        else:
+            valores[campo] = valor
+    return valores
+
+
+def formatar_moeda(valor):
+    """
+    Formata um valor monetário para exibição no padrão brasileiro (ex: 1234.5 -> "1.234,50").
+
+    Args:
+        valor: Número ou texto (vendas antigas).
+
+    Returns:
+        str: Valor formatado; textos que não são número são devolvidos como estão e None vira "".
+    """
+    numero = converter_valor_monetario(valor)
+    if numero is None:
+        return '' if valor is None else str(valor)
+    return f'{numero:,.2f}'.replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def somente_digitos(texto):
+    """
+    Mantém apenas os dígitos de um texto (ex: CNPJ/CPF '12.345.678/0001-90' -> '12345678000190').
+
+    Args:
+        texto (str): Texto original (None é tratado como vazio).
+
+    Returns:
+        str: Somente os dígitos.
+    """
+    return ''.join(c for c in str(texto or '') if c.isdigit())
+
+
+def normalizar_texto_busca(texto):
+    """
+    Normaliza um texto para busca: sem acentos, minúsculo, sem pontuação e com espaços simples.
+
+    Args:
+        texto (str): Texto original (None é tratado como vazio).
+
+    Returns:
+        str: Texto normalizado (ex: 'José  da Silva-ME' -> 'jose da silva me').
+    """
+    sem_acentos = unicodedata.normalize('NFKD', str(texto or ''))
+    sem_acentos = ''.join(c for c in sem_acentos if not unicodedata.combining(c))
+    apenas_letras = ''.join(c if c.isalnum() else ' ' for c in sem_acentos.lower())
+    return ' '.join(apenas_letras.split())
+
+
+def termos_busca(texto, max_termos=10):
+    """
+    Gera os termos de busca por prefixo de um nome: o nome normalizado a partir de cada palavra.
+    Assim a busca por prefixo encontra tanto o início do nome quanto o início de qualquer palavra.
+
+    Args:
+        texto (str): Nome original.
+        max_termos (int): Quantidade máxima de termos (limita nomes muito longos).
+
+    Returns:
+        list: Ex: 'José da Silva' -> ['jose da silva', 'da silva', 'silva'].
+    """
+    palavras = normalizar_texto_busca(texto).split()
+    return [' '.join(palavras[i:]) for i in range(min(len(palavras), max_termos))]
+
+
+def campos_busca_venda(venda):
+    """
+    Calcula os campos normalizados de busca de uma venda (gravados no cadastro e na edição).
+
+    Args:
+        venda (dict): Venda com 'cnpj_cpf', 'nome' e 'vendedor'.
+
+    Returns:
+        dict: {'busca_documento', 'busca_nome', 'busca_vendedor'}
+    """
+    return {
+        'busca_documento': somente_digitos(venda.get('cnpj_cpf')),
+        'busca_nome': termos_busca(venda.get('nome')),
+        'busca_vendedor': termos_busca(venda.get('vendedor')),
+    }
+
+
+# Faixas do prazo (dias entre a criação da venda e a prestação inicial): (limite máximo, nome)
+FAIXAS_PRAZO = [
+    (30, '≤ 30 dias'),
+    (39, '31-39 dias'),
+    (49, '40-49 dias'),
+    (150, '50-150 dias'),
+]
+NOMES_FAIXAS_PRAZO = [nome for _, nome in FAIXAS_PRAZO]
+
+
+def converter_data(valor):
+    """
+    Converte uma data da venda (datetime, date ou texto ISO 'YYYY-MM-DD[THH:MM:SS]') para datetime.
+
+    Args:
+        valor: Data original.
+
+    Returns:
+        datetime | None: Data convertida ou None se estiver vazia ou for inválida.
+    """
+    if isinstance(valor, datetime):
+        return valor
+    if isinstance(valor, date):
+        return datetime(valor.year, valor.month, valor.day)
+    if isinstance(valor, str) and valor.strip():
+        try:
+            return datetime.fromisoformat(valor.strip())
+        except ValueError:
+            return None
+    return None
+
+
+def faixa_prazo(dias):
+    """
+    Faixa do prazo para os gráficos de prazo (ver FAIXAS_PRAZO).
+
+    Args:
+        dias (float): Dias entre a criação da venda e a prestação inicial.
+
+    Returns:
+        str | None: Nome da faixa ou None se passar de 150 dias.
+    """
+    for limite, nome in FAIXAS_PRAZO:
+        if dias <= limite:
+            return nome
+    return None
+
+
+def campos_prazo_venda(venda):
+    """
+    Calcula os campos de prazo de uma venda (gravados no cadastro e na edição): a prestação
+    inicial como data, os dias até ela e a faixa usada nos gráficos de prazo.
+
+    Args:
+        venda (dict): Venda com 'data_criacao' e 'data_prestacao_inicial'.
+
+    Returns:
+        dict: {'data_prestacao_inicial', 'prazo_dias', 'faixa_prazo'}; prazo e faixa são None
+              quando falta alguma das datas.
+    """
+    data_prestacao = converter_data(venda.get('data_prestacao_inicial'))
+    data_criacao = converter_data(venda.get('data_criacao'))
+    if data_prestacao is None or data_criacao is None:
+        return {
+            # Texto inválido é mantido para não perder o que foi digitado
+            'data_prestacao_inicial': data_prestacao or venda.get('data_prestacao_inicial') or None,
+            'prazo_dias': None,
+            'faixa_prazo': None,
+        }
+    # Dias fracionados, como nos gráficos: criação (com hora) até a prestação (meia-noite)
+    prazo_dias = (data_prestacao - data_criacao).total_seconds() / 86400
+    return {
+        'data_prestacao_inicial': data_prestacao,
+        'prazo_dias': round(prazo_dias, 2),
+        'faixa_prazo': faixa_prazo(prazo_dias),
+    }
+
+
+def formatar_data_iso(valor):
+    """
+    Formata uma data para campos <input type="date"> ('YYYY-MM-DD').
+
+    Args:
+        valor: datetime/date ou texto (vendas antigas, devolvido como está).
+
+    Returns:
+        str: Data formatada ou "" se vazia.
+    """
+    if isinstance(valor, (datetime, date)):
+        return valor.strftime('%Y-%m-%d')
+    return valor or ''
@@ -0,0 +1,79 @@
+"""
+Módulo de reconstrução dos totais diários de vendas (coleção 'vendas_diarias').
+A coleção é mantida incrementalmente por models.nova_venda, models.atualizar_venda e models.excluir_venda;
+a reconstrução recalcula tudo a partir de 'vendas' (após importações, correções manuais no banco
+ou na primeira implantação).
+
+Uso pela linha de comando:
+    python -m app.vendas_diarias            # reconstrói todos os meses
+    python -m app.vendas_diarias 2025 7     # reconstrói apenas julho/2025
+"""
+
+import sys
+from datetime import datetime
+
+from app.models import contribuicao_venda, vendas_collection, vendas_diarias_collection
+
+# Campos da venda necessários para calcular os totais diários
+CAMPOS_VENDA = {'_id': 0, 'data_criacao': 1, 'vendedor': 1, 'status': 1, 'valor_real': 1, 'produto': 1, 'tipo_cliente': 1}
+
+# Documentos obsoletos removidos por delete_many
+TAMANHO_LOTE = 1000
+
+
+def reconstruir_vendas_diarias(ano=None, mes=None):
+    """
+    Recalcula 'vendas_diarias' a partir das vendas gravadas.
+
+    Parâmetros:
+        ano (int, opcional): Ano a reconstruir (junto com `mes`). Sem ano/mês, reconstrói tudo.
+        mes (int, opcional): Mês a reconstruir.
+
+    Retorna:
+        int: Quantidade de documentos diários gravados.
+    """
+    if ano and mes:
+        primeiro_dia = datetime(ano, mes, 1)
+        proximo_mes = datetime(ano + 1, 1, 1) if mes == 12 else datetime(ano, mes + 1, 1)
+        filtro_dia = {'dia': {'$gte': primeiro_dia, '$lt': proximo_mes}}
+        filtro_vendas = {'data_criacao': {'$gte': primeiro_dia, '$lt': proximo_mes}}
+    else:
+        filtro_dia = {}
+        filtro_vendas = {}
+
+    # Soma as contribuições de cada venda por (dia, vendedor, status)
+    totais_por_chave = {}
+    for venda in vendas_collection.find(filtro_vendas, CAMPOS_VENDA):
+        contribuicao = contribuicao_venda(venda)
+        if contribuicao is None:
+            continue
+        chave, totais = contribuicao
+        chave_tupla = (chave['dia'], chave['vendedor'], chave['status'])
+        if chave_tupla not in totais_por_chave:
+            totais_por_chave[chave_tupla] = dict(chave, **totais)
+        else:
+            for campo, valor in totais.items():
+                totais_por_chave[chave_tupla][campo] += valor
+
+    # Substitui cada documento pelo recalculado (upsert pela chave do índice único) e só depois
+    # remove as chaves que não existem mais. Apagar o período e inserir de novo deixava os
+    # gráficos sem dados durante a reconstrução e perdia (ou fazia falhar no índice único) o
+    # $inc de uma venda cadastrada entre as duas operações. Uma venda gravada enquanto as
+    # vendas são lidas ainda pode ficar de fora; a próxima reconstrução a inclui.
+    for (dia, vendedor, status), documento in totais_por_chave.items():
+        vendas_diarias_collection.replace_one({'dia': dia, 'vendedor': vendedor, 'status': status}, documento, upsert=True)
+
+    obsoletos = [
+        documento['_id']
+        for documento in vendas_diarias_collection.find(filtro_dia, {'dia': 1, 'vendedor': 1, 'status': 1})
+        if (documento.get('dia'), documento.get('vendedor'), documento.get('status')) not in totais_por_chave
+    ]
+    for inicio in range(0, len(obsoletos), TAMANHO_LOTE):
+        vendas_diarias_collection.delete_many({'_id': {'$in': obsoletos[inicio:inicio + TAMANHO_LOTE]}})
+    return len(totais_por_chave)
+
+
+if __name__ == '__main__':
+    argumentos = [int(a) for a in sys.argv[1:3]]
+    total = reconstruir_vendas_diarias(*argumentos)
+    print(f"vendas_diarias reconstruída: {total} documentos")
@@ -0,0 +1,218 @@
+"""
+Módulo da listagem de vendas (/vendas e /api/vendas).
+Monta o filtro da listagem conforme o usuário e os filtros da tela e busca as vendas em páginas
+com paginação por cursor (keyset): ordena por (data_criacao, _id) decrescentes e cada página
+continua a partir da última venda da anterior, usando o índice 'data_criacao_id'.
+Assim nenhuma página precisa carregar (nem pular) as vendas anteriores.
+"""
+
+import base64
+import json
+import re
+from datetime import date, datetime, timedelta
+
+from bson import ObjectId
+from pymongo import DESCENDING
+
+from app.models import vendas_collection
+from app.utils import formatar_moeda, normalizar_texto_busca, somente_digitos
+
+# Status exibidos no filtro da tela de vendas
+STATUS_LISTA = ['Aguardando', 'Aprovada', 'Faturado', 'Cancelada', 'Refazer', 'Finalizada']
+
+# Campos usados na tabela (evita trafegar logs, arquivos, endereços etc.)
+CAMPOS_LISTAGEM = {
+    '_id': 1,
+    'numero_da_venda': 1,
+    'vendedor': 1,
+    'nome': 1,
+    'cnpj_cpf': 1,
+    'produto': 1,
+    'valor_tabela': 1,
+    'valor_real': 1,
+    'status': 1,
+    'obs_vendas': 1,
+    'data_criacao': 1,
+}
+
+# Ordem da listagem: mais recentes primeiro; _id desempata vendas com a mesma data
+ORDEM_LISTAGEM = [('data_criacao', DESCENDING), ('_id', DESCENDING)]
+
+# Tamanho padrão e máximo de uma página
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 200
+
+
+def _juntar(filtro, condicao):
+    """
+    Combina dois filtros com $and (ignorando filtros vazios).
+    """
+    if not filtro:
+        return condicao
+    if '$and' in filtro:
+        return {'$and': filtro['$and'] + [condicao]}
+    return {'$and': [filtro, condicao]}
+
+
+def montar_filtro_vendas(user, busca='', data_inicio='', data_fim='', data='', status='', ver_todas=False):
+    """
+    Monta o filtro da listagem de vendas.
+
+    Regras (as mesmas da tela /vendas):
+        - sem período e sem 'ver_todas', mostra só as vendas de hoje;
+        - vendedor vê apenas as próprias vendas; pós-vendas, as vendas em que está no campo 'posvendas';
+        - 'busca' procura pelo início do CNPJ/CPF, do número da venda ou de qualquer palavra do
+          cliente/vendedor (ver filtro_busca_vendas).
+
+    Parâmetros:
+        user (dict): Usuário da sessão.
+        busca (str): Texto da pesquisa.
+        data_inicio (str): Data inicial 'YYYY-MM-DD'.
+        data_fim (str): Data final 'YYYY-MM-DD' (exige data_inicio).
+        data (str): Data única 'YYYY-MM-DD' (usada quando não há período).
+        status (str): Status exato.
+        ver_todas (bool): Não aplica o filtro padrão de hoje.
+
+    Retorna:
+        dict: Filtro para vendas_collection.
+    """
+    if not data_inicio and not data_fim and not ver_todas:
+        hoje = date.today()
+        data_inicio = hoje.isoformat()
+        data_fim = hoje.isoformat()
+
+    filtro = {}
+    if user.get('tipo') == 'vendedor':
+        filtro['usuario_id'] = ObjectId(user.get('user_id', ''))
+    elif user.get('tipo') == 'pos_vendas':
+        # 'posvendas' guarda nomes separados por vírgula
+        username_pv = re.escape(user.get('username', ''))
+        filtro['posvendas'] = {'$regex': r'(?:^|,)\s*%s\s*(?:,|$)' % username_pv}
+
+    if busca:
+        filtro = _juntar(filtro, filtro_busca_vendas(busca))
+
+    # Período (data_inicio..data_fim, dias inteiros) tem prioridade sobre a data única
+    filtro_periodo = None
+    if data_inicio:
+        try:
+            dt_inicio = datetime.strptime(data_inicio, '%Y-%m-%d')
+            dt_fim = datetime.strptime(data_fim or data_inicio, '%Y-%m-%d')
+            filtro_periodo = {'data_criacao': {'$gte': dt_inicio, '$lte': dt_fim.replace(hour=23, minute=59, second=59)}}
+        except ValueError:
+            filtro_periodo = None
+    elif data and not data_fim:
+        try:
+            dia = datetime.strptime(data, '%Y-%m-%d')
+            filtro_periodo = {'data_criacao': {'$gte': dia, '$lt': dia + timedelta(days=1)}}
+        except ValueError:
+            filtro_periodo = None
+    if filtro_periodo:
+        filtro = _juntar(filtro, filtro_periodo)
+
+    if status:
+        filtro = _juntar(filtro, {'status': status})
+    return filtro
+
+
+def filtro_busca_vendas(busca):
+    """
+    Monta o filtro da pesquisa da tela de vendas sobre os campos normalizados
+    (app/utils.py: campos_busca_venda). Todas as condições são prefixos ancorados ('^...')
+    e sem opção 'i', então cada uma usa o seu índice em vez de varrer a coleção.
+
+    Parâmetros:
+        busca (str): Texto digitado (cliente, vendedor, CNPJ/CPF ou número da venda).
+
+    Retorna:
+        dict: Filtro {'$or': [...]}.
+    """
+    condicoes = [{'numero_da_venda': {'$regex': '^' + re.escape(busca.strip())}}]
+    termo = normalizar_texto_busca(busca)
+    if termo:
+        condicoes.append({'busca_nome': {'$regex': '^' + re.escape(termo)}})
+        condicoes.append({'busca_vendedor': {'$regex': '^' + re.escape(termo)}})
+    digitos = somente_digitos(busca)
+    if digitos:
+        condicoes.append({'busca_documento': {'$regex': '^' + digitos}})
+    return {'$or': condicoes}
+
+
+def codificar_cursor(venda):
+    """
+    Gera o cursor (texto opaco) que aponta para depois de `venda` na ordem da listagem.
+    """
+    data_criacao = venda.get('data_criacao')
+    dados = {
+        'd': data_criacao.isoformat() if isinstance(data_criacao, datetime) else None,
+        'i': str(venda['_id'])
+    }
+    return base64.urlsafe_b64encode(json.dumps(dados).encode()).decode()
+
+
+def decodificar_cursor(cursor):
+    """
+    Lê um cursor gerado por codificar_cursor.
+
+    Retorna:
+        tuple: (data_criacao ou None, ObjectId)
+
+    Lança:
+        ValueError: Se o cursor for inválido.
+    """
+    try:
+        dados = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        data_criacao = datetime.fromisoformat(dados['d']) if dados['d'] else None
+        return data_criacao, ObjectId(dados['i'])
+    except Exception as e:
+        raise ValueError('Cursor inválido') from e
+
+
+def filtro_apos_cursor(data_criacao, id_venda):
+    """
+    Condição das vendas que vêm depois de (data_criacao, _id) na ordem decrescente.
+    Vendas sem data_criacao ficam no fim da ordem (null é o menor valor no MongoDB).
+    """
+    if data_criacao is None:
+        return {'data_criacao': None, '_id': {'$lt': id_venda}}
+    return {'$or': [
+        {'data_criacao': {'$lt': data_criacao}},
+        {'data_criacao': data_criacao, '_id': {'$lt': id_venda}},
+        {'data_criacao': None},
+    ]}
+
+
+def formatar_venda(venda):
+    """
+    Prepara uma venda para JSON: _id em texto, data e valores formatados (como na tela /vendas).
+    """
+    venda = dict(venda)
+    venda['_id'] = str(venda['_id'])
+    for campo in ('valor_tabela', 'valor_real'):
+        if campo in venda:
+            venda[campo] = formatar_moeda(venda[campo])
+    data_criacao = venda.get('data_criacao')
+    venda['data_criacao'] = data_criacao.strftime('%d/%m/%Y %H:%M') if isinstance(data_criacao, datetime) else None
+    return venda
+
+
+def listar_vendas_pagina(filtro, cursor=None, limite=LIMITE_PADRAO):
+    """
+    Busca uma página da listagem de vendas.
+
+    Parâmetros:
+        filtro (dict): Filtro montado por montar_filtro_vendas.
+        cursor (str, opcional): Cursor devolvido na página anterior.
+        limite (int): Quantidade de vendas por página (até LIMITE_MAXIMO).
+
+    Retorna:
+        dict: {'vendas': [...], 'proximo_cursor': str ou None (não há mais páginas)}
+    """
+    limite = max(1, min(int(limite), LIMITE_MAXIMO))
+    if cursor:
+        filtro = _juntar(filtro, filtro_apos_cursor(*decodificar_cursor(cursor)))
+
+    # Busca uma venda a mais só para saber se existe próxima página
+    vendas = list(vendas_collection.find(filtro, CAMPOS_LISTAGEM).sort(ORDEM_LISTAGEM).limit(limite + 1))
+    proximo_cursor = codificar_cursor(vendas[limite - 1]) if len(vendas) > limite else None
+    return {'vendas': vendas[:limite], 'proximo_cursor': proximo_cursor}
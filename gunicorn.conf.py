@@ -0,0 +1,76 @@
+"""
+Configuração do gunicorn para produção (Linux).
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Workers e threads saem da quantidade de CPUs e podem ser ajustados por variáveis de ambiente:
+    WEB_BIND            endereço (padrão 127.0.0.1:5000; a aplicação só aceita localhost,
+                        então fica atrás do proxy reverso)
+    WEB_WORKERS         processos (padrão 2 x CPUs + 1)
+    WEB_THREADS         threads por processo para as requisições comuns (padrão 8)
+    STREAM_CONEXOES     conexões de /api/notificacoes/stream por processo (padrão 16); cada
+                        aba aberta ocupa uma thread por até 5 min, então o worker recebe
+                        WEB_THREADS + STREAM_CONEXOES threads
+    WEB_MAX_REQUESTS    requisições até o worker ser substituído (padrão 5000; limita o
+                        crescimento de memória do Plotly/pandas)
+    WEB_TIMEOUT         segundos sem resposta do worker até ser reiniciado (padrão 120)
+
+Reload sem derrubar conexões:
+    kill -HUP <pid do mestre>   novos workers (relê esta configuração); os antigos terminam
+                                as requisições em andamento (graceful_timeout)
+    Com preload_app o código é carregado no mestre, então o HUP não carrega código novo.
+    Para publicar uma versão nova: kill -USR2 <pid> (sobe um mestre novo com o código novo),
+    depois kill -WINCH <pid antigo> e kill -QUIT <pid antigo>.
+
+Capacidade do fluxo de notificações: WEB_WORKERS x STREAM_CONEXOES abas abertas por nó
+(ex: 4 CPUs -> 9 workers x 16 = 144 abas). Acima disso a rota responde 204 e a aba consulta
+/api/notificacoes a cada 30 s; as threads das requisições comuns nunca são ocupadas pelo fluxo.
+Para mais abas, aumente STREAM_CONEXOES (cada thread parada custa pouca memória).
+"""
+
+import multiprocessing
+import os
+
+# create_app roda no mestre (preload_app) antes do fork: as threads em segundo plano são
+# iniciadas em cada worker (post_worker_init), não no mestre
+os.environ["TAREFAS_SEGUNDO_PLANO"] = "False"
+
+bind = os.environ.get("WEB_BIND", "127.0.0.1:5000")
+workers = int(os.environ.get("WEB_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+
+# Limite de conexões do fluxo por worker, lido pela aplicação (create_app) em cada processo
+os.environ.setdefault("STREAM_CONEXOES", "16")
+threads = int(os.environ.get("WEB_THREADS", 8)) + int(os.environ["STREAM_CONEXOES"])
+
+# Carrega a aplicação uma vez no mestre: workers sobem mais rápido e compartilham memória (copy-on-write)
+preload_app = True
+
+# Recicla os workers para limitar o crescimento de memória; o jitter evita que reiniciem juntos
+max_requests = int(os.environ.get("WEB_MAX_REQUESTS", 5000))
+max_requests_jitter = max_requests // 10
+
+timeout = int(os.environ.get("WEB_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
+
+pidfile = os.environ.get("WEB_PIDFILE")
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    """
+    Mestre pronto (aplicação carregada, índices criados): fecha o cliente MongoDB do mestre
+    antes de criar os workers; cada worker cria o seu (app/conexao_mongo.py).
+    """
+    from app.conexao_mongo import fechar_mongo
+    fechar_mongo()
+
+
+def post_worker_init(worker):
+    """
+    Worker criado: inicia as tarefas em segundo plano deste processo.
+    """
+    from app import iniciar_tarefas_segundo_plano
+    iniciar_tarefas_segundo_plano(worker.wsgi)
@@ -1,3 +1,4 @@
+# Servidor de desenvolvimento do Flask; em produção use wsgi.py (ver README: Execução em produção)
 from app import create_app
  
 app = create_app()
@@ -0,0 +1,26 @@
+"""
+Ponto de entrada WSGI de produção.
+
+Linux:   gunicorn -c gunicorn.conf.py wsgi:app
+Windows: python wsgi.py   (waitress; um processo com WEB_THREADS + STREAM_CONEXOES threads)
+
+run.py continua sendo o servidor de desenvolvimento do Flask.
+"""
+
+import os
+
+# Conexões de /api/notificacoes/stream no processo do waitress (no gunicorn vale o gunicorn.conf.py)
+os.environ.setdefault("STREAM_CONEXOES", "64")
+
+from app import create_app
+
+app = create_app()
+
+if __name__ == "__main__":
+    from waitress import serve
+
+    host, _, porta = os.environ.get("WEB_BIND", "127.0.0.1:5000").rpartition(":")
+    # Cada aba aberta mantém uma conexão em /api/notificacoes/stream ocupando uma thread:
+    # threads extras para elas, fora as das requisições comuns
+    threads = int(os.environ.get("WEB_THREADS", os.cpu_count() * 8)) + int(os.environ["STREAM_CONEXOES"])
+    serve(app, host=host, port=int(porta), threads=threads)